@@ -3,6 +3,7 @@ from flask import Blueprint, request, jsonify
 from shared.auth.bot_api import api_or_session_auth
 from services.browser import BrowserManager
 from services.quotes import LoginPage, QuotePage
+from services.job_processor import processor as job_processor
 from database import db as job_db
 from config import config
 import logging
@@ -339,6 +340,9 @@ def batch_refresh_pricing_async():
         }
     )
 
+    # Start it now rather than on the processor's next poll
+    job_processor.notify()
+
     logger.info(f"Created async job {job_id} for batch refresh of {len(quote_ids)} quotes (org: {org})")
 
     return jsonify({
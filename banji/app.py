@@ -167,6 +167,7 @@ def info():
         },
         'job_queue': {
             'processor_running': job_processor.is_running(),
+            'processor': job_processor.get_status(),
             'pending_jobs': job_stats['pending'],
             'processing_jobs': job_stats['processing']
         }
@@ -50,6 +50,13 @@ class Config:
         self.buz_navigation_timeout = buz_cfg.get("navigation_timeout", 5000)
         self.buz_save_timeout = buz_cfg.get("save_timeout", 10000)
 
+        # Background job config
+        jobs_cfg = data.get("jobs", {}) or {}
+        self.job_workers = jobs_cfg.get("workers", 2)
+        self.job_max_per_org = jobs_cfg.get("max_per_org", 1)
+        self.job_shards_per_job = jobs_cfg.get("shards_per_job", 3)
+        self.job_min_quotes_per_shard = jobs_cfg.get("min_quotes_per_shard", 5)
+
         # Flask secret key (env)
         self.secret_key = os.environ.get(
             "FLASK_SECRET_KEY",
@@ -89,26 +89,35 @@ class Database:
             return job
         return None
 
-    def get_pending_job(self) -> Optional[Dict]:
+    def get_pending_job(self, exclude_orgs: Optional[List[str]] = None) -> Optional[Dict]:
         """
         Get the oldest pending job and mark it as processing.
         Returns None if no pending jobs.
+
+        Args:
+            exclude_orgs: Skip jobs for these orgs (e.g. orgs already busy)
         """
         conn = self.get_connection()
         cursor = conn.cursor()
 
+        org_filter = ''
+        params: List[str] = []
+        if exclude_orgs:
+            org_filter = f"AND org NOT IN ({', '.join('?' for _ in exclude_orgs)})"
+            params = list(exclude_orgs)
+
         # Atomically claim a job
-        cursor.execute("""
+        cursor.execute(f"""
             UPDATE jobs
             SET status = 'processing', started_at = CURRENT_TIMESTAMP
             WHERE id = (
                 SELECT id FROM jobs
-                WHERE status = 'pending'
+                WHERE status = 'pending' {org_filter}
                 ORDER BY created_at ASC
                 LIMIT 1
             )
             RETURNING *
-        """)
+        """, params)
 
         row = cursor.fetchone()
         conn.commit()
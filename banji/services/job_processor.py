@@ -1,12 +1,21 @@
 """Background job processor for Banji.
 
-Runs in a background thread and processes jobs from the queue.
-Only one job is processed at a time (Playwright can only have one browser).
+Runs a dispatcher thread that claims jobs from the queue and hands them to
+a small worker pool. Jobs for different orgs run in parallel; jobs for the
+same org run one at a time (max_jobs_per_org) so they don't fight over the
+org's Buz session.
+
+Large batch refreshes are sharded: several browsers share the org's
+logged-in storage state and pull quotes from a common queue. Results are
+merged back in the original quote order.
+
+create_job callers use notify() to wake the dispatcher immediately.
 """
+import queue
 import threading
-import time
 import logging
-from typing import Optional, Callable, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 
 from banji.database import db
 from banji.services.browser import BrowserManager
@@ -16,68 +25,154 @@ from config import config
 logger = logging.getLogger(__name__)
 
 
+class _BatchProgress:
+    """Thread-safe per-quote progress for one batch job."""
+
+    def __init__(self, job_id: str, total: int):
+        self.job_id = job_id
+        self.total = total
+        self.done = 0
+        self.successful = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def record(self, quote_id: str, success: bool):
+        with self._lock:
+            self.done += 1
+            if success:
+                self.successful += 1
+            else:
+                self.failed += 1
+            done = self.done
+            # Write while holding the lock so progress never goes backwards
+            db.update_job_progress(
+                self.job_id, done, self.total,
+                f"Processed {done}/{self.total} quotes (last: {quote_id})"
+            )
+
+
 class JobProcessor:
     """Background job processor that handles async jobs."""
 
-    def __init__(self, poll_interval: int = 5):
+    def __init__(
+        self,
+        poll_interval: int = 5,
+        max_workers: int = 2,
+        max_jobs_per_org: int = 1,
+        shards_per_job: int = 3,
+        min_quotes_per_shard: int = 5
+    ):
         """
         Initialize job processor.
 
         Args:
-            poll_interval: Seconds between checking for new jobs
+            poll_interval: Seconds between checking for new jobs when nothing
+                calls notify() (e.g. jobs queued by another process)
+            max_workers: Jobs processed at the same time (across orgs)
+            max_jobs_per_org: Jobs processed at the same time for one org
+            shards_per_job: Browsers a large batch refresh is split across
+            min_quotes_per_shard: Don't start another browser for fewer quotes than this
         """
         self.poll_interval = poll_interval
+        self.max_workers = max_workers
+        self.max_jobs_per_org = max_jobs_per_org
+        self.shards_per_job = shards_per_job
+        self.min_quotes_per_shard = min_quotes_per_shard
+
         self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
         self._running = False
 
+        # job_id -> (org, future)
+        self._active: Dict[str, tuple] = {}
+        self._active_lock = threading.Lock()
+
     def start(self):
-        """Start the background processor thread."""
+        """Start the dispatcher thread and worker pool."""
         if self._running:
             logger.warning("Job processor already running")
             return
 
         self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='banji-job')
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
         self._running = True
-        logger.info("Job processor started")
+        logger.info(f"Job processor started ({self.max_workers} workers)")
 
     def stop(self, timeout: float = 30.0):
-        """Stop the background processor thread."""
+        """Stop the dispatcher and wait for running jobs to wind down."""
         if not self._running:
             return
 
         logger.info("Stopping job processor...")
         self._stop_event.set()
+        self._wake_event.set()
 
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=timeout)
             if self._thread.is_alive():
                 logger.warning("Job processor thread did not stop cleanly")
 
+        if self._executor:
+            # Workers see the stop event between quotes and finish early
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
         self._running = False
         logger.info("Job processor stopped")
 
+    def notify(self):
+        """Wake the dispatcher now (call after queueing a job)."""
+        self._wake_event.set()
+
     def is_running(self) -> bool:
         """Check if the processor is running."""
         return self._running and self._thread and self._thread.is_alive()
 
+    def get_status(self) -> Dict[str, Any]:
+        """Workers and the jobs they're running, for health endpoints."""
+        with self._active_lock:
+            active = [{'job_id': job_id, 'org': org} for job_id, (org, _) in self._active.items()]
+        return {
+            'running': bool(self.is_running()),
+            'max_workers': self.max_workers,
+            'max_jobs_per_org': self.max_jobs_per_org,
+            'shards_per_job': self.shards_per_job,
+            'active_jobs': active,
+        }
+
+    def _busy_orgs(self) -> List[str]:
+        """Orgs already running max_jobs_per_org jobs."""
+        with self._active_lock:
+            counts: Dict[str, int] = {}
+            for org, _ in self._active.values():
+                counts[org] = counts.get(org, 0) + 1
+        return [org for org, count in counts.items() if count >= self.max_jobs_per_org]
+
+    def _free_workers(self) -> int:
+        with self._active_lock:
+            return self.max_workers - len(self._active)
+
     def _run(self):
-        """Main processing loop."""
+        """Dispatcher loop: claim jobs while there are free workers."""
         logger.info("Job processor thread started")
 
         while not self._stop_event.is_set():
             try:
-                # Check for and process a pending job
-                job = db.get_pending_job()
+                job = None
+                if self._free_workers() > 0:
+                    job = db.get_pending_job(exclude_orgs=self._busy_orgs())
 
                 if job:
-                    logger.info(f"Processing job {job['id']} ({job['job_type']})")
-                    self._process_job(job)
+                    self._dispatch(job)
                 else:
-                    # No jobs, wait before checking again
-                    self._stop_event.wait(self.poll_interval)
+                    # Nothing to claim (or no free worker) - wait for a job to
+                    # finish or the next poll
+                    self._wake_event.wait(self.poll_interval)
+                    self._wake_event.clear()
 
             except Exception as e:
                 logger.exception(f"Error in job processor loop: {e}")
@@ -86,6 +181,22 @@ class JobProcessor:
 
         logger.info("Job processor thread exiting")
 
+    def _dispatch(self, job: Dict[str, Any]):
+        """Hand a claimed job to the worker pool."""
+        job_id = job['id']
+        logger.info(f"Processing job {job_id} ({job['job_type']}, org: {job['org']})")
+
+        with self._active_lock:
+            future = self._executor.submit(self._process_job, job)
+            self._active[job_id] = (job['org'], future)
+        future.add_done_callback(lambda _f, job_id=job_id: self._job_done(job_id))
+
+    def _job_done(self, job_id: str):
+        with self._active_lock:
+            self._active.pop(job_id, None)
+        # A worker and maybe an org just freed up
+        self._wake_event.set()
+
     def _process_job(self, job: Dict[str, Any]):
         """Process a single job based on its type."""
         job_id = job['id']
@@ -101,12 +212,19 @@ class JobProcessor:
             logger.exception(f"Job {job_id} failed: {e}")
             db.fail_job(job_id, str(e))
 
+    def _shard_count(self, total: int) -> int:
+        """How many browsers to split a batch of quotes across."""
+        by_size = max(1, total // max(1, self.min_quotes_per_shard))
+        return max(1, min(self.shards_per_job, by_size))
+
     def _process_batch_refresh_pricing(self, job: Dict[str, Any]):
         """
         Process a batch refresh pricing job.
 
-        This opens a browser, logs in, and refreshes pricing for each quote.
-        Progress is updated after each quote.
+        Each shard opens a browser with the org's storage state, logs in and
+        refreshes quotes taken from a shared queue until it's empty, so a slow
+        quote never holds up the rest. Progress is updated after each quote
+        and results are merged back in the order the quotes were given.
         """
         job_id = job['id']
         org = job['org']
@@ -115,18 +233,87 @@ class JobProcessor:
         headless = payload.get('headless', True)
 
         total = len(quote_ids)
+        shards = self._shard_count(total)
         db.update_job_progress(job_id, 0, total, f"Starting batch refresh for {total} quotes")
 
-        logger.info(f"Job {job_id}: Starting batch refresh for {total} quotes (org: {org})")
-
-        results = []
-        successful = 0
-        failed = 0
+        logger.info(f"Job {job_id}: Starting batch refresh for {total} quotes across {shards} browser(s) (org: {org})")
 
         try:
             # Get organization configuration
             org_config = config.get_org_config(org)
 
+            work: "queue.Queue[tuple]" = queue.Queue()
+            for index, quote_id in enumerate(quote_ids):
+                work.put((index, quote_id))
+            results: List[Optional[Dict[str, Any]]] = [None] * total
+            progress = _BatchProgress(job_id, total)
+
+            if shards == 1:
+                errors = [self._run_shard(job_id, 1, org_config, headless, work, results, progress)]
+            else:
+                with ThreadPoolExecutor(max_workers=shards, thread_name_prefix=f'banji-shard-{job_id[:8]}') as pool:
+                    futures: List[Future] = [
+                        pool.submit(self._run_shard, job_id, n + 1, org_config, headless, work, results, progress)
+                        for n in range(shards)
+                    ]
+                    errors = [f.result() for f in futures]
+
+            shard_errors = [e for e in errors if e]
+            if shard_errors and progress.done == 0 and len(shard_errors) == shards:
+                # Every browser failed before processing anything (e.g. login)
+                raise RuntimeError(shard_errors[0])
+
+            if self._stop_event.is_set() and progress.done < total:
+                logger.warning(f"Job {job_id}: Interrupted by stop signal")
+                db.update_job_progress(
+                    job_id, progress.done, total,
+                    f"Interrupted after {progress.done}/{total} quotes"
+                )
+            elif progress.done < total:
+                # Some shards died - fail the quotes nobody got to
+                for index, result in enumerate(results):
+                    if result is None:
+                        results[index] = {
+                            'quote_id': quote_ids[index],
+                            'success': False,
+                            'error': f"Not processed: {shard_errors[0]}"
+                        }
+                        progress.failed += 1
+
+            # Job completed
+            final_result = {
+                'total_quotes': total,
+                'successful': progress.successful,
+                'failed': progress.failed,
+                'shards': shards,
+                'results': [r for r in results if r is not None]
+            }
+
+            db.complete_job(job_id, final_result)
+            logger.info(f"Job {job_id}: Completed - {progress.successful}/{total} successful")
+
+        except Exception as e:
+            # Browser/login level failure
+            logger.exception(f"Job {job_id}: Fatal error: {e}")
+            db.fail_job(job_id, f"Fatal error: {str(e)}")
+
+    def _run_shard(
+        self,
+        job_id: str,
+        shard: int,
+        org_config: Dict[str, Any],
+        headless: bool,
+        work: "queue.Queue[tuple]",
+        results: List[Optional[Dict[str, Any]]],
+        progress: _BatchProgress
+    ) -> Optional[str]:
+        """
+        Refresh quotes from the shared queue in one browser until it's empty.
+
+        Returns:
+            None, or the error that stopped this shard's browser
+        """
+        try:
             # Use browser manager context to ensure cleanup
             with BrowserManager(config, org_config, headless=headless) as browser_manager:
                 page = browser_manager.page
@@ -135,58 +322,40 @@ class JobProcessor:
                 login_page = LoginPage(page, config, org_config)
                 login_page.login()
 
-                db.update_job_progress(job_id, 0, total, "Logged in, starting quote processing")
-
-                # Process each quote
                 quote_page = QuotePage(page, config, org_config)
 
-                for i, quote_id in enumerate(quote_ids):
-                    # Check if we should stop
-                    if self._stop_event.is_set():
-                        logger.warning(f"Job {job_id}: Interrupted by stop signal")
-                        db.update_job_progress(
-                            job_id, i, total,
-                            f"Interrupted after {i}/{total} quotes"
-                        )
+                while not self._stop_event.is_set():
+                    try:
+                        index, quote_id = work.get_nowait()
+                    except queue.Empty:
                         break
 
-                    db.update_job_progress(
-                        job_id, i, total,
-                        f"Processing quote {i + 1}/{total}: {quote_id}"
-                    )
-
                     try:
                         result = quote_page.refresh_pricing(quote_id)
                         result['success'] = True
-                        results.append(result)
-                        successful += 1
-                        logger.info(f"Job {job_id}: Quote {quote_id} processed successfully")
-
+                        logger.info(f"Job {job_id} [shard {shard}]: Quote {quote_id} processed successfully")
                     except Exception as e:
-                        logger.error(f"Job {job_id}: Quote {quote_id} failed: {e}")
-                        results.append({
+                        logger.error(f"Job {job_id} [shard {shard}]: Quote {quote_id} failed: {e}")
+                        result = {
                             'quote_id': quote_id,
                             'success': False,
                             'error': str(e)
-                        })
-                        failed += 1
+                        }
 
-            # Job completed
-            final_result = {
-                'total_quotes': total,
-                'successful': successful,
-                'failed': failed,
-                'results': results
-            }
+                    results[index] = result
+                    progress.record(quote_id, result['success'])
 
-            db.complete_job(job_id, final_result)
-            logger.info(f"Job {job_id}: Completed - {successful}/{total} successful")
+            return None
 
         except Exception as e:
-            # Browser/login level failure
-            logger.exception(f"Job {job_id}: Fatal error: {e}")
-            db.fail_job(job_id, f"Fatal error: {str(e)}")
+            logger.exception(f"Job {job_id} [shard {shard}]: Browser error: {e}")
+            return str(e)
 
 
 # Global processor instance
-processor = JobProcessor()
+processor = JobProcessor(
+    max_workers=config.job_workers,
+    max_jobs_per_org=config.job_max_per_org,
+    shards_per_job=config.job_shards_per_job,
+    min_quotes_per_shard=config.job_min_quotes_per_shard
+)
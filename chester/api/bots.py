@@ -61,15 +61,23 @@ def check_all_health():
             'healthy': healthy,
             'unhealthy': total - healthy
         },
-        'results': results
+        'results': results,
+        'poller': bot_service.health_poller.get_status()
     })
 
 
 @bots_bp.route('/health/<bot_name>', methods=['GET'])
 @api_key_required
 def check_bot_health(bot_name):
-    """Check health of a specific bot."""
-    result = bot_service.check_bot_health(bot_name)
+    """
+    Check health of a specific bot.
+
+    Served from the health snapshot; pass ?live=true to force a fresh check.
+    """
+    if request.args.get('live', 'false').lower() == 'true':
+        result = bot_service.check_bot_health(bot_name)
+    else:
+        result = bot_service.get_cached_bot_health(bot_name)
 
     return jsonify({
         'success': True,
@@ -85,11 +93,8 @@ def check_public_bots_health():
     public_bots = db.get_public_bots()
     public_bot_names = [bot['name'] for bot in public_bots]
 
-    # Check health for each public bot
-    results = []
-    for bot_name in public_bot_names:
-        health = bot_service.check_bot_health(bot_name)
-        results.append(health)
+    # Read health for each public bot from the snapshot
+    results = bot_service.check_all_bots_health(public_bot_names)
 
     return jsonify({
         'success': True,
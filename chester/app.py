@@ -117,6 +117,12 @@ result = db.sync_bots_from_config(verbose=False)
 if result['added']:
     print(f"🔄 Chester: Auto-registered {len(result['added'])} bot(s) from config.yaml: {', '.join(result['added'])}")
 
+# Keep the bot health snapshot warm in the background so dashboard and
+# health API reads never wait on a sweep of the whole team
+if config.health_check_enabled:
+    from services.bot_service import bot_service
+    bot_service.health_poller.start()
+
 
 if __name__ == '__main__':
     print("\n" + "="*50)
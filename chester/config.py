@@ -38,6 +38,8 @@ class Config:
         self.health_check_timeout = health_cfg.get("timeout", 0.5)
         self.health_check_interval = health_cfg.get("check_interval", 60)
         self.health_check_enabled = health_cfg.get("enabled", True)
+        self.health_check_concurrency = health_cfg.get("max_concurrency", 8)
+        self.health_check_history_size = health_cfg.get("history_size", 60)
 
         # New bot template config
         self.new_bot_template = data.get("new_bot_template", {}) or {}
@@ -4,6 +4,7 @@ import requests
 from typing import Dict, List, Optional
 from config import config
 from services.database import Database
+from services.health_poller import HealthPoller
 
 
 def is_dev_mode() -> bool:
@@ -17,6 +18,21 @@ class BotService:
     def __init__(self):
         self.timeout = config.health_check_timeout
         self.db = Database()
+        self.health_poller = HealthPoller(
+            check_fn=self.check_bot_health,
+            bot_names_fn=self._polled_bot_names,
+            interval=config.health_check_interval,
+            max_concurrency=config.health_check_concurrency,
+            history_size=config.health_check_history_size,
+        )
+
+    def _polled_bot_names(self) -> List[str]:
+        """Bots the health poller checks: the team plus public bots registered in the database."""
+        names = list(config.bot_team.keys())
+        for bot in self.db.get_public_bots():
+            if bot['name'] not in config.bot_team:
+                names.append(bot['name'])
+        return names
 
     def get_all_bots(self) -> Dict:
         """Get information about all bots in the team."""
@@ -125,19 +141,45 @@ class BotService:
                 'url': health_url
             }
 
-    def check_all_bots_health(self) -> List[Dict]:
+    def check_all_bots_health(self, bot_names: Optional[List[str]] = None) -> List[Dict]:
         """
-        Check the health of all bots in the team.
+        Get the health of all bots in the team.
+
+        Served from the health poller's snapshot. If the background poller
+        isn't running and the snapshot is missing or stale, a concurrent
+        sweep is run first. Requested bots the snapshot doesn't have yet
+        (e.g. registered since the last sweep) are checked live.
+
+        Args:
+            bot_names: Optional subset of bots to return (default: whole team)
 
         Returns:
             List of health check results for each bot
         """
+        poller = self.health_poller
+        if poller.is_stale() and (not poller.is_running() or not poller.get_results()):
+            poller.refresh()
+
+        names = bot_names if bot_names is not None else list(config.bot_team.keys())
         results = []
-        for bot_name in config.bot_team.keys():
-            health = self.check_bot_health(bot_name)
-            results.append(health)
+        for name in names:
+            health = poller.get(name)
+            results.append(health if health is not None else self.check_bot_health(name))
         return results
 
+    def get_cached_bot_health(self, bot_name: str) -> Dict:
+        """
+        Get a bot's health from the snapshot, checking live if it has no entry yet.
+
+        Returns:
+            Health result including 'checked_at' and recent 'history'
+        """
+        health = self.health_poller.get(bot_name)
+        if health is None:
+            health = self.check_bot_health(bot_name)
+        health['history'] = self.health_poller.get_history(bot_name)
+        return health
+
     def get_bot_capabilities(self, bot_name: str) -> Optional[List[str]]:
         """Get the capabilities of a specific bot."""
         bot_info = self.get_bot_info(bot_name)
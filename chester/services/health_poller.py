@@ -0,0 +1,191 @@
+"""Background health poller for Chester.
+
+Checks every bot on a timer with bounded concurrency and keeps the latest
+result (plus a short latency history) per bot in memory, so the dashboard and
+health API read a snapshot instead of making ~30 HTTP calls per page view.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HealthPoller:
+    """Keeps an in-memory, timestamped health snapshot for every bot."""
+
+    def __init__(
+        self,
+        check_fn: Callable[[str], Dict],
+        bot_names_fn: Callable[[], Iterable[str]],
+        interval: int = 60,
+        max_concurrency: int = 8,
+        history_size: int = 60,
+    ):
+        """
+        Initialize the poller.
+
+        Args:
+            check_fn: Checks one bot by name and returns its health dict
+            bot_names_fn: Returns the names of the bots to check
+            interval: Seconds between sweeps
+            max_concurrency: Maximum health checks in flight at once
+            history_size: Number of latency samples kept per bot
+        """
+        self.check_fn = check_fn
+        self.bot_names_fn = bot_names_fn
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.history_size = history_size
+
+        self._snapshot: Dict[str, Dict] = {}
+        self._history: Dict[str, deque] = {}
+        self._last_sweep_at: Optional[float] = None
+        self._last_sweep_ms: Optional[int] = None
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._running = False
+
+    def start(self):
+        """Start the background polling thread."""
+        if self._running:
+            logger.warning("Health poller already running")
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._running = True
+        logger.info(f"Health poller started (every {self.interval}s, {self.max_concurrency} at a time)")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background polling thread."""
+        if not self._running:
+            return
+
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning("Health poller thread did not stop cleanly")
+
+        self._running = False
+        logger.info("Health poller stopped")
+
+    def is_running(self) -> bool:
+        """Check if the poller is running."""
+        return self._running and self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """Main polling loop."""
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.exception(f"Error in health poller sweep: {e}")
+            self._stop_event.wait(self.interval)
+
+    def refresh(self) -> List[Dict]:
+        """
+        Check every bot now (concurrently) and update the snapshot.
+
+        Concurrent callers share a single sweep rather than starting their own.
+
+        Returns:
+            List of health results, in bot order
+        """
+        started_waiting = time.monotonic()
+        with self._sweep_lock:
+            # Another caller finished a sweep while we waited - use it
+            if self._last_sweep_at is not None and self._last_sweep_at >= started_waiting:
+                return self.get_results()
+
+            bot_names = list(self.bot_names_fn())
+            start = time.monotonic()
+
+            results: Dict[str, Dict] = {}
+            if bot_names:
+                with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(bot_names)))) as executor:
+                    futures = {name: executor.submit(self._check_one, name) for name in bot_names}
+                    for name, future in futures.items():
+                        results[name] = future.result()
+
+            with self._lock:
+                # Drop bots that have left the team
+                for name in list(self._snapshot.keys()):
+                    if name not in results:
+                        self._snapshot.pop(name, None)
+                        self._history.pop(name, None)
+
+                for name, result in results.items():
+                    history = self._history.setdefault(name, deque(maxlen=self.history_size))
+                    history.append({
+                        'checked_at': result['checked_at'],
+                        'status': result.get('status'),
+                        'response_time': result.get('response_time'),
+                    })
+                    self._snapshot[name] = result
+
+                self._last_sweep_at = time.monotonic()
+                self._last_sweep_ms = int((self._last_sweep_at - start) * 1000)
+
+        return [results[name] for name in bot_names]
+
+    def _check_one(self, bot_name: str) -> Dict:
+        try:
+            result = self.check_fn(bot_name)
+        except Exception as e:
+            result = {'bot': bot_name, 'status': 'error', 'error': str(e)}
+        result['checked_at'] = datetime.now(timezone.utc).isoformat()
+        return result
+
+    def is_stale(self) -> bool:
+        """True if there's no snapshot yet or it's older than one interval."""
+        with self._lock:
+            if self._last_sweep_at is None:
+                return True
+            return time.monotonic() - self._last_sweep_at > self.interval
+
+    def get(self, bot_name: str) -> Optional[Dict]:
+        """Latest health result for one bot, or None if it hasn't been checked."""
+        with self._lock:
+            result = self._snapshot.get(bot_name)
+            return dict(result) if result else None
+
+    def get_results(self, bot_names: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Latest health results from the snapshot.
+
+        Args:
+            bot_names: Bots to include (default: every bot in the snapshot)
+        """
+        with self._lock:
+            names = list(bot_names) if bot_names is not None else list(self._snapshot.keys())
+            return [dict(self._snapshot[name]) for name in names if name in self._snapshot]
+
+    def get_history(self, bot_name: str) -> List[Dict]:
+        """Recent status/latency samples for a bot, oldest first."""
+        with self._lock:
+            return list(self._history.get(bot_name, []))
+
+    def get_status(self) -> Dict:
+        """Poller state for diagnostics."""
+        with self._lock:
+            age = None
+            if self._last_sweep_at is not None:
+                age = round(time.monotonic() - self._last_sweep_at, 1)
+            return {
+                'running': self.is_running(),
+                'interval': self.interval,
+                'max_concurrency': self.max_concurrency,
+                'bots_tracked': len(self._snapshot),
+                'snapshot_age_seconds': age,
+                'last_sweep_ms': self._last_sweep_ms,
+            }
@@ -81,7 +81,7 @@ def bot_details(bot_name):
 
     # Check health (if enabled)
     if config.health_check_enabled:
-        health = bot_service.check_bot_health(bot_name)
+        health = bot_service.get_cached_bot_health(bot_name)
     else:
         health = {'bot': bot_name, 'status': 'disabled', 'message': 'Health checks disabled'}
 
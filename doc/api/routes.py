@@ -190,15 +190,24 @@ def run_tests():
 
     Optional JSON body:
     {
-        "marker": "fred",  // pytest marker (optional)
-        "timeout": 300     // timeout in seconds (optional, max 600)
+        "marker": "fred",       // pytest marker (optional)
+        "timeout": 300,         // timeout in seconds (optional, max 600)
+        "workers": 4,           // pytest processes to shard across (optional)
+        "shard_by": "file",     // file or marker (optional)
+        "changed_only": true    // only bots changed since the last green run (optional)
     }
     """
     data = request.get_json() or {}
     marker = data.get('marker')
     timeout = data.get('timeout')
 
-    result = test_runner.run_tests(marker=marker, timeout=timeout)
+    result = test_runner.run_tests(
+        marker=marker,
+        timeout=timeout,
+        workers=data.get('workers'),
+        shard_by=data.get('shard_by'),
+        changed_only=bool(data.get('changed_only'))
+    )
     return jsonify(result)
 
 
@@ -234,6 +243,40 @@ def get_test_run(run_id):
     })
 
 
+@api_bp.route('/tests/runs/<int:run_id>/results', methods=['GET'])
+@api_key_required
+def get_test_run_results(run_id):
+    """
+    Get per-test results for a run, slowest first
+
+    Query params:
+        outcome: passed, failed, error or skipped (optional)
+    """
+    run = test_runner.get_run(run_id)
+    if not run:
+        return jsonify({
+            'success': False,
+            'error': f'Test run {run_id} not found'
+        }), 404
+
+    results = test_runner.get_results(run_id, outcome=request.args.get('outcome'))
+    return jsonify({
+        'success': True,
+        'count': len(results),
+        'results': results
+    })
+
+
+@api_bp.route('/tests/changed', methods=['GET'])
+@api_key_required
+def get_changed_tests():
+    """Preview which tests a changed_only run would pick"""
+    return jsonify({
+        'success': True,
+        **test_runner.select_changed_tests()
+    })
+
+
 @api_bp.route('/tests/latest', methods=['GET'])
 @api_key_required
 def get_latest_test():
@@ -125,6 +125,8 @@ def info():
                 'GET /api/vitals/<bot>': 'Get specific bot metrics',
                 'POST /api/tests/run': 'Run pytest test suite',
                 'GET /api/tests/runs': 'Get test run history',
+                'GET /api/tests/runs/<id>/results': 'Get per-test results and durations',
+                'GET /api/tests/changed': 'Preview tests for bots changed since the last green run',
                 'GET /api/tests/latest': 'Get most recent test run'
             },
             'system': {
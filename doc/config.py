@@ -51,6 +51,9 @@ class Config:
         self.tests_project_root = tests_config.get("project_root", "/home/user/bot-team")
         self.tests_default_timeout = tests_config.get("default_timeout", 300)
         self.tests_max_timeout = tests_config.get("max_timeout", 600)
+        self.tests_workers = tests_config.get("workers", 4)
+        self.tests_max_workers = tests_config.get("max_workers", 8)
+        self.tests_shard_by = tests_config.get("shard_by", "file")
 
         # ── Secrets / env-specific settings ────────────────────
         self.flask_secret_key = os.environ.get("FLASK_SECRET_KEY")
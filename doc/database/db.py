@@ -3,15 +3,16 @@ Database module for Doc
 
 Tracks:
 - Bot registry (synced from Chester)
-- Health checkup results
+- Health checkup results, with hourly/daily rollups and each bot's latest status
 - Test run history
 """
 
 import sqlite3
 import logging
+from bisect import bisect_left
 from pathlib import Path
-from datetime import datetime, timezone
-from typing import Optional, List
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict
 import json
 
 from config import config
@@ -19,6 +20,50 @@ from shared.migrations import MigrationRunner
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (ms) of the response-time histogram bins kept per rollup
+# bucket; values above the last bound go in one open-ended bin
+RESPONSE_TIME_BINS = [10, 25, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000]
+
+# Hourly rollups are kept this long; longer vitals periods read daily rollups
+HOURLY_ROLLUP_DAYS = 7
+
+
+def _rollup_buckets(checked_at: str) -> List[tuple]:
+    """(period, bucket_start) pairs a checkup timestamp (UTC ISO) rolls up into"""
+    return [
+        ('hour', f"{checked_at[:13]}:00:00"),
+        ('day', checked_at[:10]),
+    ]
+
+
+def _percentile(histogram: Dict[int, int], percentile: float,
+                min_ms: Optional[int], max_ms: Optional[int]) -> Optional[float]:
+    """
+    Estimate a response-time percentile from histogram bin counts
+
+    Interpolates linearly inside the bin holding the percentile, clamped to
+    the observed min/max, so it's exact at the extremes and close elsewhere.
+    """
+    total = sum(histogram.values())
+    if not total:
+        return None
+
+    rank = percentile / 100 * total
+    cumulative = 0
+    for index in sorted(histogram):
+        count = histogram[index]
+        if count and cumulative + count >= rank:
+            lower = RESPONSE_TIME_BINS[index - 1] if index > 0 else 0
+            upper = RESPONSE_TIME_BINS[index] if index < len(RESPONSE_TIME_BINS) else max_ms
+            if min_ms is not None:
+                lower = max(lower, min_ms)
+            if max_ms is not None:
+                upper = min(upper, max_ms)
+            upper = max(upper, lower)
+            return round(lower + (upper - lower) * (rank - cumulative) / count, 2)
+        cumulative += count
+    return max_ms
+
 
 class DocDatabase:
     """Database manager for Doc"""
@@ -34,6 +79,7 @@ class DocDatabase:
         self.db_path = db_path
         self._ensure_directory()
         self._run_migrations()
+        self._backfill_rollups()
 
     def _ensure_directory(self):
         """Ensure database directory exists"""
@@ -157,21 +203,115 @@ class DocDatabase:
         status_code: int = None,
         error_message: str = None
     ) -> int:
-        """Record a health checkup result"""
+        """
+        Record a health checkup result
+
+        The checkup, the bot's latest status and its hourly/daily rollups
+        are written in one transaction.
+        """
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
             now = datetime.now(timezone.utc).isoformat()
 
+            with conn:
+                cursor.execute(
+                    """
+                    INSERT INTO checkups (bot_name, checked_at, status, response_time_ms, status_code, error_message)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (bot_name, now, status, response_time_ms, status_code, error_message)
+                )
+                checkup_id = cursor.lastrowid
+                self._apply_checkup(cursor, {
+                    'id': checkup_id,
+                    'bot_name': bot_name,
+                    'checked_at': now,
+                    'status': status,
+                    'response_time_ms': response_time_ms,
+                    'status_code': status_code,
+                    'error_message': error_message,
+                })
+            return checkup_id
+        finally:
+            conn.close()
+
+    def _apply_checkup(self, cursor: sqlite3.Cursor, checkup: dict):
+        """Fold one checkup into bot_status and the rollup tables"""
+        cursor.execute(
+            """
+            INSERT INTO bot_status (bot_name, checkup_id, checked_at, status, response_time_ms, status_code, error_message)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(bot_name) DO UPDATE SET
+                checkup_id = excluded.checkup_id,
+                checked_at = excluded.checked_at,
+                status = excluded.status,
+                response_time_ms = excluded.response_time_ms,
+                status_code = excluded.status_code,
+                error_message = excluded.error_message
+            WHERE excluded.checked_at >= bot_status.checked_at
+            """,
+            (checkup['bot_name'], checkup['id'], checkup['checked_at'], checkup['status'],
+             checkup['response_time_ms'], checkup['status_code'], checkup['error_message'])
+        )
+
+        response_time = checkup['response_time_ms']
+        healthy = 1 if checkup['status'] == 'healthy' else 0
+        for period, bucket_start in _rollup_buckets(checkup['checked_at']):
             cursor.execute(
                 """
-                INSERT INTO checkups (bot_name, checked_at, status, response_time_ms, status_code, error_message)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO checkup_rollups (
+                    bot_name, period, bucket_start, total_checks, healthy_count,
+                    response_time_count, response_time_sum, min_response_time, max_response_time
+                )
+                VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?)
+                ON CONFLICT(bot_name, period, bucket_start) DO UPDATE SET
+                    total_checks = total_checks + 1,
+                    healthy_count = healthy_count + excluded.healthy_count,
+                    response_time_count = response_time_count + excluded.response_time_count,
+                    response_time_sum = response_time_sum + excluded.response_time_sum,
+                    min_response_time = CASE
+                        WHEN excluded.min_response_time IS NULL THEN min_response_time
+                        WHEN min_response_time IS NULL THEN excluded.min_response_time
+                        ELSE MIN(min_response_time, excluded.min_response_time) END,
+                    max_response_time = CASE
+                        WHEN excluded.max_response_time IS NULL THEN max_response_time
+                        WHEN max_response_time IS NULL THEN excluded.max_response_time
+                        ELSE MAX(max_response_time, excluded.max_response_time) END
                 """,
-                (bot_name, now, status, response_time_ms, status_code, error_message)
+                (checkup['bot_name'], period, bucket_start, healthy,
+                 0 if response_time is None else 1, response_time or 0,
+                 response_time, response_time)
             )
-            conn.commit()
-            return cursor.lastrowid
+            if response_time is not None:
+                cursor.execute(
+                    """
+                    INSERT INTO checkup_rollup_histogram (bot_name, period, bucket_start, bin, count)
+                    VALUES (?, ?, ?, ?, 1)
+                    ON CONFLICT(bot_name, period, bucket_start, bin) DO UPDATE SET
+                        count = count + 1
+                    """,
+                    (checkup['bot_name'], period, bucket_start,
+                     bisect_left(RESPONSE_TIME_BINS, response_time))
+                )
+
+    def _backfill_rollups(self):
+        """Build rollups from existing checkups (first start after the rollup migration)"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM checkup_rollups)")
+            if cursor.fetchone()[0]:
+                return
+            cursor.execute("SELECT * FROM checkups ORDER BY id")
+            checkups = [dict(row) for row in cursor.fetchall()]
+            if not checkups:
+                return
+
+            with conn:
+                for checkup in checkups:
+                    self._apply_checkup(cursor, checkup)
+            logger.info(f"Backfilled checkup rollups from {len(checkups)} checkups")
         finally:
             conn.close()
 
@@ -182,10 +322,10 @@ class DocDatabase:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT * FROM checkups
+                SELECT checkup_id AS id, bot_name, checked_at, status,
+                       response_time_ms, status_code, error_message
+                FROM bot_status
                 WHERE bot_name = ?
-                ORDER BY checked_at DESC
-                LIMIT 1
                 """,
                 (bot_name,)
             )
@@ -194,6 +334,23 @@ class DocDatabase:
         finally:
             conn.close()
 
+    def get_latest_checkups(self) -> Dict[str, dict]:
+        """Get the most recent checkup for every bot, keyed by bot name"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT checkup_id AS id, bot_name, checked_at, status,
+                       response_time_ms, status_code, error_message
+                FROM bot_status
+                ORDER BY bot_name
+                """
+            )
+            return {row['bot_name']: dict(row) for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
     def get_checkup_history(self, bot_name: str = None, limit: int = 50) -> List[dict]:
         """Get checkup history, optionally filtered by bot"""
         conn = self._get_connection()
@@ -222,36 +379,82 @@ class DocDatabase:
         finally:
             conn.close()
 
+    @staticmethod
+    def _rollup_window(hours: int) -> tuple:
+        """
+        (period, first bucket_start) covering the past N hours
+
+        Windows start on a bucket boundary, so they can include up to one
+        extra hour (or day, for periods longer than HOURLY_ROLLUP_DAYS).
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        if hours <= HOURLY_ROLLUP_DAYS * 24:
+            return 'hour', cutoff.strftime('%Y-%m-%dT%H:00:00')
+        return 'day', cutoff.strftime('%Y-%m-%d')
+
+    def _rollup_percentiles(
+        self,
+        cursor: sqlite3.Cursor,
+        period: str,
+        since: str,
+        min_ms: Optional[int],
+        max_ms: Optional[int],
+        bot_name: str = None
+    ) -> dict:
+        """p50/p95 response time over a rollup window (one bot, or all bots)"""
+        query = """
+            SELECT bin, SUM(count) AS count
+            FROM checkup_rollup_histogram
+            WHERE period = ? AND bucket_start >= ?
+        """
+        params = [period, since]
+        if bot_name:
+            query += " AND bot_name = ?"
+            params.append(bot_name)
+        cursor.execute(query + " GROUP BY bin", params)
+        histogram = {row['bin']: row['count'] for row in cursor.fetchall()}
+        return {
+            'p50_response_time_ms': _percentile(histogram, 50, min_ms, max_ms),
+            'p95_response_time_ms': _percentile(histogram, 95, min_ms, max_ms),
+        }
+
     def get_bot_vitals(self, bot_name: str, hours: int = 24) -> dict:
-        """Get vital statistics for a bot over the past N hours"""
+        """Get vital statistics for a bot over the past N hours (from rollups)"""
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
+            period, since = self._rollup_window(hours)
             cursor.execute(
                 """
                 SELECT
-                    COUNT(*) as total_checks,
-                    SUM(CASE WHEN status = 'healthy' THEN 1 ELSE 0 END) as healthy_count,
-                    AVG(response_time_ms) as avg_response_time,
-                    MIN(response_time_ms) as min_response_time,
-                    MAX(response_time_ms) as max_response_time
-                FROM checkups
-                WHERE bot_name = ?
-                AND checked_at >= datetime('now', ?)
+                    SUM(total_checks) as total_checks,
+                    SUM(healthy_count) as healthy_count,
+                    SUM(response_time_sum) as response_time_sum,
+                    SUM(response_time_count) as response_time_count,
+                    MIN(min_response_time) as min_response_time,
+                    MAX(max_response_time) as max_response_time
+                FROM checkup_rollups
+                WHERE bot_name = ? AND period = ? AND bucket_start >= ?
                 """,
-                (bot_name, f'-{hours} hours')
+                (bot_name, period, since)
             )
             row = cursor.fetchone()
-            if row and row['total_checks'] > 0:
+            if row and row['total_checks']:
                 return {
                     'bot_name': bot_name,
                     'period_hours': hours,
                     'total_checks': row['total_checks'],
                     'healthy_count': row['healthy_count'] or 0,
                     'uptime_percent': round((row['healthy_count'] or 0) / row['total_checks'] * 100, 2),
-                    'avg_response_time_ms': round(row['avg_response_time'] or 0, 2),
+                    'avg_response_time_ms': round(
+                        row['response_time_sum'] / row['response_time_count'], 2
+                    ) if row['response_time_count'] else 0,
                     'min_response_time_ms': row['min_response_time'],
-                    'max_response_time_ms': row['max_response_time']
+                    'max_response_time_ms': row['max_response_time'],
+                    **self._rollup_percentiles(
+                        cursor, period, since,
+                        row['min_response_time'], row['max_response_time'], bot_name
+                    )
                 }
             return {
                 'bot_name': bot_name,
@@ -261,43 +464,45 @@ class DocDatabase:
                 'uptime_percent': None,
                 'avg_response_time_ms': None,
                 'min_response_time_ms': None,
-                'max_response_time_ms': None
+                'max_response_time_ms': None,
+                'p50_response_time_ms': None,
+                'p95_response_time_ms': None
             }
         finally:
             conn.close()
 
     def get_team_vitals(self, hours: int = 24) -> dict:
-        """Get vital statistics for the entire team"""
+        """Get vital statistics for the entire team (from rollups and bot_status)"""
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
+            period, since = self._rollup_window(hours)
 
             # Overall stats
             cursor.execute(
                 """
                 SELECT
                     COUNT(DISTINCT bot_name) as bots_checked,
-                    COUNT(*) as total_checks,
-                    SUM(CASE WHEN status = 'healthy' THEN 1 ELSE 0 END) as healthy_count,
-                    AVG(response_time_ms) as avg_response_time
-                FROM checkups
-                WHERE checked_at >= datetime('now', ?)
+                    SUM(total_checks) as total_checks,
+                    SUM(healthy_count) as healthy_count,
+                    SUM(response_time_sum) as response_time_sum,
+                    SUM(response_time_count) as response_time_count,
+                    MIN(min_response_time) as min_response_time,
+                    MAX(max_response_time) as max_response_time
+                FROM checkup_rollups
+                WHERE period = ? AND bucket_start >= ?
                 """,
-                (f'-{hours} hours',)
+                (period, since)
             )
             overall = cursor.fetchone()
 
             # Per-bot status (latest check for each)
             cursor.execute(
                 """
-                SELECT c1.*
-                FROM checkups c1
-                INNER JOIN (
-                    SELECT bot_name, MAX(checked_at) as max_checked
-                    FROM checkups
-                    GROUP BY bot_name
-                ) c2 ON c1.bot_name = c2.bot_name AND c1.checked_at = c2.max_checked
-                ORDER BY c1.bot_name
+                SELECT checkup_id AS id, bot_name, checked_at, status,
+                       response_time_ms, status_code, error_message
+                FROM bot_status
+                ORDER BY bot_name
                 """
             )
             latest_by_bot = [dict(row) for row in cursor.fetchall()]
@@ -311,7 +516,13 @@ class DocDatabase:
                 'overall_uptime_percent': round(
                     (overall['healthy_count'] or 0) / overall['total_checks'] * 100, 2
                 ) if overall['total_checks'] else None,
-                'avg_response_time_ms': round(overall['avg_response_time'] or 0, 2) if overall['avg_response_time'] else None,
+                'avg_response_time_ms': round(
+                    overall['response_time_sum'] / overall['response_time_count'], 2
+                ) if overall['response_time_count'] and overall['response_time_sum'] else None,
+                **self._rollup_percentiles(
+                    cursor, period, since,
+                    overall['min_response_time'], overall['max_response_time']
+                ),
                 'current_status': {
                     'healthy': healthy_bots,
                     'unhealthy': len(latest_by_bot) - healthy_bots,
@@ -323,7 +534,13 @@ class DocDatabase:
             conn.close()
 
     def cleanup_old_checkups(self, days: int = 30) -> int:
-        """Remove checkup records older than N days"""
+        """
+        Remove checkup records older than N days
+
+        Also drops hourly rollups older than HOURLY_ROLLUP_DAYS, and the
+        latest status of any bot not checked in N days (removed or renamed
+        bots). Daily rollups (one row per bot per day) are kept.
+        """
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
@@ -334,8 +551,24 @@ class DocDatabase:
                 """,
                 (f'-{days} days',)
             )
+            deleted = cursor.rowcount
+
+            status_cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+            cursor.execute(
+                "DELETE FROM bot_status WHERE checked_at < ?",
+                (status_cutoff,)
+            )
+
+            hourly_cutoff = (
+                datetime.now(timezone.utc) - timedelta(days=HOURLY_ROLLUP_DAYS)
+            ).strftime('%Y-%m-%dT%H:00:00')
+            for table in ('checkup_rollups', 'checkup_rollup_histogram'):
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE period = 'hour' AND bucket_start < ?",
+                    (hourly_cutoff,)
+                )
             conn.commit()
-            return cursor.rowcount
+            return deleted
         finally:
             conn.close()
 
@@ -343,7 +576,14 @@ class DocDatabase:
     # Test Runs
     # ─────────────────────────────────────────────────────────────────────────────
 
-    def start_test_run(self, marker: str = None) -> int:
+    def start_test_run(
+        self,
+        marker: str = None,
+        mode: str = 'full',
+        workers: int = 1,
+        git_commit: str = None,
+        bots: list = None
+    ) -> int:
         """Start a new test run. Returns the run ID."""
         conn = self._get_connection()
         try:
@@ -352,10 +592,11 @@ class DocDatabase:
 
             cursor.execute(
                 """
-                INSERT INTO test_runs (started_at, marker, status)
-                VALUES (?, ?, 'running')
+                INSERT INTO test_runs (started_at, marker, status, mode, workers, git_commit, bots)
+                VALUES (?, ?, 'running', ?, ?, ?, ?)
                 """,
-                (now, marker)
+                (now, marker, mode, workers, git_commit,
+                 json.dumps(bots) if bots is not None else None)
             )
             conn.commit()
             return cursor.lastrowid
@@ -470,6 +711,104 @@ class DocDatabase:
         finally:
             conn.close()
 
+    def get_last_green_run(self) -> Optional[dict]:
+        """
+        Get the most recent passing run of the whole suite (no marker)
+        that recorded its git commit
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT * FROM test_runs
+                WHERE status = 'passed'
+                AND marker IS NULL
+                AND git_commit IS NOT NULL
+                ORDER BY started_at DESC, id DESC
+                LIMIT 1
+                """
+            )
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def record_test_results(self, run_id: int, results: List[dict]) -> int:
+        """Store per-test results for a run. Returns the number stored."""
+        if not results:
+            return 0
+
+        conn = self._get_connection()
+        try:
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO test_results (run_id, nodeid, file, bot, outcome, duration_seconds, message)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (run_id, r['nodeid'], r.get('file'), r.get('bot'), r['outcome'],
+                         r.get('duration_seconds'), r.get('message'))
+                        for r in results
+                    ]
+                )
+            return len(results)
+        finally:
+            conn.close()
+
+    def get_test_results(self, run_id: int, outcome: str = None) -> List[dict]:
+        """Get per-test results for a run, slowest first"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            if outcome:
+                cursor.execute(
+                    """
+                    SELECT * FROM test_results
+                    WHERE run_id = ? AND outcome = ?
+                    ORDER BY duration_seconds DESC
+                    """,
+                    (run_id, outcome)
+                )
+            else:
+                cursor.execute(
+                    """
+                    SELECT * FROM test_results
+                    WHERE run_id = ?
+                    ORDER BY duration_seconds DESC
+                    """,
+                    (run_id,)
+                )
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def get_file_durations(self) -> Dict[str, float]:
+        """
+        Get each test file's total duration from the latest run that
+        included it (used to balance shards)
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT r.file, SUM(r.duration_seconds) as duration
+                FROM test_results r
+                INNER JOIN (
+                    SELECT file, MAX(run_id) as run_id
+                    FROM test_results
+                    WHERE file IS NOT NULL
+                    GROUP BY file
+                ) latest ON r.file = latest.file AND r.run_id = latest.run_id
+                GROUP BY r.file
+                """
+            )
+            return {row['file']: row['duration'] or 0.0 for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
     def get_running_test_run(self) -> Optional[dict]:
         """Get the currently running test run, if any"""
         conn = self._get_connection()
@@ -0,0 +1,65 @@
+"""
+Add rollup tables for checkup vitals
+
+Tables:
+- bot_status: Latest checkup per bot, replaced on every write
+- checkup_rollups: Hourly and daily counts and response-time totals per bot
+- checkup_rollup_histogram: Response-time histogram per rollup bucket,
+  used to estimate p50/p95 without reading raw checkups
+
+Existing checkups are folded into the rollups by DocDatabase on startup.
+"""
+
+
+def up(conn):
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bot_status (
+            bot_name TEXT PRIMARY KEY,
+            checkup_id INTEGER NOT NULL,
+            checked_at TIMESTAMP NOT NULL,
+            status TEXT NOT NULL,
+            response_time_ms INTEGER,
+            status_code INTEGER,
+            error_message TEXT
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS checkup_rollups (
+            bot_name TEXT NOT NULL,
+            period TEXT NOT NULL,  -- hour, day
+            bucket_start TEXT NOT NULL,  -- UTC, e.g. 2025-01-01T10:00:00 (hour) or 2025-01-01 (day)
+            total_checks INTEGER NOT NULL DEFAULT 0,
+            healthy_count INTEGER NOT NULL DEFAULT 0,
+            response_time_count INTEGER NOT NULL DEFAULT 0,
+            response_time_sum INTEGER NOT NULL DEFAULT 0,
+            min_response_time INTEGER,
+            max_response_time INTEGER,
+            PRIMARY KEY (bot_name, period, bucket_start)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_checkup_rollups_period_bucket
+        ON checkup_rollups(period, bucket_start)
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS checkup_rollup_histogram (
+            bot_name TEXT NOT NULL,
+            period TEXT NOT NULL,
+            bucket_start TEXT NOT NULL,
+            bin INTEGER NOT NULL,  -- index into RESPONSE_TIME_BINS
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (bot_name, period, bucket_start, bin)
+        )
+    ''')
+
+
+def down(conn):
+    cursor = conn.cursor()
+    cursor.execute('DROP TABLE IF EXISTS checkup_rollup_histogram')
+    cursor.execute('DROP TABLE IF EXISTS checkup_rollups')
+    cursor.execute('DROP TABLE IF EXISTS bot_status')
@@ -0,0 +1,66 @@
+"""
+Add per-test results and sharding details for test runs
+
+Tables:
+- test_results: One row per test per run (outcome, duration), parsed from
+  the JUnit XML each pytest shard writes
+
+Columns on test_runs:
+- mode: full or changed (only tests for bots changed since the last green run)
+- workers: Number of pytest processes the run was sharded across
+- git_commit: Commit the run tested (changed mode diffs against it)
+- bots: JSON list of bots a changed run selected
+"""
+
+
+def up(conn):
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS test_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER NOT NULL,
+            nodeid TEXT NOT NULL,
+            file TEXT,
+            bot TEXT,
+            outcome TEXT NOT NULL,  -- passed, failed, error, skipped
+            duration_seconds REAL,
+            message TEXT,
+            FOREIGN KEY (run_id) REFERENCES test_runs(id) ON DELETE CASCADE
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_test_results_run
+        ON test_results(run_id, outcome)
+    ''')
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_test_results_file_run
+        ON test_results(file, run_id DESC)
+    ''')
+
+    cursor.execute("PRAGMA table_info(test_runs)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if 'mode' not in columns:
+        cursor.execute("ALTER TABLE test_runs ADD COLUMN mode TEXT DEFAULT 'full'")
+        print("  Added column: mode")
+
+    if 'workers' not in columns:
+        cursor.execute("ALTER TABLE test_runs ADD COLUMN workers INTEGER DEFAULT 1")
+        print("  Added column: workers")
+
+    if 'git_commit' not in columns:
+        cursor.execute("ALTER TABLE test_runs ADD COLUMN git_commit TEXT")
+        print("  Added column: git_commit")
+
+    if 'bots' not in columns:
+        cursor.execute("ALTER TABLE test_runs ADD COLUMN bots TEXT")
+        print("  Added column: bots")
+
+
+def down(conn):
+    cursor = conn.cursor()
+    cursor.execute('DROP TABLE IF EXISTS test_results')
+    # SQLite can't drop the test_runs columns; they're harmless if left
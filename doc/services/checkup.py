@@ -215,10 +215,11 @@ class CheckupService:
             List of dicts with bot name and latest status
         """
         bots = db.get_all_bots()
+        latest_checkups = db.get_latest_checkups()
         statuses = []
 
         for bot in bots:
-            latest = db.get_latest_checkup(bot['name'])
+            latest = latest_checkups.get(bot['name'])
             statuses.append({
                 'bot_name': bot['name'],
                 'description': bot.get('description', ''),
@@ -2,13 +2,21 @@
 Test runner service for Doc
 
 Executes pytest test suites and captures results.
+
+Runs can be sharded across several pytest processes, by test file (balanced
+using the durations recorded for previous runs) or by bot marker. Each
+shard writes JUnit XML, which is parsed into per-test results stored in
+Doc's database. A "changed" run only runs the tests for bots whose files
+changed since the last green run of the full suite.
 """
 
 import logging
 import subprocess
 import re
+import tempfile
 import time
-from typing import Optional
+import xml.etree.ElementTree as ET
+from typing import Optional, List, Dict
 from pathlib import Path
 
 from config import config
@@ -16,6 +24,20 @@ from database.db import db
 
 logger = logging.getLogger(__name__)
 
+SHARD_MODES = ('file', 'marker')
+
+# Markers that describe the kind of test rather than the bot it covers
+GENERIC_MARKERS = {'unit', 'integration', 'slow', 'google_api', 'database'}
+
+# Changes to these never affect test results
+IGNORED_CHANGE_SUFFIXES = ('.md', '.txt.example', '.png', '.jpg', '.svg')
+
+
+def _bot_for_test_file(path: str) -> Optional[str]:
+    """Bot a test file covers, from its name (tests/unit/test_<bot>_*.py)"""
+    match = re.match(r'test_([a-z]+)(?:_|\.py$)', Path(path).name)
+    return match.group(1) if match else None
+
 
 class TestRunner:
     """Runs pytest test suites"""
@@ -24,12 +46,18 @@ class TestRunner:
         self.project_root = Path(config.tests_project_root)
         self.default_timeout = config.tests_default_timeout
         self.max_timeout = config.tests_max_timeout
+        self.workers = config.tests_workers
+        self.max_workers = config.tests_max_workers
+        self.shard_by = config.tests_shard_by
 
     def run_tests(
         self,
         marker: str = None,
         timeout: int = None,
-        verbose: bool = True
+        verbose: bool = True,
+        workers: int = None,
+        shard_by: str = None,
+        changed_only: bool = False
     ) -> dict:
         """
         Run pytest tests.
@@ -38,6 +66,9 @@ class TestRunner:
             marker: Optional pytest marker (e.g., 'fred', 'integration', 'unit')
             timeout: Optional timeout in seconds (max 600)
             verbose: Whether to run with verbose output
+            workers: Number of pytest processes to shard across (default from config)
+            shard_by: 'file' or 'marker' (default from config)
+            changed_only: Only run tests for bots changed since the last green run
 
         Returns:
             dict with test results
@@ -57,54 +88,90 @@ class TestRunner:
             timeout = self.default_timeout
         timeout = min(timeout, self.max_timeout)
 
-        # Build pytest command
-        cmd = ['python', '-m', 'pytest']
-
-        if marker:
-            cmd.extend(['-m', marker])
-
-        if verbose:
-            cmd.append('-v')
+        workers = max(1, min(workers or self.workers, self.max_workers))
+        shard_by = shard_by or self.shard_by
+        if shard_by not in SHARD_MODES:
+            return {
+                'success': False,
+                'error': f"shard_by must be one of: {', '.join(SHARD_MODES)}"
+            }
 
-        # Add test directory
-        tests_dir = self.project_root / 'tests'
-        cmd.append(str(tests_dir))
+        # Work out which test files to run
+        mode = 'full'
+        files = None
+        bots = None
+        if changed_only:
+            mode = 'changed'
+            selection = self.select_changed_tests()
+            if not selection['full']:
+                files = selection['files']
+                bots = selection['bots']
+                # File lists can't be split by marker
+                shard_by = 'file'
+
+        shards = self._plan_shards(files, workers, shard_by, marker, verbose)
 
         # Start the test run in database
-        run_id = db.start_test_run(marker=marker)
-        logger.info(f"Starting test run {run_id} with marker={marker}")
+        run_id = db.start_test_run(
+            marker=marker,
+            mode=mode,
+            workers=len(shards),
+            git_commit=self._git_head(),
+            bots=bots
+        )
+        logger.info(
+            f"Starting test run {run_id} with marker={marker}, mode={mode}, "
+            f"shards={len(shards)}"
+        )
 
         start_time = time.time()
 
-        try:
-            # Run pytest
-            result = subprocess.run(
-                cmd,
-                cwd=str(self.project_root),
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+        if not shards:
+            # Nothing changed that has tests - record a green no-op so the
+            # next changed run diffs from here
+            db.complete_test_run(run_id=run_id, status='passed', duration_seconds=0,
+                                 output='No changed bots with tests since the last green run')
+            return {
+                'success': True,
+                'run_id': run_id,
+                'status': 'passed',
+                'marker': marker,
+                'mode': mode,
+                'bots': bots,
+                'duration_seconds': 0,
+                'stats': {'total': 0, 'passed': 0, 'failed': 0, 'errors': 0, 'skipped': 0},
+                'return_code': 0
+            }
 
+        try:
+            return_codes, output, results = self._run_shards(shards, timeout)
             duration = time.time() - start_time
-            output = result.stdout + '\n' + result.stderr
 
-            # Parse pytest output for stats
-            stats = self._parse_pytest_output(output)
+            # Stats come from the JUnit results; fall back to scraping the
+            # output if a shard crashed before writing its report
+            if results:
+                stats = self._stats_from_results(results)
+            else:
+                stats = self._parse_pytest_output(output)
 
-            # Determine status
-            if result.returncode == 0:
-                status = 'passed'
-            elif result.returncode == 1:
+            # Determine status (5 = no tests collected, fine for some shards)
+            if any(code == 1 for code in return_codes):
                 status = 'failed'
+                return_code = 1
+            elif all(code in (0, 5) for code in return_codes) and 0 in return_codes:
+                status = 'passed'
+                return_code = 0
             else:
                 status = 'error'
+                return_code = max(return_codes)
 
             # Truncate output if too long (keep last 50KB)
             max_output_len = 50000
             if len(output) > max_output_len:
                 output = '... (truncated) ...\n' + output[-max_output_len:]
 
+            db.record_test_results(run_id, results)
+
             # Complete the test run
             db.complete_test_run(
                 run_id=run_id,
@@ -125,9 +192,15 @@ class TestRunner:
                 'run_id': run_id,
                 'status': status,
                 'marker': marker,
+                'mode': mode,
+                'bots': bots,
+                'workers': len(shards),
                 'duration_seconds': round(duration, 2),
                 'stats': stats,
-                'return_code': result.returncode
+                'slowest': sorted(
+                    results, key=lambda r: r.get('duration_seconds') or 0, reverse=True
+                )[:5],
+                'return_code': return_code
             }
 
         except subprocess.TimeoutExpired:
@@ -172,6 +245,284 @@ class TestRunner:
                 'error': str(e)
             }
 
+    # ─────────────────────────────────────────────────────────────────────────────
+    # Sharding
+    # ─────────────────────────────────────────────────────────────────────────────
+
+    def _test_files(self) -> List[str]:
+        """All test files, relative to the project root"""
+        tests_dir = self.project_root / 'tests'
+        return sorted(
+            str(path.relative_to(self.project_root))
+            for path in tests_dir.rglob('test_*.py')
+        )
+
+    def _plan_shards(
+        self,
+        files: Optional[List[str]],
+        workers: int,
+        shard_by: str,
+        marker: str = None,
+        verbose: bool = True
+    ) -> List[List[str]]:
+        """
+        Split a run into pytest argument lists, one per shard.
+
+        Args:
+            files: Test files to run (None = the whole suite)
+            workers: Maximum number of shards
+            shard_by: 'file' or 'marker'
+            marker: Marker expression every shard is limited to
+            verbose: Pass -v to pytest
+
+        Returns:
+            List of pytest argument lists (empty if there's nothing to run)
+        """
+        base = ['-v'] if verbose else []
+
+        def with_marker(expression: Optional[str]) -> List[str]:
+            if marker and expression:
+                return ['-m', f'({marker}) and ({expression})']
+            if marker or expression:
+                return ['-m', marker or expression]
+            return []
+
+        if files is not None and not files:
+            return []
+
+        if workers == 1:
+            targets = files if files is not None else [str(self.project_root / 'tests')]
+            return [base + with_marker(None) + targets]
+
+        if shard_by == 'marker':
+            bot_markers = [m for m in self.get_available_markers() if m not in GENERIC_MARKERS]
+            groups: List[List[str]] = [[] for _ in range(min(workers, len(bot_markers) + 1))]
+            for index, bot_marker in enumerate(bot_markers):
+                groups[index % len(groups)].append(bot_marker)
+            tests_dir = str(self.project_root / 'tests')
+            shards = []
+            for index, group in enumerate(groups):
+                expressions = list(group)
+                if index == 0 and bot_markers:
+                    # Tests without a bot marker
+                    expressions.append(f"not ({' or '.join(bot_markers)})")
+                expression = ' or '.join(f'({e})' if ' ' in e else e for e in expressions)
+                shards.append(base + with_marker(expression or None) + [tests_dir])
+            return shards
+
+        # Shard by file: longest first onto the least-loaded shard, using
+        # each file's duration from its latest run (average if unknown)
+        files = files if files is not None else self._test_files()
+        durations = db.get_file_durations()
+        known = [durations[f] for f in files if f in durations]
+        default = sum(known) / len(known) if known else 1.0
+
+        shard_count = min(workers, len(files))
+        loads = [0.0] * shard_count
+        shard_files: List[List[str]] = [[] for _ in range(shard_count)]
+        for path in sorted(files, key=lambda f: durations.get(f, default), reverse=True):
+            index = loads.index(min(loads))
+            shard_files[index].append(path)
+            loads[index] += durations.get(path, default)
+
+        return [base + with_marker(None) + sorted(group) for group in shard_files if group]
+
+    def _run_shards(self, shards: List[List[str]], timeout: int) -> tuple:
+        """
+        Run shards as parallel pytest processes.
+
+        Returns:
+            (return codes, combined output, per-test results)
+
+        Raises:
+            subprocess.TimeoutExpired: if the run goes past timeout (every
+                shard is killed)
+        """
+        with tempfile.TemporaryDirectory(prefix='doc-tests-') as tmp_dir:
+            processes = []
+            for index, args in enumerate(shards):
+                report = Path(tmp_dir) / f'shard-{index}.xml'
+                log = open(Path(tmp_dir) / f'shard-{index}.log', 'w+')
+                cmd = ['python', '-m', 'pytest', *args,
+                       f'--junitxml={report}', '-o', 'junit_family=xunit1']
+                process = subprocess.Popen(
+                    cmd,
+                    cwd=str(self.project_root),
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    text=True
+                )
+                processes.append((process, log, report, cmd))
+
+            deadline = time.time() + timeout
+            try:
+                for process, _, _, _ in processes:
+                    process.wait(timeout=max(0.0, deadline - time.time()))
+            except subprocess.TimeoutExpired:
+                for process, _, _, _ in processes:
+                    if process.poll() is None:
+                        process.kill()
+                        process.wait()
+                raise
+            finally:
+                outputs = []
+                for process, log, _, _ in processes:
+                    log.seek(0)
+                    outputs.append(log.read())
+                    log.close()
+
+            return_codes = []
+            sections = []
+            results: Dict[str, dict] = {}
+            for index, ((process, _, report, cmd), output) in enumerate(zip(processes, outputs)):
+                return_codes.append(process.returncode)
+                if len(shards) > 1:
+                    sections.append(f"===== shard {index + 1}/{len(shards)}: {' '.join(cmd[3:-3])} =====")
+                sections.append(output)
+                if report.exists():
+                    for result in self._parse_junit_xml(report):
+                        # Marker shards can overlap; keep each test once
+                        results.setdefault(result['nodeid'], result)
+
+        return return_codes, '\n'.join(sections), list(results.values())
+
+    def _parse_junit_xml(self, path: Path) -> List[dict]:
+        """
+        Parse a pytest JUnit XML report (xunit1 family, which records each
+        test's file) into per-test results.
+        """
+        results = []
+        try:
+            tree = ET.parse(path)
+        except ET.ParseError as e:
+            logger.warning(f"Could not parse JUnit report {path}: {e}")
+            return results
+
+        for case in tree.iter('testcase'):
+            file = case.get('file')
+            classname = case.get('classname', '')
+            name = case.get('name', '')
+
+            # classname is module.Class; the nodeid wants file::Class::name
+            module = file[:-3].replace('/', '.') if file and file.endswith('.py') else ''
+            class_part = classname[len(module) + 1:] if module and classname.startswith(module + '.') else ''
+            nodeid = '::'.join(part for part in (file or classname, class_part, name) if part)
+
+            outcome, message = 'passed', None
+            for tag in ('failure', 'error', 'skipped'):
+                child = case.find(tag)
+                if child is not None:
+                    outcome = {'failure': 'failed', 'error': 'error', 'skipped': 'skipped'}[tag]
+                    message = child.get('message')
+                    break
+
+            results.append({
+                'nodeid': nodeid,
+                'file': file,
+                'bot': _bot_for_test_file(file) if file else None,
+                'outcome': outcome,
+                'duration_seconds': float(case.get('time') or 0),
+                'message': message[:1000] if message else None
+            })
+        return results
+
+    @staticmethod
+    def _stats_from_results(results: List[dict]) -> dict:
+        """Summary counts from per-test results"""
+        stats = {
+            'total': len(results),
+            'passed': 0,
+            'failed': 0,
+            'errors': 0,
+            'skipped': 0
+        }
+        keys = {'passed': 'passed', 'failed': 'failed', 'error': 'errors', 'skipped': 'skipped'}
+        for result in results:
+            stats[keys[result['outcome']]] += 1
+        return stats
+
+    # ─────────────────────────────────────────────────────────────────────────────
+    # Changed-bots selection
+    # ─────────────────────────────────────────────────────────────────────────────
+
+    def _git(self, *args) -> Optional[str]:
+        """Run a git command in the project root; None if it fails"""
+        try:
+            result = subprocess.run(
+                ['git', *args],
+                cwd=str(self.project_root),
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"git {' '.join(args)} failed: {e}")
+            return None
+        if result.returncode != 0:
+            logger.warning(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+            return None
+        return result.stdout
+
+    def _git_head(self) -> Optional[str]:
+        """Current commit of the project"""
+        head = self._git('rev-parse', 'HEAD')
+        return head.strip() if head else None
+
+    def _bot_names(self) -> set:
+        """Top-level directories that are bots (have an app.py)"""
+        return {path.parent.name for path in self.project_root.glob('*/app.py')}
+
+    def select_changed_tests(self) -> dict:
+        """
+        Pick the tests for bots changed since the last green run.
+
+        Compares the last green full-suite run's commit with the working
+        tree (committed and uncommitted changes). Changes outside bot
+        directories and bot test files (shared code, pytest config,
+        requirements) select the whole suite, as does having no green run.
+
+        Returns:
+            dict with full (bool), bots, files and since_commit
+        """
+        green = db.get_last_green_run()
+        if not green:
+            return {'full': True, 'reason': 'No green run to compare against',
+                    'bots': None, 'files': None, 'since_commit': None}
+
+        since = green['git_commit']
+        committed = self._git('diff', '--name-only', since)
+        untracked = self._git('ls-files', '--others', '--exclude-standard')
+        if committed is None or untracked is None:
+            return {'full': True, 'reason': 'Could not diff against the last green run',
+                    'bots': None, 'files': None, 'since_commit': since}
+
+        changed = {line.strip() for line in (committed + untracked).splitlines() if line.strip()}
+        bot_names = self._bot_names()
+        bots = set()
+        changed_tests = set()
+        for path in sorted(changed):
+            if path.endswith(IGNORED_CHANGE_SUFFIXES):
+                continue
+            top = path.split('/', 1)[0]
+            if top in bot_names:
+                bots.add(top)
+            elif path.startswith('tests/') and Path(path).name.startswith('test_'):
+                if _bot_for_test_file(path) in bot_names:
+                    bots.add(_bot_for_test_file(path))
+                elif (self.project_root / path).exists():
+                    # e.g. test_shared_*.py - run just that file
+                    changed_tests.add(path)
+            else:
+                # Shared code, conftest, pytest.ini, requirements...
+                return {'full': True, 'reason': f'{path} changed', 'bots': None,
+                        'files': None, 'since_commit': since}
+
+        files = sorted(
+            {f for f in self._test_files() if _bot_for_test_file(f) in bots} | changed_tests
+        )
+        return {'full': False, 'reason': None, 'bots': sorted(bots), 'files': files,
+                'since_commit': since}
+
     def _parse_pytest_output(self, output: str) -> dict:
         """
         Parse pytest output to extract test statistics.
@@ -219,6 +570,10 @@ class TestRunner:
         """Get details of a specific test run"""
         return db.get_test_run(run_id)
 
+    def get_results(self, run_id: int, outcome: str = None) -> list:
+        """Get per-test results for a run, slowest first"""
+        return db.get_test_results(run_id, outcome)
+
     def get_latest_run(self, marker: str = None) -> Optional[dict]:
         """Get the most recent test run"""
         return db.get_latest_test_run(marker)
@@ -1,5 +1,4 @@
 """API routes for Evelyn - Excel processing endpoints."""
-import io
 import logging
 from flask import Blueprint, request, jsonify, send_file
 from shared.auth.bot_api import api_or_session_auth
@@ -33,9 +32,8 @@ def get_sheets():
         return jsonify({'error': 'File must be an Excel file (.xlsx or .xlsm)'}), 400
 
     try:
-        # Read file into memory
-        file_data = io.BytesIO(file.read())
-        sheet_names = excel_service.get_sheet_names(file_data)
+        # The upload is already spooled (to disk when large), so read it in place
+        sheet_names = excel_service.get_sheet_names(file.stream)
 
         return jsonify({
             'success': True,
@@ -125,12 +123,9 @@ def process_workbook():
         return jsonify({'error': 'No sheets specified'}), 400
 
     try:
-        # Read file into memory
-        file_data = io.BytesIO(file.read())
-
-        # Process the workbook
+        # Process the workbook straight from the spooled upload
         output, output_filename = excel_service.process_workbook(
-            file_data,
+            file.stream,
             sheets_to_keep,
             file.filename
         )
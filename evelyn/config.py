@@ -63,6 +63,10 @@ class Config:
         # Sheet profiles for specialized processing
         self.sheet_profiles = data.get("sheet_profiles", {}) or {}
 
+        # Workbook processing engine: 'streaming' or 'openpyxl'
+        excel_cfg = data.get("excel", {}) or {}
+        self.excel_engine = excel_cfg.get("engine", "streaming")
+
     def get_profile(self, profile_name: str) -> dict | None:
         """
         Get a sheet profile by name.
@@ -1,9 +1,12 @@
 """Excel processing service for Evelyn."""
 import io
 import logging
+import tempfile
 from typing import BinaryIO
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from config import config
+from services import xlsx_stream
 
 logger = logging.getLogger(__name__)
 
@@ -187,5 +190,62 @@ class ExcelServiceV2:
         return output, output_filename
 
 
-# Use the enhanced version
-excel_service = ExcelServiceV2()
+class StreamingExcelService:
+    """
+    Excel service that rewrites the workbook file directly.
+
+    Same results as ExcelServiceV2 without loading the workbook into
+    openpyxl: see services/xlsx_stream.py.
+    """
+
+    # Processed workbooks larger than this are spooled to disk
+    OUTPUT_SPOOL_BYTES = 16 * 1024 * 1024
+
+    def get_sheet_names(self, file_data: BinaryIO) -> list[str]:
+        """Get list of sheet names from an Excel workbook."""
+        return xlsx_stream.read_sheet_names(file_data)
+
+    def process_workbook(
+        self,
+        file_data: BinaryIO,
+        sheets_to_keep: list[str],
+        original_filename: str = "workbook.xlsx"
+    ) -> tuple[BinaryIO, str]:
+        """
+        Process an Excel workbook: keep only specified sheets and convert to values.
+
+        Args:
+            file_data: Seekable file-like object containing Excel data
+            sheets_to_keep: List of sheet names to keep
+            original_filename: Original filename for generating output name
+
+        Returns:
+            Tuple of (file object with processed workbook, suggested filename)
+        """
+        logger.info(f"Keeping sheets: {sheets_to_keep}")
+
+        output = tempfile.SpooledTemporaryFile(max_size=self.OUTPUT_SPOOL_BYTES)
+        try:
+            stats = xlsx_stream.convert_to_values(file_data, output, sheets_to_keep)
+        except Exception:
+            output.close()
+            raise
+        output.seek(0)
+
+        logger.info(
+            f"Kept {stats['sheets_kept']} sheets, dropped {stats['sheets_dropped']}, "
+            f"replaced {stats['formulas_replaced']} formulas"
+        )
+
+        # Generate output filename
+        base_name = original_filename.rsplit('.', 1)[0] if '.' in original_filename else original_filename
+        output_filename = f"{base_name}_processed.xlsx"
+
+        return output, output_filename
+
+
+# Streaming by default; the openpyxl dual-load path is kept as a fallback
+if config.excel_engine == 'openpyxl':
+    excel_service = ExcelServiceV2()
+else:
+    excel_service = StreamingExcelService()
@@ -0,0 +1,529 @@
+"""Streaming formula-to-values conversion for Excel workbooks.
+
+Instead of loading the workbook into openpyxl (twice, once for the cached
+values and once for the formatting), the .xlsx package is rewritten part by
+part. Unwanted sheets are dropped at the zip level along with any parts only
+they referenced (drawings, comments, tables, ...), and each kept worksheet's
+XML is streamed through a SAX filter that removes every cell's formula and
+keeps the value Excel last calculated for it. Memory use is set by the
+largest part that isn't a worksheet (usually the shared strings table), not
+by the number of cells.
+
+Everything else (styles, column widths, merged cells, images, shared
+strings) is copied through untouched.
+"""
+import io
+import re
+import posixpath
+import zipfile
+import xml.sax
+import xml.sax.handler
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, List, Optional, Set, Union
+from xml.etree import ElementTree
+from xml.sax.saxutils import XMLGenerator
+
+CONTENT_TYPES_PART = '[Content_Types].xml'
+ROOT_RELS_PART = '_rels/.rels'
+
+# Relationship types are matched on their last segment, which is the same in
+# the transitional and strict namespaces
+OFFICE_DOCUMENT_REL = 'officeDocument'
+CALC_CHAIN_REL = 'calcChain'
+VBA_PROJECT_REL = 'vbaProject'
+
+# Output is always a plain .xlsx, so macro-enabled workbooks lose their macros
+XLSX_MAIN_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml'
+
+# Bytes read from each part at a time
+CHUNK_SIZE = 64 * 1024
+
+XML_SPACE = 'xml:space'
+
+
+def _local(name: str) -> str:
+    """Local part of a qualified XML name ('x:c' -> 'c')."""
+    return name.rsplit(':', 1)[-1]
+
+
+def _prefix(name: str) -> str:
+    """Prefix of a qualified XML name, with its colon ('x:c' -> 'x:', 'c' -> '')."""
+    return name[:-len(_local(name))]
+
+
+def _rels_part(part: str) -> str:
+    """Relationships part for a part ('xl/workbook.xml' -> 'xl/_rels/workbook.xml.rels')."""
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, '_rels', f'{name}.rels')
+
+
+def _rels_source(rels_part: str) -> str:
+    """Part a relationships part belongs to ('' for the package itself)."""
+    folder, name = posixpath.split(rels_part)
+    return posixpath.join(posixpath.dirname(folder), name[:-len('.rels')])
+
+
+def _resolve_target(source: str, target: str) -> str:
+    """Zip name of a relationship target, relative to its source part."""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source), target))
+
+
+def _rel_type(rel_type: str) -> str:
+    return rel_type.rsplit('/', 1)[-1]
+
+
+def _references_sheet(formula: str, sheet_name: str) -> bool:
+    """Check whether a defined name's formula refers to a sheet."""
+    quoted = "'" + sheet_name.replace("'", "''") + "'!"
+    if quoted in formula:
+        return True
+    return re.search(r"(?<![\w.'])" + re.escape(sheet_name) + '!', formula) is not None
+
+
+# ─────────────────────────────────────────────────────────────
+# Package structure
+# ─────────────────────────────────────────────────────────────
+
+@dataclass
+class _Relationship:
+    id: str
+    type: str
+    target: str
+    external: bool
+
+
+@dataclass
+class _Sheet:
+    name: str
+    rel_id: str
+    hidden: bool
+
+
+class _Package:
+    """Sheet list and relationships of an open workbook package."""
+
+    def __init__(self, archive: zipfile.ZipFile):
+        self.archive = archive
+        self.names = set(archive.namelist())
+
+        documents = [
+            r for r in self.read_rels('') if _rel_type(r.type) == OFFICE_DOCUMENT_REL
+        ]
+        if not documents:
+            raise ValueError("File is not an Excel workbook (no workbook part found)")
+        self.workbook_part = _resolve_target('', documents[0].target)
+        self.workbook_rels = self.read_rels(self.workbook_part)
+        self.sheets = self._read_sheets()
+
+    def read_rels(self, source: str) -> List[_Relationship]:
+        """Relationships of a part ('' for the package)."""
+        rels_part = ROOT_RELS_PART if source == '' else _rels_part(source)
+        if rels_part not in self.names:
+            return []
+
+        root = ElementTree.fromstring(self.archive.read(rels_part))
+        return [
+            _Relationship(
+                id=rel.get('Id'),
+                type=rel.get('Type', ''),
+                target=rel.get('Target', ''),
+                external=rel.get('TargetMode') == 'External'
+            )
+            for rel in root
+            if rel.tag.endswith('Relationship')
+        ]
+
+    def _read_sheets(self) -> List[_Sheet]:
+        """Sheets in workbook order."""
+        sheets = []
+        with self.archive.open(self.workbook_part) as source:
+            for _, element in ElementTree.iterparse(source):
+                if element.tag.rsplit('}', 1)[-1] == 'sheet':
+                    rel_id = next(
+                        (v for k, v in element.attrib.items() if k.endswith('}id')), None
+                    )
+                    sheets.append(_Sheet(
+                        name=element.get('name'),
+                        rel_id=rel_id,
+                        hidden=element.get('state') in ('hidden', 'veryHidden')
+                    ))
+                    element.clear()
+        return sheets
+
+    def sheet_part(self, sheet: _Sheet) -> Optional[str]:
+        for rel in self.workbook_rels:
+            if rel.id == sheet.rel_id and not rel.external:
+                return _resolve_target(self.workbook_part, rel.target)
+        return None
+
+    def reachable_parts(self, removed_rel_ids: Set[str]) -> Set[str]:
+        """
+        Parts still reachable from the package root.
+
+        Args:
+            removed_rel_ids: Workbook relationships being removed
+        """
+        reachable = set()
+        pending = ['']
+        while pending:
+            source = pending.pop()
+            for rel in self.read_rels(source):
+                if rel.external:
+                    continue
+                if source == self.workbook_part and rel.id in removed_rel_ids:
+                    continue
+                target = _resolve_target(source, rel.target)
+                if target in self.names and target not in reachable:
+                    reachable.add(target)
+                    pending.append(target)
+        return reachable
+
+
+# ─────────────────────────────────────────────────────────────
+# XML filters
+# ─────────────────────────────────────────────────────────────
+
+@dataclass
+class _Element:
+    """A held-back element, small enough to rewrite in memory."""
+    name: str
+    attrs: Dict[str, str]
+    children: List[Union['_Element', str]] = field(default_factory=list)
+
+    def child(self, local_name: str) -> Optional['_Element']:
+        for child in self.children:
+            if isinstance(child, _Element) and _local(child.name) == local_name:
+                return child
+        return None
+
+    def text(self) -> str:
+        return ''.join(
+            child if isinstance(child, str) else child.text() for child in self.children
+        )
+
+
+class _XmlFilter(XMLGenerator):
+    """
+    Copies XML through unchanged, except for held elements.
+
+    Elements whose local name is in held_elements are collected (with their
+    children) and passed to rewrite(), which returns the element to write or
+    None to drop it.
+    """
+
+    held_elements = frozenset()
+
+    def __init__(self, out):
+        super().__init__(out, encoding='utf-8', short_empty_elements=True)
+        self._stack: Optional[List[_Element]] = None
+
+    def rewrite(self, element: _Element) -> Optional[_Element]:
+        return element
+
+    def startElement(self, name, attrs):
+        if self._stack is None:
+            if _local(name) not in self.held_elements:
+                super().startElement(name, attrs)
+                return
+            self._stack = []
+
+        element = _Element(name, dict(attrs))
+        if self._stack:
+            self._stack[-1].children.append(element)
+        self._stack.append(element)
+
+    def endElement(self, name):
+        if self._stack is None:
+            super().endElement(name)
+            return
+
+        element = self._stack.pop()
+        if not self._stack:
+            self._stack = None
+            element = self.rewrite(element)
+            if element is not None:
+                self._write_element(element)
+
+    def characters(self, content):
+        if self._stack is None:
+            super().characters(content)
+            return
+
+        children = self._stack[-1].children
+        if children and isinstance(children[-1], str):
+            children[-1] += content
+        else:
+            children.append(content)
+
+    def ignorableWhitespace(self, content):
+        self.characters(content)
+
+    def _write_element(self, element: _Element):
+        super().startElement(element.name, element.attrs)
+        for child in element.children:
+            if isinstance(child, str):
+                super().characters(child)
+            else:
+                self._write_element(child)
+        super().endElement(element.name)
+
+
+class _WorksheetFilter(_XmlFilter):
+    """Replaces each cell's formula with its cached value."""
+
+    held_elements = frozenset({'c'})
+
+    def __init__(self, out):
+        super().__init__(out)
+        self.formulas_replaced = 0
+
+    def rewrite(self, cell: _Element) -> _Element:
+        formula = cell.child('f')
+        if formula is None:
+            return cell
+
+        self.formulas_replaced += 1
+        cell.children = [
+            child for child in cell.children
+            if not (isinstance(child, _Element) and _local(child.name) == 'f')
+        ]
+        # Cell metadata describes the formula (e.g. dynamic arrays)
+        cell.attrs.pop('cm', None)
+
+        value = cell.child('v')
+        if value is None or value.text() == '':
+            # Never calculated - leave an empty cell that keeps its style
+            cell.attrs.pop('t', None)
+            cell.children = [
+                child for child in cell.children
+                if not (isinstance(child, _Element) and _local(child.name) == 'v')
+            ]
+        elif cell.attrs.get('t') == 'str':
+            # Formula strings become plain inline strings
+            text = value.text()
+            prefix = _prefix(value.name)
+            attrs = {XML_SPACE: 'preserve'} if text != text.strip() else {}
+            inline = _Element(f'{prefix}is', {}, [_Element(f'{prefix}t', attrs, [text])])
+            cell.attrs['t'] = 'inlineStr'
+            cell.children = [inline if child is value else child for child in cell.children]
+
+        return cell
+
+
+class _WorkbookFilter(_XmlFilter):
+    """Removes dropped sheets from the workbook and fixes up what pointed at them."""
+
+    held_elements = frozenset({'sheet', 'definedName', 'workbookView'})
+
+    def __init__(self, out, sheets: List[_Sheet], keep: Set[str], unhide: Optional[str]):
+        super().__init__(out)
+        self.dropped = [s.name for s in sheets if s.name not in keep]
+        self.unhide = unhide
+        # Old sheet index -> new sheet index
+        kept_indexes = [i for i, s in enumerate(sheets) if s.name in keep]
+        self.index_map = {old: new for new, old in enumerate(kept_indexes)}
+
+    def rewrite(self, element: _Element) -> Optional[_Element]:
+        local = _local(element.name)
+
+        if local == 'sheet':
+            name = element.attrs.get('name')
+            if name in self.dropped:
+                return None
+            if name == self.unhide:
+                element.attrs.pop('state', None)
+            return element
+
+        if local == 'definedName':
+            if 'localSheetId' in element.attrs:
+                new_index = self.index_map.get(int(element.attrs['localSheetId']))
+                if new_index is None:
+                    return None
+                element.attrs['localSheetId'] = str(new_index)
+                return element
+            formula = element.text()
+            if any(_references_sheet(formula, name) for name in self.dropped):
+                return None
+            return element
+
+        # workbookView: keep tab indexes in range
+        for attr in ('activeTab', 'firstSheet'):
+            if attr in element.attrs:
+                element.attrs[attr] = str(self.index_map.get(int(element.attrs[attr]), 0))
+        return element
+
+
+class _RelationshipsFilter(_XmlFilter):
+    """Removes relationships by id."""
+
+    held_elements = frozenset({'Relationship'})
+
+    def __init__(self, out, removed_ids: Set[str]):
+        super().__init__(out)
+        self.removed_ids = removed_ids
+
+    def rewrite(self, element: _Element) -> Optional[_Element]:
+        return None if element.attrs.get('Id') in self.removed_ids else element
+
+
+class _ContentTypesFilter(_XmlFilter):
+    """Drops overrides for removed parts and marks the workbook as a plain .xlsx."""
+
+    held_elements = frozenset({'Override'})
+
+    def __init__(self, out, parts: Set[str], workbook_part: str):
+        super().__init__(out)
+        self.parts = parts
+        self.workbook_part = workbook_part
+
+    def rewrite(self, element: _Element) -> Optional[_Element]:
+        part = element.attrs.get('PartName', '').lstrip('/')
+        if part not in self.parts:
+            return None
+        if part == self.workbook_part:
+            element.attrs['ContentType'] = XLSX_MAIN_CONTENT_TYPE
+        return element
+
+
+def _filter_part(archive: zipfile.ZipFile, output: zipfile.ZipFile, part: str, make_filter):
+    """Stream one part through an XML filter into the output package."""
+    with archive.open(part) as source, output.open(part, 'w') as target:
+        text = io.TextIOWrapper(target, encoding='utf-8', newline='\n')
+        handler = make_filter(text)
+
+        parser = xml.sax.make_parser()
+        parser.setFeature(xml.sax.handler.feature_external_ges, False)
+        parser.setContentHandler(handler)
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+        parser.close()
+
+        text.flush()
+        text.detach()
+    return handler
+
+
+def _copy_part(archive: zipfile.ZipFile, output: zipfile.ZipFile, part: str):
+    with archive.open(part) as source, output.open(part, 'w') as target:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            target.write(chunk)
+
+
+# ─────────────────────────────────────────────────────────────
+# Public API
+# ─────────────────────────────────────────────────────────────
+
+def read_sheet_names(file_data: BinaryIO) -> List[str]:
+    """
+    Get sheet names from a workbook without loading any sheets.
+
+    Args:
+        file_data: Seekable file-like object containing .xlsx/.xlsm data
+
+    Returns:
+        Sheet names in workbook order
+    """
+    file_data.seek(0)
+    with zipfile.ZipFile(file_data) as archive:
+        return [sheet.name for sheet in _Package(archive).sheets]
+
+
+def convert_to_values(
+    file_data: BinaryIO,
+    output: BinaryIO,
+    sheets_to_keep: List[str]
+) -> Dict[str, int]:
+    """
+    Write a copy of a workbook with only the chosen sheets and no formulas.
+
+    Formulas are replaced with the values Excel cached when the file was
+    last saved; formulas that were never calculated leave empty cells.
+    Defined names and the calculation chain that referred to dropped
+    sheets or formulas are removed, and macros are dropped.
+
+    Args:
+        file_data: Seekable file-like object containing .xlsx/.xlsm data
+        output: Writable (seekable) file-like object for the new workbook
+        sheets_to_keep: Sheet names to keep
+
+    Returns:
+        Counts: sheets_kept, sheets_dropped, formulas_replaced, parts_dropped
+
+    Raises:
+        ValueError: If a requested sheet isn't in the workbook
+    """
+    file_data.seek(0)
+    with zipfile.ZipFile(file_data) as archive:
+        package = _Package(archive)
+        sheets = package.sheets
+        names = [s.name for s in sheets]
+
+        for sheet_name in sheets_to_keep:
+            if sheet_name not in names:
+                raise ValueError(f"Sheet '{sheet_name}' not found in workbook")
+
+        keep = set(sheets_to_keep)
+        kept_sheets = [s for s in sheets if s.name in keep]
+
+        # A workbook needs at least one visible sheet
+        unhide = None
+        if all(s.hidden for s in kept_sheets):
+            unhide = kept_sheets[0].name
+
+        removed_rel_ids = {s.rel_id for s in sheets if s.name not in keep}
+        removed_rel_ids |= {
+            r.id for r in package.workbook_rels
+            if _rel_type(r.type) in (CALC_CHAIN_REL, VBA_PROJECT_REL)
+        }
+
+        reachable = package.reachable_parts(removed_rel_ids)
+        worksheet_parts = {package.sheet_part(s) for s in kept_sheets}
+
+        def keep_part(part: str) -> bool:
+            if part == CONTENT_TYPES_PART or part == ROOT_RELS_PART:
+                return True
+            if part.endswith('.rels'):
+                return _rels_source(part) in reachable
+            return part in reachable
+
+        output_parts = {part for part in package.names if keep_part(part)}
+        formulas_replaced = 0
+
+        with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as result:
+            for info in archive.infolist():
+                part = info.filename
+                if info.is_dir() or part not in output_parts:
+                    continue
+
+                if part == CONTENT_TYPES_PART:
+                    _filter_part(archive, result, part, lambda out: _ContentTypesFilter(
+                        out, output_parts, package.workbook_part
+                    ))
+                elif part == _rels_part(package.workbook_part):
+                    _filter_part(archive, result, part, lambda out: _RelationshipsFilter(
+                        out, removed_rel_ids
+                    ))
+                elif part == package.workbook_part:
+                    _filter_part(archive, result, part, lambda out: _WorkbookFilter(
+                        out, sheets, keep, unhide
+                    ))
+                elif part in worksheet_parts:
+                    handler = _filter_part(archive, result, part, _WorksheetFilter)
+                    formulas_replaced += handler.formulas_replaced
+                else:
+                    _copy_part(archive, result, part)
+
+    return {
+        'sheets_kept': len(kept_sheets),
+        'sheets_dropped': len(sheets) - len(kept_sheets),
+        'formulas_replaced': formulas_replaced,
+        'parts_dropped': len([p for p in package.names if not p.endswith('/')]) - len(output_parts),
+    }
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming engine against the openpyxl dual-load path.
+
+Usage: python evelyn/tools/benchmark_excel.py [--sheets 6] [--rows 20000] [--keep "Prices 1,Prices 2"] [--file "buz pricing.xlsm"]
+
+Without --file, builds a synthetic pricing workbook (numbers, text and
+formulas with cached values) and converts it with each engine, reporting
+time and peak Python memory. Also checks both engines produce the same
+values in every kept sheet.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+os.environ.setdefault('SKIP_ENV_VALIDATION', '1')
+
+import openpyxl  # noqa: E402
+
+from services.excel import ExcelServiceV2, StreamingExcelService  # noqa: E402
+
+FORMULA_CELL = re.compile(r'<c r="([A-Z]+\d+)"( s="\d+")?><f>(.*?)</f><v ?/></c>')
+
+
+def _cached_cell(match) -> str:
+    """Give a synthetic formula cell the value Excel would have cached."""
+    ref, style, formula = match.group(1), match.group(2) or '', match.group(3)
+    row = int(re.sub(r'[A-Z]+', '', ref))
+    if formula.startswith('&quot;'):
+        return f'<c r="{ref}"{style} t="str"><f>{formula}</f><v>Code-{row}</v></c>'
+    return f'<c r="{ref}"{style}><f>{formula}</f><v>{row * 2}</v></c>'
+
+
+def build_workbook(path: Path, sheets: int, rows: int):
+    """Write a synthetic pricing workbook with `sheets` sheets of `rows` rows."""
+    unsaved = path.with_suffix('.tmp.xlsx')
+    wb = openpyxl.Workbook(write_only=True)
+    for s in range(sheets):
+        ws = wb.create_sheet(f'Prices {s + 1}')
+        ws.append(['Id', 'Description', 'Width', 'Drop', 'Price', 'Double', 'Code'])
+        for r in range(2, rows + 2):
+            ws.append([r, f'Blind {r}', 600 + r % 2400, 900 + r % 2100, round(r * 1.17, 2),
+                       f'=A{r}*2', f'="Code-"&A{r}'])
+    wb.save(unsaved)
+
+    # openpyxl doesn't calculate, so add the cached values Excel would have saved
+    with zipfile.ZipFile(unsaved) as source, zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            data = source.read(info.filename)
+            if info.filename.startswith('xl/worksheets/'):
+                data = FORMULA_CELL.sub(_cached_cell, data.decode('utf-8')).encode('utf-8')
+            target.writestr(info.filename, data)
+    unsaved.unlink()
+
+
+def run(service, file_path: str, keep: list, trace_memory: bool):
+    """Process the workbook once and return (seconds, peak_bytes, output_bytes)."""
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with open(file_path, 'rb') as f:
+        output, _ = service.process_workbook(f, keep, os.path.basename(file_path))
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    data = output.read()
+    output.close()
+    return elapsed, peak, data
+
+
+def sheet_values(data: bytes, keep: list):
+    """Every kept sheet's cell values, for comparing engines."""
+    with tempfile.NamedTemporaryFile(suffix='.xlsx') as f:
+        f.write(data)
+        f.flush()
+        wb = openpyxl.load_workbook(f.name, read_only=True, data_only=True)
+        values = {name: [tuple(row) for row in wb[name].iter_rows(values_only=True)] for name in keep}
+        wb.close()
+    return values
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark Excel formula-to-values conversion')
+    arg_parser.add_argument('--sheets', type=int, default=6)
+    arg_parser.add_argument('--rows', type=int, default=20000, help='Rows per sheet')
+    arg_parser.add_argument('--keep', help='Comma-separated sheets to keep (default: first half)')
+    arg_parser.add_argument('--file', help='Process this workbook instead of a synthetic one')
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.file:
+            file_path = args.file
+        else:
+            file_path = str(Path(tmp) / 'synthetic_pricing.xlsx')
+            print(f"Building synthetic workbook: {args.sheets} sheets x {args.rows} rows...")
+            started = time.perf_counter()
+            build_workbook(Path(file_path), args.sheets, args.rows)
+            print(f"  Built in {time.perf_counter() - started:.1f}s "
+                  f"({os.path.getsize(file_path) / 1024 / 1024:.1f} MB)")
+
+        with open(file_path, 'rb') as f:
+            sheet_names = StreamingExcelService().get_sheet_names(f)
+        if args.keep:
+            keep = [s.strip() for s in args.keep.split(',') if s.strip()]
+        else:
+            keep = sheet_names[:max(1, len(sheet_names) // 2)]
+        print(f"\nKeeping {len(keep)} of {len(sheet_names)} sheets: {', '.join(keep)}")
+
+        results = {}
+        for label, service in (('openpyxl dual-load', ExcelServiceV2()),
+                               ('streaming', StreamingExcelService())):
+            seconds, _, data = run(service, file_path, keep, trace_memory=False)
+            _, peak, _ = run(service, file_path, keep, trace_memory=True)
+            results[label] = (seconds, data)
+            print(f"  {label}: {seconds:.2f}s, peak Python memory {peak / 1024 / 1024:.1f} MB, "
+                  f"output {len(data) / 1024 / 1024:.1f} MB")
+
+        (base_seconds, base_data), (stream_seconds, stream_data) = results.values()
+        if sheet_values(base_data, keep) != sheet_values(stream_data, keep):
+            print("  OUTPUT DIFFERS between engines")
+            sys.exit(1)
+        print(f"  Same values from both engines; streaming is {base_seconds / stream_seconds:.1f}x faster")
+
+
+if __name__ == '__main__':
+    main()
@@ -20,6 +20,9 @@ def intro():
         ],
         'endpoints': {
             'GET /api/access': 'Check if user has access to a bot',
+            'GET /api/access/version': 'Current permissions version (for cache revalidation)',
+            'POST /api/access/batch': 'Check access for several users against several bots',
+            'GET /api/access/users': 'List who can access each bot',
             'GET /api/permissions': 'List all permissions (filterable)',
             'POST /api/permissions': 'Grant permission',
             'DELETE /api/permissions': 'Revoke permission',
@@ -47,7 +50,7 @@ def check_access():
         bot: Bot name (required)
 
     Returns:
-        {allowed: bool, role: str|None, is_admin: bool, source: str|None}
+        {allowed: bool, role: str|None, is_admin: bool, source: str|None, version: int}
     """
     email = request.args.get('email')
     bot = request.args.get('bot')
@@ -57,8 +60,84 @@ def check_access():
     if not bot:
         return jsonify({'error': 'bot parameter is required'}), 400
 
+    # Read the version first: if a change lands mid-check, the answer is
+    # newer than its version and the caller's next revalidation drops it
+    version = permission_service.get_permissions_version()
     result = permission_service.check_access(email, bot)
-    return jsonify(result)
+    return jsonify({**result, 'version': version})
+
+
+@api_bp.route('/access/version')
+@api_key_required
+def access_version():
+    """
+    Get the current permissions version.
+
+    Bots poll this to revalidate cached access answers: any grant, revoke,
+    bot sync or access policy change moves it on.
+
+    Returns:
+        {version: int}
+    """
+    return jsonify({'version': permission_service.get_permissions_version()})
+
+
+# Most users one batch request may check (bots are few, so aren't capped)
+MAX_BATCH_EMAILS = 1000
+
+
+def _name_list(value) -> list:
+    """Accept a list of names or a comma-separated string."""
+    if isinstance(value, str):
+        value = value.split(',')
+    return [v.strip() for v in value or [] if v and v.strip()]
+
+
+@api_bp.route('/access/batch', methods=['POST'])
+@api_key_required
+def check_access_batch():
+    """
+    Check access for several users against several bots in one call.
+
+    JSON body:
+        emails: List of email addresses (required)
+        bots: List of bot names (optional, defaults to every registered bot)
+
+    Returns:
+        {results: {email: {bot: {allowed, role, is_admin, source}}}, version: int}
+    """
+    data = request.get_json() or {}
+
+    emails = _name_list(data.get('emails'))
+    bots = _name_list(data.get('bots')) if data.get('bots') is not None else None
+
+    if not emails:
+        return jsonify({'error': 'emails is required'}), 400
+    if len(emails) > MAX_BATCH_EMAILS:
+        return jsonify({'error': f'At most {MAX_BATCH_EMAILS} emails per request'}), 400
+
+    version = permission_service.get_permissions_version()
+    results = permission_service.check_access_batch(emails, bots)
+    return jsonify({'results': results, 'version': version})
+
+
+@api_bp.route('/access/users')
+@api_key_required
+def list_bot_users():
+    """
+    List who can access each bot.
+
+    Query params:
+        bot: Bot name, repeatable or comma-separated (optional, defaults to every registered bot)
+
+    Returns:
+        {bots: {bot: {default_access, domain_access, users: [{email, role, source}]}}, version: int}
+    """
+    bots = _name_list(','.join(request.args.getlist('bot'))) or None
+
+    version = permission_service.get_permissions_version()
+    results = permission_service.get_bot_users(bots)
+    return jsonify({'bots': results, 'version': version})
 
 
 # ─────────────────────────────────────────────────────────────
@@ -1,5 +1,6 @@
 """Database manager for Grant's permission management."""
 import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
@@ -22,6 +23,11 @@ class Database:
         self.db_path = str(db_path)
         self._run_migrations()
 
+        # Compiled permissions and bot policies, rebuilt when the stored
+        # permissions version moves on (see _get_snapshot)
+        self._snapshot: Optional[Dict] = None
+        self._snapshot_lock = threading.Lock()
+
     def _run_migrations(self):
         """Run database migrations."""
         migrations_dir = Path(__file__).parent.parent / 'migrations'
@@ -167,7 +173,9 @@ class Database:
                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
                 (email, bot_name, action, old_role, role, granted_by, now)
             )
+            self._bump_version(cursor)
 
+        self._rebuild_snapshot()
         return self.get_permission(email, bot_name)
 
     def revoke_permission(self, email: str, bot_name: str, revoked_by: str) -> bool:
@@ -207,7 +215,9 @@ class Database:
                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
                 (email, bot_name, 'revoke', old_role, None, revoked_by, now)
             )
+            self._bump_version(cursor)
 
+        self._rebuild_snapshot()
         return True
 
     def check_access(self, email: str, bot_name: str) -> Dict:
@@ -215,28 +225,98 @@ class Database:
         Check if a user has access to a bot.
         Returns {allowed: bool, role: str|None, is_admin: bool, source: str|None}.
 
-        Checks in order:
+        Answered from the permissions snapshot. Checks in order:
         1. Explicit permission for this user+bot
         2. Wildcard (*) permission for this user
         3. Bot's default_access policy (if 'domain', check domain)
         """
-        permission = self.get_permission(email, bot_name)
+        email = email.lower().strip()
+        bot_name = bot_name.lower().strip()
+
+        return self._resolve_access(self._get_snapshot(), email, bot_name)
+
+    def resolve_access(
+        self,
+        emails: List[str],
+        bot_names: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Dict]]:
+        """
+        Check access for every user against every bot in one pass.
+
+        Args:
+            emails: User email addresses
+            bot_names: Bots to check (defaults to every registered bot)
+
+        Returns:
+            {email: {bot_name: check_access result}}
+        """
+        snapshot = self._get_snapshot()
+        if bot_names is None:
+            bot_names = sorted(snapshot['policies'])
+        bot_names = [b.lower().strip() for b in bot_names]
+
+        return {
+            email: {bot_name: self._resolve_access(snapshot, email, bot_name) for bot_name in bot_names}
+            for email in (e.lower().strip() for e in emails)
+        }
+
+    def get_bot_users(self, bot_names: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        List who has explicit access to each bot, including wildcard (*) holders.
+
+        Args:
+            bot_names: Bots to list (defaults to every registered bot)
+
+        Returns:
+            {bot_name: {default_access: str|None, users: [{email, role, source}]}}
+            where source is 'permission' or 'wildcard', users sorted by email
+        """
+        snapshot = self._get_snapshot()
+        if bot_names is None:
+            bot_names = sorted(snapshot['policies'])
+        bot_names = [b.lower().strip() for b in bot_names]
+
+        wanted = set(bot_names)
+        explicit: Dict[str, List[Dict]] = {bot_name: [] for bot_name in bot_names}
+        wildcard: List[Dict] = []
+        for email, roles in snapshot['permissions'].items():
+            for bot_name, role in roles.items():
+                if bot_name == '*':
+                    wildcard.append({'email': email, 'role': role})
+                elif bot_name in wanted:
+                    explicit[bot_name].append({'email': email, 'role': role, 'source': 'permission'})
+
+        result = {}
+        for bot_name in bot_names:
+            users = explicit[bot_name]
+            has_explicit = {u['email'] for u in users}
+            users += [
+                {**w, 'source': 'wildcard'}
+                for w in wildcard
+                if w['email'] not in has_explicit
+            ]
+            result[bot_name] = {
+                'default_access': snapshot['policies'].get(bot_name),
+                'users': sorted(users, key=lambda u: u['email'])
+            }
+        return result
 
-        # Also check for wildcard (*) permission
-        if not permission:
-            permission = self.get_permission(email, '*')
+    @staticmethod
+    def _resolve_access(snapshot: Dict, email: str, bot_name: str) -> Dict:
+        """Resolve one (normalised) user and bot against a snapshot."""
+        roles = snapshot['permissions'].get(email, {})
+        role = roles.get(bot_name) or roles.get('*')
 
-        if permission:
+        if role:
             return {
                 'allowed': True,
-                'role': permission['role'],
-                'is_admin': permission['role'] == 'admin',
+                'role': role,
+                'is_admin': role == 'admin',
                 'source': 'permission'
             }
 
         # No explicit permission - check bot's default_access policy
-        bot = self.get_bot(bot_name)
-        if bot and bot.get('default_access') == 'domain':
+        if snapshot['policies'].get(bot_name) == 'domain':
             # Return that domain check is needed (caller handles domain validation)
             return {
                 'allowed': None,  # Signals "check domain"
@@ -254,6 +334,80 @@ class Database:
             'source': None
         }
 
+    # ─────────────────────────────────────────────────────────────
+    # Permissions Snapshot
+    # ─────────────────────────────────────────────────────────────
+
+    def get_permissions_version(self) -> int:
+        """
+        Get the stored permissions version.
+
+        Bumped by every grant, revoke, bot sync and access policy change.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT version FROM permissions_version WHERE id = 1")
+        row = cursor.fetchone()
+        conn.close()
+
+        return row['version'] if row else 0
+
+    def _bump_version(self, cursor):
+        """Move the permissions version on, inside the caller's transaction."""
+        cursor.execute("UPDATE permissions_version SET version = version + 1 WHERE id = 1")
+
+    def _build_snapshot(self) -> Dict:
+        """
+        Compile permissions and bot policies into lookup dicts.
+
+        Returns:
+            {version: int, permissions: {email: {bot: role}}, policies: {bot: default_access}}
+        """
+        conn = self.get_connection()
+        try:
+            # One read transaction so the version matches the rows
+            conn.execute("BEGIN")
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT version FROM permissions_version WHERE id = 1")
+            row = cursor.fetchone()
+            version = row['version'] if row else 0
+
+            permissions: Dict[str, Dict[str, str]] = {}
+            cursor.execute("SELECT email, bot_name, role FROM permissions")
+            for row in cursor.fetchall():
+                permissions.setdefault(row['email'], {})[row['bot_name']] = row['role']
+
+            cursor.execute("SELECT name, default_access FROM bots")
+            policies = {row['name']: row['default_access'] for row in cursor.fetchall()}
+        finally:
+            conn.rollback()
+            conn.close()
+
+        return {'version': version, 'permissions': permissions, 'policies': policies}
+
+    def _rebuild_snapshot(self) -> Dict:
+        """Rebuild the permissions snapshot now."""
+        snapshot = self._build_snapshot()
+        with self._snapshot_lock:
+            # Another thread may have rebuilt from newer data in the meantime
+            if self._snapshot is None or snapshot['version'] >= self._snapshot['version']:
+                self._snapshot = snapshot
+            return self._snapshot
+
+    def _get_snapshot(self) -> Dict:
+        """
+        Get the permissions snapshot, rebuilding it if it's out of date.
+
+        Costs one primary key read when nothing has changed. The version is
+        read from the database rather than trusted in memory so changes made
+        through another process (e.g. another gunicorn worker) are seen.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot['version'] == self.get_permissions_version():
+            return snapshot
+        return self._rebuild_snapshot()
+
     # ─────────────────────────────────────────────────────────────
     # Audit Operations
     # ─────────────────────────────────────────────────────────────
@@ -331,6 +485,9 @@ class Database:
                 )
                 synced += 1
 
+            self._bump_version(cursor)
+
+        self._rebuild_snapshot()
         return {'synced': synced, 'synced_at': now}
 
     def update_bot_access_policy(self, bot_name: str, default_access: str) -> bool:
@@ -355,7 +512,13 @@ class Database:
                 "UPDATE bots SET default_access = ? WHERE name = ?",
                 (default_access, bot_name)
             )
-            return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+            if updated:
+                self._bump_version(cursor)
+
+        if updated:
+            self._rebuild_snapshot()
+        return updated
 
     def get_bots(self) -> List[Dict]:
         """Get all registered bots."""
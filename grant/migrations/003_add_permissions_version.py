@@ -0,0 +1,25 @@
+"""Add a permissions version counter.
+
+Grant serves access checks from an in-memory snapshot of the permissions
+and bot policies. Every change to either bumps this counter, so each
+process (and each bot's auth cache) can tell when its copy is stale.
+"""
+
+
+def up(conn):
+    """Create the single-row permissions_version table."""
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS permissions_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO permissions_version (id, version) VALUES (1, 1)')
+
+
+def down(conn):
+    """Drop the permissions_version table."""
+    cursor = conn.cursor()
+    cursor.execute('DROP TABLE IF EXISTS permissions_version')
@@ -47,16 +47,80 @@ class PermissionService:
 
         # Superadmins always have admin access
         if email in self.superadmins:
-            return {
-                'allowed': True,
-                'role': 'admin',
-                'is_admin': True,
-                'source': 'superadmin'
-            }
+            return self._superadmin_access()
 
         # Check database (returns allowed=None if default_access='domain')
-        result = self._get_db().check_access(email, bot_name)
+        return self._apply_domain_policy(email, self._get_db().check_access(email, bot_name))
+
+    def check_access_batch(
+        self,
+        emails: List[str],
+        bot_names: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Dict]]:
+        """
+        Check access for several users against several bots at once.
+
+        Same rules as check_access, resolved against one permissions
+        snapshot instead of one lookup per pair.
+
+        Args:
+            emails: User email addresses
+            bot_names: Bots to check (defaults to every registered bot)
+
+        Returns:
+            {email: {bot_name: {allowed, role, is_admin, source}}}
+        """
+        emails = [e.lower().strip() for e in emails]
+        results = self._get_db().resolve_access(emails, bot_names)
 
+        for email, bots in results.items():
+            for bot_name, result in bots.items():
+                if email in self.superadmins:
+                    bots[bot_name] = self._superadmin_access()
+                else:
+                    bots[bot_name] = self._apply_domain_policy(email, result)
+
+        return results
+
+    def get_bot_users(self, bot_names: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        List who can access each bot.
+
+        Explicit and wildcard permissions are listed per user, plus
+        superadmins. Bots with default_access 'domain' also admit anyone
+        from allowed_domains, reported as domain_access rather than listed.
+
+        Args:
+            bot_names: Bots to list (defaults to every registered bot)
+
+        Returns:
+            {bot_name: {default_access, domain_access: bool, users: [{email, role, source}]}}
+        """
+        results = self._get_db().get_bot_users(bot_names)
+
+        superadmins = [
+            {'email': email, 'role': 'admin', 'source': 'superadmin'}
+            for email in self.superadmins
+        ]
+        for entry in results.values():
+            # Superadmin access overrides any permission they also hold
+            users = [u for u in entry['users'] if u['email'] not in self.superadmins]
+            entry['users'] = sorted(users + superadmins, key=lambda u: u['email'])
+            entry['domain_access'] = entry['default_access'] == 'domain'
+
+        return results
+
+    @staticmethod
+    def _superadmin_access() -> Dict:
+        return {
+            'allowed': True,
+            'role': 'admin',
+            'is_admin': True,
+            'source': 'superadmin'
+        }
+
+    def _apply_domain_policy(self, email: str, result: Dict) -> Dict:
+        """Resolve a database answer of "check domain" against allowed_domains."""
         # If database returned allowed=None, it means check domain
         if result.get('allowed') is None and result.get('default_access') == 'domain':
             if self._is_domain_allowed(email):
@@ -76,6 +140,10 @@ class PermissionService:
 
         return result
 
+    def get_permissions_version(self) -> int:
+        """Get the current permissions version (bots use it to revalidate their caches)."""
+        return self._get_db().get_permissions_version()
+
     def is_superadmin(self, email: str) -> bool:
         """Check if email is a superadmin."""
         return email.lower().strip() in self.superadmins
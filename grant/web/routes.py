@@ -48,15 +48,13 @@ def users():
 def bots():
     """List all bots with their permissions."""
     all_bots = permission_service.get_bots()
-    all_permissions = permission_service.get_all_permissions()
+    bot_users = permission_service.get_bot_users([bot['name'] for bot in all_bots])
 
-    # Group permissions by bot
-    bots_dict = {bot['name']: [] for bot in all_bots}
-    for perm in all_permissions:
-        bot_name = perm['bot_name']
-        if bot_name not in bots_dict:
-            bots_dict[bot_name] = []
-        bots_dict[bot_name].append(perm)
+    # Explicit and wildcard permissions per bot (superadmins go without saying)
+    bots_dict = {
+        bot_name: [u for u in entry['users'] if u['source'] != 'superadmin']
+        for bot_name, entry in bot_users.items()
+    }
 
     return render_template('bots.html', bots=all_bots, permissions=bots_dict)
 
@@ -11,7 +11,7 @@ from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 from playwright.async_api import Page
 
-from shared.playwright import AsyncBrowserManager
+from shared.playwright import AsyncBrowserManager, get_browser_pool, runs_on_pool
 from shared.playwright.buz import BuzOrgs, BuzNavigation
 from hugo.database.db import user_db
 
@@ -58,6 +58,19 @@ class BuzUserService:
         self.config = config
         self.headless = config.browser_headless
         self.debug = getattr(config, 'browser_debug', False)
+        self.browser_pool = get_browser_pool(
+            headless=self.headless,
+            default_timeout=config.browser_default_timeout,
+            max_contexts_per_org=config.browser_pool_max_contexts_per_org,
+            max_context_age=config.browser_pool_max_context_age,
+            idle_timeout=config.browser_pool_idle_timeout
+        ) if config.browser_pool_enabled else None
+
+    def _open_browser(self, **kwargs):
+        """Lease from the shared browser pool if enabled, else launch a fresh browser."""
+        if self.browser_pool is not None:
+            return self.browser_pool.browser(**kwargs)
+        return AsyncBrowserManager(headless=self.headless, **kwargs)
 
     async def _scrape_users_from_page(
         self,
@@ -129,6 +142,7 @@ class BuzUserService:
 
         return users
 
+    @runs_on_pool
     async def scrape_org_users(
         self,
         org_key: str,
@@ -159,8 +173,7 @@ class BuzUserService:
         all_users = []
 
         logger.info("Creating AsyncBrowserManager...")
-        async with AsyncBrowserManager(
-            headless=self.headless,
+        async with self._open_browser(
             screenshot_dir=self.config.browser_screenshot_dir,
             screenshot_on_failure=self.config.browser_screenshot_on_failure
         ) as browser:
@@ -218,6 +231,7 @@ class BuzUserService:
             'duration_seconds': duration
         }
 
+    @runs_on_pool
     async def toggle_user_status(
         self,
         org_key: str,
@@ -247,8 +261,7 @@ class BuzUserService:
             'message': ''
         }
 
-        async with AsyncBrowserManager(
-            headless=self.headless,
+        async with self._open_browser(
             screenshot_dir=self.config.browser_screenshot_dir,
             screenshot_on_failure=self.config.browser_screenshot_on_failure
         ) as browser:
@@ -311,6 +324,7 @@ class BuzUserService:
 
         return result
 
+    @runs_on_pool
     async def batch_toggle_users(
         self,
         org_key: str,
@@ -331,8 +345,7 @@ class BuzUserService:
         org_config = self.config.get_org_config(org_key)
         results = []
 
-        async with AsyncBrowserManager(
-            headless=self.headless,
+        async with self._open_browser(
             screenshot_dir=self.config.browser_screenshot_dir,
             screenshot_on_failure=self.config.browser_screenshot_on_failure
         ) as browser:
@@ -509,6 +522,7 @@ class BuzUserService:
     # User Edit Methods
     # -------------------------------------------------------------------------
 
+    @runs_on_pool
     async def get_user_details(
         self,
         org_key: str,
@@ -536,8 +550,7 @@ class BuzUserService:
         }
 
         try:
-            async with AsyncBrowserManager(
-                headless=self.headless,
+            async with self._open_browser(
                 screenshot_dir=self.config.browser_screenshot_dir,
                 screenshot_on_failure=self.config.browser_screenshot_on_failure
             ) as browser:
@@ -569,6 +582,7 @@ class BuzUserService:
 
         return result
 
+    @runs_on_pool
     async def update_user(
         self,
         org_key: str,
@@ -600,8 +614,7 @@ class BuzUserService:
         }
 
         try:
-            async with AsyncBrowserManager(
-                headless=self.headless,
+            async with self._open_browser(
                 screenshot_dir=self.config.browser_screenshot_dir,
                 screenshot_on_failure=self.config.browser_screenshot_on_failure
             ) as browser:
@@ -690,6 +703,7 @@ class BuzUserService:
 
         return result
 
+    @runs_on_pool
     async def get_available_groups(self, org_key: str) -> Dict[str, Any]:
         """
         Get list of available user groups for an org.
@@ -712,8 +726,7 @@ class BuzUserService:
         }
 
         try:
-            async with AsyncBrowserManager(
-                headless=self.headless,
+            async with self._open_browser(
                 screenshot_dir=self.config.browser_screenshot_dir,
                 screenshot_on_failure=self.config.browser_screenshot_on_failure
             ) as browser:
@@ -748,6 +761,7 @@ class BuzUserService:
     # Customer Search Methods
     # -------------------------------------------------------------------------
 
+    @runs_on_pool
     async def search_customers(
         self,
         org_key: str,
@@ -773,8 +787,7 @@ class BuzUserService:
         }
 
         try:
-            async with AsyncBrowserManager(
-                headless=self.headless,
+            async with self._open_browser(
                 screenshot_dir=self.config.browser_screenshot_dir,
                 screenshot_on_failure=self.config.browser_screenshot_on_failure
             ) as browser:
@@ -805,6 +818,7 @@ class BuzUserService:
 
         return result
 
+    @runs_on_pool
     async def get_customer_from_user(
         self,
         org_key: str,
@@ -834,8 +848,7 @@ class BuzUserService:
         }
 
         try:
-            async with AsyncBrowserManager(
-                headless=self.headless,
+            async with self._open_browser(
                 screenshot_dir=self.config.browser_screenshot_dir,
                 screenshot_on_failure=self.config.browser_screenshot_on_failure
             ) as browser:
@@ -884,6 +897,7 @@ class BuzUserService:
     # Group Sync Methods
     # -------------------------------------------------------------------------
 
+    @runs_on_pool
     async def sync_groups(self, org_key: str) -> Dict[str, Any]:
         """
         Sync groups from Buz to local database.
@@ -906,8 +920,7 @@ class BuzUserService:
         }
 
         try:
-            async with AsyncBrowserManager(
-                headless=self.headless,
+            async with self._open_browser(
                 screenshot_dir=self.config.browser_screenshot_dir,
                 screenshot_on_failure=self.config.browser_screenshot_on_failure
             ) as browser:
@@ -39,8 +39,8 @@ def _wait_for_lock(sync_id: int, sync_type: str, org_key: str) -> bool:
     from database.db import inventory_db
     from shared.playwright.buz import is_lock_available, get_lock_holder_info
 
-    while not is_lock_available():
-        holder_info = get_lock_holder_info()
+    while not is_lock_available(org_key):
+        holder_info = get_lock_holder_info(org_key)
         holder_bot = holder_info.get('bot', 'unknown') if holder_info else 'unknown'
         logger.info(
             f"[{org_key}] {sync_type} sync waiting for lock "
@@ -193,8 +193,8 @@ def sync_inventory():
         }), 409
 
     # For manual runs (wait_for_lock=False), check lock availability immediately
-    if not wait_for_lock and not is_lock_available():
-        holder_info = get_lock_holder_info()
+    if not wait_for_lock and not is_lock_available(org_key):
+        holder_info = get_lock_holder_info(org_key)
         holder_bot = holder_info.get('bot', 'unknown') if holder_info else 'unknown'
         acquired_at = holder_info.get('acquired_at', 'unknown') if holder_info else 'unknown'
         return jsonify({
@@ -203,7 +203,7 @@ def sync_inventory():
         }), 409
 
     # Determine initial status based on mode
-    initial_status = 'waiting_for_lock' if wait_for_lock and not is_lock_available() else 'running'
+    initial_status = 'waiting_for_lock' if wait_for_lock and not is_lock_available(org_key) else 'running'
 
     # Start sync log record
     sync_id = inventory_db.start_sync(org_key, 'inventory', status=initial_status)
@@ -261,8 +261,8 @@ def sync_pricing():
         }), 409
 
     # For manual runs (wait_for_lock=False), check lock availability immediately
-    if not wait_for_lock and not is_lock_available():
-        holder_info = get_lock_holder_info()
+    if not wait_for_lock and not is_lock_available(org_key):
+        holder_info = get_lock_holder_info(org_key)
         holder_bot = holder_info.get('bot', 'unknown') if holder_info else 'unknown'
         acquired_at = holder_info.get('acquired_at', 'unknown') if holder_info else 'unknown'
         return jsonify({
@@ -271,7 +271,7 @@ def sync_pricing():
         }), 409
 
     # Determine initial status based on mode
-    initial_status = 'waiting_for_lock' if wait_for_lock and not is_lock_available() else 'running'
+    initial_status = 'waiting_for_lock' if wait_for_lock and not is_lock_available(org_key) else 'running'
 
     # Start sync log record
     sync_id = inventory_db.start_sync(org_key, 'pricing', status=initial_status)
@@ -330,8 +330,8 @@ def sync_all():
         }), 409
 
     # For manual runs (wait_for_lock=False), check lock availability immediately
-    if not wait_for_lock and not is_lock_available():
-        holder_info = get_lock_holder_info()
+    if not wait_for_lock and not is_lock_available(org_key):
+        holder_info = get_lock_holder_info(org_key)
         holder_bot = holder_info.get('bot', 'unknown') if holder_info else 'unknown'
         acquired_at = holder_info.get('acquired_at', 'unknown') if holder_info else 'unknown'
         return jsonify({
@@ -340,7 +340,7 @@ def sync_all():
         }), 409
 
     # Determine initial status based on mode
-    initial_status = 'waiting_for_lock' if wait_for_lock and not is_lock_available() else 'running'
+    initial_status = 'waiting_for_lock' if wait_for_lock and not is_lock_available(org_key) else 'running'
 
     # Start sync log records
     inventory_sync_id = inventory_db.start_sync(org_key, 'inventory', status=initial_status)
@@ -454,6 +454,14 @@ def sync_status():
     return jsonify(result)
 
 
+@api_bp.route('/sync/lock', methods=['GET'])
+@api_or_session_auth
+def sync_lock_status():
+    """Get Buz lease holders, queue depth and wait-time metrics."""
+    from shared.playwright.buz import get_buz_lock
+    return jsonify(get_buz_lock().get_lock_status())
+
+
 @api_bp.route('/sync/history', methods=['GET'])
 @api_or_session_auth
 def sync_history():
@@ -40,6 +40,11 @@ class Config:
         self.browser_default_timeout = browser_cfg.get("default_timeout", 60000)
         self.browser_screenshot_on_failure = browser_cfg.get("screenshot_on_failure", True)
         self.browser_screenshot_dir = browser_cfg.get("screenshot_dir", "screenshots")
+        pool_cfg = browser_cfg.get("pool", {}) or {}
+        self.browser_pool_enabled = pool_cfg.get("enabled", False)
+        self.browser_pool_max_contexts_per_org = pool_cfg.get("max_contexts_per_org", 2)
+        self.browser_pool_max_context_age = pool_cfg.get("max_context_age", 1800)
+        self.browser_pool_idle_timeout = pool_cfg.get("idle_timeout", 900)
 
         # Buz config
         buz_cfg = data.get("buz", {}) or {}
@@ -58,6 +63,11 @@ class Config:
             "https://go.buzmanager.com/Settings/InventoryPrices/Import"
         )
 
+        # Sync config
+        sync_cfg = data.get("sync", {}) or {}
+        self.sync_batch_size = sync_cfg.get("batch_size", 500)
+        self.sync_parse_workers = sync_cfg.get("parse_workers", 1)
+
         # Inventory group home orgs - which org has the authoritative items
         self.inventory_group_home_orgs = data.get("inventory_group_home_orgs", {}) or {}
 
@@ -78,6 +88,8 @@ class Config:
         if self.browser_debug:
             # Debug mode forces headed browser
             self.browser_headless = False
+            # ...and a fresh browser per operation, so pause points behave
+            self.browser_pool_enabled = False
 
         # Load Buz organizations from shared .secrets/buz/ directory
         self.buz_orgs, self.buz_orgs_missing_auth = BuzOrgs.load_orgs()
@@ -4,10 +4,36 @@ Database service for Ivy's Buz inventory and pricing cache.
 import sqlite3
 import os
 import json
+import hashlib
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from shared.migrations import MigrationRunner
 
+# Rows staged and merged per statement in bulk upserts
+BULK_CHUNK_SIZE = 500
+
+# Synced columns, in the order bulk upserts build their row tuples
+INVENTORY_ITEM_COLUMNS = (
+    'org_key', 'group_code', 'item_code', 'item_name', 'description',
+    'unit_of_measure', 'is_active', 'supplier_code', 'supplier_name',
+    'cost_price', 'sell_price', 'min_qty', 'max_qty', 'sort_order', 'extra_data'
+)
+
+PRICING_COEFFICIENT_COLUMNS = (
+    'org_key', 'group_code', 'item_code', 'description', 'price_group_code', 'effective_date',
+    'is_active', 'sell_each', 'sell_lm_wide', 'sell_lm_height', 'sell_lm_depth',
+    'sell_sqm', 'sell_percentage_on_main', 'sell_minimum',
+    'cost_each', 'cost_lm_wide', 'cost_lm_height', 'cost_lm_depth',
+    'cost_sqm', 'cost_percentage_on_main', 'cost_minimum',
+    'install_cost_each', 'install_cost_lm_width', 'install_cost_height',
+    'install_cost_depth', 'install_cost_sqm', 'install_cost_percentage_of_main',
+    'install_cost_minimum',
+    'install_sell_each', 'install_sell_minimum', 'install_sell_lm_wide',
+    'install_sell_sqm', 'install_sell_height', 'install_sell_depth',
+    'install_sell_percentage_of_main',
+    'supplier_code', 'supplier_description', 'pk_id', 'sort_order', 'extra_data'
+)
+
 
 class InventoryDatabase:
     """SQLite database for caching Buz inventory and pricing data."""
@@ -151,6 +177,7 @@ class InventoryDatabase:
                     max_qty = ?,
                     sort_order = ?,
                     extra_data = ?,
+                    content_hash = '',
                     last_synced = CURRENT_TIMESTAMP,
                     updated_at = CURRENT_TIMESTAMP
                 WHERE org_key = ? AND group_code = ? AND item_code = ?
@@ -182,88 +209,52 @@ class InventoryDatabase:
     def bulk_upsert_inventory_items(
         self,
         org_key: str,
-        items: List[Dict[str, Any]]
+        items: List[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE
     ) -> Dict[str, Any]:
-        """Bulk upsert inventory items from a sync operation."""
-        conn = self.get_connection()
-        created = 0
-        updated = 0
+        """
+        Bulk upsert inventory items from a sync operation.
 
-        for item in items:
-            extra_json = json.dumps(item.get('extra_data', {}))
+        Rows are staged and merged set-based, one INSERT ... ON CONFLICT per
+        chunk. Rows whose content hash matches the stored row are not written.
 
+        Returns:
+            Dict with created/updated/unchanged counts; total is all rows processed
+        """
+        rows = []
+        for item in items:
             # Buz exports use 'description' as the item name
             # Use 'description' as item_name if not explicitly set
             item_name = item.get('item_name') or item.get('description', '')
 
-            cursor = conn.execute(
-                'SELECT id FROM inventory_items WHERE org_key = ? AND group_code = ? AND item_code = ?',
-                (org_key, item['group_code'], item['item_code'])
-            )
-            existing = cursor.fetchone()
-
-            if existing:
-                conn.execute('''
-                    UPDATE inventory_items SET
-                        item_name = ?,
-                        description = ?,
-                        unit_of_measure = ?,
-                        is_active = ?,
-                        supplier_code = ?,
-                        supplier_name = ?,
-                        cost_price = ?,
-                        sell_price = ?,
-                        min_qty = ?,
-                        max_qty = ?,
-                        sort_order = ?,
-                        extra_data = ?,
-                        last_synced = CURRENT_TIMESTAMP,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE org_key = ? AND group_code = ? AND item_code = ?
-                ''', (
-                    item_name,
-                    item.get('description', ''),
-                    item.get('unit_of_measure', ''),
-                    1 if item.get('is_active', True) else 0,
-                    item.get('supplier_code', ''),
-                    item.get('supplier_name', ''),
-                    item.get('cost_price', 0),
-                    item.get('sell_price', 0),
-                    item.get('min_qty', 0),
-                    item.get('max_qty', 0),
-                    item.get('sort_order', 0),
-                    extra_json,
-                    org_key, item['group_code'], item['item_code']
-                ))
-                updated += 1
-            else:
-                conn.execute('''
-                    INSERT INTO inventory_items (
-                        org_key, group_code, item_code, item_name, description,
-                        unit_of_measure, is_active, supplier_code, supplier_name,
-                        cost_price, sell_price, min_qty, max_qty, sort_order, extra_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    org_key, item['group_code'], item['item_code'],
-                    item_name, item.get('description', ''),
-                    item.get('unit_of_measure', ''),
-                    1 if item.get('is_active', True) else 0,
-                    item.get('supplier_code', ''), item.get('supplier_name', ''),
-                    item.get('cost_price', 0), item.get('sell_price', 0),
-                    item.get('min_qty', 0), item.get('max_qty', 0),
-                    item.get('sort_order', 0), extra_json
-                ))
-                created += 1
+            rows.append((
+                org_key, item['group_code'], item['item_code'],
+                item_name, item.get('description', ''),
+                item.get('unit_of_measure', ''),
+                1 if item.get('is_active', True) else 0,
+                item.get('supplier_code', ''), item.get('supplier_name', ''),
+                item.get('cost_price', 0), item.get('sell_price', 0),
+                item.get('min_qty', 0), item.get('max_qty', 0),
+                item.get('sort_order', 0), json.dumps(item.get('extra_data', {}))
+            ))
 
-        conn.commit()
-        conn.close()
+        conn = self.get_connection()
+        try:
+            counts = self._bulk_merge(
+                conn,
+                table='inventory_items',
+                columns=INVENTORY_ITEM_COLUMNS,
+                key_columns=('org_key', 'group_code', 'item_code'),
+                rows=rows,
+                chunk_size=chunk_size
+            )
+        finally:
+            conn.close()
 
         return {
             'success': True,
             'org_key': org_key,
-            'created': created,
-            'updated': updated,
-            'total': created + updated
+            **counts
         }
 
     def get_inventory_items(
@@ -571,117 +562,63 @@ class InventoryDatabase:
     def bulk_upsert_pricing_coefficients(
         self,
         org_key: str,
-        coefficients: List[Dict[str, Any]]
+        coefficients: List[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE
     ) -> Dict[str, Any]:
-        """Bulk upsert pricing coefficients from a sync operation."""
-        conn = self.get_connection()
-        created = 0
-        updated = 0
+        """
+        Bulk upsert pricing coefficients from a sync operation.
 
+        Rows are staged and merged set-based, one INSERT ... ON CONFLICT per
+        chunk. Rows whose content hash matches the stored row are not written.
+
+        Returns:
+            Dict with created/updated/unchanged counts; total is all rows processed
+        """
+        rows = []
         for coeff in coefficients:
-            extra_json = json.dumps(coeff.get('extra_data', {}))
-            item_code = coeff.get('item_code', '')
-            price_group_code = coeff.get('price_group_code', '')
+            rows.append((
+                org_key, coeff['group_code'], coeff.get('item_code', ''),
+                coeff.get('description', ''), coeff.get('price_group_code', ''),
+                coeff.get('effective_date'),
+                1 if coeff.get('is_active', True) else 0,
+                coeff.get('sell_each', 0), coeff.get('sell_lm_wide', 0),
+                coeff.get('sell_lm_height', 0), coeff.get('sell_lm_depth', 0),
+                coeff.get('sell_sqm', 0), coeff.get('sell_percentage_on_main', 0),
+                coeff.get('sell_minimum', 0),
+                coeff.get('cost_each', 0), coeff.get('cost_lm_wide', 0),
+                coeff.get('cost_lm_height', 0), coeff.get('cost_lm_depth', 0),
+                coeff.get('cost_sqm', 0), coeff.get('cost_percentage_on_main', 0),
+                coeff.get('cost_minimum', 0),
+                coeff.get('install_cost_each', 0), coeff.get('install_cost_lm_width', 0),
+                coeff.get('install_cost_height', 0), coeff.get('install_cost_depth', 0),
+                coeff.get('install_cost_sqm', 0), coeff.get('install_cost_percentage_of_main', 0),
+                coeff.get('install_cost_minimum', 0),
+                coeff.get('install_sell_each', 0), coeff.get('install_sell_minimum', 0),
+                coeff.get('install_sell_lm_wide', 0), coeff.get('install_sell_sqm', 0),
+                coeff.get('install_sell_height', 0), coeff.get('install_sell_depth', 0),
+                coeff.get('install_sell_percentage_of_main', 0),
+                coeff.get('supplier_code', ''), coeff.get('supplier_description', ''),
+                coeff.get('pk_id'), coeff.get('sort_order', 0),
+                json.dumps(coeff.get('extra_data', {}))
+            ))
 
-            cursor = conn.execute(
-                '''SELECT id FROM pricing_coefficients
-                   WHERE org_key = ? AND group_code = ? AND item_code = ? AND price_group_code = ?''',
-                (org_key, coeff['group_code'], item_code, price_group_code)
+        conn = self.get_connection()
+        try:
+            counts = self._bulk_merge(
+                conn,
+                table='pricing_coefficients',
+                columns=PRICING_COEFFICIENT_COLUMNS,
+                key_columns=('org_key', 'group_code', 'item_code', 'price_group_code'),
+                rows=rows,
+                chunk_size=chunk_size
             )
-            existing = cursor.fetchone()
-
-            if existing:
-                conn.execute('''
-                    UPDATE pricing_coefficients SET
-                        description = ?, effective_date = ?, is_active = ?,
-                        sell_each = ?, sell_lm_wide = ?, sell_lm_height = ?, sell_lm_depth = ?,
-                        sell_sqm = ?, sell_percentage_on_main = ?, sell_minimum = ?,
-                        cost_each = ?, cost_lm_wide = ?, cost_lm_height = ?, cost_lm_depth = ?,
-                        cost_sqm = ?, cost_percentage_on_main = ?, cost_minimum = ?,
-                        install_cost_each = ?, install_cost_lm_width = ?, install_cost_height = ?,
-                        install_cost_depth = ?, install_cost_sqm = ?, install_cost_percentage_of_main = ?,
-                        install_cost_minimum = ?,
-                        install_sell_each = ?, install_sell_minimum = ?, install_sell_lm_wide = ?,
-                        install_sell_sqm = ?, install_sell_height = ?, install_sell_depth = ?,
-                        install_sell_percentage_of_main = ?,
-                        supplier_code = ?, supplier_description = ?,
-                        pk_id = ?, sort_order = ?, extra_data = ?,
-                        last_synced = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
-                    WHERE org_key = ? AND group_code = ? AND item_code = ? AND price_group_code = ?
-                ''', (
-                    coeff.get('description', ''), coeff.get('effective_date'),
-                    1 if coeff.get('is_active', True) else 0,
-                    coeff.get('sell_each', 0), coeff.get('sell_lm_wide', 0),
-                    coeff.get('sell_lm_height', 0), coeff.get('sell_lm_depth', 0),
-                    coeff.get('sell_sqm', 0), coeff.get('sell_percentage_on_main', 0),
-                    coeff.get('sell_minimum', 0),
-                    coeff.get('cost_each', 0), coeff.get('cost_lm_wide', 0),
-                    coeff.get('cost_lm_height', 0), coeff.get('cost_lm_depth', 0),
-                    coeff.get('cost_sqm', 0), coeff.get('cost_percentage_on_main', 0),
-                    coeff.get('cost_minimum', 0),
-                    coeff.get('install_cost_each', 0), coeff.get('install_cost_lm_width', 0),
-                    coeff.get('install_cost_height', 0), coeff.get('install_cost_depth', 0),
-                    coeff.get('install_cost_sqm', 0), coeff.get('install_cost_percentage_of_main', 0),
-                    coeff.get('install_cost_minimum', 0),
-                    coeff.get('install_sell_each', 0), coeff.get('install_sell_minimum', 0),
-                    coeff.get('install_sell_lm_wide', 0), coeff.get('install_sell_sqm', 0),
-                    coeff.get('install_sell_height', 0), coeff.get('install_sell_depth', 0),
-                    coeff.get('install_sell_percentage_of_main', 0),
-                    coeff.get('supplier_code', ''), coeff.get('supplier_description', ''),
-                    coeff.get('pk_id'), coeff.get('sort_order', 0), extra_json,
-                    org_key, coeff['group_code'], item_code, price_group_code
-                ))
-                updated += 1
-            else:
-                conn.execute('''
-                    INSERT INTO pricing_coefficients (
-                        org_key, group_code, item_code, description, price_group_code, effective_date,
-                        is_active, sell_each, sell_lm_wide, sell_lm_height, sell_lm_depth,
-                        sell_sqm, sell_percentage_on_main, sell_minimum,
-                        cost_each, cost_lm_wide, cost_lm_height, cost_lm_depth,
-                        cost_sqm, cost_percentage_on_main, cost_minimum,
-                        install_cost_each, install_cost_lm_width, install_cost_height,
-                        install_cost_depth, install_cost_sqm, install_cost_percentage_of_main,
-                        install_cost_minimum,
-                        install_sell_each, install_sell_minimum, install_sell_lm_wide,
-                        install_sell_sqm, install_sell_height, install_sell_depth,
-                        install_sell_percentage_of_main,
-                        supplier_code, supplier_description, pk_id, sort_order, extra_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    org_key, coeff['group_code'], item_code, coeff.get('description', ''),
-                    price_group_code, coeff.get('effective_date'),
-                    1 if coeff.get('is_active', True) else 0,
-                    coeff.get('sell_each', 0), coeff.get('sell_lm_wide', 0),
-                    coeff.get('sell_lm_height', 0), coeff.get('sell_lm_depth', 0),
-                    coeff.get('sell_sqm', 0), coeff.get('sell_percentage_on_main', 0),
-                    coeff.get('sell_minimum', 0),
-                    coeff.get('cost_each', 0), coeff.get('cost_lm_wide', 0),
-                    coeff.get('cost_lm_height', 0), coeff.get('cost_lm_depth', 0),
-                    coeff.get('cost_sqm', 0), coeff.get('cost_percentage_on_main', 0),
-                    coeff.get('cost_minimum', 0),
-                    coeff.get('install_cost_each', 0), coeff.get('install_cost_lm_width', 0),
-                    coeff.get('install_cost_height', 0), coeff.get('install_cost_depth', 0),
-                    coeff.get('install_cost_sqm', 0), coeff.get('install_cost_percentage_of_main', 0),
-                    coeff.get('install_cost_minimum', 0),
-                    coeff.get('install_sell_each', 0), coeff.get('install_sell_minimum', 0),
-                    coeff.get('install_sell_lm_wide', 0), coeff.get('install_sell_sqm', 0),
-                    coeff.get('install_sell_height', 0), coeff.get('install_sell_depth', 0),
-                    coeff.get('install_sell_percentage_of_main', 0),
-                    coeff.get('supplier_code', ''), coeff.get('supplier_description', ''),
-                    coeff.get('pk_id'), coeff.get('sort_order', 0), extra_json
-                ))
-                created += 1
-
-        conn.commit()
-        conn.close()
+        finally:
+            conn.close()
 
         return {
             'success': True,
             'org_key': org_key,
-            'created': created,
-            'updated': updated,
-            'total': created + updated
+            **counts
         }
 
     def get_pricing_coefficients(
@@ -782,6 +719,103 @@ class InventoryDatabase:
         conn.close()
         return count
 
+    # =====================
+    # Bulk Merge Helpers
+    # =====================
+
+    @staticmethod
+    def _content_hash(row: tuple) -> str:
+        """Stable hash of a row's synced values, used to skip unchanged rows."""
+        return hashlib.sha1(json.dumps(row, default=str).encode('utf-8')).hexdigest()
+
+    def _bulk_merge(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        columns: tuple,
+        key_columns: tuple,
+        rows: List[tuple],
+        chunk_size: int
+    ) -> Dict[str, int]:
+        """
+        Merge rows into a table with set-based statements.
+
+        Each chunk is loaded into a temp staging table with executemany, then
+        counted against the live table with one join and merged with one
+        INSERT ... ON CONFLICT DO UPDATE. The update only fires when the
+        content hash differs, so unchanged rows cause no writes.
+
+        Args:
+            conn: Open connection (committed here, closed by the caller)
+            table: Target table
+            columns: Column names matching each row tuple (without content_hash)
+            key_columns: Columns of the table's UNIQUE constraint
+            rows: Row tuples in `columns` order
+            chunk_size: Rows staged and merged per statement
+
+        Returns:
+            Dict with created, updated, unchanged and total counts
+        """
+        # Last occurrence of a key wins, matching row-by-row upsert behaviour
+        key_idx = [columns.index(c) for c in key_columns]
+        deduped = {}
+        for row in rows:
+            deduped[tuple(row[i] for i in key_idx)] = row
+        staged_rows = [row + (self._content_hash(row),) for row in deduped.values()]
+
+        all_columns = columns + ('content_hash',)
+        column_list = ', '.join(all_columns)
+        placeholders = ', '.join('?' for _ in all_columns)
+        stage = f'_stage_{table}'
+        key_join = ' AND '.join(f't.{c} = s.{c}' for c in key_columns)
+        update_set = ', '.join(
+            f'{c} = excluded.{c}' for c in all_columns if c not in key_columns
+        )
+
+        conn.execute(f'CREATE TEMP TABLE IF NOT EXISTS {stage} AS SELECT {column_list} FROM {table} WHERE 0')
+
+        created = updated = unchanged = 0
+        for start in range(0, len(staged_rows), chunk_size):
+            chunk = staged_rows[start:start + chunk_size]
+
+            conn.execute(f'DELETE FROM temp.{stage}')
+            conn.executemany(f'INSERT INTO temp.{stage} ({column_list}) VALUES ({placeholders})', chunk)
+
+            counts = conn.execute(f'''
+                SELECT
+                    SUM(CASE WHEN t.rowid IS NULL THEN 1 ELSE 0 END) AS created,
+                    SUM(CASE WHEN t.content_hash = s.content_hash THEN 1 ELSE 0 END) AS unchanged
+                FROM temp.{stage} s
+                LEFT JOIN main.{table} t ON {key_join}
+            ''').fetchone()
+            chunk_created = counts['created'] or 0
+            chunk_unchanged = counts['unchanged'] or 0
+
+            # "WHERE true" is required by SQLite's parser for INSERT ... SELECT ... ON CONFLICT
+            conn.execute(f'''
+                INSERT INTO main.{table} ({column_list})
+                SELECT {column_list} FROM temp.{stage} WHERE true
+                ON CONFLICT({', '.join(key_columns)}) DO UPDATE SET
+                    {update_set},
+                    last_synced = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE {table}.content_hash IS NOT excluded.content_hash
+            ''')
+
+            created += chunk_created
+            unchanged += chunk_unchanged
+            updated += len(chunk) - chunk_created - chunk_unchanged
+
+        conn.execute(f'DROP TABLE IF EXISTS temp.{stage}')
+        conn.commit()
+
+        return {
+            'created': created,
+            'updated': updated,
+            'unchanged': unchanged,
+            'total': created + updated + unchanged
+        }
+
     # =====================
     # Sync Log Operations
     # =====================
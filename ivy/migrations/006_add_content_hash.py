@@ -0,0 +1,25 @@
+"""
+Migration: Add content_hash to inventory_items and pricing_coefficients.
+
+Bulk syncs hash each row's synced fields and skip the write when the stored
+hash matches, so a resync only touches rows that actually changed in Buz.
+Existing rows start with an empty hash and are filled in on the next sync.
+"""
+
+
+def up(conn):
+    """Add content_hash columns."""
+    conn.execute('''
+        ALTER TABLE inventory_items
+        ADD COLUMN content_hash TEXT DEFAULT ''
+    ''')
+    conn.execute('''
+        ALTER TABLE pricing_coefficients
+        ADD COLUMN content_hash TEXT DEFAULT ''
+    ''')
+
+
+def down(conn):
+    """Remove content_hash columns (SQLite doesn't support DROP COLUMN easily)."""
+    # SQLite doesn't support DROP COLUMN, would need to recreate table
+    pass
@@ -2,7 +2,7 @@
 Browser service for downloading inventory and pricing exports from Buz.
 
 Uses Playwright to automate the export process through Buz's web interface.
-Uses BuzPlaywrightLock to prevent concurrent access from multiple bots.
+Uses BuzPlaywrightLock leases to prevent concurrent access to an org from multiple bots.
 """
 import logging
 import asyncio
@@ -13,6 +13,7 @@ from playwright.async_api import Page, Download
 from filelock import Timeout as LockTimeout
 
 from shared.playwright.async_browser import AsyncBrowserManager
+from shared.playwright.browser_pool import get_browser_pool, runs_on_pool
 from shared.playwright.buz import get_buz_lock, get_lock_holder_info
 
 logger = logging.getLogger(__name__)
@@ -44,6 +45,19 @@ class BuzExportService:
         self.headless = headless
         self.download_dir = Path(download_dir) if download_dir else Path(tempfile.gettempdir())
         self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.browser_pool = get_browser_pool(
+            headless=self.headless,
+            default_timeout=config.browser_default_timeout,
+            max_contexts_per_org=config.browser_pool_max_contexts_per_org,
+            max_context_age=config.browser_pool_max_context_age,
+            idle_timeout=config.browser_pool_idle_timeout
+        ) if config.browser_pool_enabled else None
+
+    def _open_browser(self, **kwargs):
+        """Lease from the shared browser pool if enabled, else launch a fresh browser."""
+        if self.browser_pool is not None:
+            return self.browser_pool.browser(**kwargs)
+        return AsyncBrowserManager(headless=self.headless, **kwargs)
 
     def _format_lock_error(self, operation: str, org_key: str) -> str:
         """
@@ -56,7 +70,7 @@ class BuzExportService:
         Returns:
             User-friendly error message
         """
-        holder_info = get_lock_holder_info()
+        holder_info = get_lock_holder_info(org_key)
         if holder_info:
             holder_bot = holder_info.get('bot', 'unknown')
             acquired_at = holder_info.get('acquired_at', 'unknown time')
@@ -70,6 +84,7 @@ class BuzExportService:
             f"Buz is busy with another operation. Please try again later."
         )
 
+    @runs_on_pool
     async def export_inventory(
         self,
         org_key: str,
@@ -90,12 +105,11 @@ class BuzExportService:
 
         logger.info(f"Starting inventory export for {org_key}")
 
-        # Acquire Buz lock to prevent concurrent access from other bots
+        # Lease Buz access for this org to prevent concurrent access from other bots
         buz_lock = get_buz_lock()
         try:
-            async with buz_lock.acquire_async('ivy'):
-                async with AsyncBrowserManager(
-                    headless=self.headless,
+            async with buz_lock.acquire_async('ivy', org_key=org_key, priority='batch'):
+                async with self._open_browser(
                     screenshot_dir=self.config.browser_screenshot_dir,
                     default_timeout=self.config.buz_navigation_timeout
                 ) as browser:
@@ -173,6 +187,7 @@ class BuzExportService:
                 'org_key': org_key
             }
 
+    @runs_on_pool
     async def export_pricing(
         self,
         org_key: str,
@@ -193,12 +208,11 @@ class BuzExportService:
 
         logger.info(f"Starting pricing export for {org_key}")
 
-        # Acquire Buz lock to prevent concurrent access from other bots
+        # Lease Buz access for this org to prevent concurrent access from other bots
         buz_lock = get_buz_lock()
         try:
-            async with buz_lock.acquire_async('ivy'):
-                async with AsyncBrowserManager(
-                    headless=self.headless,
+            async with buz_lock.acquire_async('ivy', org_key=org_key, priority='batch'):
+                async with self._open_browser(
                     screenshot_dir=self.config.browser_screenshot_dir,
                     default_timeout=self.config.buz_navigation_timeout
                 ) as browser:
@@ -419,6 +433,7 @@ class BuzExportService:
         logger.info(f"Downloaded {export_type} export to: {file_path}")
         return file_path
 
+    @runs_on_pool
     async def get_available_groups(
         self,
         org_key: str,
@@ -437,12 +452,11 @@ class BuzExportService:
         org_config = self.config.get_org_config(org_key)
         storage_state_path = org_config['storage_state_path']
 
-        # Acquire Buz lock to prevent concurrent access from other bots
+        # Lease Buz access for this org to prevent concurrent access from other bots
         buz_lock = get_buz_lock()
         try:
-            async with buz_lock.acquire_async('ivy'):
-                async with AsyncBrowserManager(
-                    headless=self.headless,
+            async with buz_lock.acquire_async('ivy', org_key=org_key, priority='interactive'):
+                async with self._open_browser(
                     screenshot_dir=self.config.browser_screenshot_dir,
                     default_timeout=self.config.buz_navigation_timeout
                 ) as browser:
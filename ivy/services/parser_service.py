@@ -13,8 +13,10 @@ Buz export format quirks:
 - 'Help' and 'Sheet1' sheets should be skipped
 """
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Callable
 import openpyxl
 from openpyxl.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
@@ -24,6 +26,38 @@ logger = logging.getLogger(__name__)
 # Sheets to skip when parsing
 SKIP_SHEETS = {'help', 'sheet1'}
 
+# Rows per batch when streaming a workbook into the database
+DEFAULT_BATCH_SIZE = 500
+
+
+class GroupCounter:
+    """
+    Tracks row counts per inventory group while rows stream past.
+
+    Group code comes from the row, falling back to the sheet name.
+    """
+
+    def __init__(self, count_field: str):
+        self.count_field = count_field
+        self._groups: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, rows: List[Dict[str, Any]], sheet_name: str):
+        for row in rows:
+            group_code = row.get('group_code') or sheet_name
+            if group_code not in self._groups:
+                self._groups[group_code] = {
+                    'group_code': group_code,
+                    'group_name': group_code,
+                    self.count_field: 0
+                }
+            self._groups[group_code][self.count_field] += 1
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self._groups.values())
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
 
 class BuzExcelParser:
     """
@@ -197,12 +231,16 @@ class BuzExcelParser:
         'operation': 'operation',
     }
 
-    def parse_inventory_file(self, file_path: str) -> Dict[str, Any]:
+    def parse_inventory_file(self, file_path: str, max_workers: int = 1) -> Dict[str, Any]:
         """
         Parse an inventory items Excel file.
 
+        Loads every item into memory; for large exports prefer
+        iter_inventory_batches(), which streams rows in fixed-size batches.
+
         Args:
             file_path: Path to the Excel file
+            max_workers: Parse sheets in this many processes (1 = in-process)
 
         Returns:
             Dict with items list and metadata
@@ -210,39 +248,19 @@ class BuzExcelParser:
         logger.info(f"Parsing inventory file: {file_path}")
 
         try:
-            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
             items = []
-            groups = {}
-
-            for sheet_name in workbook.sheetnames:
-                # Skip Help and Sheet1 sheets
-                if sheet_name.lower() in SKIP_SHEETS:
-                    logger.debug(f"Skipping sheet: {sheet_name}")
-                    continue
-
-                sheet = workbook[sheet_name]
-                sheet_items = self._parse_inventory_sheet(sheet, sheet_name)
-                items.extend(sheet_items)
-
-                # Track groups - use sheet name as group code
-                for item in sheet_items:
-                    group_code = item.get('group_code') or sheet_name
-                    if group_code not in groups:
-                        groups[group_code] = {
-                            'group_code': group_code,
-                            'group_name': group_code,
-                            'item_count': 0
-                        }
-                    groups[group_code]['item_count'] += 1
+            groups = GroupCounter('item_count')
 
-            workbook.close()
+            for batch in self.iter_inventory_batches(file_path, max_workers=max_workers):
+                items.extend(batch['rows'])
+                groups.add(batch['rows'], batch['sheet'])
 
             logger.info(f"Parsed {len(items)} inventory items from {len(groups)} groups")
 
             return {
                 'success': True,
                 'items': items,
-                'groups': list(groups.values()),
+                'groups': groups.to_list(),
                 'total_items': len(items),
                 'total_groups': len(groups)
             }
@@ -256,12 +274,16 @@ class BuzExcelParser:
                 'groups': []
             }
 
-    def parse_pricing_file(self, file_path: str) -> Dict[str, Any]:
+    def parse_pricing_file(self, file_path: str, max_workers: int = 1) -> Dict[str, Any]:
         """
         Parse a pricing coefficients Excel file.
 
+        Loads every coefficient into memory; for large exports prefer
+        iter_pricing_batches(), which streams rows in fixed-size batches.
+
         Args:
             file_path: Path to the Excel file
+            max_workers: Parse sheets in this many processes (1 = in-process)
 
         Returns:
             Dict with coefficients list and metadata
@@ -269,39 +291,19 @@ class BuzExcelParser:
         logger.info(f"Parsing pricing file: {file_path}")
 
         try:
-            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
             coefficients = []
-            groups = {}
-
-            for sheet_name in workbook.sheetnames:
-                # Skip Help and Sheet1 sheets
-                if sheet_name.lower() in SKIP_SHEETS:
-                    logger.debug(f"Skipping sheet: {sheet_name}")
-                    continue
-
-                sheet = workbook[sheet_name]
-                sheet_pricing = self._parse_pricing_sheet(sheet, sheet_name)
-                coefficients.extend(sheet_pricing)
-
-                # Track groups - use sheet name as group code
-                for pricing in sheet_pricing:
-                    group_code = pricing.get('group_code') or sheet_name
-                    if group_code not in groups:
-                        groups[group_code] = {
-                            'group_code': group_code,
-                            'group_name': group_code,
-                            'coefficient_count': 0
-                        }
-                    groups[group_code]['coefficient_count'] += 1
+            groups = GroupCounter('coefficient_count')
 
-            workbook.close()
+            for batch in self.iter_pricing_batches(file_path, max_workers=max_workers):
+                coefficients.extend(batch['rows'])
+                groups.add(batch['rows'], batch['sheet'])
 
             logger.info(f"Parsed {len(coefficients)} pricing coefficients from {len(groups)} groups")
 
             return {
                 'success': True,
                 'coefficients': coefficients,
-                'groups': list(groups.values()),
+                'groups': groups.to_list(),
                 'total_coefficients': len(coefficients),
                 'total_groups': len(groups)
             }
@@ -315,6 +317,138 @@ class BuzExcelParser:
                 'groups': []
             }
 
+    def iter_inventory_batches(
+        self,
+        file_path: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = 1
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream validated inventory items sheet by sheet in fixed-size batches.
+
+        Only one batch of rows is held in memory at a time, so memory stays
+        flat however large the export is.
+
+        Args:
+            file_path: Path to the Excel file
+            batch_size: Maximum rows per batch
+            max_workers: Parse sheets in this many processes (1 = in-process)
+
+        Yields:
+            Dict with 'sheet', 'sheet_index', 'sheet_count' and 'rows'
+        """
+        return self._iter_batches(file_path, 'inventory', batch_size, max_workers)
+
+    def iter_pricing_batches(
+        self,
+        file_path: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = 1
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream validated pricing coefficients sheet by sheet in fixed-size batches.
+
+        Args:
+            file_path: Path to the Excel file
+            batch_size: Maximum rows per batch
+            max_workers: Parse sheets in this many processes (1 = in-process)
+
+        Yields:
+            Dict with 'sheet', 'sheet_index', 'sheet_count' and 'rows'
+        """
+        return self._iter_batches(file_path, 'pricing', batch_size, max_workers)
+
+    def _sheet_parser(self, kind: str) -> Callable[[Worksheet, str], Iterator[Dict[str, Any]]]:
+        """Per-sheet row iterator for an export kind ('inventory' or 'pricing')."""
+        if kind == 'inventory':
+            return self._iter_inventory_sheet
+        if kind == 'pricing':
+            return self._iter_pricing_sheet
+        raise ValueError(f"Unknown export kind: {kind}")
+
+    def _iter_batches(
+        self,
+        file_path: str,
+        kind: str,
+        batch_size: int,
+        max_workers: int = 1
+    ) -> Iterator[Dict[str, Any]]:
+        """Open a workbook read-only and yield batches of parsed rows per sheet."""
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            # Skip Help and Sheet1 sheets
+            sheet_names = [name for name in workbook.sheetnames if name.lower() not in SKIP_SHEETS]
+
+            if max_workers > 1 and len(sheet_names) > 1:
+                sheet_rows = self._iter_sheets_parallel(file_path, kind, sheet_names, max_workers)
+            else:
+                sheet_parser = self._sheet_parser(kind)
+                sheet_rows = ((name, sheet_parser(workbook[name], name)) for name in sheet_names)
+
+            for sheet_index, (sheet_name, rows) in enumerate(sheet_rows):
+                batch = []
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        yield self._batch(sheet_name, sheet_index, len(sheet_names), batch)
+                        batch = []
+                if batch:
+                    yield self._batch(sheet_name, sheet_index, len(sheet_names), batch)
+        finally:
+            workbook.close()
+
+    def _iter_sheets_parallel(
+        self,
+        file_path: str,
+        kind: str,
+        sheet_names: List[str],
+        max_workers: int
+    ) -> Iterator[tuple]:
+        """
+        Parse sheets in a process pool and yield (sheet_name, rows) in workbook order.
+
+        Each worker opens the workbook once and parses whole sheets with the
+        same per-sheet logic as the in-process path. At most two sheets per
+        worker are in flight, so memory is bounded by the window rather than
+        the whole workbook.
+        """
+        workers = min(max_workers, len(sheet_names))
+        window = workers * 2
+        pending = deque()
+        remaining = iter(sheet_names)
+
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_sheet_worker,
+            initargs=(file_path,)
+        )
+        try:
+            for sheet_name in remaining:
+                pending.append((sheet_name, pool.submit(_parse_sheet_in_worker, kind, sheet_name)))
+                if len(pending) >= window:
+                    break
+
+            while pending:
+                sheet_name, future = pending.popleft()
+                rows = future.result()
+
+                next_sheet = next(remaining, None)
+                if next_sheet is not None:
+                    pending.append((next_sheet, pool.submit(_parse_sheet_in_worker, kind, next_sheet)))
+
+                yield sheet_name, rows
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _batch(sheet_name: str, sheet_index: int, sheet_count: int, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'sheet': sheet_name,
+            'sheet_index': sheet_index,
+            'sheet_count': sheet_count,
+            'rows': rows
+        }
+
     def _parse_inventory_sheet(
         self,
         sheet: Worksheet,
@@ -330,7 +464,14 @@ class BuzExcelParser:
         Returns:
             List of inventory item dicts
         """
-        items = []
+        return list(self._iter_inventory_sheet(sheet, default_group))
+
+    def _iter_inventory_sheet(
+        self,
+        sheet: Worksheet,
+        default_group: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield inventory item dicts from a single sheet."""
         header_row = None
         column_map = {}
 
@@ -349,9 +490,7 @@ class BuzExcelParser:
             # Parse data row
             item = self._parse_inventory_row(row, column_map, default_group)
             if item:
-                items.append(item)
-
-        return items
+                yield item
 
     def _parse_pricing_sheet(
         self,
@@ -368,7 +507,14 @@ class BuzExcelParser:
         Returns:
             List of pricing coefficient dicts
         """
-        coefficients = []
+        return list(self._iter_pricing_sheet(sheet, default_group))
+
+    def _iter_pricing_sheet(
+        self,
+        sheet: Worksheet,
+        default_group: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield pricing coefficient dicts from a single sheet."""
         header_row = None
         column_map = {}
 
@@ -387,9 +533,7 @@ class BuzExcelParser:
             # Parse data row
             coeff = self._parse_pricing_row(row, column_map, default_group)
             if coeff:
-                coefficients.append(coeff)
-
-        return coefficients
+                yield coeff
 
     def _looks_like_header(self, row: tuple, mapping: Dict[str, str]) -> bool:
         """Check if a row looks like a header based on known column names."""
@@ -639,5 +783,21 @@ class BuzExcelParser:
         return str(value).strip() if value else ''
 
 
+# Per-process state for parallel sheet parsing (see BuzExcelParser._iter_sheets_parallel)
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_sheet_worker(file_path: str):
+    """Process pool initializer: open the workbook once per worker."""
+    _worker_state['workbook'] = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    _worker_state['parser'] = BuzExcelParser()
+
+
+def _parse_sheet_in_worker(kind: str, sheet_name: str) -> List[Dict[str, Any]]:
+    """Parse one whole sheet inside a pool worker."""
+    sheet_parser = _worker_state['parser']._sheet_parser(kind)
+    return list(sheet_parser(_worker_state['workbook'][sheet_name], sheet_name))
+
+
 # Singleton instance
 parser = BuzExcelParser()
@@ -7,11 +7,11 @@ import logging
 import asyncio
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Callable
 
 from database.db import inventory_db
 from services.browser_service import BuzExportService, run_async
-from services.parser_service import parser
+from services.parser_service import parser, GroupCounter
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +33,51 @@ class SyncService:
         self.config = config
         self.db = inventory_db
 
+    def _stream_into_db(
+        self,
+        sync_id: int,
+        batches: Iterator[Dict[str, Any]],
+        upsert: Callable[[str, List[Dict[str, Any]]], Dict[str, Any]],
+        org_key: str,
+        groups: GroupCounter,
+        noun: str
+    ) -> Dict[str, Any]:
+        """
+        Upsert parsed batches as they come off the parser.
+
+        Only one batch is held in memory at a time. Progress (40-95%) is
+        reported after each batch is persisted, by sheet position.
+
+        Args:
+            sync_id: Sync log ID for progress updates
+            batches: Batches from parser.iter_*_batches()
+            upsert: Bulk upsert method taking (org_key, rows)
+            org_key: Organization key being synced
+            groups: Counter collecting per-group row counts
+            noun: What the rows are, for progress messages
+
+        Returns:
+            Dict with created/updated/unchanged/total counts and 'groups'
+        """
+        totals = {'created': 0, 'updated': 0, 'unchanged': 0, 'total': 0}
+
+        for batch in batches:
+            rows = batch['rows']
+            result = upsert(org_key, rows)
+            for key in totals:
+                totals[key] += result.get(key, 0)
+            groups.add(rows, batch['sheet'])
+
+            progress = 40 + int(55 * batch['sheet_index'] / batch['sheet_count'])
+            self.db.update_sync_progress(
+                sync_id,
+                progress,
+                f"Saved {totals['total']} {noun} "
+                f"(sheet {batch['sheet_index'] + 1}/{batch['sheet_count']}: {batch['sheet']})"
+            )
+
+        return {**totals, 'groups': groups.to_list()}
+
     def _do_inventory_sync(
         self,
         org_key: str,
@@ -84,26 +129,24 @@ class SyncService:
             file_path = export_result['file_path']
             self.db.update_sync_progress(sync_id, 40, 'Parsing Excel file...')
 
-            # Stage 2: Parse the exported file (40-70%)
-            parse_result = parser.parse_inventory_file(file_path)
-
-            if not parse_result['success']:
-                duration = time.time() - start_time
-                self.db.complete_sync(
-                    sync_id,
-                    item_count=0,
-                    status='failed',
-                    error_message=parse_result.get('error', 'Parse failed'),
-                    duration_seconds=duration
-                )
-                return parse_result
-
-            items = parse_result['items']
-            groups = parse_result['groups']
-            self.db.update_sync_progress(sync_id, 70, f'Parsed {len(items)} items from {len(groups)} groups')
+            # Stage 2: Stream parsed items into the database batch by batch (40-95%)
+            db_result = self._stream_into_db(
+                sync_id,
+                batches=parser.iter_inventory_batches(
+                    file_path,
+                    batch_size=self.config.sync_batch_size,
+                    max_workers=self.config.sync_parse_workers
+                ),
+                upsert=self.db.bulk_upsert_inventory_items,
+                org_key=org_key,
+                groups=GroupCounter('item_count'),
+                noun='items'
+            )
+            items_synced = db_result['total']
+            groups = db_result['groups']
 
-            # Stage 3: Update inventory groups in database (70-80%)
-            self.db.update_sync_progress(sync_id, 75, f'Updating {len(groups)} groups...')
+            # Stage 3: Update inventory groups in database
+            self.db.update_sync_progress(sync_id, 95, f'Updating {len(groups)} groups...')
             for group in groups:
                 group_code = group['group_code']
                 self.db.upsert_inventory_group(
@@ -114,17 +157,12 @@ class SyncService:
                     home_org=self.config.get_home_org(group_code)
                 )
 
-            # Stage 4: Bulk upsert items to database (80-100%)
-            self.db.update_sync_progress(sync_id, 80, f'Saving {len(items)} items to database...')
-            db_result = self.db.bulk_upsert_inventory_items(org_key, items)
-            self.db.update_sync_progress(sync_id, 95, 'Finalizing...')
-
             duration = time.time() - start_time
 
             # Complete sync log
             self.db.complete_sync(
                 sync_id,
-                item_count=len(items),
+                item_count=items_synced,
                 status='success',
                 duration_seconds=duration
             )
@@ -135,7 +173,7 @@ class SyncService:
                 entity_type='inventory',
                 entity_id=org_key,
                 org_key=org_key,
-                new_value=f'{len(items)} items synced',
+                new_value=f'{items_synced} items synced',
                 performed_by=performed_by
             )
 
@@ -145,15 +183,16 @@ class SyncService:
             except Exception:
                 pass
 
-            logger.info(f"Inventory sync completed for {org_key}: {len(items)} items in {duration:.1f}s")
+            logger.info(f"Inventory sync completed for {org_key}: {items_synced} items in {duration:.1f}s")
 
             return {
                 'success': True,
                 'org_key': org_key,
-                'items_synced': len(items),
+                'items_synced': items_synced,
                 'groups_synced': len(groups),
                 'created': db_result['created'],
                 'updated': db_result['updated'],
+                'unchanged': db_result['unchanged'],
                 'duration_seconds': duration
             }
 
@@ -258,26 +297,24 @@ class SyncService:
             file_path = export_result['file_path']
             self.db.update_sync_progress(sync_id, 40, 'Parsing Excel file...')
 
-            # Stage 2: Parse the exported file (40-70%)
-            parse_result = parser.parse_pricing_file(file_path)
-
-            if not parse_result['success']:
-                duration = time.time() - start_time
-                self.db.complete_sync(
-                    sync_id,
-                    item_count=0,
-                    status='failed',
-                    error_message=parse_result.get('error', 'Parse failed'),
-                    duration_seconds=duration
-                )
-                return parse_result
-
-            coefficients = parse_result['coefficients']
-            groups = parse_result['groups']
-            self.db.update_sync_progress(sync_id, 70, f'Parsed {len(coefficients)} coefficients from {len(groups)} groups')
+            # Stage 2: Stream parsed coefficients into the database batch by batch (40-95%)
+            db_result = self._stream_into_db(
+                sync_id,
+                batches=parser.iter_pricing_batches(
+                    file_path,
+                    batch_size=self.config.sync_batch_size,
+                    max_workers=self.config.sync_parse_workers
+                ),
+                upsert=self.db.bulk_upsert_pricing_coefficients,
+                org_key=org_key,
+                groups=GroupCounter('coefficient_count'),
+                noun='coefficients'
+            )
+            coefficients_synced = db_result['total']
+            groups = db_result['groups']
 
-            # Stage 3: Update pricing groups in database (70-80%)
-            self.db.update_sync_progress(sync_id, 75, f'Updating {len(groups)} groups...')
+            # Stage 3: Update pricing groups in database
+            self.db.update_sync_progress(sync_id, 95, f'Updating {len(groups)} groups...')
             for group in groups:
                 self.db.upsert_pricing_group(
                     org_key=org_key,
@@ -286,17 +323,12 @@ class SyncService:
                     coefficient_count=group.get('coefficient_count', 0)
                 )
 
-            # Stage 4: Bulk upsert coefficients to database (80-100%)
-            self.db.update_sync_progress(sync_id, 80, f'Saving {len(coefficients)} coefficients to database...')
-            db_result = self.db.bulk_upsert_pricing_coefficients(org_key, coefficients)
-            self.db.update_sync_progress(sync_id, 95, 'Finalizing...')
-
             duration = time.time() - start_time
 
             # Complete sync log
             self.db.complete_sync(
                 sync_id,
-                item_count=len(coefficients),
+                item_count=coefficients_synced,
                 status='success',
                 duration_seconds=duration
             )
@@ -307,7 +339,7 @@ class SyncService:
                 entity_type='pricing',
                 entity_id=org_key,
                 org_key=org_key,
-                new_value=f'{len(coefficients)} coefficients synced',
+                new_value=f'{coefficients_synced} coefficients synced',
                 performed_by=performed_by
             )
 
@@ -317,15 +349,16 @@ class SyncService:
             except Exception:
                 pass
 
-            logger.info(f"Pricing sync completed for {org_key}: {len(coefficients)} coefficients in {duration:.1f}s")
+            logger.info(f"Pricing sync completed for {org_key}: {coefficients_synced} coefficients in {duration:.1f}s")
 
             return {
                 'success': True,
                 'org_key': org_key,
-                'coefficients_synced': len(coefficients),
+                'coefficients_synced': coefficients_synced,
                 'groups_synced': len(groups),
                 'created': db_result['created'],
                 'updated': db_result['updated'],
+                'unchanged': db_result['unchanged'],
                 'duration_seconds': duration
             }
 
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential vs parallel parsing of a Buz export.
+
+Usage: python ivy/tools/benchmark_parser.py [--sheets 50] [--rows 2000] [--workers 1,2,4] [--file export.xlsx]
+
+Without --file, builds a synthetic inventory workbook (one sheet per group,
+Buz layout: title row then headers) and times parsing it with each worker
+count. Also checks every run produces the same items as the sequential one.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import openpyxl  # noqa: E402
+
+from services.parser_service import BuzExcelParser  # noqa: E402
+
+
+def build_workbook(path: Path, sheets: int, rows: int):
+    """Write a synthetic inventory export with `sheets` groups of `rows` items."""
+    wb = openpyxl.Workbook(write_only=True)
+    help_sheet = wb.create_sheet('Help')
+    help_sheet.append(['Instructions go here'])
+
+    for s in range(sheets):
+        group = f'GRP{s:03d}'
+        ws = wb.create_sheet(group)
+        ws.append([f'{group} Blinds - 28/11/2025'])
+        ws.append(['PkId', 'Code*', 'Description*', 'Price Grid Code', 'Cost Grid Code',
+                   'Supplier', 'Supplier Product Code', 'Min Qty', 'Max Qty', 'Active'])
+        for i in range(rows):
+            ws.append([i + 1, f'{group}-{i:05d}', f'{group} item {i}', f'PG{i % 20}', f'CG{i % 20}',
+                       'Acme', f'AC{i:05d}', 1, 100, 'Yes' if i % 10 else 'No'])
+
+    wb.save(path)
+
+
+def time_parse(file_path: str, workers: int):
+    """Parse the workbook once and return (seconds, items)."""
+    started = time.perf_counter()
+    result = BuzExcelParser().parse_inventory_file(file_path, max_workers=workers)
+    elapsed = time.perf_counter() - started
+    if not result['success']:
+        raise RuntimeError(result.get('error', 'Parse failed'))
+    return elapsed, result['items']
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark Buz export parsing')
+    arg_parser.add_argument('--sheets', type=int, default=50)
+    arg_parser.add_argument('--rows', type=int, default=2000, help='Rows per sheet')
+    arg_parser.add_argument('--workers', default=f'1,2,{os.cpu_count() or 1}',
+                            help='Comma-separated worker counts to try')
+    arg_parser.add_argument('--file', help='Parse this export instead of a synthetic one')
+    args = arg_parser.parse_args()
+
+    worker_counts = sorted({int(w) for w in args.workers.split(',')} | {1})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.file:
+            file_path = args.file
+        else:
+            file_path = str(Path(tmp) / 'synthetic_export.xlsx')
+            print(f"Building synthetic workbook: {args.sheets} sheets x {args.rows} rows...")
+            started = time.perf_counter()
+            build_workbook(Path(file_path), args.sheets, args.rows)
+            print(f"  Built in {time.perf_counter() - started:.1f}s "
+                  f"({os.path.getsize(file_path) / 1024 / 1024:.1f} MB)")
+
+        print(f"\nCPUs available: {os.cpu_count()}")
+        baseline_seconds, baseline_items = None, None
+        for workers in worker_counts:
+            seconds, items = time_parse(file_path, workers)
+            if baseline_items is None:
+                baseline_seconds, baseline_items = seconds, items
+                note = ''
+            else:
+                if items != baseline_items:
+                    print(f"  workers={workers}: OUTPUT DIFFERS from sequential parse")
+                    sys.exit(1)
+                note = f"  ({baseline_seconds / seconds:.2f}x)"
+            print(f"  workers={workers}: {len(items)} items in {seconds:.2f}s{note}")
+
+
+if __name__ == '__main__':
+    main()
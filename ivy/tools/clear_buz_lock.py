@@ -1,84 +1,57 @@
 #!/usr/bin/env python3
 """
-Clear stale Buz Playwright lock files.
+Clear stale Buz Playwright leases.
 
 Usage: python ivy/tools/clear_buz_lock.py [--force]
 
-Without --force, shows current lock status.
-With --force, clears the lock files.
+Without --force, shows current leases and queue per org.
+With --force, drops every lease and queued request (and any lock files
+left over from the old single file lock).
 """
 import sys
 from pathlib import Path
 
-# Find the lock files
-SECRETS_DIR = Path(__file__).parent.parent.parent / '.secrets'
-LOCK_PATH = SECRETS_DIR / 'buz_playwright.lock'
-INFO_PATH = SECRETS_DIR / 'buz_playwright.info'
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
+from shared.playwright.buz.lock import BuzPlaywrightLock  # noqa: E402
 
-def get_lock_status():
-    """Get current lock status."""
-    info = None
-    if INFO_PATH.exists():
-        try:
-            import json
-            info = json.loads(INFO_PATH.read_text())
-        except Exception:
-            info = {'error': 'Could not read info file'}
-
-    return {
-        'lock_exists': LOCK_PATH.exists(),
-        'info_exists': INFO_PATH.exists(),
-        'holder_info': info
-    }
-
-
-def clear_lock():
-    """Clear the lock files."""
-    cleared = []
-    if LOCK_PATH.exists():
-        LOCK_PATH.unlink()
-        cleared.append(str(LOCK_PATH))
-    if INFO_PATH.exists():
-        INFO_PATH.unlink()
-        cleared.append(str(INFO_PATH))
-    return cleared
+# Files left behind by the previous file-based lock
+SECRETS_DIR = PROJECT_ROOT / '.secrets'
+LEGACY_PATHS = [SECRETS_DIR / 'buz_playwright.lock', SECRETS_DIR / 'buz_playwright.info']
 
 
 def main():
     force = '--force' in sys.argv
 
-    status = get_lock_status()
+    lock = BuzPlaywrightLock()
+    status = lock.get_lock_status()
+    legacy = [path for path in LEGACY_PATHS if path.exists()]
 
-    if not status['lock_exists'] and not status['info_exists']:
-        print("No lock files found - lock is clear.")
+    if not status['active_leases'] and not status['queue_depth'] and not legacy:
+        print("No leases held or queued - lock is clear.")
         return
 
     print("Current lock status:")
-    print(f"  Lock file: {'EXISTS' if status['lock_exists'] else 'not present'}")
-    print(f"  Info file: {'EXISTS' if status['info_exists'] else 'not present'}")
-
-    if status['holder_info']:
-        info = status['holder_info']
-        if 'error' in info:
-            print(f"  Holder: {info['error']}")
-        else:
-            print(f"  Holder: {info.get('bot', 'unknown')}")
-            print(f"  Acquired: {info.get('acquired_at', 'unknown')}")
-            print(f"  PID: {info.get('pid', 'unknown')}")
+    for org_key, entry in sorted(status['orgs'].items()):
+        print(f"  {org_key}: {entry['active']} active, {entry['queued']} queued")
+        for holder in entry['holders']:
+            print(f"    Holder: {holder.get('bot', 'unknown')} "
+                  f"(since {holder.get('acquired_at', 'unknown')}, PID {holder.get('pid', 'unknown')})")
+    for path in legacy:
+        print(f"  Legacy lock file: {path}")
 
     if not force:
         print("\nTo clear the lock, run with --force")
         return
 
-    print("\nClearing lock files...")
-    cleared = clear_lock()
-    if cleared:
-        for f in cleared:
-            print(f"  Removed: {f}")
-        print("Lock cleared.")
-    else:
-        print("No files to clear.")
+    print("\nClearing leases...")
+    removed = lock.clear()
+    print(f"  Removed {removed} lease(s)/queued request(s)")
+    for path in legacy:
+        path.unlink()
+        print(f"  Removed: {path}")
+    print("Lock cleared.")
 
 
 if __name__ == '__main__':
@@ -185,8 +185,8 @@ def trigger_sync(org_key: str, sync_type: str):
             return redirect(url_for('web.sync_page'))
 
         # Check lock availability immediately for manual runs
-        if not is_lock_available():
-            holder_info = get_lock_holder_info()
+        if not is_lock_available(org_key):
+            holder_info = get_lock_holder_info(org_key)
             holder = holder_info.get('bot', 'another process') if holder_info else 'another process'
             flash(f'Buz is busy (used by {holder}). Please try again later.', 'warning')
             return redirect(url_for('web.sync_page'))
@@ -207,8 +207,8 @@ def trigger_sync(org_key: str, sync_type: str):
             return redirect(url_for('web.sync_page'))
 
         # Check lock availability immediately for manual runs
-        if not is_lock_available():
-            holder_info = get_lock_holder_info()
+        if not is_lock_available(org_key):
+            holder_info = get_lock_holder_info(org_key)
             holder = holder_info.get('bot', 'another process') if holder_info else 'another process'
             flash(f'Buz is busy (used by {holder}). Please try again later.', 'warning')
             return redirect(url_for('web.sync_page'))
@@ -230,8 +230,8 @@ def trigger_sync(org_key: str, sync_type: str):
             return redirect(url_for('web.sync_page'))
 
         # Check lock availability immediately for manual runs
-        if not is_lock_available():
-            holder_info = get_lock_holder_info()
+        if not is_lock_available(org_key):
+            holder_info = get_lock_holder_info(org_key)
             holder = holder_info.get('bot', 'another process') if holder_info else 'another process'
             flash(f'Buz is busy (used by {holder}). Please try again later.', 'warning')
             return redirect(url_for('web.sync_page'))
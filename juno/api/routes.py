@@ -11,13 +11,15 @@ ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from flask import Blueprint, request, jsonify
-import requests
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+import json
+import time
 import logging
 
 from juno.config import config
 from juno.database.db import db
-from shared.http_client import BotHttpClient
+from juno.services.location_cache import location_cache
+from juno.services.view_counter import view_counter
 
 logger = logging.getLogger(__name__)
 
@@ -144,11 +146,30 @@ def get_tracking_link(code: str):
         }), 500
 
 
+def _link_location(link: dict) -> dict:
+    """
+    Location payload for a tracking link.
+
+    Ended links get their status; active links get the staff member's
+    location from the shared cache (one Travis call per staff member per
+    travis.location_cache_seconds, however many customers are watching).
+    """
+    if link['status'] != 'active':
+        return {
+            'success': False,
+            'shareable': False,
+            'status': link['status'],
+            'message': f"Tracking session has ended ({link['status']})"
+        }
+    return location_cache.get(link['staff_id'])
+
+
 @api_bp.route('/tracking-links/<code>/location', methods=['GET'])
 def get_tracking_location(code: str):
     """
     Get current location for a tracking link.
-    This calls Travis to get the privacy-aware location.
+    This calls Travis (via a short-lived shared cache) to get the
+    privacy-aware location.
 
     Response JSON (when in transit):
         {
@@ -178,44 +199,11 @@ def get_tracking_location(code: str):
                 'error': 'Tracking link not found'
             }), 404
 
-        # Check if link is still active
-        if link['status'] != 'active':
-            return jsonify({
-                'success': False,
-                'shareable': False,
-                'status': link['status'],
-                'message': f"Tracking session has ended ({link['status']})"
-            }), 200
-
-        # Record the view
-        db.record_view(code)
-
-        # Call Travis to get location
-        try:
-            travis = BotHttpClient(config.travis_base_url, timeout=5)
-            response = travis.get(f"/api/location/{link['staff_id']}")
-
-            if response.status_code == 200:
-                location_data = response.json()
-                return jsonify({
-                    'success': True,
-                    **location_data
-                }), 200
-            else:
-                logger.warning(f"Travis returned {response.status_code} for staff {link['staff_id']}")
-                return jsonify({
-                    'success': False,
-                    'shareable': False,
-                    'message': 'Location temporarily unavailable'
-                }), 200
-
-        except requests.RequestException as e:
-            logger.error(f"Failed to contact Travis: {e}")
-            return jsonify({
-                'success': False,
-                'shareable': False,
-                'message': 'Location service temporarily unavailable'
-            }), 200
+        # Record the view (written in batches)
+        if link['status'] == 'active':
+            view_counter.record(code)
+
+        return jsonify(_link_location(link)), 200
 
     except Exception as e:
         logger.error(f"Get tracking location error: {e}", exc_info=True)
@@ -225,6 +213,68 @@ def get_tracking_location(code: str):
         }), 500
 
 
+@api_bp.route('/tracking-links/<code>/stream', methods=['GET'])
+def stream_tracking_location(code: str):
+    """
+    Stream the location for a tracking link as server-sent events.
+    Used by the tracking page instead of polling the location endpoint.
+
+    Sends a "location" event (same JSON as /location) whenever the
+    location or status changes, checking every live_updates.interval
+    seconds, and an "ended" event when the link is no longer active.
+    Streams close after live_updates.stream_max_seconds; browsers'
+    EventSource reconnects on its own.
+
+    Off by default: each stream holds a worker for its whole life, so this
+    needs a threaded or async worker and a stream_max_seconds below the
+    worker timeout.
+    """
+    if not config.live_updates_enabled:
+        return jsonify({
+            'success': False,
+            'error': 'Live updates are disabled'
+        }), 404
+
+    link = db.get_tracking_link_by_code(code)
+    if not link:
+        return jsonify({
+            'success': False,
+            'error': 'Tracking link not found'
+        }), 404
+
+    if link['status'] == 'active':
+        view_counter.record(code)
+
+    def stream(link):
+        started = time.monotonic()
+        last_payload = None
+        yield f"retry: {int(config.live_update_interval * 1000)}\n\n"
+
+        while True:
+            payload = _link_location(link)
+            if link['status'] != 'active':
+                yield f"event: ended\ndata: {json.dumps(payload, default=str)}\n\n"
+                return
+
+            if payload != last_payload:
+                yield f"event: location\ndata: {json.dumps(payload, default=str)}\n\n"
+                last_payload = payload
+            else:
+                yield ": keepalive\n\n"
+
+            if time.monotonic() - started >= config.live_stream_max_seconds:
+                return
+            time.sleep(config.live_update_interval)
+
+            link = db.get_tracking_link_by_code(code) or {**link, 'status': 'expired'}
+
+    return Response(
+        stream_with_context(stream(link)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @api_bp.route('/tracking-links/<code>/arrived', methods=['PUT'])
 def mark_arrived(code: str):
     """
@@ -338,6 +388,7 @@ def intro():
             'Generate unique tracking links for customers',
             'Serve customer-facing map tracking page',
             'Display real-time location when staff is in transit',
+            'Stream live location updates to tracking pages',
             'Respect privacy - only shows "with previous customer" when appropriate',
             'Auto-expire tracking links after delivery'
         ],
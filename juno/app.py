@@ -12,6 +12,7 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 import os
+import atexit
 import logging
 from flask import Flask, jsonify
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -20,6 +21,8 @@ from juno.config import config
 from juno.api.routes import api_bp
 from juno.web.routes import web_bp
 from juno.web.auth_routes import auth_bp
+from juno.services.location_cache import location_cache
+from juno.services.view_counter import view_counter
 from shared.auth import GatewayAuth
 from shared.error_handlers import register_error_handlers
 
@@ -63,6 +66,15 @@ app.register_blueprint(web_bp, url_prefix='/')
 # Register error handlers
 register_error_handlers(app, logger)
 
+# Start the view counter (writes aggregated view counts periodically)
+view_counter.start()
+
+
+@atexit.register
+def shutdown_view_counter():
+    """Write any pending view counts on shutdown"""
+    view_counter.stop()
+
 
 @app.route('/health')
 def health():
@@ -70,7 +82,8 @@ def health():
     return jsonify({
         'status': 'healthy',
         'bot': config.name,
-        'version': config.version
+        'version': config.version,
+        'location_cache': location_cache.get_stats()
     })
 
 
@@ -91,6 +104,7 @@ def info():
                 'GET /api/tracking-links': 'List active tracking links',
                 'GET /api/tracking-links/<code>': 'Get tracking link details',
                 'GET /api/tracking-links/<code>/location': 'Get current location',
+                'GET /api/tracking-links/<code>/stream': 'Stream location updates (server-sent events)',
                 'PUT /api/tracking-links/<code>/arrived': 'Mark as arrived',
                 'PUT /api/tracking-links/<code>/cancel': 'Cancel tracking link'
             },
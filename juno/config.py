@@ -59,6 +59,17 @@ class Config:
         travis = data.get("travis", {}) or {}
         self.travis_base_url = travis.get("base_url", "http://localhost:8021")
         self.poll_interval = travis.get("poll_interval", 10)
+        self.location_cache_seconds = travis.get("location_cache_seconds", 5)
+
+        # ── Live updates (server-sent events) ─────────────────
+        live = data.get("live_updates", {}) or {}
+        self.live_updates_enabled = live.get("enabled", False)
+        self.live_update_interval = live.get("interval", 5)
+        self.live_stream_max_seconds = live.get("stream_max_seconds", 60)
+
+        # ── View counting ─────────────────────────────────────
+        views = data.get("views", {}) or {}
+        self.view_flush_interval = views.get("flush_interval", 30)
 
         # ── Map settings ──────────────────────────────────────
         map_config = data.get("map", {}) or {}
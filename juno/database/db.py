@@ -179,40 +179,56 @@ class Database:
         Returns:
             True if recorded, False if link not found
         """
+        return self.record_views({code: 1}) > 0
+
+    def record_views(self, counts: Dict[str, int]) -> int:
+        """
+        Add aggregated view counts to tracking links in one transaction
+
+        Sets first_viewed_at on links seeing their first view and logs one
+        'viewed' event per link with the number of views it covers.
+
+        Args:
+            counts: Tracking code -> views since the last call
+
+        Returns:
+            Number of links updated (unknown codes are skipped)
+        """
+        counts = {code: n for code, n in counts.items() if n > 0}
+        if not counts:
+            return 0
+
         conn = self.get_connection()
         try:
-            # Get link
+            placeholders = ', '.join('?' * len(counts))
             cursor = conn.execute(
-                "SELECT id, first_viewed_at FROM tracking_links WHERE code = ?",
-                (code,)
+                f"""SELECT id, code, first_viewed_at FROM tracking_links
+                    WHERE code IN ({placeholders})""",
+                list(counts)
             )
-            row = cursor.fetchone()
-            if not row:
-                return False
-
-            link_id = row['id']
-            first_view = row['first_viewed_at']
+            links = cursor.fetchall()
 
-            # Update view count and first_viewed_at if needed
-            if first_view is None:
-                conn.execute(
+            with conn:
+                conn.executemany(
                     """UPDATE tracking_links
-                       SET view_count = view_count + 1, first_viewed_at = CURRENT_TIMESTAMP
+                       SET view_count = view_count + ?,
+                           first_viewed_at = COALESCE(first_viewed_at, CURRENT_TIMESTAMP)
                        WHERE id = ?""",
-                    (link_id,)
+                    [(counts[link['code']], link['id']) for link in links]
                 )
-            else:
-                conn.execute(
-                    "UPDATE tracking_links SET view_count = view_count + 1 WHERE id = ?",
-                    (link_id,)
+                conn.executemany(
+                    """INSERT INTO tracking_events (tracking_link_id, event_type, event_data)
+                       VALUES (?, 'viewed', ?)""",
+                    [
+                        (link['id'], json.dumps({
+                            'first_view': link['first_viewed_at'] is None,
+                            'views': counts[link['code']]
+                        }))
+                        for link in links
+                    ]
                 )
 
-            conn.commit()
-
-            # Log view event
-            self._log_event(conn, link_id, 'viewed', {'first_view': first_view is None})
-
-            return True
+            return len(links)
         finally:
             conn.close()
 
@@ -0,0 +1,139 @@
+"""Shared, short-lived cache of staff locations fetched from Travis.
+
+Several customers can be watching the same installer, and each of their
+browsers asks for the location every few seconds. Entries are cached per
+staff member for ttl_seconds, and concurrent requests for a stale entry
+wait on a single upstream fetch instead of each calling Travis.
+"""
+import time
+import threading
+import logging
+from typing import Optional, Dict, Any, Tuple
+
+import requests
+
+from juno.config import config
+from shared.http_client import BotHttpClient
+
+logger = logging.getLogger(__name__)
+
+
+class LocationCache:
+    """Per-staff location cache with request coalescing."""
+
+    def __init__(self, base_url: str, ttl_seconds: float = 5, timeout: float = 5):
+        """
+        Initialize the cache.
+
+        Args:
+            base_url: Travis base URL
+            ttl_seconds: How long a fetched location is served before refetching
+            timeout: Travis request timeout in seconds
+        """
+        self.base_url = base_url
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+
+        self._client: Optional[BotHttpClient] = None
+        # staff_id -> (expires_at, payload)
+        self._entries: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        # staff_id -> event set when the in-flight fetch finishes
+        self._inflight: Dict[int, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.upstream_fetches = 0
+
+    def get(self, staff_id: int) -> Dict[str, Any]:
+        """
+        Get a staff member's location payload, fetching from Travis if stale.
+
+        Returns:
+            Response payload for the tracking API (success, shareable, ...)
+        """
+        with self._lock:
+            entry = self._entries.get(staff_id)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return dict(entry[1])
+
+            event = self._inflight.get(staff_id)
+            leader = event is None
+            if leader:
+                event = threading.Event()
+                self._inflight[staff_id] = event
+
+        if not leader:
+            # Someone else is already asking Travis - share their answer
+            event.wait(self.timeout + 1)
+            with self._lock:
+                entry = self._entries.get(staff_id)
+                self.hits += 1
+            if entry:
+                return dict(entry[1])
+            return self._unavailable('Location temporarily unavailable')
+
+        try:
+            payload = self._fetch(staff_id)
+        except Exception as e:
+            logger.error(f"Location fetch for staff {staff_id} failed: {e}", exc_info=True)
+            payload = self._unavailable('Location temporarily unavailable')
+
+        with self._lock:
+            self._entries[staff_id] = (time.monotonic() + self.ttl_seconds, payload)
+            self._inflight.pop(staff_id, None)
+            self.upstream_fetches += 1
+        event.set()
+        return dict(payload)
+
+    def invalidate(self, staff_id: int):
+        """Drop a staff member's cached location."""
+        with self._lock:
+            self._entries.pop(staff_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters, for health endpoints."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'upstream_fetches': self.upstream_fetches,
+                'ttl_seconds': self.ttl_seconds,
+            }
+
+    def _get_client(self) -> BotHttpClient:
+        if self._client is None:
+            self._client = BotHttpClient(self.base_url, timeout=self.timeout)
+        return self._client
+
+    def _fetch(self, staff_id: int) -> Dict[str, Any]:
+        """Ask Travis for a staff member's privacy-aware location."""
+        try:
+            response = self._get_client().get(f"/api/location/{staff_id}")
+        except requests.RequestException as e:
+            logger.error(f"Failed to contact Travis: {e}")
+            return self._unavailable('Location service temporarily unavailable')
+
+        if response.status_code == 200:
+            return {
+                'success': True,
+                **response.json()
+            }
+
+        logger.warning(f"Travis returned {response.status_code} for staff {staff_id}")
+        return self._unavailable('Location temporarily unavailable')
+
+    @staticmethod
+    def _unavailable(message: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'shareable': False,
+            'message': message
+        }
+
+
+# Global cache instance
+location_cache = LocationCache(
+    config.travis_base_url,
+    ttl_seconds=config.location_cache_seconds
+)
@@ -0,0 +1,120 @@
+"""Aggregated tracking link view counts for Juno.
+
+Counting a view used to mean a read, an update, a commit and an event row
+on every location poll. Views are now counted in memory and a background
+thread adds them to tracking_links in one transaction every
+flush_interval seconds.
+"""
+import threading
+import logging
+from typing import Optional, Dict
+
+from juno.config import config
+from juno.database.db import db
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Counts tracking link views in memory and flushes them periodically."""
+
+    def __init__(self, database=None, flush_interval: float = 30):
+        """
+        Initialize the counter.
+
+        Args:
+            database: Database to flush to (defaults to the global db)
+            flush_interval: Seconds between flushes
+        """
+        self.db = database or db
+        self.flush_interval = flush_interval
+
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._running = False
+
+    def start(self):
+        """Start the background flush thread."""
+        if self._running:
+            logger.warning("View counter already running")
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._running = True
+        logger.info(f"View counter started (flushing every {self.flush_interval}s)")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flush thread and write any pending counts."""
+        if not self._running:
+            return
+
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning("View counter thread did not stop cleanly")
+
+        self._running = False
+        self.flush()
+        logger.info("View counter stopped")
+
+    def is_running(self) -> bool:
+        """Check if the counter is running."""
+        return self._running and self._thread and self._thread.is_alive()
+
+    def record(self, code: str):
+        """
+        Count a view of a tracking link.
+
+        Written straight away when the counter isn't running (scripts, tests).
+        """
+        if not self.is_running():
+            self.db.record_views({code: 1})
+            return
+
+        with self._lock:
+            self._counts[code] = self._counts.get(code, 0) + 1
+
+    def pending(self) -> Dict[str, int]:
+        """Views counted but not yet written, by code."""
+        with self._lock:
+            return dict(self._counts)
+
+    def flush(self) -> int:
+        """
+        Write pending counts.
+
+        Returns:
+            Number of views written
+        """
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return 0
+
+        try:
+            self.db.record_views(counts)
+        except Exception:
+            # Put them back so the next flush retries
+            with self._lock:
+                for code, count in counts.items():
+                    self._counts[code] = self._counts.get(code, 0) + count
+            raise
+        return sum(counts.values())
+
+    def _run(self):
+        """Flush loop."""
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception(f"Error flushing view counts: {e}")
+
+
+# Global counter instance
+view_counter = ViewCounter(flush_interval=config.view_flush_interval)
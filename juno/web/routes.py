@@ -18,6 +18,7 @@ import logging
 from juno.config import config
 from juno.database.db import db
 from juno.services.auth import login_required
+from juno.services.view_counter import view_counter
 
 logger = logging.getLogger(__name__)
 
@@ -115,8 +116,8 @@ def track(code: str):
             customer_name=link.get('customer_name', 'there')
         )
 
-    # Record the view
-    db.record_view(code)
+    # Record the view (written in batches)
+    view_counter.record(code)
 
     # Active link - show tracking page
     return render_template(
@@ -129,6 +130,7 @@ def track(code: str):
         destination_lng=link.get('destination_lng') or config.default_lng,
         default_zoom=config.default_zoom,
         poll_interval=config.poll_interval * 1000,  # Convert to milliseconds
+        live_updates=config.live_updates_enabled,
         google_maps_api_key=config.google_maps_api_key or ''
     )
 
@@ -42,7 +42,7 @@ def intro():
             'Get changed products since timestamp'
         ],
         'endpoints': {
-            'POST /api/sync/run': 'Trigger a full product sync',
+            'POST /api/sync/run': 'Trigger a product sync (?mode=auto|full|delta)',
             'GET /api/sync/status': 'Get current sync status',
             'GET /api/sync/history': 'Get sync history',
             'GET /api/products': 'Get a product by code (?code=XXX)',
@@ -60,15 +60,25 @@ def intro():
 @api_key_required
 def run_sync():
     """
-    Trigger a full products sync from Unleashed.
+    Trigger a products sync from Unleashed.
+
+    Query/body parameters:
+        mode (optional): 'auto' (default) pulls only products modified since
+            the last successful sync, with a periodic full reconcile;
+            'full' forces a full pull; 'delta' forces a modified-since pull
 
     Runs asynchronously - returns 202 Accepted immediately.
     Use GET /api/sync/status to check progress.
 
     If a sync is already running, returns 409 Conflict.
     """
+    data = request.get_json(silent=True) or {}
+    mode = request.args.get('mode') or data.get('mode') or 'auto'
+    if mode not in ('auto', 'full', 'delta'):
+        return jsonify({'error': f"Invalid mode '{mode}' (expected auto, full or delta)"}), 400
+
     try:
-        result = sync_service.run_product_sync_async()
+        result = sync_service.run_product_sync_async(mode)
 
         if result['status'] == 'conflict':
             return jsonify(result), 409
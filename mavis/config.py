@@ -45,6 +45,8 @@ class Config:
         )
         self.unleashed_page_size = unleashed_config.get("page_size", 200)
         self.unleashed_timeout = unleashed_config.get("timeout", 30)
+        self.unleashed_max_concurrency = unleashed_config.get("max_concurrency", 4)
+        self.unleashed_requests_per_second = unleashed_config.get("requests_per_second", 4)
 
         # Unleashed credentials (from environment only - never in config)
         self.unleashed_api_id = os.environ.get("UNLEASHED_API_ID")
@@ -56,6 +58,11 @@ class Config:
         # ── Sync config (from YAML) ──────────────────────────
         sync_config = data.get("sync", {}) or {}
         self.sync_product_fields = sync_config.get("product_fields", [])
+        self.sync_resume_max_age_minutes = sync_config.get("resume_max_age_minutes", 60)
+        self.sync_delta_overlap_minutes = sync_config.get("delta_overlap_minutes", 5)
+        self.sync_full_reconcile_hours = sync_config.get("full_reconcile_hours", 24)
+        self.sync_reconcile_max_delete_percent = sync_config.get("reconcile_max_delete_percent", 10)
+        self.sync_chunk_size = sync_config.get("chunk_size", 500)
 
         # ── Secrets / env-specific settings ────────────────────
 
@@ -1,4 +1,5 @@
 import sqlite3
+import hashlib
 import json
 from pathlib import Path
 from datetime import datetime, timezone
@@ -67,6 +68,26 @@ class Database:
             return ""
         return code.strip().upper()
 
+    def _product_values(self, product_data: Dict[str, Any]) -> tuple:
+        """Stored column values for a product (description through raw_payload)"""
+        return (
+            product_data.get('product_description'),
+            product_data.get('product_group'),
+            product_data.get('product_sub_group'),
+            product_data.get('default_sell_price'),
+            product_data.get('sell_price_tier_9'),
+            product_data.get('unit_of_measure'),
+            product_data.get('width'),
+            1 if product_data.get('is_sellable', True) else 0,
+            1 if product_data.get('is_obsolete', False) else 0,
+            product_data.get('raw_payload'),
+        )
+
+    def product_fingerprint(self, product_data: Dict[str, Any]) -> str:
+        """Hash of everything we store for a product (to skip unchanged rows)"""
+        values = self._product_values(product_data)
+        return hashlib.sha1(json.dumps(values, default=str).encode('utf-8')).hexdigest()
+
     def upsert_product(self, product_data: Dict[str, Any]) -> tuple:
         """
         Insert or update a product.
@@ -77,6 +98,8 @@ class Database:
             raise ValueError("Product code is required")
 
         now = utc_now_iso()
+        values = self._product_values(product_data)
+        content_hash = self.product_fingerprint(product_data)
 
         with self.connection() as conn:
             cursor = conn.cursor()
@@ -102,22 +125,11 @@ class Database:
                         is_sellable = ?,
                         is_obsolete = ?,
                         raw_payload = ?,
-                        updated_at = ?
+                        updated_at = ?,
+                        last_seen_at = ?,
+                        content_hash = ?
                     WHERE product_code = ?
-                """, (
-                    product_data.get('product_description'),
-                    product_data.get('product_group'),
-                    product_data.get('product_sub_group'),
-                    product_data.get('default_sell_price'),
-                    product_data.get('sell_price_tier_9'),
-                    product_data.get('unit_of_measure'),
-                    product_data.get('width'),
-                    1 if product_data.get('is_sellable', True) else 0,
-                    1 if product_data.get('is_obsolete', False) else 0,
-                    product_data.get('raw_payload'),
-                    now,
-                    code
-                ))
+                """, values + (now, now, content_hash, code))
                 return (existing['id'], False)
             else:
                 # Insert new product
@@ -126,105 +138,128 @@ class Database:
                         product_code, product_description, product_group, product_sub_group,
                         default_sell_price, sell_price_tier_9,
                         unit_of_measure, width, is_sellable, is_obsolete,
-                        raw_payload, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    code,
-                    product_data.get('product_description'),
-                    product_data.get('product_group'),
-                    product_data.get('product_sub_group'),
-                    product_data.get('default_sell_price'),
-                    product_data.get('sell_price_tier_9'),
-                    product_data.get('unit_of_measure'),
-                    product_data.get('width'),
-                    1 if product_data.get('is_sellable', True) else 0,
-                    1 if product_data.get('is_obsolete', False) else 0,
-                    product_data.get('raw_payload'),
-                    now,
-                    now
-                ))
+                        raw_payload, created_at, updated_at, last_seen_at, content_hash
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (code,) + values + (now, now, now, content_hash))
                 return (cursor.lastrowid, True)
 
-    def batch_upsert_products(self, products: List[Dict[str, Any]], progress_callback=None) -> Dict[str, int]:
+    def upsert_products_chunk(self, products: List[Dict[str, Any]]) -> Dict[str, int]:
         """
-        Batch insert/update products with commits every 500 records.
-        Commits frequently to avoid database locking issues.
+        Insert/update a chunk of products in a single transaction.
+
+        Products whose fingerprint matches the stored content_hash aren't
+        rewritten (only their last_seen_at is bumped, for full-sync
+        reconciles), so updated_at only moves when something really changed.
+        If a code appears more than once, the last one wins.
 
         Args:
             products: List of product data dicts
-            progress_callback: Optional callback(processed, created, updated) for progress updates
 
         Returns:
-            Dict with 'created' and 'updated' counts
+            Dict with 'created', 'updated' and 'unchanged' counts
         """
-        if not products:
-            return {'created': 0, 'updated': 0}
-
-        now = utc_now_iso()
-
-        # Get existing product codes first (separate transaction)
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT product_code FROM unleashed_products")
-        existing_codes = set(row[0] for row in cursor.fetchall())
-        conn.close()
-
-        created = 0
-        updated = 0
+        rows = {}
+        for product_data in products:
+            code = self.normalize_product_code(product_data.get('product_code', ''))
+            if not code:
+                continue
+            rows[code] = (self._product_values(product_data), self.product_fingerprint(product_data))
 
-        # Process in batches of 500, committing each batch
-        batch_size = 500
-        for i in range(0, len(products), batch_size):
-            batch = products[i:i + batch_size]
-
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            for product_data in batch:
-                code = self.normalize_product_code(product_data.get('product_code', ''))
-                if not code:
-                    continue
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0}
+        if not rows:
+            return counts
 
-                is_new = code not in existing_codes
+        now = utc_now_iso()
+        codes = list(rows)
 
-                cursor.execute("""
-                    INSERT OR REPLACE INTO unleashed_products (
+        with self.connection() as conn:
+            # Stored fingerprints for this chunk (IN lists kept well under
+            # SQLite's variable limit)
+            existing = {}
+            for i in range(0, len(codes), 500):
+                part = codes[i:i + 500]
+                placeholders = ','.join('?' * len(part))
+                cursor = conn.execute(
+                    f"SELECT product_code, content_hash FROM unleashed_products WHERE product_code IN ({placeholders})",
+                    part
+                )
+                existing.update((row['product_code'], row['content_hash']) for row in cursor.fetchall())
+
+            unchanged = []
+            changed = []
+            for code, (values, content_hash) in rows.items():
+                if code in existing and existing[code] == content_hash:
+                    unchanged.append((now, code))
+                else:
+                    changed.append((code,) + values + (now, now, now, content_hash))
+                    if code in existing:
+                        counts['updated'] += 1
+                    else:
+                        counts['created'] += 1
+            counts['unchanged'] = len(unchanged)
+
+            if unchanged:
+                conn.executemany(
+                    "UPDATE unleashed_products SET last_seen_at = ? WHERE product_code = ?",
+                    unchanged
+                )
+            if changed:
+                conn.executemany("""
+                    INSERT INTO unleashed_products (
                         product_code, product_description, product_group, product_sub_group,
                         default_sell_price, sell_price_tier_9,
                         unit_of_measure, width, is_sellable, is_obsolete,
-                        raw_payload, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    code,
-                    product_data.get('product_description'),
-                    product_data.get('product_group'),
-                    product_data.get('product_sub_group'),
-                    product_data.get('default_sell_price'),
-                    product_data.get('sell_price_tier_9'),
-                    product_data.get('unit_of_measure'),
-                    product_data.get('width'),
-                    1 if product_data.get('is_sellable', True) else 0,
-                    1 if product_data.get('is_obsolete', False) else 0,
-                    product_data.get('raw_payload'),
-                    now,
-                    now
-                ))
-
-                if is_new:
-                    created += 1
-                    existing_codes.add(code)
-                else:
-                    updated += 1
+                        raw_payload, created_at, updated_at, last_seen_at, content_hash
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(product_code) DO UPDATE SET
+                        product_description = excluded.product_description,
+                        product_group = excluded.product_group,
+                        product_sub_group = excluded.product_sub_group,
+                        default_sell_price = excluded.default_sell_price,
+                        sell_price_tier_9 = excluded.sell_price_tier_9,
+                        unit_of_measure = excluded.unit_of_measure,
+                        width = excluded.width,
+                        is_sellable = excluded.is_sellable,
+                        is_obsolete = excluded.is_obsolete,
+                        raw_payload = excluded.raw_payload,
+                        updated_at = excluded.updated_at,
+                        last_seen_at = excluded.last_seen_at,
+                        content_hash = excluded.content_hash
+                """, changed)
+
+        return counts
+
+    def batch_upsert_products(
+        self,
+        products: List[Dict[str, Any]],
+        progress_callback=None,
+        batch_size: int = 500
+    ) -> Dict[str, int]:
+        """
+        Batch insert/update products, one transaction per batch_size records.
+        Commits per batch to avoid holding the write lock for long.
 
-            # Commit this batch and close connection
-            conn.commit()
-            conn.close()
+        Args:
+            products: List of product data dicts
+            progress_callback: Optional callback(processed, created, updated) for progress updates
+            batch_size: Products per transaction
+
+        Returns:
+            Dict with 'created', 'updated' and 'unchanged' counts
+        """
+        totals = {'created': 0, 'updated': 0, 'unchanged': 0}
+
+        for i in range(0, len(products), batch_size):
+            counts = self.upsert_products_chunk(products[i:i + batch_size])
+            for key in totals:
+                totals[key] += counts[key]
 
             # Call progress callback after each batch (outside transaction)
             if progress_callback:
-                progress_callback(created + updated, created, updated)
+                processed = sum(totals.values())
+                progress_callback(processed, totals['created'], totals['updated'])
 
-        return {'created': created, 'updated': updated}
+        return totals
 
     def get_product_by_code(self, code: str) -> Optional[Dict]:
         """Get a product by its code"""
@@ -327,6 +362,32 @@ class Database:
         conn.close()
         return count
 
+    def count_products_not_seen_since(self, timestamp: str) -> int:
+        """Count products no sync has written since the given timestamp"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM unleashed_products WHERE COALESCE(last_seen_at, updated_at) < ?",
+            (timestamp,)
+        )
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+
+    def delete_products_not_seen_since(self, timestamp: str) -> int:
+        """
+        Delete products no sync has written since the given timestamp.
+
+        Used after a full sync: anything the full pull didn't return has been
+        deleted in Unleashed. Returns the number of products removed.
+        """
+        with self.connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM unleashed_products WHERE COALESCE(last_seen_at, updated_at) < ?",
+                (timestamp,)
+            )
+            return cursor.rowcount
+
     def get_valid_fabric_products(self) -> List[Dict]:
         """
         Get all valid fabric products.
@@ -373,18 +434,152 @@ class Database:
     # Sync Metadata Operations
     # ─────────────────────────────────────────────────────────────
 
-    def create_sync_record(self, sync_type: str) -> int:
-        """Create a new sync record, returns the ID"""
+    def create_sync_record(
+        self,
+        sync_type: str,
+        resume_from: Optional[Dict] = None,
+        sync_mode: str = 'full',
+        modified_since: str = None
+    ) -> int:
+        """
+        Create a new sync record, returns the ID.
+
+        Args:
+            sync_type: e.g. 'products'
+            resume_from: A failed sync record (from get_resumable_sync) whose
+                page checkpoints this sync carries on from. Its sync_mode and
+                modified_since are used instead of the arguments, since the
+                checkpointed pages only make sense for the same query.
+            sync_mode: 'full' or 'delta'
+            modified_since: For delta syncs, the modifiedSince sent to Unleashed
+        """
         now = utc_now_iso()
 
+        resumed_from = None
+        pages_total = None
+        pages_completed = None
+        if resume_from:
+            resumed_from = resume_from['id']
+            pages_total = resume_from.get('pages_total')
+            pages_completed = resume_from.get('pages_completed')
+            sync_mode = resume_from.get('sync_mode') or 'full'
+            modified_since = resume_from.get('modified_since')
+
         with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO sync_metadata (sync_type, status, started_at)
-                VALUES (?, 'running', ?)
-            """, (sync_type, now))
+                INSERT INTO sync_metadata (
+                    sync_type, status, started_at,
+                    resumed_from, pages_total, pages_completed,
+                    sync_mode, modified_since
+                )
+                VALUES (?, 'running', ?, ?, ?, ?, ?, ?)
+            """, (sync_type, now, resumed_from, pages_total, pages_completed, sync_mode, modified_since))
             return cursor.lastrowid
 
+    def get_sync_record(self, sync_id: int) -> Optional[Dict]:
+        """Get a sync record by ID"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM sync_metadata WHERE id = ?", (sync_id,))
+        row = cursor.fetchone()
+        conn.close()
+
+        return dict(row) if row else None
+
+    def get_sync_chain_started_at(self, sync_id: int) -> Optional[str]:
+        """
+        When the pull a sync belongs to really started.
+
+        For a resumed sync this is the start of the first failed attempt,
+        since the pages it wrote are part of the same pull.
+        """
+        record = self.get_sync_record(sync_id)
+        started_at = record.get('started_at') if record else None
+        seen = set()
+        while record and record.get('resumed_from') and record['resumed_from'] not in seen:
+            seen.add(record['resumed_from'])
+            record = self.get_sync_record(record['resumed_from'])
+            if record and record.get('started_at'):
+                started_at = record['started_at']
+        return started_at
+
+    def save_sync_checkpoint(
+        self,
+        sync_id: int,
+        pages_total: int,
+        pages_completed: List[int],
+        progress: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Record which pages a running sync has fetched and written.
+
+        Args:
+            progress: Optional live counts to write in the same statement -
+                records_processed, records_created, records_updated,
+                records_unchanged, rows_per_second
+        """
+        progress = progress or {}
+        with self.connection() as conn:
+            conn.execute("""
+                UPDATE sync_metadata SET
+                    pages_total = ?,
+                    pages_completed = ?,
+                    records_processed = COALESCE(?, records_processed),
+                    records_created = COALESCE(?, records_created),
+                    records_updated = COALESCE(?, records_updated),
+                    records_unchanged = COALESCE(?, records_unchanged),
+                    rows_per_second = COALESCE(?, rows_per_second),
+                    duration_seconds = COALESCE(?, duration_seconds)
+                WHERE id = ?
+            """, (
+                pages_total,
+                json.dumps(sorted(pages_completed)),
+                progress.get('records_processed'),
+                progress.get('records_created'),
+                progress.get('records_updated'),
+                progress.get('records_unchanged'),
+                progress.get('rows_per_second'),
+                progress.get('duration_seconds'),
+                sync_id
+            ))
+
+    def get_sync_checkpoint(self, sync_record: Dict) -> List[int]:
+        """Page numbers completed according to a sync record"""
+        raw = sync_record.get('pages_completed') if sync_record else None
+        if not raw:
+            return []
+        try:
+            return [int(page) for page in json.loads(raw)]
+        except (ValueError, TypeError):
+            return []
+
+    def get_resumable_sync(self, sync_type: str, max_age_minutes: int = 60) -> Optional[Dict]:
+        """
+        Get the latest sync of a type if it failed part way and can be resumed.
+
+        Only the most recent sync counts (a later success makes resuming
+        pointless), and only if it started within max_age_minutes - pages
+        shift as products are added, so an old checkpoint isn't trusted.
+        """
+        history = self.get_sync_history(sync_type, limit=1)
+        if not history:
+            return None
+
+        latest = history[0]
+        if latest.get('status') != 'failed' or not self.get_sync_checkpoint(latest):
+            return None
+
+        started_at = latest.get('started_at')
+        if not started_at:
+            return None
+        started = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
+        age_minutes = (datetime.now(timezone.utc) - started).total_seconds() / 60
+        if age_minutes > max_age_minutes:
+            return None
+
+        return latest
+
     def update_sync_record(
         self,
         sync_id: int,
@@ -392,7 +587,10 @@ class Database:
         records_processed: int = 0,
         records_created: int = 0,
         records_updated: int = 0,
-        error_message: str = None
+        error_message: str = None,
+        records_deleted: int = 0,
+        records_unchanged: int = 0,
+        rows_per_second: float = None
     ):
         """Update a sync record with results"""
         now = utc_now_iso()
@@ -418,6 +616,9 @@ class Database:
                     records_processed = ?,
                     records_created = ?,
                     records_updated = ?,
+                    records_deleted = ?,
+                    records_unchanged = ?,
+                    rows_per_second = ?,
                     finished_at = ?,
                     duration_seconds = ?,
                     error_message = ?
@@ -427,6 +628,9 @@ class Database:
                 records_processed,
                 records_created,
                 records_updated,
+                records_deleted,
+                records_unchanged,
+                rows_per_second,
                 now,
                 duration,
                 error_message,
@@ -471,15 +675,22 @@ class Database:
                 sync_id
             ))
 
-    def get_last_successful_sync(self, sync_type: str) -> Optional[Dict]:
-        """Get the most recent successful sync for a type"""
+    def get_last_successful_sync(self, sync_type: str, sync_mode: str = None) -> Optional[Dict]:
+        """Get the most recent successful sync for a type (optionally of one mode)"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM sync_metadata
-            WHERE sync_type = ? AND status = 'success'
-            ORDER BY finished_at DESC LIMIT 1
-        """, (sync_type,))
+        if sync_mode:
+            cursor.execute("""
+                SELECT * FROM sync_metadata
+                WHERE sync_type = ? AND status = 'success' AND COALESCE(sync_mode, 'full') = ?
+                ORDER BY finished_at DESC, id DESC LIMIT 1
+            """, (sync_type, sync_mode))
+        else:
+            cursor.execute("""
+                SELECT * FROM sync_metadata
+                WHERE sync_type = ? AND status = 'success'
+                ORDER BY finished_at DESC, id DESC LIMIT 1
+            """, (sync_type,))
         row = cursor.fetchone()
         conn.close()
 
@@ -494,12 +705,12 @@ class Database:
             cursor.execute("""
                 SELECT * FROM sync_metadata
                 WHERE sync_type = ?
-                ORDER BY started_at DESC LIMIT ?
+                ORDER BY started_at DESC, id DESC LIMIT ?
             """, (sync_type, limit))
         else:
             cursor.execute("""
                 SELECT * FROM sync_metadata
-                ORDER BY started_at DESC LIMIT ?
+                ORDER BY started_at DESC, id DESC LIMIT ?
             """, (limit,))
 
         rows = cursor.fetchall()
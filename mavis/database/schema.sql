@@ -30,7 +30,9 @@ CREATE TABLE IF NOT EXISTS unleashed_products (
 
     -- Audit fields (UTC ISO8601)
     created_at TEXT NOT NULL,
-    updated_at TEXT NOT NULL
+    updated_at TEXT NOT NULL,
+    last_seen_at TEXT,  -- last time a sync wrote this product (for full reconciles)
+    content_hash TEXT   -- fingerprint of the stored fields (unchanged rows are skipped)
 );
 
 -- Sync metadata table - tracks sync operations
@@ -45,6 +47,11 @@ CREATE TABLE IF NOT EXISTS sync_metadata (
     records_processed INTEGER DEFAULT 0,
     records_created INTEGER DEFAULT 0,
     records_updated INTEGER DEFAULT 0,
+    records_deleted INTEGER DEFAULT 0,  -- removed by a full reconcile
+    records_unchanged INTEGER DEFAULT 0,  -- fingerprint matched, not rewritten
+    rows_per_second REAL,  -- sync throughput
+    sync_mode TEXT DEFAULT 'full',  -- 'full' or 'delta' (modified-since)
+    modified_since TEXT,  -- delta syncs: the modifiedSince sent to Unleashed
 
     -- Timing
     started_at TEXT NOT NULL,
@@ -52,12 +59,18 @@ CREATE TABLE IF NOT EXISTS sync_metadata (
     duration_seconds REAL,
 
     -- Error tracking
-    error_message TEXT
+    error_message TEXT,
+
+    -- Page checkpoints (so a failed sync can resume)
+    pages_total INTEGER,
+    pages_completed TEXT,  -- JSON list of page numbers fetched and written
+    resumed_from INTEGER   -- sync_metadata.id of the failed sync this continues
 );
 
 -- Indexes for quick lookups
 CREATE INDEX IF NOT EXISTS idx_products_code ON unleashed_products(product_code);
 CREATE INDEX IF NOT EXISTS idx_products_group ON unleashed_products(product_group);
 CREATE INDEX IF NOT EXISTS idx_products_updated ON unleashed_products(updated_at);
+CREATE INDEX IF NOT EXISTS idx_products_last_seen ON unleashed_products(last_seen_at);
 CREATE INDEX IF NOT EXISTS idx_sync_type ON sync_metadata(sync_type);
 CREATE INDEX IF NOT EXISTS idx_sync_started ON sync_metadata(started_at);
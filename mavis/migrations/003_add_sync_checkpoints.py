@@ -0,0 +1,40 @@
+"""Add page checkpoint columns to sync_metadata.
+
+Lets a failed product sync resume from the pages it had already written
+instead of pulling the whole catalogue again.
+"""
+
+
+def up(conn):
+    """Add pages_total, pages_completed, resumed_from if missing."""
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA table_info(sync_metadata)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if 'pages_total' not in columns:
+        cursor.execute('''
+            ALTER TABLE sync_metadata
+            ADD COLUMN pages_total INTEGER
+        ''')
+        print("  Added column: pages_total")
+
+    if 'pages_completed' not in columns:
+        # JSON list of page numbers fetched and written
+        cursor.execute('''
+            ALTER TABLE sync_metadata
+            ADD COLUMN pages_completed TEXT
+        ''')
+        print("  Added column: pages_completed")
+
+    if 'resumed_from' not in columns:
+        cursor.execute('''
+            ALTER TABLE sync_metadata
+            ADD COLUMN resumed_from INTEGER
+        ''')
+        print("  Added column: resumed_from")
+
+
+def down(conn):
+    """SQLite doesn't support DROP COLUMN easily, so this is a no-op."""
+    pass
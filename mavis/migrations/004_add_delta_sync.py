@@ -0,0 +1,55 @@
+"""Add columns for incremental (modified-since) product syncs.
+
+sync_metadata records which mode each sync ran in and how many products a
+full reconcile removed. unleashed_products.last_seen_at is stamped every
+time a sync writes a product, so a full sync can find products Unleashed
+no longer returns.
+"""
+
+
+def up(conn):
+    """Add sync_mode, modified_since, records_deleted, last_seen_at if missing."""
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA table_info(sync_metadata)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if 'sync_mode' not in columns:
+        # 'full' or 'delta'
+        cursor.execute('''
+            ALTER TABLE sync_metadata
+            ADD COLUMN sync_mode TEXT DEFAULT 'full'
+        ''')
+        print("  Added column: sync_mode")
+
+    if 'modified_since' not in columns:
+        cursor.execute('''
+            ALTER TABLE sync_metadata
+            ADD COLUMN modified_since TEXT
+        ''')
+        print("  Added column: modified_since")
+
+    if 'records_deleted' not in columns:
+        cursor.execute('''
+            ALTER TABLE sync_metadata
+            ADD COLUMN records_deleted INTEGER DEFAULT 0
+        ''')
+        print("  Added column: records_deleted")
+
+    cursor.execute("PRAGMA table_info(unleashed_products)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if 'last_seen_at' not in columns:
+        cursor.execute('''
+            ALTER TABLE unleashed_products
+            ADD COLUMN last_seen_at TEXT
+        ''')
+        cursor.execute('UPDATE unleashed_products SET last_seen_at = updated_at')
+        print("  Added column: last_seen_at")
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_last_seen ON unleashed_products(last_seen_at)')
+
+
+def down(conn):
+    """SQLite doesn't support DROP COLUMN easily, so this is a no-op."""
+    pass
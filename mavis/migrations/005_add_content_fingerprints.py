@@ -0,0 +1,43 @@
+"""Add content fingerprints to products and throughput to sync_metadata.
+
+content_hash lets a sync skip rewriting products whose data hasn't changed;
+records_unchanged and rows_per_second record how a sync went.
+"""
+
+
+def up(conn):
+    """Add content_hash, records_unchanged, rows_per_second if missing."""
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA table_info(unleashed_products)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if 'content_hash' not in columns:
+        # Existing rows get NULL, so the next sync rewrites them once
+        cursor.execute('''
+            ALTER TABLE unleashed_products
+            ADD COLUMN content_hash TEXT
+        ''')
+        print("  Added column: content_hash")
+
+    cursor.execute("PRAGMA table_info(sync_metadata)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if 'records_unchanged' not in columns:
+        cursor.execute('''
+            ALTER TABLE sync_metadata
+            ADD COLUMN records_unchanged INTEGER DEFAULT 0
+        ''')
+        print("  Added column: records_unchanged")
+
+    if 'rows_per_second' not in columns:
+        cursor.execute('''
+            ALTER TABLE sync_metadata
+            ADD COLUMN rows_per_second REAL
+        ''')
+        print("  Added column: rows_per_second")
+
+
+def down(conn):
+    """SQLite doesn't support DROP COLUMN easily, so this is a no-op."""
+    pass
@@ -8,7 +8,8 @@ Tracks sync status and provides status reporting.
 import json
 import logging
 import threading
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List
 
 from database.db import db, utc_now_iso
@@ -17,6 +18,8 @@ from config import config
 
 logger = logging.getLogger(__name__)
 
+SYNC_MODES = ('auto', 'full', 'delta')
+
 
 class SyncService:
     """
@@ -56,7 +59,9 @@ class SyncService:
             api_key=config.unleashed_api_key,
             base_url=config.unleashed_base_url,
             page_size=config.unleashed_page_size,
-            timeout=config.unleashed_timeout
+            timeout=config.unleashed_timeout,
+            max_concurrency=config.unleashed_max_concurrency,
+            requests_per_second=config.unleashed_requests_per_second
         )
 
     def get_status(self) -> Dict[str, Any]:
@@ -89,7 +94,8 @@ class SyncService:
             'last_run_started_at': latest.get('started_at'),
             'last_run_finished_at': latest.get('finished_at'),
             'last_successful_sync_at': last_successful.get('finished_at') if last_successful else None,
-            'last_error': latest.get('error_message') if status == 'failed' else None
+            'last_error': latest.get('error_message') if status == 'failed' else None,
+            'last_sync_mode': latest.get('sync_mode')
         }
 
     def is_running(self) -> bool:
@@ -137,12 +143,91 @@ class SyncService:
             'raw_payload': json.dumps(unleashed_product)
         }
 
-    def run_product_sync(self) -> Dict[str, Any]:
+    def _plan_sync(self, mode: str) -> tuple:
+        """
+        Decide between a full pull and a delta (modified-since) pull.
+
+        'auto' does a delta sync unless there has never been a successful
+        sync, or the last successful full sync is older than
+        sync.full_reconcile_hours or was resumed - only uninterrupted full
+        syncs reconcile deletions.
+
+        Returns:
+            (sync_mode, modified_since) - modified_since is None for full syncs
+        """
+        last_sync = db.get_last_successful_sync('products')
+        if mode == 'full' or not last_sync or not last_sync.get('started_at'):
+            return 'full', None
+
+        if mode == 'auto':
+            last_full = db.get_last_successful_sync('products', sync_mode='full')
+            if not last_full or not last_full.get('finished_at') or last_full.get('resumed_from'):
+                return 'full', None
+            finished = datetime.fromisoformat(last_full['finished_at'].replace('Z', '+00:00'))
+            if datetime.now(timezone.utc) - finished >= timedelta(hours=config.sync_full_reconcile_hours):
+                return 'full', None
+
+        # Ask for changes since the last successful sync *started* (anything
+        # modified while it ran may have been missed), with some overlap for
+        # clock differences
+        started = datetime.fromisoformat(last_sync['started_at'].replace('Z', '+00:00'))
+        since = started - timedelta(minutes=config.sync_delta_overlap_minutes)
+        return 'delta', since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _reconcile_deletions(self, sync_id: int) -> int:
+        """
+        After a full sync, delete products Unleashed no longer returns.
+
+        Every product written by this pull has last_seen_at at or after the
+        pull started, so anything older wasn't in the catalogue. Skipped if
+        it would remove more than sync.reconcile_max_delete_percent of the
+        products, which usually means a bad API response rather than a mass
+        deletion.
+
+        Returns:
+            Number of products deleted
         """
-        Run a full product sync from Unleashed.
+        cutoff = db.get_sync_chain_started_at(sync_id)
+        if not cutoff:
+            return 0
+
+        stale = db.count_products_not_seen_since(cutoff)
+        if not stale:
+            return 0
+
+        total = db.get_product_count()
+        max_delete = total * config.sync_reconcile_max_delete_percent / 100
+        if stale > max_delete:
+            logger.warning(
+                f"Full sync would delete {stale}/{total} products - more than "
+                f"{config.sync_reconcile_max_delete_percent}%, so skipping the reconcile"
+            )
+            return 0
+
+        deleted = db.delete_products_not_seen_since(cutoff)
+        logger.info(f"Full sync reconcile: deleted {deleted} products no longer in Unleashed")
+        return deleted
+
+    def run_product_sync(self, mode: str = 'auto') -> Dict[str, Any]:
+        """
+        Run a product sync from Unleashed.
+
+        Pages are fetched concurrently and each is written as it arrives,
+        then checkpointed on the sync record. If the previous sync failed
+        part way (and recently), this one skips the pages it had already
+        written.
+
+        Args:
+            mode: 'full' pulls every product and deletes any Unleashed no
+                longer has; 'delta' pulls only products modified since the
+                last successful sync; 'auto' picks delta unless a full
+                reconcile is due (see _plan_sync)
 
         Returns dict with sync results.
         """
+        if mode not in SYNC_MODES:
+            raise ValueError(f"Unknown sync mode '{mode}' (expected one of {', '.join(SYNC_MODES)})")
+
         # Check if already running (database-based lock for multi-worker support)
         if db.is_sync_running('products'):
             return {
@@ -151,8 +236,29 @@ class SyncService:
                 'status': self.get_status()
             }
 
+        # Pick up where a recently failed sync left off, in that sync's mode
+        # (unless a different mode was asked for explicitly)
+        resume_from = db.get_resumable_sync(
+            'products', max_age_minutes=config.sync_resume_max_age_minutes
+        )
+        if resume_from and mode not in ('auto', resume_from.get('sync_mode') or 'full'):
+            resume_from = None
+
+        if resume_from:
+            sync_mode = resume_from.get('sync_mode') or 'full'
+            modified_since = resume_from.get('modified_since')
+        else:
+            sync_mode, modified_since = self._plan_sync(mode)
+
         # Create sync record in database (this is our lock)
-        sync_id = db.create_sync_record('products')
+        sync_id = db.create_sync_record(
+            'products', resume_from=resume_from,
+            sync_mode=sync_mode, modified_since=modified_since
+        )
+        logger.info(
+            f"Starting {sync_mode} product sync"
+            + (f" (modified since {modified_since})" if modified_since else "")
+        )
 
         with self._lock:
             self._status['status'] = 'running'
@@ -163,58 +269,83 @@ class SyncService:
         records_processed = 0
         records_created = 0
         records_updated = 0
+        records_unchanged = 0
+        records_deleted = 0
+        started = time.monotonic()
+
+        def rows_per_second():
+            elapsed = time.monotonic() - started
+            return round(records_processed / elapsed, 1) if elapsed > 0 else None
 
         try:
-            # Create client and fetch products with progress updates
             client = self._create_unleashed_client()
 
-            # Progress callback to update UI during fetch phase
-            def on_fetch_progress(fetched_count):
-                db.update_sync_progress(
-                    sync_id,
-                    records_processed=fetched_count,
-                    records_created=0,
-                    records_updated=0
+            pages_completed = set(db.get_sync_checkpoint(resume_from))
+            pages_total = resume_from.get('pages_total') if resume_from else None
+            if pages_completed:
+                logger.info(
+                    f"Resuming failed sync {resume_from['id']}: "
+                    f"{len(pages_completed)}/{pages_total} pages already written"
                 )
 
-            products = client.fetch_all_products(progress_callback=on_fetch_progress)
-
-            # Debug: Check for duplicates in fetched data
-            unique_codes = set(p.get('ProductCode') for p in products)
-            logger.info(f"Fetched {len(products)} products from Unleashed ({len(unique_codes)} unique codes)")
-
-            if len(unique_codes) != len(products):
-                logger.warning(f"DUPLICATE DETECTION: {len(products) - len(unique_codes)} duplicate product codes in API response!")
-
-            logger.info(f"Starting sync of {len(products)} products")
-
-            # Process each product
-            progress_interval = 100
-            for product in products:
-                try:
-                    product_data = self._extract_product_data(product)
-                    product_id, was_created = db.upsert_product(product_data)
-
-                    records_processed += 1
-                    if was_created:
-                        records_created += 1
-                    else:
-                        records_updated += 1
-
-                    # Update progress periodically
-                    if records_processed % progress_interval == 0:
-                        logger.info(f"Sync progress: {records_processed} processed, {records_created} created, {records_updated} updated")
-                        db.update_sync_progress(
-                            sync_id,
-                            records_processed=records_processed,
-                            records_created=records_created,
-                            records_updated=records_updated
+            seen_codes = set()
+            duplicates = 0
+            chunk_size = max(1, config.sync_chunk_size)
+
+            for page, products, pages_total in client.iter_product_pages(
+                skip_pages=pages_completed, total_pages=pages_total,
+                modified_since=modified_since
+            ):
+                product_rows = []
+                for product in products:
+                    code = product.get('ProductCode')
+                    if code in seen_codes:
+                        duplicates += 1
+                    seen_codes.add(code)
+
+                    try:
+                        product_rows.append(self._extract_product_data(product))
+                    except Exception as e:
+                        logger.error(
+                            f"Error processing product {product.get('ProductCode', 'unknown')}: {e}"
                         )
 
-                except Exception as e:
-                    logger.error(
-                        f"Error processing product {product.get('ProductCode', 'unknown')}: {e}"
-                    )
+                # One transaction per chunk; unchanged products are skipped
+                for i in range(0, len(product_rows), chunk_size):
+                    counts = db.upsert_products_chunk(product_rows[i:i + chunk_size])
+                    records_created += counts['created']
+                    records_updated += counts['updated']
+                    records_unchanged += counts['unchanged']
+                    records_processed += sum(counts.values())
+
+                # Page is written - a retry after a failure can skip it.
+                # Progress goes in the same write as the checkpoint.
+                pages_completed.add(page)
+                db.save_sync_checkpoint(sync_id, pages_total, pages_completed, progress={
+                    'records_processed': records_processed,
+                    'records_created': records_created,
+                    'records_updated': records_updated,
+                    'records_unchanged': records_unchanged,
+                    'rows_per_second': rows_per_second(),
+                    'duration_seconds': round(time.monotonic() - started, 1),
+                })
+                logger.info(
+                    f"Page {page} written ({len(pages_completed)}/{pages_total} pages): "
+                    f"{records_processed} processed, {records_created} created, "
+                    f"{records_updated} updated, {records_unchanged} unchanged"
+                )
+
+            if duplicates:
+                logger.warning(f"DUPLICATE DETECTION: {duplicates} duplicate product codes in API response!")
+
+            # A resumed pull skipped pages an earlier attempt wrote. If the
+            # catalogue shifted in between, live products can have moved into
+            # those pages and been missed by both attempts, so leave deletions
+            # to the next uninterrupted full sync.
+            if sync_mode == 'full' and not resume_from:
+                records_deleted = self._reconcile_deletions(sync_id)
+            elif sync_mode == 'full':
+                logger.info("Full sync was resumed - skipping the deletion reconcile")
 
             # Mark sync as successful
             finished_at = utc_now_iso()
@@ -223,7 +354,10 @@ class SyncService:
                 status='success',
                 records_processed=records_processed,
                 records_created=records_created,
-                records_updated=records_updated
+                records_updated=records_updated,
+                records_deleted=records_deleted,
+                records_unchanged=records_unchanged,
+                rows_per_second=rows_per_second()
             )
 
             with self._lock:
@@ -233,15 +367,22 @@ class SyncService:
                 self._status['current_sync_id'] = None
 
             logger.info(
-                f"Product sync completed: {records_processed} processed, "
-                f"{records_created} created, {records_updated} updated"
+                f"Product sync ({sync_mode}) completed: {records_processed} processed, "
+                f"{records_created} created, {records_updated} updated, "
+                f"{records_unchanged} unchanged, {records_deleted} deleted "
+                f"({rows_per_second() or 0} rows/s)"
             )
 
             return {
                 'success': True,
+                'sync_mode': sync_mode,
                 'records_processed': records_processed,
                 'records_created': records_created,
                 'records_updated': records_updated,
+                'records_deleted': records_deleted,
+                'records_unchanged': records_unchanged,
+                'rows_per_second': rows_per_second(),
+                'resumed_from': resume_from['id'] if resume_from else None,
                 'started_at': self._status['last_run_started_at'],
                 'finished_at': finished_at
             }
@@ -258,6 +399,8 @@ class SyncService:
                 records_processed=records_processed,
                 records_created=records_created,
                 records_updated=records_updated,
+                records_unchanged=records_unchanged,
+                rows_per_second=rows_per_second(),
                 error_message=error_message
             )
 
@@ -281,10 +424,13 @@ class SyncService:
         """Get recent sync history from database"""
         return db.get_sync_history('products', limit)
 
-    def run_product_sync_async(self) -> Dict[str, Any]:
+    def run_product_sync_async(self, mode: str = 'auto') -> Dict[str, Any]:
         """
         Start a product sync in a background thread.
 
+        Args:
+            mode: 'auto', 'full' or 'delta' (see run_product_sync)
+
         Returns immediately with status 'accepted' if sync was started,
         or 'conflict' if a sync is already running.
 
@@ -298,16 +444,19 @@ class SyncService:
                 'sync_status': self.get_status()
             }
 
+        if mode not in SYNC_MODES:
+            raise ValueError(f"Unknown sync mode '{mode}' (expected one of {', '.join(SYNC_MODES)})")
+
         # Start sync in background thread
         thread = threading.Thread(
             target=self.run_product_sync,
+            args=(mode,),
             name='mavis-product-sync',
             daemon=True
         )
         thread.start()
 
         # Give it a moment to create the sync record
-        import time
         time.sleep(0.1)
 
         return {
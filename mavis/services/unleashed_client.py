@@ -3,21 +3,44 @@ Unleashed API Client
 
 Handles communication with the Unleashed API including:
 - Authentication (HMAC-SHA256 signature)
-- Pagination
+- Pagination (concurrent, rate limited, resumable)
 - Error handling and retries
 """
 
 import hashlib
 import hmac
 import base64
+import threading
+import time
 import requests
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 from urllib.parse import urlencode
 
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """Spaces calls evenly so no more than rate_per_second start each second."""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second and rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the caller may make its request."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 class UnleashedClient:
     """Client for the Unleashed API"""
 
@@ -28,7 +51,9 @@ class UnleashedClient:
         base_url: str = "https://api.unleashedsoftware.com",
         page_size: int = 200,
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        max_concurrency: int = 4,
+        requests_per_second: float = 4.0
     ):
         """
         Initialize the Unleashed client.
@@ -40,6 +65,8 @@ class UnleashedClient:
             page_size: Number of records per page
             timeout: Request timeout in seconds
             max_retries: Maximum number of retries for failed requests
+            max_concurrency: Pages fetched at the same time
+            requests_per_second: Rate limit shared by all requests (0 = none)
         """
         self.api_id = api_id
         self.api_key = api_key
@@ -47,6 +74,8 @@ class UnleashedClient:
         self.page_size = page_size
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_second)
 
     def _generate_signature(self, query_string: str) -> str:
         """
@@ -102,6 +131,7 @@ class UnleashedClient:
         for attempt in range(self.max_retries):
             try:
                 logger.debug(f"API request attempt {attempt + 1}: {method} {endpoint}")
+                self.rate_limiter.acquire()
                 response = requests.request(
                     method=method,
                     url=url,
@@ -117,12 +147,112 @@ class UnleashedClient:
                 )
                 if attempt < self.max_retries - 1:
                     # Simple backoff: wait longer between retries
-                    import time
                     time.sleep(2 ** attempt)
 
         logger.error(f"All {self.max_retries} attempts failed for {endpoint}")
         raise last_error
 
+    def _fetch_page(
+        self,
+        endpoint: str,
+        items_key: str,
+        page: int,
+        extra_params: Dict[str, Any] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fetch one page of a paginated endpoint.
+
+        Returns:
+            (items, total_pages) - total_pages as reported by Unleashed
+        """
+        # Unleashed API: page number goes in URL path, not query params
+        # e.g., /Products/2 for page 2
+        paged_endpoint = f"{endpoint}/{page}"
+        params = {'pageSize': self.page_size}
+        if extra_params:
+            params.update(extra_params)
+
+        logger.info(f"Fetching {paged_endpoint} with params: {params}")
+        response = self._make_request(paged_endpoint, params)
+
+        items = response.get(items_key, [])
+        pagination = response.get('Pagination', {}) or {}
+        total_pages = pagination.get('NumberOfPages', 1) or 1
+        return items, total_pages
+
+    def iter_pages(
+        self,
+        endpoint: str,
+        items_key: str,
+        extra_params: Dict[str, Any] = None,
+        skip_pages: Iterable[int] = (),
+        total_pages: int = None
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]], int]]:
+        """
+        Fetch the pages of a paginated endpoint concurrently.
+
+        The first page is fetched on its own to find out how many pages
+        there are; the rest are fetched max_concurrency at a time under the
+        client's rate limit. Pages are yielded as they arrive, so they may
+        come out of order.
+
+        To resume an interrupted pull, pass the pages already handled as
+        skip_pages and the page count from that run as total_pages (which
+        avoids re-fetching page 1 just to count pages).
+
+        Args:
+            endpoint: API endpoint
+            items_key: Key in response that contains the items list
+            extra_params: Additional query parameters
+            skip_pages: Page numbers not to fetch
+            total_pages: Known page count (fetched from page 1 if None)
+
+        Yields:
+            (page_number, items, total_pages)
+        """
+        skip = set(skip_pages or ())
+
+        if total_pages is None or 1 not in skip:
+            items, total_pages = self._fetch_page(endpoint, items_key, 1, extra_params)
+            logger.info(f"{endpoint}: {total_pages} page(s) to fetch")
+            if 1 not in skip:
+                yield 1, items, total_pages
+            if not items:
+                return
+
+        remaining = [page for page in range(2, total_pages + 1) if page not in skip]
+        if not remaining:
+            return
+
+        workers = min(self.max_concurrency, len(remaining))
+        pending = iter(remaining)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='unleashed-page') as executor:
+            in_flight = {}
+
+            def submit_next():
+                page = next(pending, None)
+                if page is not None:
+                    in_flight[executor.submit(self._fetch_page, endpoint, items_key, page, extra_params)] = page
+
+            # Keep a small window in flight so pages don't pile up in memory
+            # faster than the caller handles them
+            for _ in range(workers * 2):
+                submit_next()
+
+            try:
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page = in_flight.pop(future)
+                        items, _ = future.result()
+                        logger.info(f"Fetched {len(items)} items from {endpoint} page {page}/{total_pages}")
+                        yield page, items, total_pages
+                        submit_next()
+            finally:
+                # Caller stopped early or a page failed - don't start any more
+                for future in in_flight:
+                    future.cancel()
+
     def _paginate(
         self,
         endpoint: str,
@@ -142,55 +272,26 @@ class UnleashedClient:
             max_records: Optional limit on total records to fetch (for testing)
 
         Returns:
-            Combined list of all items from all pages
+            Combined list of all items from all pages, in page order
         """
-        all_items = []
-        page = 1
-
-        while True:
-            # Unleashed API: page number goes in URL path, not query params
-            # e.g., /Products/2 for page 2
-            paged_endpoint = f"{endpoint}/{page}"
-            params = {'pageSize': self.page_size}
-            if extra_params:
-                params.update(extra_params)
-
-            logger.info(f"Fetching {paged_endpoint} with params: {params}")
-            response = self._make_request(paged_endpoint, params)
-
-            items = response.get(items_key, [])
-            if not items:
-                break
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        fetched = 0
 
-            # Log first product code to verify we're getting different pages
-            if items and page <= 3:
-                first_code = items[0].get('ProductCode', 'N/A')
-                last_code = items[-1].get('ProductCode', 'N/A')
-                logger.info(f"Page {page} first product: {first_code}, last product: {last_code}")
-
-            all_items.extend(items)
-            logger.info(f"Fetched {len(items)} items from {endpoint} page {page} "
-                       f"(total: {len(all_items)})")
+        for page, items, _ in self.iter_pages(endpoint, items_key, extra_params):
+            pages[page] = items
+            fetched += len(items)
 
             # Call progress callback if provided
             if progress_callback:
-                progress_callback(len(all_items))
+                progress_callback(fetched)
 
             # Check if we've hit the max_records limit
-            if max_records and len(all_items) >= max_records:
+            if max_records and fetched >= max_records:
                 logger.info(f"Reached max_records limit ({max_records}), stopping pagination")
                 break
 
-            # Check if we've reached the last page
-            pagination = response.get('Pagination', {})
-            logger.info(f"Pagination response: {pagination}")
-            total_pages = pagination.get('NumberOfPages', 1)
-            if page >= total_pages:
-                break
-
-            page += 1
-
-        return all_items
+        all_items = [item for page in sorted(pages) for item in pages[page]]
+        return all_items[:max_records] if max_records else all_items
 
     # ─────────────────────────────────────────────────────────────
     # Product Methods
@@ -212,6 +313,40 @@ class UnleashedClient:
         logger.info(f"Completed fetching {len(products)} products from Unleashed")
         return products
 
+    def iter_product_pages(
+        self,
+        skip_pages: Iterable[int] = (),
+        total_pages: int = None,
+        modified_since: str = None
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]], int]]:
+        """
+        Fetch product pages concurrently, yielding each as it arrives.
+
+        See iter_pages() for resuming with skip_pages/total_pages.
+
+        Args:
+            skip_pages: Page numbers not to fetch
+            total_pages: Known page count (fetched from page 1 if None)
+            modified_since: Only products modified at or after this UTC time
+                (ISO8601, e.g. 2025-01-15T10:00:00Z)
+
+        Yields:
+            (page_number, products, total_pages)
+        """
+        extra_params = None
+        if modified_since:
+            extra_params = {'modifiedSince': self.format_modified_since(modified_since)}
+        return self.iter_pages(
+            'Products', 'Items', extra_params=extra_params,
+            skip_pages=skip_pages, total_pages=total_pages
+        )
+
+    @staticmethod
+    def format_modified_since(timestamp: str) -> str:
+        """Convert an ISO8601 UTC timestamp to Unleashed's modifiedSince format"""
+        # Unleashed wants yyyy-MM-ddTHH:mm:ss (UTC, no zone suffix)
+        return timestamp.rstrip('Z').split('.')[0].split('+')[0]
+
     def fetch_product(self, product_code: str) -> Optional[Dict[str, Any]]:
         """
         Fetch a single product by code.
@@ -17,13 +17,17 @@ import secrets
 import logging
 
 from monica.config import config
-from monica.database.db import db
+from monica.database.db import db, heartbeat_status, history_resolution
 from monica.services.status_service import status_service
+from monica.services.heartbeat_writer import heartbeat_writer
 
 logger = logging.getLogger(__name__)
 
 api_bp = Blueprint('api', __name__)
 
+# Longest latency history window served (90 days of hourly rollups)
+MAX_HISTORY_HOURS = 24 * 90
+
 
 @api_bp.route('/register', methods=['POST'])
 def register():
@@ -146,7 +150,7 @@ def heartbeat():
                 'error': 'agent_token is required (X-Agent-Token header or JSON body)'
             }), 401
 
-        # Find device by token
+        # Find device by token (cached, so this rarely touches the database)
         device = db.get_device_by_token(agent_token)
         if not device:
             return jsonify({
@@ -203,47 +207,30 @@ def heartbeat():
         # Get user agent
         user_agent = request.headers.get('User-Agent', '')
 
-        # Record heartbeat in database
-        heartbeat_id = db.record_heartbeat(
-            device_id=device['id'],
-            public_ip=public_ip,
-            user_agent=user_agent,
-            latency_ms=latency_ms,
-            download_mbps=download_mbps,
-            timestamp=timestamp,
-            is_wake_event=is_wake_event,
-            sleep_duration_seconds=sleep_duration_seconds,
-            network_ok_on_wake=network_ok_on_wake
-        )
-
-        # If this is a wake event, update the device's wake tracking
-        if is_wake_event:
-            db.update_device_wake(
-                device_id=device['id'],
-                sleep_duration_seconds=sleep_duration_seconds
-            )
-
         # Compute status based on thresholds
-        status = 'online'
-        if latency_ms is not None and latency_ms > 500:
-            status = 'degraded'
-        elif download_mbps is not None and download_mbps < 10:
-            status = 'degraded'
-
-        # Update device's last heartbeat
-        db.update_device_heartbeat(
-            device_id=device['id'],
-            status=status,
-            public_ip=public_ip
-        )
+        status = heartbeat_status(latency_ms, download_mbps)
+
+        # Queue the heartbeat; the writer records it and updates the device
+        # (including wake tracking) in its next batch
+        heartbeat_writer.submit({
+            'device_id': device['id'],
+            'public_ip': public_ip,
+            'user_agent': user_agent,
+            'latency_ms': latency_ms,
+            'download_mbps': download_mbps,
+            'timestamp': timestamp,
+            'is_wake_event': is_wake_event,
+            'sleep_duration_seconds': sleep_duration_seconds,
+            'network_ok_on_wake': network_ok_on_wake,
+            'status': status
+        })
 
         # Conditional heartbeat logging based on config
         if config.log_heartbeats or logger.isEnabledFor(logging.DEBUG):
             # Device dict already includes store_code and device_label from get_device_by_token
             log_msg = (
                 f"Heartbeat recorded: {device['store_code']}/{device['device_label']} "
-                f"(device_id={device['id']}, heartbeat_id={heartbeat_id}, "
-                f"ip={public_ip}, status={status}"
+                f"(device_id={device['id']}, ip={public_ip}, status={status}"
             )
 
             # Add optional metrics if present
@@ -350,26 +337,43 @@ def get_device_latency_history(device_id: int):
     """
     Get latency history for a specific device
 
+    Short windows come from raw heartbeats and longer ones from 5-minute or
+    hourly rollups, so every window returns a bounded number of points.
+
     Query params:
-        hours: Number of hours of history (default 24, max 168 for 1 week)
+        hours: Number of hours of history (default 24, max 2160 for 90 days)
 
     Response JSON:
         {
             "success": true,
+            "resolution_seconds": 300,    // 0 for raw heartbeats
             "data": [
-                {"timestamp": "2025-11-25T10:30:00", "latency_ms": 45.2, "download_mbps": 50.1},
+                {"timestamp": "2025-11-25 10:30:00", "latency_ms": 45.2, "download_mbps": 50.1,
+                 "latency_min": 30.0, "latency_max": 80.5, "online_fraction": 1.0, ...},
                 ...
             ]
         }
     """
     try:
         hours = request.args.get('hours', 24, type=int)
-        hours = min(hours, 168)  # Cap at 1 week
+        hours = max(1, min(hours, MAX_HISTORY_HOURS))
+
+        resolution = history_resolution(
+            hours,
+            heartbeat_interval=config.heartbeat_interval,
+            raw_retention_hours=config.raw_retention_hours
+        )
+        history = db.get_device_latency_history(device_id, hours, resolution=resolution)
 
-        history = db.get_device_latency_history(device_id, hours)
+        if resolution:
+            # Share of expected heartbeats in the bucket that reported online
+            expected = resolution / config.heartbeat_interval
+            for point in history:
+                point['online_fraction'] = round(min(1.0, point['online_count'] / expected), 3)
 
         return jsonify({
             'success': True,
+            'resolution_seconds': resolution,
             'data': history
         }), 200
 
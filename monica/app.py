@@ -12,12 +12,14 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 import os
+import atexit
 import logging
 from flask import Flask, jsonify
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from monica.config import config
 from monica.database.db import db
+from monica.services.heartbeat_writer import heartbeat_writer
 from shared.auth import GatewayAuth
 from shared.error_handlers import register_error_handlers
 
@@ -64,6 +66,16 @@ app.register_blueprint(web_bp, url_prefix='/')
 # Register error handlers
 register_error_handlers(app, logger)
 
+# Start the heartbeat writer (group-commits queued heartbeats)
+heartbeat_writer.start()
+
+
+@atexit.register
+def shutdown_heartbeat_writer():
+    """Write any queued heartbeats on shutdown"""
+    heartbeat_writer.stop()
+
+
 # Note: Registration code cleanup removed - pending devices are now shown on
 # the dashboard and users delete them directly if not needed
 
@@ -74,7 +86,8 @@ def health():
     return jsonify({
         'status': 'healthy',
         'bot': config.name,
-        'version': config.version
+        'version': config.version,
+        'heartbeat_writer': heartbeat_writer.get_status()
     })
 
 
@@ -90,13 +103,15 @@ def info():
             'web': {
                 '/': 'Home page',
                 '/dashboard': 'Device dashboard',
+                '/dashboard/changes': 'Devices changed since a dashboard version (JSON)',
                 '/agent': 'Agent page (requires ?store=X&device=Y params)'
             },
             'api': {
                 'POST /api/register': 'Register a new device',
                 'POST /api/heartbeat': 'Record device heartbeat',
                 'GET /api/devices': 'List all devices',
-                'GET /api/devices/{id}/heartbeats': 'Get device heartbeat history'
+                'GET /api/devices/{id}/heartbeats': 'Get device heartbeat history',
+                'GET /api/devices/{id}/latency': 'Get latency history (raw or rolled up by window)'
             },
             'system': {
                 '/health': 'Health check',
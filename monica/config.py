@@ -61,11 +61,21 @@ class Config:
 
         # ── Database settings ─────────────────────────────────
         database = data.get("database", {}) or {}
-        self.cleanup_days = database.get("cleanup_days", 30)
+        self.raw_retention_hours = database.get("raw_retention_hours", 48)
+        self.five_minute_retention_days = database.get("five_minute_retention_days", 90)
+        self.hourly_retention_days = database.get("hourly_retention_days")
+        self.cleanup_interval_seconds = database.get("cleanup_interval_seconds", 3600)
+
+        # ── Heartbeat ingest settings ─────────────────────────
+        ingest = data.get("ingest", {}) or {}
+        self.ingest_flush_interval_seconds = ingest.get("flush_interval_seconds", 2)
+        self.ingest_flush_batch_size = ingest.get("flush_batch_size", 100)
+        self.ingest_max_pending = ingest.get("max_pending", 5000)
 
         # ── Dashboard settings ────────────────────────────────
         dashboard = data.get("dashboard", {}) or {}
         self.auto_refresh = dashboard.get("auto_refresh", 30)
+        self.dashboard_cache_seconds = dashboard.get("cache_seconds", 10)
 
         # ── Logging settings ──────────────────────────────────
         logging = data.get("logging", {}) or {}
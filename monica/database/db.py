@@ -4,14 +4,92 @@ Handles SQLite database connections and initialization
 """
 
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+from datetime import datetime, timezone
 import logging
 from shared.migrations import MigrationRunner
 
 logger = logging.getLogger(__name__)
 
+# How long a device looked up by agent token is trusted before re-reading it.
+# Changes made through this process drop the cache straight away; the TTL
+# bounds how long another worker's re-registration or delete goes unnoticed.
+DEVICE_CACHE_SECONDS = 300
+
+
+# Heartbeat storage tiers: raw rows, then 5-minute and hourly rollups
+RAW_RETENTION_HOURS = 48
+FIVE_MINUTE_RETENTION_DAYS = 90
+ROLLUP_RESOLUTIONS = (300, 3600)
+
+# Charts use the finest tier that keeps a window under this many points
+MAX_CHART_POINTS = 600
+
+# Heartbeats above this latency or below this download speed are degraded
+DEGRADED_LATENCY_MS = 500
+DEGRADED_DOWNLOAD_MBPS = 10
+
+
+def heartbeat_status(latency_ms: Optional[float] = None, download_mbps: Optional[float] = None) -> str:
+    """
+    Status a heartbeat reports based on its network metrics
+
+    Args:
+        latency_ms: Latency in milliseconds, if measured
+        download_mbps: Download speed in Mbps, if measured
+
+    Returns:
+        'online' or 'degraded'
+    """
+    if latency_ms is not None and latency_ms > DEGRADED_LATENCY_MS:
+        return 'degraded'
+    if download_mbps is not None and download_mbps < DEGRADED_DOWNLOAD_MBPS:
+        return 'degraded'
+    return 'online'
+
+
+def history_resolution(
+    hours: float,
+    heartbeat_interval: int = 60,
+    raw_retention_hours: float = RAW_RETENTION_HOURS
+) -> int:
+    """
+    Pick the storage tier for a chart window
+
+    Args:
+        hours: Window length in hours
+        heartbeat_interval: Seconds between device heartbeats
+        raw_retention_hours: How long raw heartbeats are kept
+
+    Returns:
+        0 for raw heartbeats, otherwise the rollup bucket size in seconds
+    """
+    if hours <= raw_retention_hours and hours * 3600 / heartbeat_interval <= MAX_CHART_POINTS:
+        return 0
+    for bucket_seconds in ROLLUP_RESOLUTIONS[:-1]:
+        if hours * 3600 / bucket_seconds <= MAX_CHART_POINTS:
+            return bucket_seconds
+    return ROLLUP_RESOLUTIONS[-1]
+
+
+def format_heartbeat_timestamp(value: Optional[datetime] = None) -> str:
+    """
+    Format a time the way SQLite's CURRENT_TIMESTAMP does (UTC)
+
+    Args:
+        value: Time to format (defaults to now)
+
+    Returns:
+        'YYYY-MM-DD HH:MM:SS' string
+    """
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
 
 class Database:
     """
@@ -32,6 +110,15 @@ class Database:
 
         self.db_path = str(db_path)
         logger.info(f"Database path: {self.db_path}")
+
+        # agent_token -> (expires_at, device) for the heartbeat hot path
+        self._device_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._cache_lock = threading.Lock()
+
+        # Bumped whenever this process changes a device or records
+        # heartbeats, so cached views (the dashboard) know to rebuild
+        self.devices_version = 0
+
         self._run_migrations()
 
     def _run_migrations(self):
@@ -139,6 +226,7 @@ class Database:
                         (agent_token, row['id'])
                     )
                     conn.commit()
+                    self.forget_cached_devices()
                     logger.info(f"Updated token for device {row['id']}")
 
                     # Fetch updated device to get the new token
@@ -154,6 +242,7 @@ class Database:
                 (store_id, device_label, agent_token)
             )
             conn.commit()
+            self.devices_changed()
             logger.info(f"Created new device: {device_label} at store {store_id}")
 
             # Fetch the newly created device
@@ -169,9 +258,18 @@ class Database:
         Args:
             agent_token: Agent token
 
+        Devices are cached by token for DEVICE_CACHE_SECONDS, so a device
+        heartbeating every minute is only read from SQLite occasionally.
+        Unknown tokens are not cached.
+
         Returns:
             Device dictionary with store info or None if not found
         """
+        with self._cache_lock:
+            entry = self._device_cache.get(agent_token)
+            if entry and entry[0] > time.monotonic():
+                return dict(entry[1])
+
         conn = self.get_connection()
         try:
             cursor = conn.execute("""
@@ -184,10 +282,27 @@ class Database:
                 WHERE d.agent_token = ?
             """, (agent_token,))
             row = cursor.fetchone()
-            return dict(row) if row else None
         finally:
             conn.close()
 
+        if not row:
+            return None
+        device = dict(row)
+        with self._cache_lock:
+            self._device_cache[agent_token] = (time.monotonic() + DEVICE_CACHE_SECONDS, device)
+        return dict(device)
+
+    def forget_cached_devices(self):
+        """Drop every cached token lookup (call after changing devices)"""
+        with self._cache_lock:
+            self._device_cache.clear()
+        self.devices_changed()
+
+    def devices_changed(self):
+        """Note that device rows or their latest heartbeats have changed"""
+        with self._cache_lock:
+            self.devices_version += 1
+
     def update_device_heartbeat(self, device_id: int, status: str, public_ip: Optional[str] = None):
         """
         Update device's last heartbeat timestamp and status
@@ -208,6 +323,7 @@ class Database:
                 (status, public_ip, device_id)
             )
             conn.commit()
+            self.devices_changed()
         finally:
             conn.close()
 
@@ -303,6 +419,7 @@ class Database:
             if cursor.rowcount == 0:
                 return None
 
+            self.forget_cached_devices()
             logger.info(f"Updated device {device_id}: label={device_label}, store={store_code}")
 
             # Return updated device
@@ -347,6 +464,7 @@ class Database:
             conn.commit()
             deleted = cursor.rowcount > 0
             if deleted:
+                self.forget_cached_devices()
                 logger.info(f"Deleted device {device_id}")
             return deleted
         finally:
@@ -385,33 +503,176 @@ class Database:
         """
         conn = self.get_connection()
         try:
-            # Convert boolean to int for SQLite
-            wake_flag = 1 if is_wake_event else 0
-            network_ok_flag = 1 if network_ok_on_wake else (0 if network_ok_on_wake is False else None)
+            cursor = self._insert_heartbeat(conn, {
+                'device_id': device_id,
+                'timestamp': timestamp,
+                'public_ip': public_ip,
+                'user_agent': user_agent,
+                'latency_ms': latency_ms,
+                'download_mbps': download_mbps,
+                'is_wake_event': is_wake_event,
+                'sleep_duration_seconds': sleep_duration_seconds,
+                'network_ok_on_wake': network_ok_on_wake,
+            })
+            self._rollup_heartbeat(conn, {
+                'device_id': device_id,
+                'timestamp': timestamp,
+                'latency_ms': latency_ms,
+                'download_mbps': download_mbps,
+                'is_wake_event': is_wake_event,
+                'sleep_duration_seconds': sleep_duration_seconds,
+            })
+            conn.commit()
+            self.devices_changed()
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _insert_heartbeat(conn: sqlite3.Connection, heartbeat: Dict[str, Any]) -> sqlite3.Cursor:
+        """Insert one heartbeat row (see record_heartbeat for the fields)"""
+        # Convert boolean to int for SQLite
+        wake_flag = 1 if heartbeat.get('is_wake_event') else 0
+        network_ok_on_wake = heartbeat.get('network_ok_on_wake')
+        network_ok_flag = 1 if network_ok_on_wake else (0 if network_ok_on_wake is False else None)
+
+        return conn.execute(
+            """INSERT INTO heartbeats
+               (device_id, timestamp, public_ip, user_agent, latency_ms, download_mbps,
+                is_wake_event, sleep_duration_seconds, network_ok_on_wake)
+               VALUES (?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?, ?, ?, ?, ?)""",
+            (heartbeat['device_id'], heartbeat.get('timestamp'), heartbeat.get('public_ip'),
+             heartbeat.get('user_agent'), heartbeat.get('latency_ms'),
+             heartbeat.get('download_mbps'), wake_flag,
+             heartbeat.get('sleep_duration_seconds'), network_ok_flag)
+        )
+
+    @staticmethod
+    def _rollup_heartbeat(conn: sqlite3.Connection, heartbeat: Dict[str, Any]):
+        """Add one heartbeat to its 5-minute and hourly rollup buckets"""
+        latency_ms = heartbeat.get('latency_ms')
+        download_mbps = heartbeat.get('download_mbps')
+        status = heartbeat.get('status') or heartbeat_status(latency_ms, download_mbps)
+        is_wake_event = bool(heartbeat.get('is_wake_event'))
+
+        conn.executemany(
+            """INSERT INTO heartbeat_rollups
+                   (device_id, bucket_seconds, bucket_start, heartbeat_count, online_count,
+                    latency_count, latency_sum, latency_min, latency_max,
+                    download_count, download_sum, download_min, download_max,
+                    wake_count, sleep_seconds_max)
+               VALUES (
+                   :device_id, :bucket_seconds,
+                   datetime(CAST(strftime('%s', COALESCE(:timestamp, CURRENT_TIMESTAMP)) AS INTEGER)
+                            / :bucket_seconds * :bucket_seconds, 'unixepoch'),
+                   1, :online, :latency_count, :latency, :latency, :latency,
+                   :download_count, :download, :download, :download, :wake, :sleep)
+               ON CONFLICT(device_id, bucket_seconds, bucket_start) DO UPDATE SET
+                   heartbeat_count = heartbeat_count + 1,
+                   online_count = online_count + excluded.online_count,
+                   latency_count = latency_count + excluded.latency_count,
+                   latency_sum = COALESCE(latency_sum, 0) + COALESCE(excluded.latency_sum, 0),
+                   latency_min = MIN(COALESCE(latency_min, excluded.latency_min),
+                                     COALESCE(excluded.latency_min, latency_min)),
+                   latency_max = MAX(COALESCE(latency_max, excluded.latency_max),
+                                     COALESCE(excluded.latency_max, latency_max)),
+                   download_count = download_count + excluded.download_count,
+                   download_sum = COALESCE(download_sum, 0) + COALESCE(excluded.download_sum, 0),
+                   download_min = MIN(COALESCE(download_min, excluded.download_min),
+                                      COALESCE(excluded.download_min, download_min)),
+                   download_max = MAX(COALESCE(download_max, excluded.download_max),
+                                      COALESCE(excluded.download_max, download_max)),
+                   wake_count = wake_count + excluded.wake_count,
+                   sleep_seconds_max = MAX(COALESCE(sleep_seconds_max, excluded.sleep_seconds_max),
+                                           COALESCE(excluded.sleep_seconds_max, sleep_seconds_max))""",
+            [{
+                'device_id': heartbeat['device_id'],
+                'bucket_seconds': bucket_seconds,
+                'timestamp': heartbeat.get('timestamp'),
+                'online': 1 if status == 'online' else 0,
+                'latency_count': 0 if latency_ms is None else 1,
+                'latency': latency_ms,
+                'download_count': 0 if download_mbps is None else 1,
+                'download': download_mbps,
+                'wake': 1 if is_wake_event else 0,
+                'sleep': heartbeat.get('sleep_duration_seconds') if is_wake_event else None,
+            } for bucket_seconds in ROLLUP_RESOLUTIONS]
+        )
+
+    def record_heartbeats(self, heartbeats: Iterable[Dict[str, Any]]) -> int:
+        """
+        Record a batch of heartbeats and update their devices in one transaction
+
+        Each heartbeat is inserted and added to its rollup buckets, then
+        every device in the batch gets one status update from its most
+        recent heartbeat (and its wake details, if any heartbeat was a wake
+        event). Heartbeats for devices deleted since they were queued are
+        dropped.
+
+        Args:
+            heartbeats: Heartbeat dictionaries with the record_heartbeat
+                fields plus status and received_at (when the server got it,
+                see format_heartbeat_timestamp)
 
-            if timestamp:
+        Returns:
+            Number of heartbeats written
+        """
+        heartbeats = list(heartbeats)
+        if not heartbeats:
+            return 0
+
+        conn = self.get_connection()
+        try:
+            with conn:
+                device_ids = sorted({hb['device_id'] for hb in heartbeats})
                 cursor = conn.execute(
-                    """INSERT INTO heartbeats
-                       (device_id, timestamp, public_ip, user_agent, latency_ms, download_mbps,
-                        is_wake_event, sleep_duration_seconds, network_ok_on_wake)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (device_id, timestamp, public_ip, user_agent, latency_ms, download_mbps,
-                     wake_flag, sleep_duration_seconds, network_ok_flag)
+                    f"SELECT id FROM devices WHERE id IN ({', '.join('?' * len(device_ids))})",
+                    device_ids
                 )
-            else:
-                cursor = conn.execute(
-                    """INSERT INTO heartbeats
-                       (device_id, public_ip, user_agent, latency_ms, download_mbps,
-                        is_wake_event, sleep_duration_seconds, network_ok_on_wake)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (device_id, public_ip, user_agent, latency_ms, download_mbps,
-                     wake_flag, sleep_duration_seconds, network_ok_flag)
+                existing = {row['id'] for row in cursor.fetchall()}
+
+                written = 0
+                latest: Dict[int, Dict[str, Any]] = {}
+                woke: Dict[int, Dict[str, Any]] = {}
+                for hb in heartbeats:
+                    if hb['device_id'] not in existing:
+                        continue
+                    self._insert_heartbeat(conn, hb)
+                    self._rollup_heartbeat(conn, hb)
+                    written += 1
+                    latest[hb['device_id']] = hb
+                    if hb.get('is_wake_event'):
+                        woke[hb['device_id']] = hb
+
+                conn.executemany(
+                    """UPDATE devices
+                       SET last_heartbeat_at = ?,
+                           last_status = ?,
+                           last_public_ip = COALESCE(?, last_public_ip)
+                       WHERE id = ?""",
+                    [(hb['received_at'], hb['status'], hb.get('public_ip'), device_id)
+                     for device_id, hb in latest.items()]
+                )
+                conn.executemany(
+                    """UPDATE devices
+                       SET last_wake_at = ?,
+                           last_sleep_duration_seconds = ?
+                       WHERE id = ?""",
+                    [(hb['received_at'], hb.get('sleep_duration_seconds'), device_id)
+                     for device_id, hb in woke.items()]
                 )
-            conn.commit()
-            return cursor.lastrowid
         finally:
             conn.close()
 
+        if written:
+            self.devices_changed()
+        dropped = len(heartbeats) - written
+        if dropped:
+            logger.warning(f"Dropped {dropped} heartbeats for deleted devices")
+        for device_id, hb in woke.items():
+            logger.info(f"Device {device_id} woke from sleep ({hb.get('sleep_duration_seconds')}s)")
+        return written
+
     def update_device_wake(self, device_id: int, sleep_duration_seconds: Optional[int] = None):
         """
         Update device's last wake time and sleep duration
@@ -430,6 +691,7 @@ class Database:
                 (sleep_duration_seconds, device_id)
             )
             conn.commit()
+            self.devices_changed()
             logger.info(f"Device {device_id} woke from sleep ({sleep_duration_seconds}s)")
         finally:
             conn.close()
@@ -465,29 +727,63 @@ class Database:
     def get_device_latency_history(
         self,
         device_id: int,
-        hours: int = 24
+        hours: int = 24,
+        resolution: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Get latency history for a device over a time period
 
+        Short windows read raw heartbeats; longer ones read 5-minute or
+        hourly rollups, so the rows read depend on the window and not on
+        how much history is kept.
+
         Args:
             device_id: Device ID
             hours: Number of hours of history to retrieve
+            resolution: 0 for raw heartbeats or a rollup bucket size in
+                seconds (defaults to history_resolution(hours))
 
         Returns:
-            List of heartbeat dictionaries with latency data, oldest first
+            List of heartbeat (or rollup bucket) dictionaries with latency
+            data, oldest first. Rollup buckets report the average latency
+            and download as latency_ms and download_mbps, plus their min,
+            max and heartbeat counts.
         """
+        if resolution is None:
+            resolution = history_resolution(hours)
+
         conn = self.get_connection()
         try:
+            if not resolution:
+                cursor = conn.execute(
+                    """SELECT id, timestamp, latency_ms, download_mbps,
+                              is_wake_event, sleep_duration_seconds
+                       FROM heartbeats
+                       WHERE device_id = ?
+                         AND latency_ms IS NOT NULL
+                         AND timestamp >= datetime('now', '-' || ? || ' hours')
+                       ORDER BY timestamp ASC""",
+                    (device_id, hours)
+                )
+                return [dict(row) for row in cursor.fetchall()]
+
             cursor = conn.execute(
-                """SELECT id, timestamp, latency_ms, download_mbps,
-                          is_wake_event, sleep_duration_seconds
-                   FROM heartbeats
+                """SELECT bucket_start AS timestamp,
+                          latency_sum / latency_count AS latency_ms,
+                          latency_min, latency_max,
+                          CASE WHEN download_count > 0
+                               THEN download_sum / download_count END AS download_mbps,
+                          download_min, download_max,
+                          heartbeat_count, online_count,
+                          CASE WHEN wake_count > 0 THEN 1 ELSE 0 END AS is_wake_event,
+                          sleep_seconds_max AS sleep_duration_seconds
+                   FROM heartbeat_rollups
                    WHERE device_id = ?
-                     AND latency_ms IS NOT NULL
-                     AND timestamp >= datetime('now', '-' || ? || ' hours')
-                   ORDER BY timestamp ASC""",
-                (device_id, hours)
+                     AND bucket_seconds = ?
+                     AND latency_count > 0
+                     AND bucket_start >= datetime('now', '-' || ? || ' hours')
+                   ORDER BY bucket_start ASC""",
+                (device_id, resolution, hours)
             )
             return [dict(row) for row in cursor.fetchall()]
         finally:
@@ -519,25 +815,63 @@ class Database:
         finally:
             conn.close()
 
-    def cleanup_old_heartbeats(self, days: int = 30):
+    def cleanup_old_heartbeats(
+        self,
+        raw_hours: float = RAW_RETENTION_HOURS,
+        five_minute_days: float = FIVE_MINUTE_RETENTION_DAYS,
+        hourly_days: Optional[float] = None
+    ) -> Dict[str, int]:
         """
-        Delete heartbeats older than specified days
+        Trim each heartbeat tier to its retention period
+
+        Rollups are written as heartbeats arrive, so trimming raw rows loses
+        no chart history beyond the detail of the finer tiers.
 
         Args:
-            days: Number of days to keep
+            raw_hours: Hours of raw heartbeats to keep
+            five_minute_days: Days of 5-minute rollups to keep
+            hourly_days: Days of hourly rollups to keep (None keeps them all)
+
+        Returns:
+            Rows deleted per tier
         """
         conn = self.get_connection()
         try:
-            conn.execute(
-                """DELETE FROM heartbeats
-                   WHERE timestamp < datetime('now', '-' || ? || ' days')""",
-                (days,)
-            )
-            conn.commit()
-            logger.info(f"Cleaned up heartbeats older than {days} days")
+            deleted = {}
+            with conn:
+                cursor = conn.execute(
+                    """DELETE FROM heartbeats
+                       WHERE timestamp < datetime('now', '-' || ? || ' hours')""",
+                    (raw_hours,)
+                )
+                deleted['raw'] = cursor.rowcount
+
+                cursor = conn.execute(
+                    """DELETE FROM heartbeat_rollups
+                       WHERE bucket_seconds = 300
+                         AND bucket_start < datetime('now', '-' || ? || ' days')""",
+                    (five_minute_days,)
+                )
+                deleted['five_minute'] = cursor.rowcount
+
+                deleted['hourly'] = 0
+                if hourly_days is not None:
+                    cursor = conn.execute(
+                        """DELETE FROM heartbeat_rollups
+                           WHERE bucket_seconds = 3600
+                             AND bucket_start < datetime('now', '-' || ? || ' days')""",
+                        (hourly_days,)
+                    )
+                    deleted['hourly'] = cursor.rowcount
         finally:
             conn.close()
 
+        logger.info(
+            f"Cleaned up heartbeats: {deleted['raw']} raw, {deleted['five_minute']} "
+            f"5-minute and {deleted['hourly']} hourly rows"
+        )
+        return deleted
+
     # Registration code operations
 
     def create_registration_code(
@@ -613,6 +947,7 @@ class Database:
                     (code, store_code, device_label)
                 )
             conn.commit()
+            self.forget_cached_devices()
 
             # Fetch the created code
             cursor = conn.execute(
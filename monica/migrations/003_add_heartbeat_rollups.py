@@ -0,0 +1,70 @@
+"""Add downsampled heartbeat rollups (5-minute and hourly tiers).
+
+Existing heartbeats are folded into both tiers so charts keep their
+history once raw heartbeats are trimmed to the last 48 hours.
+"""
+
+ROLLUP_RESOLUTIONS = (300, 3600)
+
+
+def up(conn):
+    """Create the rollup table and backfill it from raw heartbeats."""
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS heartbeat_rollups (
+            device_id INTEGER NOT NULL,
+            bucket_seconds INTEGER NOT NULL,  -- 300 (5 minutes) or 3600 (hourly)
+            bucket_start DATETIME NOT NULL,   -- UTC, YYYY-MM-DD HH:MM:SS
+            heartbeat_count INTEGER NOT NULL DEFAULT 0,
+            online_count INTEGER NOT NULL DEFAULT 0,
+            latency_count INTEGER NOT NULL DEFAULT 0,
+            latency_sum REAL,
+            latency_min REAL,
+            latency_max REAL,
+            download_count INTEGER NOT NULL DEFAULT 0,
+            download_sum REAL,
+            download_min REAL,
+            download_max REAL,
+            wake_count INTEGER NOT NULL DEFAULT 0,
+            sleep_seconds_max INTEGER,
+            PRIMARY KEY (device_id, bucket_seconds, bucket_start),
+            FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_heartbeat_rollups_retention
+        ON heartbeat_rollups(bucket_seconds, bucket_start)
+    ''')
+
+    # Backfill. Raw heartbeats don't store a status, so use the same rule
+    # as ingest: degraded on high latency or slow download.
+    for bucket_seconds in ROLLUP_RESOLUTIONS:
+        cursor.execute('''
+            INSERT OR IGNORE INTO heartbeat_rollups
+                (device_id, bucket_seconds, bucket_start, heartbeat_count, online_count,
+                 latency_count, latency_sum, latency_min, latency_max,
+                 download_count, download_sum, download_min, download_max,
+                 wake_count, sleep_seconds_max)
+            SELECT
+                device_id,
+                ?,
+                datetime(CAST(strftime('%s', timestamp) AS INTEGER) / ? * ?, 'unixepoch'),
+                COUNT(*),
+                SUM(CASE WHEN COALESCE(latency_ms, 0) > 500 OR COALESCE(download_mbps, 10) < 10
+                         THEN 0 ELSE 1 END),
+                COUNT(latency_ms), SUM(latency_ms), MIN(latency_ms), MAX(latency_ms),
+                COUNT(download_mbps), SUM(download_mbps), MIN(download_mbps), MAX(download_mbps),
+                SUM(CASE WHEN is_wake_event = 1 THEN 1 ELSE 0 END),
+                MAX(CASE WHEN is_wake_event = 1 THEN sleep_duration_seconds END)
+            FROM heartbeats
+            WHERE timestamp IS NOT NULL
+            GROUP BY device_id, 3
+        ''', (bucket_seconds, bucket_seconds, bucket_seconds))
+
+
+def down(conn):
+    """Drop the rollup table."""
+    cursor = conn.cursor()
+    cursor.execute('DROP INDEX IF EXISTS idx_heartbeat_rollups_retention')
+    cursor.execute('DROP TABLE IF EXISTS heartbeat_rollups')
@@ -0,0 +1,176 @@
+"""
+Monica Dashboard Service
+Cached dashboard model with versioned per-device changes
+"""
+
+import time
+import secrets
+import threading
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from monica.config import config
+from monica.database.db import db
+from monica.services.status_service import status_service
+
+logger = logging.getLogger(__name__)
+
+# Enriched device fields shown on a dashboard card; a device counts as
+# changed when any of them do
+CARD_FIELDS = (
+    'store_code', 'device_label', 'computed_status', 'status_emoji', 'status_label',
+    'last_seen_text', 'is_pending', 'registration_code', 'recently_woke',
+    'last_latency_ms', 'last_public_ip',
+)
+
+
+def _card_signature(device: Dict[str, Any]) -> tuple:
+    """What a device's dashboard card shows"""
+    wake_info = device.get('wake_info') or {}
+    return tuple(device.get(field) for field in CARD_FIELDS) + (wake_info.get('sleep_duration_text'),)
+
+
+class DashboardService:
+    """
+    Builds the dashboard's device list once and serves it until it's stale
+
+    The model is rebuilt when the database reports device changes (new
+    heartbeats written, devices edited) or when it's older than
+    max_age_seconds, since statuses and "last seen" text also change as
+    time passes. Each rebuild bumps the version only if some card changed,
+    and remembers which version each device last changed in, so clients
+    can ask for just the devices that changed since the version they have.
+    """
+
+    def __init__(self, database=None, max_age_seconds: float = 10):
+        """
+        Initialize the service
+
+        Args:
+            database: Database to read (defaults to the global db)
+            max_age_seconds: Longest a built model is served without rebuilding
+        """
+        self.db = database or db
+        self.max_age_seconds = max_age_seconds
+
+        # Versions from another process (or before a restart) can't be
+        # compared with ours, so they're tagged with a per-process epoch
+        self._epoch = secrets.token_hex(4)
+        self._version = 0
+        self._devices: List[Dict[str, Any]] = []
+        # device_id -> (card signature, version it last changed in)
+        self._cards: Dict[int, Tuple[tuple, int]] = {}
+        # device_id -> version it was removed in
+        self._removed: Dict[int, int] = {}
+        self._built_at: Optional[float] = None
+        self._built_from: Optional[int] = None
+        self._lock = threading.Lock()
+
+        self.rebuilds = 0
+
+    @property
+    def version(self) -> str:
+        """Current version token (epoch.counter)"""
+        return f"{self._epoch}.{self._version}"
+
+    def get_model(self) -> Dict[str, Any]:
+        """
+        Get the dashboard model, rebuilding it first if stale
+
+        Returns:
+            Dict with version and devices (enriched, sorted by store then label)
+        """
+        with self._lock:
+            self._refresh()
+            return {'version': self.version, 'devices': list(self._devices)}
+
+    def get_changes(self, since: Optional[str]) -> Dict[str, Any]:
+        """
+        Get devices whose card changed after a version
+
+        Args:
+            since: Version token from an earlier model or change set
+
+        Returns:
+            Dict with version, full (True when since couldn't be used and
+            every device is included), devices and removed device IDs
+        """
+        with self._lock:
+            self._refresh()
+
+            since_version = self._parse_version(since)
+            if since_version is None:
+                return {
+                    'version': self.version,
+                    'full': True,
+                    'devices': list(self._devices),
+                    'removed': []
+                }
+
+            return {
+                'version': self.version,
+                'full': False,
+                'devices': [d for d in self._devices if self._cards[d['id']][1] > since_version],
+                'removed': sorted(
+                    device_id for device_id, version in self._removed.items()
+                    if version > since_version
+                )
+            }
+
+    def invalidate(self):
+        """Rebuild the model on its next use"""
+        with self._lock:
+            self._built_at = None
+
+    def _parse_version(self, token: Optional[str]) -> Optional[int]:
+        """Counter from one of our version tokens, or None if it isn't ours"""
+        if not token:
+            return None
+        epoch, _, counter = token.partition('.')
+        if epoch != self._epoch or not counter.isdigit() or int(counter) > self._version:
+            return None
+        return int(counter)
+
+    def _refresh(self):
+        """Rebuild the model if the database changed or it's too old (lock held)"""
+        fresh = (
+            self._built_at is not None
+            and self._built_from == self.db.devices_version
+            and time.monotonic() - self._built_at < self.max_age_seconds
+        )
+        if fresh:
+            return
+
+        built_from = self.db.devices_version
+        devices = [status_service.enrich_device(d) for d in self.db.get_all_devices_with_stores()]
+        devices.sort(key=lambda d: (d['store_code'], d['device_label']))
+
+        next_version = self._version + 1
+        changed = False
+        cards = {}
+        for device in devices:
+            signature = _card_signature(device)
+            previous = self._cards.get(device['id'])
+            if previous and previous[0] == signature:
+                cards[device['id']] = previous
+            else:
+                cards[device['id']] = (signature, next_version)
+                changed = True
+
+        for device_id in self._cards.keys() - cards.keys():
+            self._removed[device_id] = next_version
+            changed = True
+        for device_id in cards.keys() & self._removed.keys():
+            del self._removed[device_id]
+
+        if changed:
+            self._version = next_version
+        self._devices = devices
+        self._cards = cards
+        self._built_at = time.monotonic()
+        self._built_from = built_from
+        self.rebuilds += 1
+
+
+# Global service instance
+dashboard_service = DashboardService(max_age_seconds=config.dashboard_cache_seconds)
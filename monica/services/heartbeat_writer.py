@@ -0,0 +1,223 @@
+"""Write-behind heartbeat writer for Monica.
+
+Every store device heartbeats once a minute, and recording one used to cost
+a token lookup, a heartbeat insert, an optional wake update and a device
+update, each on its own connection and commit. The request handler now only
+validates and queues the heartbeat; a background thread writes the queue
+with Database.record_heartbeats in one transaction every
+flush_interval_seconds, or sooner once flush_batch_size are waiting.
+
+The same thread trims old heartbeats and rollups to their retention
+periods every cleanup_interval_seconds.
+"""
+import time
+import threading
+import logging
+from typing import Optional, Dict, Any, List
+
+from monica.config import config
+from monica.database.db import db, format_heartbeat_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class HeartbeatWriter:
+    """Queues device heartbeats and writes them in batches."""
+
+    def __init__(
+        self,
+        database=None,
+        flush_interval_seconds: float = 2.0,
+        flush_batch_size: int = 100,
+        max_pending: int = 5000,
+        cleanup_interval_seconds: float = 3600,
+        retention: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the heartbeat writer.
+
+        Args:
+            database: Database to write to (defaults to the global db)
+            flush_interval_seconds: Longest a queued heartbeat waits before
+                being written
+            flush_batch_size: Write as soon as this many heartbeats are queued
+            max_pending: Heartbeats kept queued while writes are failing; the
+                oldest are dropped beyond this
+            cleanup_interval_seconds: Seconds between retention cleanups
+                (0 disables them)
+            retention: Keyword arguments for Database.cleanup_old_heartbeats
+        """
+        self.db = database or db
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_batch_size = flush_batch_size
+        self.max_pending = max_pending
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self.retention = retention or {}
+        self._last_cleanup = time.monotonic()
+
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        # Serialises flushes so batches are committed in the order queued
+        self._flush_lock = threading.Lock()
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._running = False
+
+        self.heartbeats_written = 0
+        self.batches_written = 0
+
+    def start(self):
+        """Start the background flush thread."""
+        if self._running:
+            logger.warning("Heartbeat writer already running")
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._running = True
+        logger.info(
+            f"Heartbeat writer started (every {self.flush_interval_seconds}s "
+            f"or {self.flush_batch_size} heartbeats)"
+        )
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flush thread and write anything still queued."""
+        if not self._running:
+            return
+
+        logger.info("Stopping heartbeat writer...")
+        self._stop_event.set()
+        self._wake_event.set()
+
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning("Heartbeat writer thread did not stop cleanly")
+
+        self._running = False
+        self.flush()
+        logger.info("Heartbeat writer stopped")
+
+    def is_running(self) -> bool:
+        """Check if the writer is running."""
+        return self._running and self._thread and self._thread.is_alive()
+
+    def submit(self, heartbeat: Dict[str, Any]):
+        """
+        Queue a heartbeat for the next batch write.
+
+        The heartbeat is stamped with the time it was received, which becomes
+        the device's last_heartbeat_at (and the heartbeat's own timestamp if
+        the device didn't send one), so buffering doesn't make devices look
+        late. When the writer isn't running (scripts, tests) the heartbeat is
+        written immediately.
+
+        Args:
+            heartbeat: Heartbeat dictionary with the Database.record_heartbeat
+                fields plus the computed device status
+        """
+        heartbeat = dict(heartbeat)
+        heartbeat['received_at'] = format_heartbeat_timestamp()
+        if heartbeat.get('timestamp') is None:
+            heartbeat['timestamp'] = heartbeat['received_at']
+
+        if not self.is_running():
+            self.db.record_heartbeats([heartbeat])
+            return
+
+        with self._lock:
+            self._pending.append(heartbeat)
+            full = len(self._pending) >= self.flush_batch_size
+        if full:
+            self._wake_event.set()
+
+    def pending_count(self) -> int:
+        """Number of heartbeats waiting to be written."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write every queued heartbeat in one transaction.
+
+        Returns:
+            Number of heartbeats taken off the queue
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            try:
+                self.db.record_heartbeats(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} heartbeats: {e}")
+                with self._lock:
+                    self._pending = batch + self._pending
+                    overflow = len(self._pending) - self.max_pending
+                    if overflow > 0:
+                        del self._pending[:overflow]
+                        logger.warning(f"Heartbeat queue full, dropped {overflow} oldest heartbeats")
+                raise
+
+            self.heartbeats_written += len(batch)
+            self.batches_written += 1
+            return len(batch)
+
+    def cleanup(self) -> Dict[str, int]:
+        """
+        Trim heartbeats and rollups to their retention periods.
+
+        Returns:
+            Rows deleted per tier
+        """
+        self._last_cleanup = time.monotonic()
+        return self.db.cleanup_old_heartbeats(**self.retention)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth and write counters, for health endpoints."""
+        return {
+            'running': bool(self.is_running()),
+            'pending': self.pending_count(),
+            'heartbeats_written': self.heartbeats_written,
+            'batches_written': self.batches_written,
+            'flush_interval_seconds': self.flush_interval_seconds,
+            'flush_batch_size': self.flush_batch_size,
+        }
+
+    def _run(self):
+        """Flush loop: write on the interval, or early when a batch fills."""
+        logger.info("Heartbeat writer thread started")
+
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.flush_interval_seconds)
+            self._wake_event.clear()
+            try:
+                self.flush()
+                if (self.cleanup_interval_seconds
+                        and time.monotonic() - self._last_cleanup >= self.cleanup_interval_seconds):
+                    self.cleanup()
+            except Exception as e:
+                logger.exception(f"Error in heartbeat writer loop: {e}")
+                # Back off so a locked database isn't hammered
+                self._stop_event.wait(self.flush_interval_seconds)
+
+        logger.info("Heartbeat writer thread exiting")
+
+
+# Global writer instance
+heartbeat_writer = HeartbeatWriter(
+    flush_interval_seconds=config.ingest_flush_interval_seconds,
+    flush_batch_size=config.ingest_flush_batch_size,
+    max_pending=config.ingest_max_pending,
+    cleanup_interval_seconds=config.cleanup_interval_seconds,
+    retention={
+        'raw_hours': config.raw_retention_hours,
+        'five_minute_days': config.five_minute_retention_days,
+        'hourly_days': config.hourly_retention_days,
+    }
+)
@@ -11,7 +11,8 @@ from config import config
 logger = logging.getLogger(__name__)
 
 # Default polling configuration
-DEFAULT_POLL_INTERVAL = 5  # seconds between status checks
+DEFAULT_POLL_INTERVAL = 1  # seconds before the first status check
+DEFAULT_MAX_POLL_INTERVAL = 5  # back-off cap while a job isn't moving (the old fixed poll)
 DEFAULT_MAX_WAIT_TIME = 3600  # 1 hour max wait time
 
 
@@ -24,6 +25,7 @@ class PriceChecker:
         self.banji = BotHttpClient(self.banji_url, timeout=30)
         # Polling configuration
         self.poll_interval = DEFAULT_POLL_INTERVAL
+        self.max_poll_interval = DEFAULT_MAX_POLL_INTERVAL
         self.max_wait_time = DEFAULT_MAX_WAIT_TIME
 
     def check_price(self, quote_id: str, org: str) -> Dict:
@@ -147,6 +149,11 @@ class PriceChecker:
         """
         Poll for job completion and return results.
 
+        Each status check is a quick GET /api/quotes/jobs/<id>, so Banji's
+        single worker is never held waiting on a job. The delay between
+        checks starts at poll_interval and doubles up to max_poll_interval
+        while the job isn't moving, dropping back when progress changes.
+
         Args:
             job_id: The job ID to poll
             quote_ids: Original quote IDs (for error results if needed)
@@ -156,7 +163,9 @@ class PriceChecker:
             List of result dicts
         """
         start_time = time.time()
-        last_progress = None
+        interval = self.poll_interval
+        last_state = None
+        last_message = None
 
         while True:
             elapsed = time.time() - start_time
@@ -171,42 +180,43 @@ class PriceChecker:
                 response = self.banji.get(f'/api/quotes/jobs/{job_id}')
                 if response.status_code != 200:
                     logger.error(f"Failed to get job status: HTTP {response.status_code}")
-                    time.sleep(self.poll_interval)
-                    continue
-
-                job = response.json().get('job', {})
-                status = job.get('status')
-                progress_msg = job.get('progress_message')
-
-                # Log progress updates (but not every poll)
-                if progress_msg and progress_msg != last_progress:
-                    logger.info(f"Job {job_id}: {progress_msg}")
-                    last_progress = progress_msg
-
-                if status == 'completed':
-                    result_data = job.get('result', {})
-                    logger.info(
-                        f"Job {job_id} completed: "
-                        f"{result_data.get('successful', 0)}/{result_data.get('total_quotes', 0)} successful"
-                    )
-                    return self._format_batch_results(result_data, org)
-
-                elif status == 'failed':
-                    error = job.get('error', 'Unknown error')
-                    logger.error(f"Job {job_id} failed: {error}")
-                    return self._make_error_results(quote_ids, org, error)
-
-                elif status in ('pending', 'processing'):
-                    # Still running, wait and poll again
-                    time.sleep(self.poll_interval)
-
                 else:
-                    logger.warning(f"Job {job_id} has unknown status: {status}")
-                    time.sleep(self.poll_interval)
+                    job = response.json().get('job', {})
+                    status = job.get('status')
+                    progress_msg = job.get('progress_message')
+
+                    # Log progress updates (but not every poll)
+                    if progress_msg and progress_msg != last_message:
+                        logger.info(f"Job {job_id}: {progress_msg}")
+                        last_message = progress_msg
+
+                    if status == 'completed':
+                        result_data = job.get('result', {})
+                        logger.info(
+                            f"Job {job_id} completed: "
+                            f"{result_data.get('successful', 0)}/{result_data.get('total_quotes', 0)} successful"
+                        )
+                        return self._format_batch_results(result_data, org)
+
+                    elif status == 'failed':
+                        error = job.get('error', 'Unknown error')
+                        logger.error(f"Job {job_id} failed: {error}")
+                        return self._make_error_results(quote_ids, org, error)
+
+                    elif status not in ('pending', 'processing'):
+                        logger.warning(f"Job {job_id} has unknown status: {status}")
+
+                    # Moving again: check back soon
+                    state = (status, job.get('progress_current'))
+                    if state != last_state:
+                        interval = self.poll_interval
+                        last_state = state
 
             except Exception as e:
                 logger.warning(f"Error polling job {job_id}: {e}")
-                time.sleep(self.poll_interval)
+
+            time.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
 
     def _format_batch_results(self, result_data: Dict, org: str) -> List[Dict]:
         """Format Banji's batch results to our standard format."""
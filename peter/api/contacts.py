@@ -60,17 +60,19 @@ def get_contacts():
 @api_bp.route('/contacts/search', methods=['GET'])
 def search_contacts():
     """
-    GET /api/contacts/search?q=query
+    GET /api/contacts/search?q=query&limit=10
 
-    Search for contacts
+    Search for contacts, best match first. Words match as prefixes, so this
+    can be called on each keystroke for type-ahead.
     """
     query = request.args.get('q', '')
+    limit = request.args.get('limit', type=int)
 
     if not query:
         return jsonify({'error': 'Query parameter "q" is required'}), 400
 
     try:
-        results = staff_db.search_staff(query)
+        results = staff_db.search_staff(query, limit=limit)
 
         # Convert to old format for compatibility
         formatted = []
@@ -1,11 +1,37 @@
 """
 Database service for Peter's staff database
 """
+import re
 import sqlite3
 import os
 from datetime import datetime
 from shared.migrations import MigrationRunner
 
+# A search made only of digits and phone punctuation is a number lookup
+PHONE_QUERY = re.compile(r'[\d\s()+./-]+')
+
+# Column weights for ranking text matches: name, position, section,
+# work_email, google_primary_email (same order as staff_fts)
+SEARCH_WEIGHTS = (10.0, 3.0, 2.0, 5.0, 5.0)
+
+
+def normalise_digits(value):
+    """
+    Reduce a phone number or extension to digits, as the staff_digits index does
+
+    Australian numbers written with +61 become their 0-prefixed form.
+
+    Args:
+        value: Phone number, extension or search text
+
+    Returns:
+        Digit string (may be empty)
+    """
+    digits = re.sub(r'\D', '', value or '')
+    if len(digits) == 11 and digits.startswith('61'):
+        digits = '0' + digits[2:]
+    return digits
+
 
 class StaffDatabase:
     """SQLite database for staff information"""
@@ -145,32 +171,55 @@ class StaffDatabase:
         conn.close()
         return emails
 
-    def search_staff(self, query):
+    def search_staff(self, query, limit=None):
         """
-        Search for staff by name, extension, or phone
+        Search active staff by name, position, section, email, extension or phone
+
+        Words match as prefixes, so partial input works for type-ahead, and
+        results are ranked by relevance (name matches first). A query of only
+        digits and phone punctuation is looked up in the phone digits index,
+        matching the start of an extension, a full number, or a number
+        without its leading 0 or area code.
 
         Args:
             query: Search string
+            limit: Maximum number of results (optional)
 
         Returns:
-            List of matching staff dictionaries
+            List of matching staff dictionaries, best match first
         """
-        conn = self.get_connection()
+        terms = re.findall(r'[^\W_]+', query.lower())
+        if not terms:
+            return []
 
-        # Use LIKE for partial matching
-        search_pattern = f'%{query}%'
-
-        cursor = conn.execute('''
-            SELECT * FROM staff
-            WHERE (name LIKE ? OR
-                   extension LIKE ? OR
-                   phone_fixed LIKE ? OR
-                   phone_mobile LIKE ? OR
-                   work_email LIKE ? OR
-                   google_primary_email LIKE ?)
-            AND status = ?
-            ORDER BY name
-        ''', (search_pattern, search_pattern, search_pattern, search_pattern, search_pattern, search_pattern, 'active'))
+        conn = self.get_connection()
+        digits = normalise_digits(query)
+
+        if digits and PHONE_QUERY.fullmatch(query):
+            # ':' sorts straight after '9', so this is a prefix range scan
+            cursor = conn.execute('''
+                SELECT s.* FROM staff s
+                JOIN (
+                    SELECT staff_id, MIN(LENGTH(digits)) AS closeness
+                    FROM staff_digits
+                    WHERE digits >= ? AND digits < ?
+                    GROUP BY staff_id
+                ) matches ON matches.staff_id = s.id
+                WHERE s.status = ?
+                ORDER BY matches.closeness, s.name
+                LIMIT ?
+            ''', (digits, digits + ':', 'active', limit or -1))
+        else:
+            match = ' '.join(f'"{term}"*' for term in terms)
+            weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+            cursor = conn.execute(f'''
+                SELECT s.* FROM staff_fts
+                JOIN staff s ON s.id = staff_fts.rowid
+                WHERE staff_fts MATCH ?
+                AND s.status = ?
+                ORDER BY bm25(staff_fts, {weights}), s.name
+                LIMIT ?
+            ''', (match, 'active', limit or -1))
 
         staff = [dict(row) for row in cursor.fetchall()]
         conn.close()
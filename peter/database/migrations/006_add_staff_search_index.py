@@ -0,0 +1,116 @@
+"""
+Add full-text and phone-digit search indexes for staff.
+
+staff_fts is an FTS5 index over name, position, section and the work and
+Google emails, used for ranked prefix (type-ahead) search. staff_digits
+holds each extension and phone number reduced to its digits, with +61
+numbers rewritten to their 0-prefixed form, plus the number without its
+trunk 0 and without its area code, so "6280 1234", "0262801234" and
+"+61 2 6280 1234" all find the same person.
+
+Both are kept in sync with the staff table by triggers and backfilled here.
+"""
+
+FTS_COLUMNS = ('name', 'position', 'section', 'work_email', 'google_primary_email')
+PHONE_COLUMNS = ('extension', 'phone_fixed', 'phone_mobile')
+
+# Characters stripped from phone numbers before indexing
+PHONE_SEPARATORS = (' ', '-', '(', ')', '+', '.', '/')
+
+
+def _digits_sql(column):
+    """SQL expression for a phone column reduced to digits, +61 as 0"""
+    expr = f"COALESCE({column}, '')"
+    for separator in PHONE_SEPARATORS:
+        expr = f"REPLACE({expr}, '{separator}', '')"
+    return (
+        f"CASE WHEN {expr} GLOB '61[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]' "
+        f"THEN '0' || SUBSTR({expr}, 3) ELSE {expr} END"
+    )
+
+
+def _digits_insert_sql(row, from_staff=False):
+    """
+    INSERT ... SELECT of every indexed digit string for a staff row
+
+    row is 'new' inside triggers, or 'staff' with from_staff=True to index
+    every existing row.
+    """
+    source = ' FROM staff' if from_staff else ''
+    numbers = ' UNION ALL '.join(
+        f'SELECT {row}.id AS staff_id, {_digits_sql(f"{row}.{column}")} AS n{source}'
+        for column in PHONE_COLUMNS
+    )
+    return f'''
+        INSERT OR IGNORE INTO staff_digits (digits, staff_id)
+        SELECT SUBSTR(numbers.n, offsets.start), numbers.staff_id
+        FROM ({numbers}) AS numbers,
+             (SELECT 1 AS start UNION ALL SELECT 2 UNION ALL SELECT 3) AS offsets
+        WHERE numbers.n != ''
+          AND numbers.n NOT GLOB '*[^0-9]*'
+          AND (offsets.start = 1 OR (LENGTH(numbers.n) = 10 AND SUBSTR(numbers.n, 1, 1) = '0'))
+    '''
+
+
+def _fts_values(row):
+    return ', '.join(f'{row}.{column}' for column in FTS_COLUMNS)
+
+
+def up(conn):
+    """Create the search indexes, their triggers, and backfill them"""
+    cursor = conn.cursor()
+    columns = ', '.join(FTS_COLUMNS)
+
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS staff_fts USING fts5(
+            {columns},
+            content='staff',
+            content_rowid='id',
+            prefix='1 2 3',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS staff_digits (
+            digits TEXT NOT NULL,
+            staff_id INTEGER NOT NULL,
+            PRIMARY KEY (digits, staff_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_staff_digits_staff ON staff_digits(staff_id)')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS staff_search_ai AFTER INSERT ON staff BEGIN
+            INSERT INTO staff_fts (rowid, {columns}) VALUES (new.id, {_fts_values('new')});
+            {_digits_insert_sql('new')};
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS staff_search_ad AFTER DELETE ON staff BEGIN
+            INSERT INTO staff_fts (staff_fts, rowid, {columns}) VALUES ('delete', old.id, {_fts_values('old')});
+            DELETE FROM staff_digits WHERE staff_id = old.id;
+        END
+    ''')
+    watched = ', '.join(FTS_COLUMNS + PHONE_COLUMNS)
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS staff_search_au AFTER UPDATE OF {watched} ON staff BEGIN
+            INSERT INTO staff_fts (staff_fts, rowid, {columns}) VALUES ('delete', old.id, {_fts_values('old')});
+            INSERT INTO staff_fts (rowid, {columns}) VALUES (new.id, {_fts_values('new')});
+            DELETE FROM staff_digits WHERE staff_id = old.id;
+            {_digits_insert_sql('new')};
+        END
+    ''')
+
+    # Backfill existing staff
+    cursor.execute("INSERT INTO staff_fts (staff_fts) VALUES ('rebuild')")
+    cursor.execute(_digits_insert_sql('staff', from_staff=True))
+
+
+def down(conn):
+    """Drop the search indexes and their triggers"""
+    cursor = conn.cursor()
+    for trigger in ('staff_search_ai', 'staff_search_ad', 'staff_search_au'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    cursor.execute('DROP TABLE IF EXISTS staff_digits')
+    cursor.execute('DROP TABLE IF EXISTS staff_fts')
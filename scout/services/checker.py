@@ -11,6 +11,7 @@ from typing import Optional
 from config import config
 from database.db import db
 from services.bot_clients import mavis_client, fiona_client, sadie_client, peter_client, fred_client, nigel_client
+from shared.async_http_client import fan_out
 
 logger = logging.getLogger(__name__)
 
@@ -747,14 +748,19 @@ class CheckerService:
         return result
 
     def get_bot_status(self) -> dict:
-        """Get connection status for all dependent bots"""
+        """Get connection status for all dependent bots (checked concurrently)"""
+        results = fan_out({
+            'mavis': mavis_client.check_connection,
+            'fiona': fiona_client.check_connection,
+            'sadie': sadie_client.check_connection,
+            'peter': peter_client.check_connection,
+            'fred': fred_client.check_connection,
+            'nigel': nigel_client.check_connection
+        }, deadline=15)
+
         return {
-            'mavis': mavis_client.check_connection(),
-            'fiona': fiona_client.check_connection(),
-            'sadie': sadie_client.check_connection(),
-            'peter': peter_client.check_connection(),
-            'fred': fred_client.check_connection(),
-            'nigel': nigel_client.check_connection()
+            name: result.value if result.ok else {'connected': False, 'error': result.error}
+            for name, result in results.items()
         }
 
 
@@ -0,0 +1,241 @@
+"""
+Concurrent bot-to-bot calls built on shared.http_client.
+
+Orchestrators that need answers from several bots (health sweeps, offboarding
+checks, Scout's connection status) can issue the calls concurrently, so the
+whole batch takes as long as the slowest bot instead of the sum of all of them.
+
+There's no async HTTP library in our requirements, so AsyncBotHttpClient runs
+the pooled BotHttpClient calls on a thread pool. Connections are still shared
+through BotHttpClient's per-host keep-alive pools.
+
+Usage (async):
+    from shared.async_http_client import AsyncBotHttpClient, BotRequest, gather_requests
+
+    results = await gather_requests([
+        BotRequest('mavis', mavis_url, 'GET', '/health', timeout=5),
+        BotRequest('fiona', fiona_url, 'GET', '/health', timeout=5),
+    ], deadline=8)
+    if results['mavis'].ok:
+        data = results['mavis'].response.json()
+
+Usage (sync, e.g. from a Flask route):
+    from shared.async_http_client import fan_out
+
+    results = fan_out({
+        'mavis': mavis_client.check_connection,
+        'fiona': fiona_client.check_connection,
+    }, deadline=10)
+    mavis_status = results['mavis'].value
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from shared.http_client import BotHttpClient
+
+# Upper bound on threads used for a single fan-out
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+@dataclass
+class BotRequest:
+    """A single request in a batch, identified by key in the results."""
+    key: str
+    base_url: str
+    method: str = 'GET'
+    path: str = '/health'
+    timeout: Optional[float] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FanOutResult:
+    """
+    Outcome of one call in a batch.
+
+    For HTTP requests `response` holds the requests.Response; for fan_out()
+    callables `value` holds whatever the callable returned. `error` is set
+    when the call raised or was still running at the deadline.
+    """
+    key: str
+    ok: bool
+    elapsed_ms: int
+    value: Any = None
+    error: Optional[str] = None
+    timed_out: bool = False
+
+    @property
+    def response(self):
+        return self.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'key': self.key,
+            'ok': self.ok,
+            'elapsed_ms': self.elapsed_ms,
+            'error': self.error,
+            'timed_out': self.timed_out,
+        }
+
+
+class AsyncBotHttpClient:
+    """
+    asyncio wrapper around BotHttpClient.
+
+    Each call runs the blocking request in an executor, so many calls can be
+    awaited at once. Shares BotHttpClient's connection pool for the host.
+    """
+
+    def __init__(self, base_url: str, timeout: int = 10, executor: Optional[ThreadPoolExecutor] = None):
+        self._client = BotHttpClient(base_url, timeout=timeout)
+        self._executor = executor
+        self.base_url = self._client.base_url
+        self.timeout = timeout
+
+    async def request(self, method: str, path: str, **kwargs):
+        call = getattr(self._client, method.lower())
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: call(path, **kwargs))
+
+    async def get(self, path: str, **kwargs):
+        return await self.request('GET', path, **kwargs)
+
+    async def post(self, path: str, json=None, **kwargs):
+        return await self.request('POST', path, json=json, **kwargs)
+
+    async def patch(self, path: str, json=None, **kwargs):
+        return await self.request('PATCH', path, json=json, **kwargs)
+
+    async def put(self, path: str, json=None, **kwargs):
+        return await self.request('PUT', path, json=json, **kwargs)
+
+    async def delete(self, path: str, **kwargs):
+        return await self.request('DELETE', path, **kwargs)
+
+
+async def gather_requests(
+    requests: Iterable[BotRequest],
+    deadline: Optional[float] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> Dict[str, FanOutResult]:
+    """
+    Issue a batch of bot requests concurrently.
+
+    Args:
+        requests: BotRequests to send. Keys must be unique.
+        deadline: Seconds to wait for the whole batch. Requests still running
+                  at the deadline come back with timed_out=True.
+        max_concurrency: Maximum requests in flight at once
+
+    Returns:
+        Dict of key -> FanOutResult, in the order the requests were given
+    """
+    requests = list(requests)
+    results: Dict[str, FanOutResult] = {}
+    if not requests:
+        return results
+
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(requests))))
+
+    async def run_one(req: BotRequest) -> FanOutResult:
+        client = AsyncBotHttpClient(req.base_url, executor=executor)
+        kwargs = dict(req.kwargs)
+        if req.timeout is not None:
+            kwargs['timeout'] = req.timeout
+        call_started = time.monotonic()
+        try:
+            response = await client.request(req.method, req.path, **kwargs)
+            return FanOutResult(
+                key=req.key,
+                ok=response.ok,
+                elapsed_ms=_elapsed_ms(call_started),
+                value=response,
+                error=None if response.ok else f'HTTP {response.status_code}',
+            )
+        except Exception as e:
+            return FanOutResult(key=req.key, ok=False, elapsed_ms=_elapsed_ms(call_started), error=str(e))
+
+    tasks = {asyncio.ensure_future(run_one(req)): req for req in requests}
+    try:
+        done, pending = await asyncio.wait(tasks.keys(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+        for task, req in tasks.items():
+            if task in done:
+                results[req.key] = task.result()
+            else:
+                results[req.key] = _deadline_result(req.key, started, deadline)
+    finally:
+        # Don't wait for stragglers; their socket timeouts bound them anyway
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {req.key: results[req.key] for req in requests}
+
+
+def fan_out(
+    calls: Dict[str, Callable[[], Any]],
+    deadline: Optional[float] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> Dict[str, FanOutResult]:
+    """
+    Run independent blocking calls (usually bot client methods) concurrently.
+
+    For synchronous code such as Flask routes and orchestrators, where the
+    calls are already wrapped in client methods with their own error handling.
+
+    Args:
+        calls: Dict of key -> zero-argument callable
+        deadline: Seconds to wait for all calls. Calls still running at the
+                  deadline come back with timed_out=True.
+        max_concurrency: Maximum calls in flight at once
+
+    Returns:
+        Dict of key -> FanOutResult, in the order the calls were given
+    """
+    results: Dict[str, FanOutResult] = {}
+    if not calls:
+        return results
+
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(calls))))
+
+    def run_one(key: str, call: Callable[[], Any]) -> FanOutResult:
+        call_started = time.monotonic()
+        try:
+            value = call()
+            return FanOutResult(key=key, ok=True, elapsed_ms=_elapsed_ms(call_started), value=value)
+        except Exception as e:
+            return FanOutResult(key=key, ok=False, elapsed_ms=_elapsed_ms(call_started), error=str(e))
+
+    try:
+        futures = {key: executor.submit(run_one, key, call) for key, call in calls.items()}
+        wait(futures.values(), timeout=deadline)
+        for key, future in futures.items():
+            if future.done():
+                results[key] = future.result()
+            else:
+                future.cancel()
+                results[key] = _deadline_result(key, started, deadline)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
+
+
+def _deadline_result(key: str, started: float, deadline: Optional[float]) -> FanOutResult:
+    return FanOutResult(
+        key=key,
+        ok=False,
+        elapsed_ms=_elapsed_ms(started),
+        error=f'Deadline of {deadline}s exceeded',
+        timed_out=True,
+    )
@@ -56,9 +56,19 @@ Grant mode:
     1. Set auth.mode: grant in your bot's config.yaml
     2. Ensure GRANT_URL is set in environment (defaults to http://localhost:8026)
     3. Grant permissions via Grant's UI or API
+
+    Grant's answers are kept in a bounded LRU cache (auth.grant_cache_size,
+    default 1024) and re-checked on every request, so a revoked user is
+    logged out and a demoted admin loses admin features. Cached answers
+    carry Grant's permissions version, which is polled at most every
+    auth.grant_version_check_seconds (default 5); when it moves on, the
+    cache is dropped. Steady-state requests make no calls to Grant.
 """
 import os
+import time
 import logging
+import threading
+from collections import OrderedDict
 from functools import wraps
 from pathlib import Path
 import yaml
@@ -149,9 +159,16 @@ class GatewayAuth:
         # Bot name for Grant queries (lowercase)
         self.bot_name = getattr(config, 'name', 'unknown').lower()
 
-        # Cache for Grant responses (email -> {allowed, is_admin, timestamp})
-        self._grant_cache = {}
-        self._grant_cache_ttl = 300  # 5 minutes
+        # LRU cache of Grant responses ("email:bot" -> {allowed, is_admin, version, timestamp}),
+        # revalidated against Grant's permissions version
+        self._grant_cache = OrderedDict()
+        self._grant_cache_size = auth_config.get('grant_cache_size', 1024)
+        self._grant_cache_ttl = 300  # 5 minutes, backstop for changes that don't bump the version
+        self._grant_version_interval = auth_config.get('grant_version_check_seconds', 5)
+        self._grant_version = None
+        self._grant_version_checked_at = 0.0
+        self._grant_retry_at = 0.0
+        self._grant_lock = threading.Lock()
 
         # Verify Flask session is configured (bots must set their own secret key)
         if not self.app.config.get('SECRET_KEY'):
@@ -174,11 +191,24 @@ class GatewayAuth:
             """Load user from session"""
             if 'user' in session:
                 user_data = session['user']
+                is_admin = user_data.get('is_admin', False)
+
+                if gateway_auth.mode == 'grant':
+                    # Re-check Grant (normally a cache hit) so revocations
+                    # apply to existing sessions, not just new logins
+                    grant_result = gateway_auth._query_grant(user_data['email'])
+                    if grant_result is not None:
+                        if not grant_result['allowed']:
+                            logger.info(f"Grant access revoked for {user_data['email']}, ending session")
+                            session.pop('user', None)
+                            return None
+                        is_admin = grant_result['is_admin']
+
                 return User(
                     email=user_data['email'],
                     name=user_data.get('name', ''),
                     picture=user_data.get('picture', ''),
-                    is_admin=user_data.get('is_admin', False)
+                    is_admin=is_admin
                 )
             return None
 
@@ -294,21 +324,35 @@ class GatewayAuth:
         """
         Query Grant for authorization.
 
+        Answers come from the LRU cache while Grant's permissions version is
+        unchanged; the version is polled at most every
+        grant_version_check_seconds.
+
         Args:
             email: User's email address
 
         Returns:
             {allowed: bool, is_admin: bool} or None if Grant is unavailable
         """
-        import time
         email = email.lower()
+        cache_key = f"{email}:{self.bot_name}"
+        now = time.time()
+
+        self._revalidate_grant_cache(now)
 
         # Check cache first
-        cache_key = f"{email}:{self.bot_name}"
-        if cache_key in self._grant_cache:
-            cached = self._grant_cache[cache_key]
-            if time.time() - cached['timestamp'] < self._grant_cache_ttl:
-                return {'allowed': cached['allowed'], 'is_admin': cached['is_admin']}
+        with self._grant_lock:
+            cached = self._grant_cache.get(cache_key)
+            if cached is not None:
+                if (cached['version'] == self._grant_version
+                        and now - cached['timestamp'] < self._grant_cache_ttl):
+                    self._grant_cache.move_to_end(cache_key)
+                    return {'allowed': cached['allowed'], 'is_admin': cached['is_admin']}
+                del self._grant_cache[cache_key]
+
+            # Don't retry a failing Grant on every request
+            if now < self._grant_retry_at:
+                return None
 
         # Query Grant
         try:
@@ -323,19 +367,67 @@ class GatewayAuth:
                     'is_admin': data.get('is_admin', False)
                 }
                 # Cache the result
-                self._grant_cache[cache_key] = {
-                    **result,
-                    'timestamp': time.time()
-                }
+                self._cache_grant_result(cache_key, result, data.get('version'), now)
                 return result
             else:
                 logger.warning(f"Grant returned status {response.status_code} for {email}")
+                self._grant_retry_at = now + self._grant_version_interval
                 return None
 
         except Exception as e:
             logger.warning(f"Failed to query Grant for {email}: {e}")
+            self._grant_retry_at = now + self._grant_version_interval
             return None
 
+    def _cache_grant_result(self, cache_key: str, result: dict, version, now: float):
+        """Store a Grant answer, evicting the least recently used beyond the size limit."""
+        with self._grant_lock:
+            if version != self._grant_version:
+                # Newer permissions than anything cached - drop the rest
+                if self._grant_version is not None:
+                    self._grant_cache.clear()
+                self._grant_version = version
+                self._grant_version_checked_at = now
+
+            self._grant_cache[cache_key] = {
+                **result,
+                'version': version,
+                'timestamp': now
+            }
+            self._grant_cache.move_to_end(cache_key)
+            while len(self._grant_cache) > self._grant_cache_size:
+                self._grant_cache.popitem(last=False)
+
+    def _revalidate_grant_cache(self, now: float):
+        """
+        Poll Grant's permissions version and drop the cache if it has moved on.
+
+        Polls at most every grant_version_check_seconds. If Grant can't be
+        reached the cache is kept; entries still expire after the TTL.
+        """
+        with self._grant_lock:
+            if not self._grant_cache or now - self._grant_version_checked_at < self._grant_version_interval:
+                return
+            self._grant_version_checked_at = now
+
+        try:
+            from shared.http_client import BotHttpClient
+            client = BotHttpClient(self.grant_url, timeout=2)
+            response = client.get('/api/access/version')
+            if response.status_code != 200:
+                logger.warning(f"Grant returned status {response.status_code} for permissions version")
+                return
+            version = response.json().get('version')
+        except Exception as e:
+            logger.warning(f"Failed to check Grant permissions version: {e}")
+            return
+
+        with self._grant_lock:
+            if version != self._grant_version:
+                logger.info(f"Grant permissions changed ({self._grant_version} -> {version}), clearing cache")
+                self._grant_cache.clear()
+                self._grant_version = version
+
     def _is_authorized(self, email: str) -> bool:
         """
         Check if email is authorized based on config mode.
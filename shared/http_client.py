@@ -1,23 +1,233 @@
 import os
-from urllib.parse import urljoin
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urljoin, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 BOT_API_KEY = os.getenv("BOT_API_KEY", "")
 
+# Connection pool defaults. These can be overridden per process with
+# environment variables, or per client via BotHttpClient(...) kwargs.
+# Clients for the same host share a pool only if their pool_maxsize,
+# pool_block and keep_alive settings match.
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("BOT_HTTP_POOL_CONNECTIONS", "4"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("BOT_HTTP_POOL_MAXSIZE", "10"))
+DEFAULT_POOL_BLOCK = os.getenv("BOT_HTTP_POOL_BLOCK", "false").lower() in ("1", "true", "yes")
+DEFAULT_KEEP_ALIVE = os.getenv("BOT_HTTP_KEEP_ALIVE", "true").lower() in ("1", "true", "yes")
+
+
+def _pool_host(base_url: str) -> str:
+    """scheme://host:port, so every path on a bot shares one pool."""
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class _CountingConnectionMixin:
+    """Calls back into the owning pool every time a real socket is opened."""
+
+    on_connect = None
+
+    def connect(self):
+        super().connect()
+        if self.on_connect is not None:
+            self.on_connect()
+
+
+class _CountingHTTPConnection(_CountingConnectionMixin, HTTPConnection):
+    pass
+
+
+class _CountingHTTPSConnection(_CountingConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CountingPoolMixin:
+    """
+    Tracks sockets opened by a urllib3 pool.
+
+    urllib3's own num_connections only counts connection objects; a pooled
+    connection the server closed gets silently reconnected, which is exactly
+    the kind of churn we want to see, so count at connect() instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sockets_opened = 0
+        self._count_lock = threading.Lock()
+
+    def _count_connect(self):
+        with self._count_lock:
+            self.sockets_opened += 1
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.on_connect = self._count_connect
+        return conn
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools count socket opens."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+class _SharedPool:
+    """
+    A requests.Session plus its adapter for a single bot host.
+
+    urllib3's connection pools are thread-safe, so one of these is shared by
+    every BotHttpClient (and every thread) talking to the same host with the
+    same pool settings. The session rejects all cookies: it's shared by
+    unrelated callers, and the plain requests.get calls it replaced never
+    carried cookies from one call to the next.
+    """
+
+    def __init__(self, key: str, pool_connections: int, pool_maxsize: int,
+                 pool_block: bool, keep_alive: bool):
+        self.key = key
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+
+        self.adapter = _CountingHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def stats(self) -> dict:
+        """
+        Connection counters for this host.
+
+        Every request that didn't have to open a socket was a connection reuse.
+        """
+        new_connections = 0
+        requests_sent = 0
+        pools = self.adapter.poolmanager.pools
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            if pool is None:
+                continue
+            new_connections += getattr(pool, "sockets_opened", pool.num_connections)
+            requests_sent += pool.num_requests
+
+        return {
+            "host": self.key,
+            "requests": requests_sent,
+            "new_connections": new_connections,
+            "reused_connections": max(requests_sent - new_connections, 0),
+            "pool_maxsize": self.pool_maxsize,
+            "pool_block": self.pool_block,
+            "keep_alive": self.keep_alive,
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_pools: dict = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(base_url: str, pool_connections: int, pool_maxsize: int,
+              pool_block: bool, keep_alive: bool) -> _SharedPool:
+    host = _pool_host(base_url)
+    key = (host, pool_maxsize, pool_block, keep_alive)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _SharedPool(host, pool_connections, pool_maxsize, pool_block, keep_alive)
+            _pools[key] = pool
+        return pool
+
+
+def get_pool_stats() -> dict:
+    """
+    Connection reuse counters for every bot host this process has talked to.
+
+    Returns:
+        Dict with per-host stats under 'hosts' and summed 'totals'
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+
+    hosts = [pool.stats() for pool in pools]
+    totals = {
+        "requests": sum(h["requests"] for h in hosts),
+        "new_connections": sum(h["new_connections"] for h in hosts),
+        "reused_connections": sum(h["reused_connections"] for h in hosts),
+    }
+    return {"hosts": hosts, "totals": totals}
+
+
+def close_all_pools() -> None:
+    """Close every pooled connection (e.g. in a gunicorn worker_exit hook or tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
 
 class BotHttpClient:
     """
     Simple HTTP client for talking to other bots.
 
     Always sends X-API-Key header.
+
+    Requests go through a keep-alive connection pool shared by every client
+    (and thread) in the process that talks to the same host with the same
+    pool settings, so creating a BotHttpClient per call is cheap and doesn't
+    open a new socket each time. Cookies are never stored.
     """
 
-    def __init__(self, base_url: str, timeout: int = 10):
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 10,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = DEFAULT_POOL_BLOCK,
+        keep_alive: bool = DEFAULT_KEEP_ALIVE,
+    ):
         if not base_url.endswith("/"):
             base_url += "/"
         self.base_url = base_url
         self.timeout = timeout
+        self._pool = _get_pool(base_url, pool_connections, pool_maxsize, pool_block, keep_alive)
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled session shared by all clients for this host."""
+        return self._pool.session
+
+    def pool_stats(self) -> dict:
+        """Connection reuse counters for this client's host."""
+        return self._pool.stats()
 
     def _headers(self) -> dict:
         headers: dict = {}
@@ -35,7 +245,7 @@ class BotHttpClient:
         # Use per-call timeout if provided, otherwise default
         timeout = kwargs.pop("timeout", self.timeout)
 
-        return requests.get(
+        return self.session.get(
             url,
             headers=self._headers(),
             timeout=timeout,
@@ -48,7 +258,7 @@ class BotHttpClient:
         # Use per-call timeout if provided, otherwise default
         timeout = kwargs.pop("timeout", self.timeout)
 
-        return requests.post(
+        return self.session.post(
             url,
             headers=self._headers(),
             json=json,
@@ -62,7 +272,7 @@ class BotHttpClient:
         # Use per-call timeout if provided, otherwise default
         timeout = kwargs.pop("timeout", self.timeout)
 
-        return requests.patch(
+        return self.session.patch(
             url,
             headers=self._headers(),
             json=json,
@@ -76,7 +286,7 @@ class BotHttpClient:
         # Use per-call timeout if provided, otherwise default
         timeout = kwargs.pop("timeout", self.timeout)
 
-        return requests.put(
+        return self.session.put(
             url,
             headers=self._headers(),
             json=json,
@@ -90,7 +300,7 @@ class BotHttpClient:
         # Use per-call timeout if provided, otherwise default
         timeout = kwargs.pop("timeout", self.timeout)
 
-        return requests.delete(
+        return self.session.delete(
             url,
             headers=self._headers(),
             timeout=timeout,
@@ -11,10 +11,24 @@ Usage:
     async with AsyncBrowserManager(headless=True) as browser:
         page = await browser.new_page_for_org('canberra')
         # ... do stuff
+
+    # Or keep a warm browser + logged-in contexts between operations
+    from shared.playwright import get_browser_pool
+    pool = get_browser_pool(headless=True)
 """
 
 from shared.playwright.async_browser import AsyncBrowserManager
+from shared.playwright.browser_pool import (
+    BrowserPool,
+    PooledBrowser,
+    get_browser_pool,
+    runs_on_pool,
+)
 
 __all__ = [
     'AsyncBrowserManager',
+    'BrowserPool',
+    'PooledBrowser',
+    'get_browser_pool',
+    'runs_on_pool',
 ]
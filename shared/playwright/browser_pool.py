@@ -0,0 +1,642 @@
+"""
+Persistent Playwright browser pool for Buz automation.
+
+Launching Chromium and loading an org's storage state costs several seconds,
+which dominates short operations like toggling a single Hugo user. The pool
+keeps one browser and a few authenticated contexts per org warm between
+operations, recycling them on age, use count, storage-state changes or a
+failed health check.
+
+Playwright objects are bound to the event loop that created them, while bots
+call in from a fresh asyncio.run() per request. So the pool owns a dedicated
+event loop thread and pooled work runs there.
+
+Usage:
+    pool = get_browser_pool(headless=True)
+
+    # From sync code (any thread)
+    result = pool.run_coroutine(do_buz_work())
+
+    # From a coroutine on any loop
+    result = await pool.run_on_pool(do_buz_work())
+
+    # Inside work running on the pool loop: lease a warm context + fresh page
+    async with pool.lease('canberra', storage_state_path) as lease:
+        await lease.page.goto(url)
+
+    # Drop-in replacement for AsyncBrowserManager (on the pool loop)
+    async with pool.browser(screenshot_dir='screenshots') as browser:
+        page = await browser.new_page_for_org('canberra', storage_state_path)
+"""
+import asyncio
+import atexit
+import functools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from playwright.async_api import async_playwright
+
+from shared.playwright.async_browser import AsyncBrowserManager
+
+logger = logging.getLogger(__name__)
+
+# How often the janitor closes idle/expired contexts (seconds)
+JANITOR_INTERVAL = 60
+# How long a context health check may take before the context is discarded
+HEALTH_CHECK_TIMEOUT = 5
+
+
+async def _launch_chromium(headless: bool) -> Tuple[Any, Any]:
+    """Default launcher: start Playwright and launch Chromium."""
+    playwright = await async_playwright().start()
+    browser = await playwright.chromium.launch(headless=headless)
+    return playwright, browser
+
+
+def _storage_mtime(storage_state_path: Optional[str]) -> Optional[float]:
+    if not storage_state_path:
+        return None
+    try:
+        return Path(storage_state_path).stat().st_mtime
+    except OSError:
+        return None
+
+
+@dataclass
+class PooledContext:
+    """A browser context kept warm for one org."""
+    org_key: str
+    storage_state_path: Optional[str]
+    storage_mtime: Optional[float]
+    context: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    healthy: bool = True
+
+
+@dataclass
+class BrowserLease:
+    """A context checked out of the pool, with a fresh page."""
+    org_key: str
+    context: Any
+    page: Any
+    pooled: PooledContext
+
+    def discard(self):
+        """Don't return this context to the pool (e.g. it looks logged out)."""
+        self.pooled.healthy = False
+
+
+class BrowserPool:
+    """
+    Keeps a warm Chromium and authenticated contexts per org between operations.
+
+    Contexts are leased (one page each) and returned. On return, pages are
+    closed and the context goes back to the idle list unless it failed,
+    reached max_context_age / max_context_uses, or its storage state file
+    changed since it was created (re-authentication).
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        default_timeout: int = 30000,
+        max_contexts_per_org: int = 2,
+        max_context_age: int = 1800,
+        max_context_uses: int = 100,
+        max_browser_age: int = 14400,
+        idle_timeout: int = 900,
+        lease_timeout: int = 600,
+        launcher: Optional[Callable[[bool], Awaitable[Tuple[Any, Any]]]] = None,
+        health_check: Optional[Callable[[Any], Awaitable[bool]]] = None
+    ):
+        """
+        Initialize the pool. Nothing is launched until the first lease.
+
+        Args:
+            headless: Run browser in headless mode
+            default_timeout: Default context timeout in milliseconds
+            max_contexts_per_org: Maximum concurrent leases (and contexts) per org
+            max_context_age: Seconds before a context is recycled
+            max_context_uses: Leases before a context is recycled
+            max_browser_age: Seconds before the browser is relaunched (when idle)
+            idle_timeout: Close contexts, and then the browser, unused this long
+            lease_timeout: Seconds to wait for a free context before giving up
+            launcher: Async callable(headless) -> (playwright, browser); for tests
+            health_check: Extra async check(context) -> bool run before reuse
+        """
+        self.headless = headless
+        self.default_timeout = default_timeout
+        self.max_contexts_per_org = max_contexts_per_org
+        self.max_context_age = max_context_age
+        self.max_context_uses = max_context_uses
+        self.max_browser_age = max_browser_age
+        self.idle_timeout = idle_timeout
+        self.lease_timeout = lease_timeout
+        self._launcher = launcher or _launch_chromium
+        self._health_check = health_check
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._janitor: Optional[asyncio.Task] = None
+
+        # Everything below is only touched on the pool loop
+        self._playwright = None
+        self._browser = None
+        self._browser_started_at: Optional[float] = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._idle: Dict[str, List[PooledContext]] = {}
+        self._in_use: Dict[str, int] = {}
+        self._conditions: Dict[str, asyncio.Condition] = {}
+        self._last_activity = time.monotonic()
+        self._stats = {
+            'browser_launches': 0,
+            'contexts_created': 0,
+            'contexts_recycled': 0,
+            'leases': 0,
+            'warm_leases': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Event loop thread
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name='browser-pool', daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+                asyncio.run_coroutine_threadsafe(self._start_janitor(), loop).result()
+                logger.info("Browser pool event loop started")
+            return self._loop
+
+    async def _start_janitor(self):
+        self._browser_lock = asyncio.Lock()
+        self._janitor = asyncio.get_running_loop().create_task(self._run_janitor())
+
+    def _on_pool_loop(self) -> bool:
+        try:
+            return self._loop is not None and asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _check_on_pool_loop(self):
+        if not self._on_pool_loop():
+            raise RuntimeError(
+                "Browser pool leases must be used on the pool loop. "
+                "Wrap the calling coroutine with pool.run_on_pool() or pool.run_coroutine()."
+            )
+
+    def submit(self, coro) -> 'asyncio.Future':
+        """Schedule a coroutine on the pool loop; returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run_coroutine(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the pool loop from sync code and return its result."""
+        return self.submit(coro).result(timeout)
+
+    async def run_on_pool(self, coro):
+        """Await a coroutine on the pool loop from any event loop."""
+        if self._on_pool_loop():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    # ------------------------------------------------------------------
+    # Browser lifecycle
+    # ------------------------------------------------------------------
+
+    async def _get_browser(self):
+        async with self._browser_lock:
+            if self._browser is not None and not self._browser.is_connected():
+                logger.warning("Pooled browser disconnected - relaunching")
+                await self._close_browser()
+
+            if (
+                self._browser is not None
+                and time.monotonic() - self._browser_started_at > self.max_browser_age
+                and not any(self._in_use.values())
+            ):
+                logger.info("Pooled browser reached max age - relaunching")
+                await self._close_browser()
+
+            if self._browser is None:
+                logger.info(f"Launching pooled browser (headless={self.headless})")
+                self._playwright, self._browser = await self._launcher(self.headless)
+                self._browser_started_at = time.monotonic()
+                self._stats['browser_launches'] += 1
+
+            return self._browser
+
+    async def _close_browser(self):
+        """Close every idle context, the browser and Playwright."""
+        for pooled_list in self._idle.values():
+            for pooled in pooled_list:
+                await self._close_context(pooled)
+        self._idle.clear()
+
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing pooled browser: {e}")
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.warning(f"Error stopping Playwright: {e}")
+
+        self._browser = None
+        self._playwright = None
+        self._browser_started_at = None
+
+    # ------------------------------------------------------------------
+    # Contexts
+    # ------------------------------------------------------------------
+
+    def _condition(self, org_key: str) -> asyncio.Condition:
+        if org_key not in self._conditions:
+            self._conditions[org_key] = asyncio.Condition()
+        return self._conditions[org_key]
+
+    def _expired(self, pooled: PooledContext) -> Optional[str]:
+        """Reason a context should be recycled, or None if it can be reused."""
+        if not pooled.healthy:
+            return 'unhealthy'
+        if time.monotonic() - pooled.created_at > self.max_context_age:
+            return 'max age'
+        if pooled.uses >= self.max_context_uses:
+            return 'max uses'
+        if _storage_mtime(pooled.storage_state_path) != pooled.storage_mtime:
+            return 'storage state changed'
+        return None
+
+    async def _is_healthy(self, pooled: PooledContext) -> bool:
+        if self._browser is None or not self._browser.is_connected():
+            return False
+        try:
+            await asyncio.wait_for(pooled.context.cookies(), HEALTH_CHECK_TIMEOUT)
+            if self._health_check is not None:
+                return bool(await asyncio.wait_for(self._health_check(pooled.context), HEALTH_CHECK_TIMEOUT))
+            return True
+        except Exception as e:
+            logger.info(f"Pooled context for {pooled.org_key} failed health check: {e}")
+            return False
+
+    async def _take_idle(self, org_key: str, storage_state_path: Optional[str]) -> Optional[PooledContext]:
+        """Pop a reusable idle context for the org, recycling any that aren't."""
+        idle = self._idle.get(org_key, [])
+        while idle:
+            pooled = idle.pop()
+            reason = self._expired(pooled)
+            if reason is None and pooled.storage_state_path != storage_state_path:
+                reason = 'different storage state'
+            if reason is None and not await self._is_healthy(pooled):
+                reason = 'failed health check'
+            if reason is None:
+                return pooled
+            logger.info(f"Recycling pooled context for {org_key} ({reason})")
+            await self._close_context(pooled)
+        return None
+
+    async def _create_context(self, org_key: str, storage_state_path: Optional[str]) -> PooledContext:
+        browser = await self._get_browser()
+
+        context_kwargs: Dict[str, Any] = {
+            'viewport': {'width': 1920, 'height': 1080}
+        }
+        if storage_state_path:
+            storage_path = Path(storage_state_path)
+            if not storage_path.exists():
+                raise FileNotFoundError(
+                    f"Storage state file not found: {storage_state_path}. "
+                    f"Run the auth bootstrap script first."
+                )
+            context_kwargs['storage_state'] = str(storage_path)
+
+        context = await browser.new_context(**context_kwargs)
+        self._stats['contexts_created'] += 1
+        logger.info(f"Created pooled browser context for {org_key}")
+
+        return PooledContext(
+            org_key=org_key,
+            storage_state_path=storage_state_path,
+            storage_mtime=_storage_mtime(storage_state_path),
+            context=context
+        )
+
+    async def _close_context(self, pooled: PooledContext):
+        self._stats['contexts_recycled'] += 1
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled context for {pooled.org_key}: {e}")
+
+    # ------------------------------------------------------------------
+    # Lease / return
+    # ------------------------------------------------------------------
+
+    async def acquire(
+        self,
+        org_key: str,
+        storage_state_path: Optional[str] = None,
+        default_timeout: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> BrowserLease:
+        """
+        Check out a warm (or new) context for an org with a fresh page.
+
+        Must be called on the pool loop; always pair with release().
+
+        Args:
+            org_key: Organization key
+            storage_state_path: Storage state JSON for the org's Buz login
+            default_timeout: Context default timeout in ms (default: pool setting)
+            timeout: Seconds to wait for a free context (default: lease_timeout)
+
+        Raises:
+            TimeoutError: If every context for the org stays leased
+        """
+        self._check_on_pool_loop()
+        wait = self.lease_timeout if timeout is None else timeout
+
+        condition = self._condition(org_key)
+        async with condition:
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: self._in_use.get(org_key, 0) < self.max_contexts_per_org),
+                    wait
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"No browser context free for {org_key} after {wait}s "
+                    f"({self.max_contexts_per_org} in use)"
+                )
+            self._in_use[org_key] = self._in_use.get(org_key, 0) + 1
+
+        pooled = None
+        try:
+            pooled = await self._take_idle(org_key, storage_state_path)
+            if pooled is not None:
+                self._stats['warm_leases'] += 1
+            else:
+                pooled = await self._create_context(org_key, storage_state_path)
+
+            pooled.context.set_default_timeout(default_timeout or self.default_timeout)
+            page = await pooled.context.new_page()
+        except BaseException:
+            if pooled is not None:
+                await self._close_context(pooled)
+            await self._return_slot(org_key)
+            raise
+
+        pooled.uses += 1
+        pooled.last_used_at = time.monotonic()
+        self._last_activity = pooled.last_used_at
+        self._stats['leases'] += 1
+        return BrowserLease(org_key=org_key, context=pooled.context, page=page, pooled=pooled)
+
+    async def release(self, lease: BrowserLease, discard: bool = False):
+        """
+        Return a leased context to the pool.
+
+        Args:
+            lease: Lease from acquire()
+            discard: Close the context instead of keeping it warm
+        """
+        pooled = lease.pooled
+        if discard:
+            pooled.healthy = False
+
+        for page in list(pooled.context.pages):
+            try:
+                await page.close()
+            except Exception:
+                pooled.healthy = False
+
+        pooled.last_used_at = time.monotonic()
+        self._last_activity = pooled.last_used_at
+        reason = self._expired(pooled)
+        if reason is None and self._browser is not None:
+            self._idle.setdefault(lease.org_key, []).append(pooled)
+        else:
+            logger.info(f"Not returning context for {lease.org_key} to pool ({reason or 'browser closed'})")
+            await self._close_context(pooled)
+
+        await self._return_slot(lease.org_key)
+
+    async def _return_slot(self, org_key: str):
+        condition = self._condition(org_key)
+        async with condition:
+            self._in_use[org_key] = max(0, self._in_use.get(org_key, 0) - 1)
+            condition.notify()
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        org_key: str,
+        storage_state_path: Optional[str] = None,
+        default_timeout: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Context manager around acquire()/release().
+
+        The context is discarded rather than reused if the body raises.
+        """
+        lease = await self.acquire(org_key, storage_state_path, default_timeout, timeout)
+        failed = False
+        try:
+            yield lease
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            await self.release(lease, discard=failed)
+
+    def browser(self, **kwargs) -> 'PooledBrowser':
+        """AsyncBrowserManager-compatible view of the pool (see PooledBrowser)."""
+        return PooledBrowser(self, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    async def _run_janitor(self):
+        while True:
+            await asyncio.sleep(JANITOR_INTERVAL)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.exception(f"Error in browser pool janitor: {e}")
+
+    async def sweep(self):
+        """Close idle contexts past idle_timeout or max age; close an idle browser."""
+        now = time.monotonic()
+        for org_key, idle in self._idle.items():
+            keep = []
+            for pooled in idle:
+                if now - pooled.last_used_at > self.idle_timeout or self._expired(pooled):
+                    await self._close_context(pooled)
+                else:
+                    keep.append(pooled)
+            idle[:] = keep
+
+        async with self._browser_lock:
+            if (
+                self._browser is not None
+                and not any(self._idle.values())
+                and not any(self._in_use.values())
+                and now - self._last_activity > self.idle_timeout
+            ):
+                logger.info("Closing idle pooled browser")
+                await self._close_browser()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Pool state for health/diagnostic endpoints."""
+        orgs = sorted(set(self._idle) | set(self._in_use))
+        browser_age = None
+        if self._browser_started_at is not None:
+            browser_age = round(time.monotonic() - self._browser_started_at, 1)
+        return {
+            'running': self._loop is not None,
+            'browser_open': self._browser is not None,
+            'browser_age_seconds': browser_age,
+            'max_contexts_per_org': self.max_contexts_per_org,
+            'orgs': {
+                org_key: {
+                    'idle': len(self._idle.get(org_key, [])),
+                    'in_use': self._in_use.get(org_key, 0),
+                }
+                for org_key in orgs
+            },
+            **self._stats,
+        }
+
+    def close(self, timeout: float = 30.0):
+        """Close the browser and stop the pool loop."""
+        with self._start_lock:
+            loop = self._loop
+            self._loop = None
+        if loop is None:
+            return
+
+        async def shutdown():
+            if self._janitor is not None:
+                self._janitor.cancel()
+            await self._close_browser()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Error shutting down browser pool: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        loop.close()
+        logger.info("Browser pool closed")
+
+
+class PooledBrowser(AsyncBrowserManager):
+    """
+    AsyncBrowserManager backed by a BrowserPool.
+
+    Same interface (new_context, new_page_for_org, screenshot, get_context),
+    but contexts are leased from the pool on demand and returned on exit
+    instead of launching and closing a browser. Must be used on the pool loop.
+    """
+
+    def __init__(self, pool: BrowserPool, headless: Optional[bool] = None, **kwargs):
+        """
+        Args:
+            pool: Pool to lease contexts from
+            headless: Ignored - the pool's browser setting applies
+            **kwargs: default_timeout, screenshot_dir, screenshot_on_failure
+        """
+        kwargs.setdefault('default_timeout', pool.default_timeout)
+        super().__init__(headless=pool.headless, **kwargs)
+        self.pool = pool
+        self._leases: Dict[str, BrowserLease] = {}
+
+    async def __aenter__(self):
+        self.pool._check_on_pool_loop()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type and self.screenshot_on_failure:
+            for name, lease in self._leases.items():
+                try:
+                    await self._screenshot(lease.page, f"error_{name}")
+                except Exception as e:
+                    logger.warning(f"Could not take error screenshot: {e}")
+
+        for lease in self._leases.values():
+            await self.pool.release(lease, discard=exc_type is not None)
+        self._leases.clear()
+        self._contexts.clear()
+        return False  # Don't suppress exceptions
+
+    async def _lease(self, name: str, storage_state_path: Optional[str]) -> BrowserLease:
+        if name in self._leases:
+            await self.pool.release(self._leases.pop(name))
+        lease = await self.pool.acquire(name, storage_state_path, default_timeout=self.default_timeout)
+        self._leases[name] = lease
+        self._contexts[name] = lease.context
+        return lease
+
+    async def new_context(self, name: str, storage_state_path: Optional[str] = None):
+        """Lease a context from the pool (name is the org key)."""
+        return (await self._lease(name, storage_state_path)).context
+
+    async def new_page_for_org(self, org_name: str, storage_state_path: str):
+        """Lease a warm context for the org and return its fresh page."""
+        return (await self._lease(org_name, storage_state_path)).page
+
+
+def runs_on_pool(method):
+    """
+    Decorator for async service methods that drive a browser.
+
+    If the service has a `browser_pool`, the method body runs on the pool's
+    loop (so it can use pooled contexts); otherwise it runs inline.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        pool = getattr(self, 'browser_pool', None)
+        if pool is None:
+            return await method(self, *args, **kwargs)
+        return await pool.run_on_pool(method(self, *args, **kwargs))
+    return wrapper
+
+
+# Module-level singleton for convenience
+_default_pool: Optional[BrowserPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_browser_pool(**kwargs) -> BrowserPool:
+    """
+    Get the process-wide browser pool.
+
+    Args:
+        **kwargs: BrowserPool settings (only used on first call)
+
+    Returns:
+        The singleton BrowserPool instance
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool(**kwargs)
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -15,16 +15,17 @@ Usage:
     nav = BuzNavigation(page)
     await nav.go_to_user_management()
 
-    # Use Playwright with lock (prevents concurrent Buz access)
+    # Lease Buz access for an org (other orgs aren't blocked)
     lock = BuzPlaywrightLock()
-    async with lock.acquire_async('ivy'):
-        # Only one bot can be in here at a time
+    async with lock.acquire_async('ivy', org_key='canberra', priority='batch'):
+        # Only one bot per org can be in here at a time (by default)
         await do_buz_work()
 """
 
 from shared.playwright.buz.orgs import BuzOrgs
 from shared.playwright.buz.navigation import BuzNavigation
 from shared.playwright.buz.lock import (
+    BuzLockTimeout,
     BuzPlaywrightLock,
     get_buz_lock,
     get_lock_holder_info,
@@ -34,6 +35,7 @@ from shared.playwright.buz.lock import (
 __all__ = [
     'BuzOrgs',
     'BuzNavigation',
+    'BuzLockTimeout',
     'BuzPlaywrightLock',
     'get_buz_lock',
     'get_lock_holder_info',
@@ -1,51 +1,146 @@
 """
-Buz Playwright concurrency lock.
-
-Ensures only one bot can use Playwright to access Buz at a time.
-This prevents login conflicts and session corruption when multiple bots
-try to interact with the same Buz organization simultaneously.
+Buz Playwright lease scheduler.
+
+Coordinates Buz browser work across bots so they don't trip over each
+other's sessions, without serialising unrelated work:
+
+- Leases are per org. Each org allows up to N concurrent holders (default 1,
+  one session per org login), so work on different orgs runs in parallel.
+  Leases without an org reserve all of Buz.
+- Waiters are served by priority class (interactive before normal before
+  batch), FIFO within a class. Waiters queued longer than
+  PRIORITY_AGING_SECONDS are promoted so batch work can't starve.
+- Holders whose process has died, or that have no PID and are older than
+  MAX_LOCK_AGE_SECONDS, are reclaimed.
+
+Bots are separate processes, so the queue lives in a small SQLite database
+in .secrets/ that every bot on the host shares.
 """
 import asyncio
-import json
 import logging
 import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
 from contextlib import contextmanager, asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
-from filelock import FileLock, Timeout
+from filelock import Timeout
 
 # Max lock age before considering it stale (30 minutes)
 MAX_LOCK_AGE_SECONDS = 1800
 
+# Priority classes (lower is served first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 5
+PRIORITY_BATCH = 10
+PRIORITIES = {
+    'interactive': PRIORITY_INTERACTIVE,
+    'normal': PRIORITY_NORMAL,
+    'batch': PRIORITY_BATCH,
+}
+
+# Waiters queued this long are served as interactive
+PRIORITY_AGING_SECONDS = 300
+
+# How often waiters re-check the queue
+POLL_INTERVAL = 0.25
+
+# Concurrent leases per org (same value should be used by every bot)
+DEFAULT_MAX_PER_ORG = int(os.environ.get('BUZ_LOCK_MAX_PER_ORG', '1'))
+
+# Completed/timed-out leases kept for wait-time metrics
+HISTORY_SIZE = 200
+
+# Org key for leases that reserve all of Buz
+ALL_ORGS = '*'
+
 logger = logging.getLogger(__name__)
 
 # Default lock location
-DEFAULT_LOCK_PATH = Path(__file__).parent.parent.parent.parent / '.secrets' / 'buz_playwright.lock'
-# Info file tracks who holds the lock (for better error messages)
-DEFAULT_LOCK_INFO_PATH = DEFAULT_LOCK_PATH.with_suffix('.info')
+DEFAULT_LOCK_PATH = Path(__file__).parent.parent.parent.parent / '.secrets' / 'buz_playwright.db'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    id TEXT PRIMARY KEY,
+    org_key TEXT NOT NULL,
+    bot TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    pid INTEGER,
+    host TEXT,
+    enqueued_at REAL NOT NULL,
+    acquired_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS waiters (
+    id TEXT PRIMARY KEY,
+    org_key TEXT NOT NULL,
+    bot TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    pid INTEGER,
+    host TEXT,
+    enqueued_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_key TEXT NOT NULL,
+    bot TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    wait_seconds REAL NOT NULL,
+    hold_seconds REAL,
+    finished_at REAL NOT NULL
+);
+"""
+
+
+class BuzLockTimeout(Timeout):
+    """Raised when a Buz lease can't be granted within the timeout."""
+
+    def __init__(self, lock_file: str, org_key: str, waited: float):
+        super().__init__(lock_file)
+        self.org_key = org_key
+        self.waited = waited
+
+    def __str__(self) -> str:
+        return f"Could not get a Buz lease for '{self.org_key}' after {self.waited:.0f}s"
+
+
+def _priority_value(priority: Union[str, int]) -> int:
+    if isinstance(priority, int):
+        return priority
+    try:
+        return PRIORITIES[priority]
+    except KeyError:
+        raise ValueError(f"Unknown Buz lock priority: {priority}")
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
 
 
 class BuzPlaywrightLock:
     """
-    File-based lock for Buz Playwright access.
+    Per-org, priority-aware lease on Buz Playwright access.
 
     Usage (sync context manager):
         lock = BuzPlaywrightLock()
-        with lock.acquire('hugo'):
+        with lock.acquire('hugo', org_key='canberra', priority='interactive'):
             # Do Playwright work
             pass
 
     Usage (async context manager):
         lock = BuzPlaywrightLock()
-        async with lock.acquire_async('ivy'):
+        async with lock.acquire_async('ivy', org_key='canberra', priority='batch'):
             # Do async Playwright work
             pass
 
     Usage (manual):
         lock = BuzPlaywrightLock()
-        lock.lock('hugo')
+        lock.lock('hugo', org_key='canberra')
         try:
             # Do Playwright work
         finally:
@@ -55,228 +150,418 @@ class BuzPlaywrightLock:
     def __init__(
         self,
         lock_path: Optional[Path] = None,
-        timeout: int = 600  # 10 minutes default
+        timeout: int = 600,  # 10 minutes default
+        max_per_org: int = DEFAULT_MAX_PER_ORG,
+        org_limits: Optional[Dict[str, int]] = None
     ):
         """
         Initialize the lock.
 
         Args:
-            lock_path: Path to the lock file. Defaults to .secrets/buz_playwright.lock
-            timeout: Seconds to wait for lock acquisition before timing out.
+            lock_path: Path to the scheduler database. Defaults to .secrets/buz_playwright.db
+            timeout: Seconds to wait for a lease before timing out.
                      Set to -1 for infinite wait. Default: 600 (10 minutes)
+            max_per_org: Concurrent leases allowed per org
+            org_limits: Per-org overrides of max_per_org
         """
-        self.lock_path = lock_path or DEFAULT_LOCK_PATH
-        self.lock_info_path = self.lock_path.with_suffix('.info')
+        self.lock_path = Path(lock_path or DEFAULT_LOCK_PATH)
         self.timeout = timeout
-        self._file_lock = FileLock(str(self.lock_path))
-        self._holder: Optional[str] = None
-        self._acquired_at: Optional[datetime] = None
+        self.max_per_org = max_per_org
+        self.org_limits = org_limits or {}
+        self._host = socket.gethostname()
+        self._held: Dict[str, str] = {}  # lease id -> bot name
+        self._held_lock = threading.Lock()
+        self._manual = threading.local()
+        self._initialized = False
+
+    # ------------------------------------------------------------------
+    # Database
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.lock_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        return conn
 
-    def _write_holder_info(self, bot_name: str) -> None:
-        """Write holder info to the info file."""
-        try:
-            info = {
-                'bot': bot_name,
-                'acquired_at': datetime.now(timezone.utc).isoformat(),
-                'pid': __import__('os').getpid()
-            }
-            self.lock_info_path.write_text(json.dumps(info))
-        except Exception as e:
-            logger.warning(f"Could not write lock info: {e}")
-
-    def _clear_holder_info(self) -> None:
-        """Clear the holder info file."""
+    @contextmanager
+    def _transaction(self):
+        """Exclusive write transaction (serialises schedulers across processes)."""
+        conn = self._connect()
         try:
-            if self.lock_info_path.exists():
-                self.lock_info_path.unlink()
-        except Exception as e:
-            logger.warning(f"Could not clear lock info: {e}")
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+
+    def limit_for(self, org_key: str) -> int:
+        """Concurrent leases allowed for an org."""
+        return self.org_limits.get(org_key, self.max_per_org)
+
+    def _reap_stale(self, conn: sqlite3.Connection) -> None:
+        """Remove leases and waiters left behind by dead processes."""
+        now = time.time()
+        for row in conn.execute('SELECT * FROM leases').fetchall():
+            info = self._holder_dict(row)
+            if row['host'] not in (None, self._host):
+                # Can't check another host's PIDs - fall back to age
+                info = {**info, 'pid': None}
+            if _is_lock_stale(info):
+                logger.warning(f"Reclaiming stale Buz lease for '{row['org_key']}' from '{row['bot']}'")
+                conn.execute('DELETE FROM leases WHERE id = ?', (row['id'],))
+                self._record(conn, row, 'stale', row['acquired_at'] - row['enqueued_at'],
+                             now - row['acquired_at'])
+
+        for row in conn.execute('SELECT * FROM waiters').fetchall():
+            if (
+                row['host'] == self._host and row['pid'] and row['pid'] != os.getpid()
+                and not _is_process_running(row['pid'])
+            ):
+                conn.execute('DELETE FROM waiters WHERE id = ?', (row['id'],))
+
+    @staticmethod
+    def _record(conn, row, outcome: str, wait_seconds: float, hold_seconds: Optional[float]) -> None:
+        conn.execute(
+            'INSERT INTO history (org_key, bot, priority, outcome, wait_seconds, hold_seconds, finished_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (row['org_key'], row['bot'], row['priority'], outcome, wait_seconds, hold_seconds, time.time())
+        )
+        conn.execute(
+            'DELETE FROM history WHERE id <= (SELECT MAX(id) FROM history) - ?',
+            (HISTORY_SIZE,)
+        )
+
+    @staticmethod
+    def _holder_dict(row) -> dict:
+        return {
+            'bot': row['bot'],
+            'org_key': row['org_key'],
+            'priority': row['priority'],
+            'acquired_at': _iso(row['acquired_at']),
+            'pid': row['pid'],
+        }
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, bot_name: str, org_key: str, priority: int) -> str:
+        lease_id = uuid.uuid4().hex
+        with self._transaction() as conn:
+            conn.execute(
+                'INSERT INTO waiters (id, org_key, bot, priority, pid, host, enqueued_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (lease_id, org_key, bot_name, priority, os.getpid(), self._host, time.time())
+            )
+        return lease_id
+
+    def _try_grant(self, lease_id: str) -> bool:
+        """Turn our waiter into a lease if it's at the head of its queue and there's room."""
+        with self._transaction() as conn:
+            self._reap_stale(conn)
+
+            me = conn.execute('SELECT * FROM waiters WHERE id = ?', (lease_id,)).fetchone()
+            if me is None:
+                raise RuntimeError('Buz lease request was removed from the queue')
+
+            now = time.time()
+            aged_before = now - PRIORITY_AGING_SECONDS
+            effective = 'CASE WHEN enqueued_at < ? THEN ? ELSE priority END'
+            my_priority = PRIORITY_INTERACTIVE if me['enqueued_at'] < aged_before else me['priority']
+
+            # Anyone competing for the same org (or all of Buz) who goes first?
+            if me['org_key'] == ALL_ORGS:
+                competing, params = '1 = 1', ()
+            else:
+                competing, params = 'org_key IN (?, ?)', (me['org_key'], ALL_ORGS)
+            ahead = conn.execute(
+                f'SELECT COUNT(*) FROM waiters WHERE id != ? AND {competing} AND '
+                f'({effective} < ? OR ({effective} = ? AND enqueued_at < ?))',
+                (lease_id, *params, aged_before, PRIORITY_INTERACTIVE, my_priority,
+                 aged_before, PRIORITY_INTERACTIVE, my_priority, me['enqueued_at'])
+            ).fetchone()[0]
+            if ahead:
+                return False
+
+            if me['org_key'] == ALL_ORGS:
+                busy = conn.execute('SELECT COUNT(*) FROM leases').fetchone()[0] > 0
+            else:
+                active = conn.execute(
+                    'SELECT COUNT(*) FROM leases WHERE org_key = ?', (me['org_key'],)
+                ).fetchone()[0]
+                global_held = conn.execute(
+                    'SELECT COUNT(*) FROM leases WHERE org_key = ?', (ALL_ORGS,)
+                ).fetchone()[0]
+                busy = global_held > 0 or active >= self.limit_for(me['org_key'])
+            if busy:
+                return False
+
+            conn.execute('DELETE FROM waiters WHERE id = ?', (lease_id,))
+            conn.execute(
+                'INSERT INTO leases (id, org_key, bot, priority, pid, host, enqueued_at, acquired_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (lease_id, me['org_key'], me['bot'], me['priority'], me['pid'], me['host'],
+                 me['enqueued_at'], now)
+            )
+            return True
+
+    def _abandon(self, lease_id: str, outcome: str) -> None:
+        """Drop a waiter that gave up (timeout or cancellation)."""
+        with self._transaction() as conn:
+            row = conn.execute('SELECT * FROM waiters WHERE id = ?', (lease_id,)).fetchone()
+            if row is not None:
+                conn.execute('DELETE FROM waiters WHERE id = ?', (lease_id,))
+                self._record(conn, row, outcome, time.time() - row['enqueued_at'], None)
+
+    def _release(self, lease_id: str) -> None:
+        with self._transaction() as conn:
+            row = conn.execute('SELECT * FROM leases WHERE id = ?', (lease_id,)).fetchone()
+            if row is not None:
+                conn.execute('DELETE FROM leases WHERE id = ?', (lease_id,))
+                self._record(conn, row, 'released', row['acquired_at'] - row['enqueued_at'],
+                             time.time() - row['acquired_at'])
+        with self._held_lock:
+            self._held.pop(lease_id, None)
+
+    def _granted(self, lease_id: str, bot_name: str, org_key: str, started: float) -> None:
+        with self._held_lock:
+            self._held[lease_id] = bot_name
+        waited = time.monotonic() - started
+        logger.info(f"[{bot_name}] Buz lease acquired for '{org_key}' (waited {waited:.1f}s)")
+
+    def _timed_out(self, lease_id: str, bot_name: str, org_key: str, started: float):
+        self._abandon(lease_id, 'timeout')
+        holder_info = get_lock_holder_info(None if org_key == ALL_ORGS else org_key, self.lock_path)
+        if holder_info:
+            logger.error(
+                f"[{bot_name}] Failed to get Buz lease for '{org_key}' after {self.timeout}s. "
+                f"Held by '{holder_info.get('bot', 'unknown')}' since {holder_info.get('acquired_at', 'unknown time')}"
+            )
+        else:
+            logger.error(
+                f"[{bot_name}] Failed to get Buz lease for '{org_key}' after {self.timeout}s. "
+                f"Another bot may be using Buz."
+            )
+        return BuzLockTimeout(str(self.lock_path), org_key, time.monotonic() - started)
 
-    def _get_holder_info(self) -> Optional[dict]:
-        """Read holder info from the info file."""
+    def _lock_blocking(self, bot_name: str, org_key: Optional[str], priority: Union[str, int]) -> str:
+        org_key = org_key or ALL_ORGS
+        logger.info(f"[{bot_name}] Requesting Buz lease for '{org_key}' ({priority})...")
+        started = time.monotonic()
+        lease_id = self._enqueue(bot_name, org_key, _priority_value(priority))
         try:
-            if self.lock_info_path.exists():
-                return json.loads(self.lock_info_path.read_text())
-        except Exception as e:
-            logger.warning(f"Could not read lock info: {e}")
-        return None
+            while not self._try_grant(lease_id):
+                if self.timeout >= 0 and time.monotonic() - started >= self.timeout:
+                    raise self._timed_out(lease_id, bot_name, org_key, started)
+                time.sleep(POLL_INTERVAL)
+        except BuzLockTimeout:
+            raise
+        except BaseException:
+            self._abandon(lease_id, 'cancelled')
+            raise
+        self._granted(lease_id, bot_name, org_key, started)
+        return lease_id
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
 
     @contextmanager
-    def acquire(self, bot_name: str):
+    def acquire(
+        self,
+        bot_name: str,
+        org_key: Optional[str] = None,
+        priority: Union[str, int] = 'normal'
+    ):
         """
-        Sync context manager to acquire the Buz Playwright lock.
+        Sync context manager to lease Buz Playwright access.
 
         Args:
-            bot_name: Name of the bot acquiring the lock (for logging)
+            bot_name: Name of the bot acquiring the lease (for logging)
+            org_key: Org the work touches (None reserves all of Buz)
+            priority: 'interactive', 'normal' or 'batch'
 
         Raises:
-            Timeout: If the lock cannot be acquired within the timeout period
+            Timeout: If the lease cannot be granted within the timeout period
         """
-        acquired = False
+        lease_id = self._lock_blocking(bot_name, org_key, priority)
         try:
-            logger.info(f"[{bot_name}] Acquiring Buz Playwright lock...")
-            self._file_lock.acquire(timeout=self.timeout)
-            acquired = True
-            self._holder = bot_name
-            self._acquired_at = datetime.now(timezone.utc)
-            self._write_holder_info(bot_name)
-            logger.info(f"[{bot_name}] Buz Playwright lock acquired")
             yield
-        except Timeout:
-            holder_info = self._get_holder_info()
-            if holder_info:
-                holder_bot = holder_info.get('bot', 'unknown')
-                acquired_at = holder_info.get('acquired_at', 'unknown time')
-                logger.error(
-                    f"[{bot_name}] Failed to acquire Buz Playwright lock after {self.timeout}s. "
-                    f"Lock held by '{holder_bot}' since {acquired_at}"
-                )
-            else:
-                logger.error(
-                    f"[{bot_name}] Failed to acquire Buz Playwright lock after {self.timeout}s. "
-                    f"Another bot may be using Buz."
-                )
-            raise
         finally:
-            if acquired:
-                try:
-                    self._file_lock.release()
-                    self._clear_holder_info()
-                    logger.info(f"[{bot_name}] Buz Playwright lock released")
-                except Exception as e:
-                    logger.warning(f"[{bot_name}] Error releasing lock: {e}")
-                self._holder = None
-                self._acquired_at = None
+            try:
+                self._release(lease_id)
+                logger.info(f"[{bot_name}] Buz lease released")
+            except Exception as e:
+                logger.warning(f"[{bot_name}] Error releasing lease: {e}")
 
     @asynccontextmanager
-    async def acquire_async(self, bot_name: str):
+    async def acquire_async(
+        self,
+        bot_name: str,
+        org_key: Optional[str] = None,
+        priority: Union[str, int] = 'normal'
+    ):
         """
-        Async context manager to acquire the Buz Playwright lock.
+        Async context manager to lease Buz Playwright access.
 
-        Uses run_in_executor to avoid blocking the event loop while waiting.
+        Waits with asyncio.sleep between queue checks, so the event loop
+        stays responsive.
 
         Args:
-            bot_name: Name of the bot acquiring the lock (for logging)
+            bot_name: Name of the bot acquiring the lease (for logging)
+            org_key: Org the work touches (None reserves all of Buz)
+            priority: 'interactive', 'normal' or 'batch'
 
         Raises:
-            Timeout: If the lock cannot be acquired within the timeout period
+            Timeout: If the lease cannot be granted within the timeout period
         """
-        loop = asyncio.get_event_loop()
-        acquired = False
+        org_key = org_key or ALL_ORGS
+        logger.info(f"[{bot_name}] Requesting Buz lease for '{org_key}' ({priority}, async)...")
+        started = time.monotonic()
+        lease_id = self._enqueue(bot_name, org_key, _priority_value(priority))
         try:
-            logger.info(f"[{bot_name}] Acquiring Buz Playwright lock (async)...")
-            # Run blocking lock acquisition in executor
-            await loop.run_in_executor(
-                None,
-                lambda: self._file_lock.acquire(timeout=self.timeout)
-            )
-            acquired = True
-            self._holder = bot_name
-            self._acquired_at = datetime.now(timezone.utc)
-            self._write_holder_info(bot_name)
-            logger.info(f"[{bot_name}] Buz Playwright lock acquired")
-            yield
-        except Timeout:
-            holder_info = self._get_holder_info()
-            if holder_info:
-                holder_bot = holder_info.get('bot', 'unknown')
-                acquired_at = holder_info.get('acquired_at', 'unknown time')
-                logger.error(
-                    f"[{bot_name}] Failed to acquire Buz Playwright lock after {self.timeout}s. "
-                    f"Lock held by '{holder_bot}' since {acquired_at}"
-                )
-            else:
-                logger.error(
-                    f"[{bot_name}] Failed to acquire Buz Playwright lock after {self.timeout}s. "
-                    f"Another bot may be using Buz."
-                )
+            while not self._try_grant(lease_id):
+                if self.timeout >= 0 and time.monotonic() - started >= self.timeout:
+                    raise self._timed_out(lease_id, bot_name, org_key, started)
+                await asyncio.sleep(POLL_INTERVAL)
+        except BuzLockTimeout:
             raise
+        except BaseException:
+            self._abandon(lease_id, 'cancelled')
+            raise
+        self._granted(lease_id, bot_name, org_key, started)
+
+        try:
+            yield
         finally:
-            if acquired:
-                try:
-                    # IMPORTANT: Release must run in executor too!
-                    # filelock uses thread-local state, so release must happen
-                    # in the same thread context as acquire
-                    await loop.run_in_executor(
-                        None,
-                        lambda: self._file_lock.release()
-                    )
-                    self._clear_holder_info()
-                    logger.info(f"[{bot_name}] Buz Playwright lock released")
-                except Exception as e:
-                    logger.warning(f"[{bot_name}] Error releasing lock: {e}")
-                self._holder = None
-                self._acquired_at = None
-
-    def lock(self, bot_name: str) -> None:
+            try:
+                self._release(lease_id)
+                logger.info(f"[{bot_name}] Buz lease released")
+            except Exception as e:
+                logger.warning(f"[{bot_name}] Error releasing lease: {e}")
+
+    def lock(
+        self,
+        bot_name: str,
+        org_key: Optional[str] = None,
+        priority: Union[str, int] = 'normal'
+    ) -> None:
         """
-        Manually acquire the lock (non-context-manager usage).
+        Manually acquire a lease (non-context-manager usage).
 
         Args:
-            bot_name: Name of the bot acquiring the lock
+            bot_name: Name of the bot acquiring the lease
+            org_key: Org the work touches (None reserves all of Buz)
+            priority: 'interactive', 'normal' or 'batch'
 
         Raises:
-            Timeout: If the lock cannot be acquired within the timeout period
+            Timeout: If the lease cannot be granted within the timeout period
         """
-        logger.info(f"[{bot_name}] Acquiring Buz Playwright lock...")
-        try:
-            self._file_lock.acquire(timeout=self.timeout)
-            self._holder = bot_name
-            self._acquired_at = datetime.now(timezone.utc)
-            self._write_holder_info(bot_name)
-            logger.info(f"[{bot_name}] Buz Playwright lock acquired")
-        except Timeout:
-            holder_info = self._get_holder_info()
-            if holder_info:
-                holder_bot = holder_info.get('bot', 'unknown')
-                acquired_at = holder_info.get('acquired_at', 'unknown time')
-                logger.error(
-                    f"[{bot_name}] Failed to acquire Buz Playwright lock after {self.timeout}s. "
-                    f"Lock held by '{holder_bot}' since {acquired_at}"
-                )
-            else:
-                logger.error(
-                    f"[{bot_name}] Failed to acquire Buz Playwright lock after {self.timeout}s. "
-                    f"Another bot may be using Buz."
-                )
-            raise
+        lease_id = self._lock_blocking(bot_name, org_key, priority)
+        if not hasattr(self._manual, 'leases'):
+            self._manual.leases = []
+        self._manual.leases.append(lease_id)
 
     def unlock(self) -> None:
-        """Release the lock if held."""
-        if self._file_lock.is_locked:
-            bot_name = self._holder or "unknown"
-            self._file_lock.release()
-            self._clear_holder_info()
-            logger.info(f"[{bot_name}] Buz Playwright lock released")
-            self._holder = None
-            self._acquired_at = None
+        """Release the most recent manual lease taken by this thread, if any."""
+        leases = getattr(self._manual, 'leases', None)
+        if leases:
+            lease_id = leases.pop()
+            bot_name = self._held.get(lease_id, 'unknown')
+            self._release(lease_id)
+            logger.info(f"[{bot_name}] Buz lease released")
 
     @property
     def is_locked(self) -> bool:
-        """Check if the lock is currently held (by this instance)."""
-        return self._file_lock.is_locked
+        """Check if this instance currently holds any lease."""
+        with self._held_lock:
+            return bool(self._held)
 
     @property
     def holder(self) -> Optional[str]:
-        """Get the name of the bot currently holding the lock (this instance only)."""
-        return self._holder
+        """Bot name of the most recent lease held by this instance."""
+        with self._held_lock:
+            return next(reversed(self._held.values()), None)
 
     def get_lock_status(self) -> dict:
         """
-        Get current lock status information.
+        Get current scheduler status.
 
         Returns:
-            Dict with lock status, holder info if available
+            Dict with holders and queue depth per org, plus wait-time metrics
+            over the last HISTORY_SIZE leases
         """
-        holder_info = self._get_holder_info()
+        with self._transaction() as conn:
+            self._reap_stale(conn)
+            leases = conn.execute('SELECT * FROM leases ORDER BY acquired_at').fetchall()
+            waiters = conn.execute('SELECT * FROM waiters ORDER BY enqueued_at').fetchall()
+            history = conn.execute('SELECT * FROM history ORDER BY id').fetchall()
+
+        now = time.time()
+        orgs: Dict[str, dict] = {}
+
+        def org_entry(org_key: str) -> dict:
+            if org_key not in orgs:
+                orgs[org_key] = {
+                    'limit': None if org_key == ALL_ORGS else self.limit_for(org_key),
+                    'active': 0,
+                    'queued': 0,
+                    'queued_by_priority': {},
+                    'oldest_wait_seconds': None,
+                    'holders': [],
+                }
+            return orgs[org_key]
+
+        for row in leases:
+            entry = org_entry(row['org_key'])
+            entry['active'] += 1
+            entry['holders'].append(self._holder_dict(row))
+
+        for row in waiters:
+            entry = org_entry(row['org_key'])
+            entry['queued'] += 1
+            by_priority = entry['queued_by_priority']
+            by_priority[row['priority']] = by_priority.get(row['priority'], 0) + 1
+            if entry['oldest_wait_seconds'] is None:
+                entry['oldest_wait_seconds'] = round(now - row['enqueued_at'], 1)
+
+        granted_waits = sorted(r['wait_seconds'] for r in history if r['outcome'] != 'timeout')
+
         return {
-            'is_locked_by_us': self._file_lock.is_locked,
-            'our_holder': self._holder,
-            'holder_info': holder_info,
+            'is_locked_by_us': self.is_locked,
+            'our_holder': self.holder,
+            'holder_info': self._holder_dict(leases[0]) if leases else None,
             'lock_file_exists': self.lock_path.exists(),
-            'info_file_exists': self.lock_info_path.exists()
+            'active_leases': len(leases),
+            'queue_depth': len(waiters),
+            'orgs': orgs,
+            'wait_seconds': {
+                'samples': len(granted_waits),
+                'avg': round(sum(granted_waits) / len(granted_waits), 2) if granted_waits else None,
+                'p95': round(granted_waits[int(0.95 * (len(granted_waits) - 1))], 2) if granted_waits else None,
+                'max': round(granted_waits[-1], 2) if granted_waits else None,
+            },
+            'timeouts': sum(1 for r in history if r['outcome'] == 'timeout'),
+            'stale_reclaimed': sum(1 for r in history if r['outcome'] == 'stale'),
         }
 
+    def clear(self) -> int:
+        """Forcefully drop every lease and waiter. Returns how many were removed."""
+        with self._transaction() as conn:
+            removed = conn.execute('DELETE FROM leases').rowcount
+            removed += conn.execute('DELETE FROM waiters').rowcount
+        return removed
+
 
 # Module-level singleton for convenience
 _default_lock: Optional[BuzPlaywrightLock] = None
@@ -287,7 +572,7 @@ def get_buz_lock(timeout: int = 600) -> BuzPlaywrightLock:
     Get the default Buz Playwright lock instance.
 
     Args:
-        timeout: Lock timeout in seconds (only used on first call).
+        timeout: Lease timeout in seconds (only used on first call).
                  Default: 600 (10 minutes)
 
     Returns:
@@ -299,20 +584,40 @@ def get_buz_lock(timeout: int = 600) -> BuzPlaywrightLock:
     return _default_lock
 
 
-def get_lock_holder_info() -> Optional[dict]:
+def _read_leases(lock_path: Path) -> List[sqlite3.Row]:
+    """Current leases (oldest first) without taking a write lock."""
+    if not lock_path.exists():
+        return []
+    try:
+        conn = sqlite3.connect(str(lock_path), timeout=5)
+        conn.row_factory = sqlite3.Row
+        try:
+            return conn.execute('SELECT * FROM leases ORDER BY acquired_at').fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read Buz lease state: {e}")
+        return []
+
+
+def get_lock_holder_info(
+    org_key: Optional[str] = None,
+    lock_path: Optional[Path] = None
+) -> Optional[dict]:
     """
-    Get info about who currently holds the Buz Playwright lock.
+    Get info about who currently holds a Buz lease.
 
-    Useful for checking lock status without creating a lock instance.
+    Args:
+        org_key: Only consider leases that block this org (default: any lease)
+        lock_path: Scheduler database (default: the shared one)
 
     Returns:
-        Dict with 'bot', 'acquired_at', 'pid' if lock is held, None otherwise
+        Dict with 'bot', 'org_key', 'acquired_at', 'pid' for the oldest
+        matching lease, None if there isn't one
     """
-    try:
-        if DEFAULT_LOCK_INFO_PATH.exists():
-            return json.loads(DEFAULT_LOCK_INFO_PATH.read_text())
-    except Exception:
-        pass
+    for row in _read_leases(Path(lock_path or DEFAULT_LOCK_PATH)):
+        if org_key is None or row['org_key'] in (org_key, ALL_ORGS):
+            return BuzPlaywrightLock._holder_dict(row)
     return None
 
 
@@ -327,24 +632,24 @@ def _is_process_running(pid: int) -> bool:
 
 def _is_lock_stale(holder_info: dict) -> bool:
     """
-    Check if a lock is stale (process dead, or process unknown and too old).
+    Check if a lease is stale (process dead, or process unknown and too old).
 
-    A lock is stale if:
+    A lease is stale if:
     - The holding process is no longer running, OR
-    - We can't check the PID AND the lock is older than MAX_LOCK_AGE_SECONDS
+    - We can't check the PID AND the lease is older than MAX_LOCK_AGE_SECONDS
 
-    If the process IS running, the lock is NEVER stale (even if old).
+    If the process IS running, the lease is NEVER stale (even if old).
     """
     pid = holder_info.get('pid')
 
     # If we have a PID, check if it's running
     if pid:
         if _is_process_running(pid):
-            # Process is alive - lock is NOT stale, regardless of age
+            # Process is alive - lease is NOT stale, regardless of age
             return False
         else:
-            # Process is dead - lock IS stale
-            logger.info(f"Lock held by dead process (PID {pid}) - stale")
+            # Process is dead - lease IS stale
+            logger.info(f"Lease held by dead process (PID {pid}) - stale")
             return True
 
     # No PID available - fall back to age check
@@ -354,7 +659,7 @@ def _is_lock_stale(holder_info: dict) -> bool:
             acquired_at = datetime.fromisoformat(acquired_at_str)
             age = (datetime.now(timezone.utc) - acquired_at).total_seconds()
             if age > MAX_LOCK_AGE_SECONDS:
-                logger.info(f"Lock is {age:.0f}s old (max {MAX_LOCK_AGE_SECONDS}s) with no PID - stale")
+                logger.info(f"Lease is {age:.0f}s old (max {MAX_LOCK_AGE_SECONDS}s) with no PID - stale")
                 return True
         except (ValueError, TypeError):
             pass
@@ -362,52 +667,28 @@ def _is_lock_stale(holder_info: dict) -> bool:
     return False
 
 
-def _cleanup_stale_lock() -> bool:
+def is_lock_available(org_key: Optional[str] = None) -> bool:
     """
-    Clean up stale lock files if the lock is stale.
-
-    Returns:
-        True if stale lock was cleaned up, False otherwise
-    """
-    holder_info = get_lock_holder_info()
-    if holder_info and _is_lock_stale(holder_info):
-        bot = holder_info.get('bot', 'unknown')
-        logger.warning(f"Cleaning up stale lock from '{bot}'")
-        try:
-            if DEFAULT_LOCK_INFO_PATH.exists():
-                DEFAULT_LOCK_INFO_PATH.unlink()
-            if DEFAULT_LOCK_PATH.exists():
-                DEFAULT_LOCK_PATH.unlink()
-            return True
-        except Exception as e:
-            logger.error(f"Failed to clean up stale lock: {e}")
-    return False
+    Quick check if a Buz lease could be granted right now.
 
+    Non-blocking - useful for deciding whether to wait or fail immediately.
+    Reclaims stale leases first.
 
-def is_lock_available() -> bool:
-    """
-    Quick check if the Buz Playwright lock is available.
-
-    This is a non-blocking check - useful for determining whether to
-    wait or fail immediately. Automatically cleans up stale locks.
+    Args:
+        org_key: Org to check (default: whether Buz is entirely idle)
 
     Returns:
-        True if lock appears to be available, False if held
+        True if nothing is holding or queued for the org, False otherwise
     """
-    # Try to clean up stale locks first
-    _cleanup_stale_lock()
+    lock = get_buz_lock()
+    status = lock.get_lock_status()
+    if org_key is None:
+        return status['active_leases'] == 0 and status['queue_depth'] == 0
 
-    # Check if info file exists (indicates lock is held)
-    if DEFAULT_LOCK_INFO_PATH.exists():
+    global_entry = status['orgs'].get(ALL_ORGS, {})
+    if global_entry.get('active') or global_entry.get('queued'):
         return False
-    # Also check the actual lock file
-    if DEFAULT_LOCK_PATH.exists():
-        # Try to acquire with timeout=0 to check availability
-        try:
-            lock = FileLock(str(DEFAULT_LOCK_PATH))
-            lock.acquire(timeout=0)
-            lock.release()
-            return True
-        except Timeout:
-            return False
-    return True
+    entry = status['orgs'].get(org_key)
+    if entry is None:
+        return True
+    return entry['queued'] == 0 and entry['active'] < lock.limit_for(org_key)
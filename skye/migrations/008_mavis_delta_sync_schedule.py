@@ -0,0 +1,36 @@
+"""Run the Mavis-Unleashed sync every 5 minutes.
+
+Mavis now pulls only products modified since its last sync (with a full
+reconcile once a day), so frequent runs are cheap and keep fabric data
+within a five-minute freshness target.
+"""
+import json
+
+
+def up(conn):
+    conn.execute('''
+        UPDATE jobs
+        SET schedule_type = 'interval',
+            schedule_config = ?,
+            description = ?,
+            quiet = 1
+        WHERE job_id = 'mavis_unleashed_sync'
+    ''', (
+        json.dumps({'minutes': 5}),
+        'Sync product data from Unleashed API into Mavis database '
+        '(changes only, with a daily full reconcile).'
+    ))
+
+
+def down(conn):
+    conn.execute('''
+        UPDATE jobs
+        SET schedule_type = 'cron',
+            schedule_config = ?,
+            description = ?,
+            quiet = 0
+        WHERE job_id = 'mavis_unleashed_sync'
+    ''', (
+        json.dumps({'hour': '*/4', 'minute': '0'}),
+        'Sync product data from Unleashed API into Mavis database.'
+    ))
@@ -0,0 +1,223 @@
+"""Unit tests for Banji's background job processor."""
+import importlib
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add project root to path
+ROOT_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT_DIR))
+
+# Skip all tests in this module if playwright is not installed
+# (Banji requires playwright for browser automation)
+pytest.importorskip("playwright")
+
+
+@pytest.fixture
+def job_module():
+    """Import job_processor with a fake config and an in-memory job store."""
+    fake_config = types.ModuleType('config')
+    fake_config.config = MagicMock(
+        job_workers=2, job_max_per_org=1, job_shards_per_job=3, job_min_quotes_per_shard=2
+    )
+    fake_config.config.get_org_config.side_effect = lambda org: {'name': org, 'storage_state_path': f'/fake/{org}.json'}
+
+    fake_database = types.ModuleType('banji.database')
+    fake_database.db = MagicMock()
+
+    with patch.dict(sys.modules, {'config': fake_config, 'banji.database': fake_database}):
+        sys.modules.pop('banji.services.job_processor', None)
+        module = importlib.import_module('banji.services.job_processor')
+        yield module
+        sys.modules.pop('banji.services.job_processor', None)
+
+
+class FakeQuotePage:
+    """Refreshes a quote after a short delay; quotes starting with 'bad' fail."""
+
+    delay = 0.05
+
+    def __init__(self, page, config, org_config):
+        self.org = org_config['name']
+
+    def refresh_pricing(self, quote_id):
+        time.sleep(self.delay)
+        if quote_id.startswith('bad'):
+            raise RuntimeError(f'Could not open quote {quote_id}')
+        return {'quote_id': quote_id, 'org': self.org, 'price_changed': False}
+
+
+@pytest.fixture
+def fake_browser(job_module):
+    with patch.object(job_module, 'BrowserManager') as browser_cls, \
+            patch.object(job_module, 'LoginPage'), \
+            patch.object(job_module, 'QuotePage', FakeQuotePage):
+        browser_cls.return_value.__enter__.return_value = MagicMock()
+        yield browser_cls
+
+
+def _job(job_id, org, quote_ids):
+    return {
+        'id': job_id,
+        'job_type': 'batch_refresh_pricing',
+        'org': org,
+        'payload': {'quote_ids': quote_ids, 'headless': True},
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.banji
+class TestBatchSharding:
+    """Test sharded batch refresh within one job."""
+
+    def test_results_merged_in_order(self, job_module, fake_browser):
+        processor = job_module.JobProcessor(shards_per_job=3, min_quotes_per_shard=2)
+        quote_ids = [f'Q{i:03d}' for i in range(12)] + ['bad1']
+
+        processor._process_batch_refresh_pricing(_job('job-1', 'canberra', quote_ids))
+
+        db = job_module.db
+        result = db.complete_job.call_args[0][1]
+        assert [r['quote_id'] for r in result['results']] == quote_ids
+        assert result['successful'] == 12
+        assert result['failed'] == 1
+        assert result['shards'] == 3
+        assert fake_browser.call_count == 3
+
+    def test_progress_per_quote(self, job_module, fake_browser):
+        processor = job_module.JobProcessor(shards_per_job=2, min_quotes_per_shard=1)
+
+        processor._process_batch_refresh_pricing(_job('job-1', 'canberra', ['A', 'B', 'C', 'D']))
+
+        progress = [c[0][1] for c in job_module.db.update_job_progress.call_args_list]
+        assert progress == [0, 1, 2, 3, 4]
+
+    def test_shards_run_concurrently(self, job_module, fake_browser):
+        processor = job_module.JobProcessor(shards_per_job=4, min_quotes_per_shard=1)
+        FakeQuotePage.delay = 0.1
+        try:
+            started = time.monotonic()
+            processor._process_batch_refresh_pricing(_job('job-1', 'canberra', list('ABCDEFGH')))
+            elapsed = time.monotonic() - started
+        finally:
+            FakeQuotePage.delay = 0.05
+
+        # Eight 100ms quotes in one browser would take 0.8s
+        assert elapsed < 0.6
+
+    def test_small_batches_use_one_browser(self, job_module, fake_browser):
+        processor = job_module.JobProcessor(shards_per_job=3, min_quotes_per_shard=5)
+
+        processor._process_batch_refresh_pricing(_job('job-1', 'canberra', ['A', 'B']))
+
+        assert fake_browser.call_count == 1
+
+    def test_one_shard_login_failure_is_absorbed(self, job_module, fake_browser):
+        logins = {'count': 0}
+        lock = threading.Lock()
+
+        def login_page(page, config, org_config):
+            login = MagicMock()
+            with lock:
+                logins['count'] += 1
+                if logins['count'] == 1:
+                    login.login.side_effect = RuntimeError('login failed')
+            return login
+
+        processor = job_module.JobProcessor(shards_per_job=2, min_quotes_per_shard=1)
+        with patch.object(job_module, 'LoginPage', side_effect=login_page):
+            processor._process_batch_refresh_pricing(_job('job-1', 'canberra', ['A', 'B', 'C']))
+
+        result = job_module.db.complete_job.call_args[0][1]
+        assert result['successful'] == 3
+
+    def test_all_shards_failing_fails_job(self, job_module, fake_browser):
+        fake_browser.return_value.__enter__.side_effect = RuntimeError('browser crashed')
+        processor = job_module.JobProcessor(shards_per_job=2, min_quotes_per_shard=1)
+
+        processor._process_batch_refresh_pricing(_job('job-1', 'canberra', ['A', 'B']))
+
+        job_module.db.fail_job.assert_called_once()
+        assert 'browser crashed' in job_module.db.fail_job.call_args[0][1]
+
+
+@pytest.mark.unit
+@pytest.mark.banji
+class TestJobDispatch:
+    """Test running jobs for several orgs in parallel."""
+
+    def test_orgs_run_in_parallel_and_same_org_waits(self, job_module, fake_browser):
+        pending = [
+            _job('job-a', 'canberra', ['A1', 'A2']),
+            _job('job-b', 'canberra', ['B1']),
+            _job('job-c', 'tweed', ['C1', 'C2']),
+        ]
+        claim_lock = threading.Lock()
+
+        def get_pending_job(exclude_orgs=None):
+            with claim_lock:
+                for job in pending:
+                    if job['org'] not in (exclude_orgs or []):
+                        pending.remove(job)
+                        return job
+            return None
+
+        db = job_module.db
+        db.get_pending_job.side_effect = get_pending_job
+        running = {'now': 0, 'max': 0, 'orgs': []}
+        original = job_module.JobProcessor._process_batch_refresh_pricing
+
+        def tracked(self, job):
+            with claim_lock:
+                running['now'] += 1
+                running['max'] = max(running['max'], running['now'])
+                running['orgs'].append(job['org'])
+            try:
+                original(self, job)
+            finally:
+                with claim_lock:
+                    running['now'] -= 1
+
+        processor = job_module.JobProcessor(poll_interval=0.05, max_workers=3, min_quotes_per_shard=10)
+        with patch.object(job_module.JobProcessor, '_process_batch_refresh_pricing', tracked):
+            processor.start()
+            deadline = time.monotonic() + 5
+            while db.complete_job.call_count < 3 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            processor.stop()
+
+        assert db.complete_job.call_count == 3
+        # canberra's second job had to wait, but tweed ran alongside canberra
+        assert running['max'] == 2
+        assert running['orgs'].index('tweed') < 2
+
+
+@pytest.mark.unit
+@pytest.mark.banji
+class TestJobNotify:
+    """Test waking the dispatcher when a job is queued."""
+
+    def test_notify_wakes_dispatcher(self, job_module, fake_browser):
+        pending = []
+        db = job_module.db
+        db.get_pending_job.side_effect = lambda exclude_orgs=None: pending.pop() if pending else None
+
+        processor = job_module.JobProcessor(poll_interval=30, max_workers=1)
+        processor.start()
+        try:
+            time.sleep(0.1)
+            pending.append(_job('job-1', 'canberra', ['A']))
+            started = time.monotonic()
+            processor.notify()
+            while not db.complete_job.called and time.monotonic() - started < 5:
+                time.sleep(0.01)
+        finally:
+            processor.stop()
+
+        assert db.complete_job.called
+        assert time.monotonic() - started < 2
@@ -0,0 +1,137 @@
+"""
+Unit tests for Chester's background health poller.
+"""
+
+import sys
+import threading
+import time
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Import directly to avoid pulling in Chester's config and database
+module_path = project_root / 'chester' / 'services' / 'health_poller.py'
+spec = importlib.util.spec_from_file_location('chester_health_poller', module_path)
+health_poller_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(health_poller_module)
+HealthPoller = health_poller_module.HealthPoller
+
+
+def make_check(delay=0.0, down=()):
+    """Build a fake check_fn that records how many checks ran concurrently."""
+    state = {'calls': 0, 'in_flight': 0, 'max_in_flight': 0}
+    lock = threading.Lock()
+
+    def check(bot_name):
+        with lock:
+            state['calls'] += 1
+            state['in_flight'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        time.sleep(delay)
+        with lock:
+            state['in_flight'] -= 1
+        if bot_name in down:
+            return {'bot': bot_name, 'status': 'unreachable', 'error': 'Could not connect to bot'}
+        return {'bot': bot_name, 'status': 'healthy', 'response_time': 0.01}
+
+    return check, state
+
+
+@pytest.mark.unit
+@pytest.mark.chester
+class TestHealthPoller:
+    """Test snapshot refresh and reads."""
+
+    def test_refresh_builds_snapshot(self):
+        check, state = make_check(down={'sally'})
+        poller = HealthPoller(check, lambda: ['fred', 'sally', 'pam'])
+
+        results = poller.refresh()
+
+        assert [r['bot'] for r in results] == ['fred', 'sally', 'pam']
+        assert poller.get('sally')['status'] == 'unreachable'
+        assert 'checked_at' in poller.get('fred')
+        assert state['calls'] == 3
+
+    def test_reads_do_not_trigger_checks(self):
+        check, state = make_check()
+        poller = HealthPoller(check, lambda: ['fred', 'pam'])
+        poller.refresh()
+
+        for _ in range(10):
+            poller.get_results()
+            poller.get('fred')
+
+        assert state['calls'] == 2
+
+    def test_concurrency_is_bounded_and_parallel(self):
+        check, state = make_check(delay=0.1)
+        bots = [f'bot{i}' for i in range(12)]
+        poller = HealthPoller(check, lambda: bots, max_concurrency=4)
+
+        started = time.monotonic()
+        poller.refresh()
+        elapsed = time.monotonic() - started
+
+        assert state['max_in_flight'] <= 4
+        # 12 checks in series would take 1.2s; 4 at a time takes ~0.3s
+        assert elapsed < 0.8
+
+    def test_history_is_bounded(self):
+        check, _ = make_check()
+        poller = HealthPoller(check, lambda: ['fred'], history_size=3)
+
+        for _ in range(5):
+            poller.refresh()
+
+        history = poller.get_history('fred')
+        assert len(history) == 3
+        assert all(h['status'] == 'healthy' for h in history)
+
+    def test_removed_bots_drop_out_of_snapshot(self):
+        check, _ = make_check()
+        team = ['fred', 'pam']
+        poller = HealthPoller(check, lambda: list(team))
+        poller.refresh()
+
+        team.remove('pam')
+        poller.refresh()
+
+        assert poller.get('pam') is None
+        assert [r['bot'] for r in poller.get_results()] == ['fred']
+
+    def test_check_errors_are_captured(self):
+        def check(bot_name):
+            raise RuntimeError('boom')
+
+        poller = HealthPoller(check, lambda: ['fred'])
+        poller.refresh()
+
+        assert poller.get('fred')['status'] == 'error'
+
+    def test_staleness(self):
+        check, _ = make_check()
+        poller = HealthPoller(check, lambda: ['fred'], interval=60)
+
+        assert poller.is_stale() is True
+        poller.refresh()
+        assert poller.is_stale() is False
+
+    def test_background_thread(self):
+        check, state = make_check()
+        poller = HealthPoller(check, lambda: ['fred'], interval=0.05)
+
+        poller.start()
+        try:
+            time.sleep(0.3)
+            assert poller.is_running()
+        finally:
+            poller.stop()
+
+        assert not poller.is_running()
+        assert state['calls'] >= 2
+        assert poller.get_status()['bots_tracked'] == 1
@@ -0,0 +1,244 @@
+"""
+Unit tests for Doc's sharded, incremental test runner.
+"""
+
+import os
+import sys
+import subprocess
+import textwrap
+import pytest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(content))
+
+
+@pytest.fixture
+def sample_project(tmp_path):
+    """A tiny git project with two bots and their tests."""
+    root = tmp_path / 'project'
+    _write(root / 'pytest.ini', """
+        [pytest]
+        testpaths = tests
+        markers =
+            unit: Unit tests
+            alpha: Alpha bot
+            beta: Beta bot
+    """)
+    _write(root / 'alpha' / 'app.py', "NAME = 'alpha'\n")
+    _write(root / 'beta' / 'app.py', "NAME = 'beta'\n")
+    _write(root / 'tests' / 'unit' / 'test_alpha_core.py', """
+        import pytest
+
+        @pytest.mark.alpha
+        class TestAlpha:
+            def test_one(self):
+                assert True
+
+            def test_two(self):
+                assert True
+    """)
+    _write(root / 'tests' / 'unit' / 'test_beta_core.py', """
+        import pytest
+
+        @pytest.mark.beta
+        def test_passes():
+            assert True
+
+        @pytest.mark.beta
+        @pytest.mark.skip(reason='not today')
+        def test_skipped():
+            pass
+    """)
+    _write(root / 'tests' / 'unit' / 'test_misc.py', """
+        def test_plain():
+            assert True
+    """)
+
+    def git(*args):
+        subprocess.run(['git', *args], cwd=root, check=True, capture_output=True)
+
+    git('init', '-q')
+    git('-c', 'user.email=doc@example.com', '-c', 'user.name=Doc', 'add', '.')
+    git('-c', 'user.email=doc@example.com', '-c', 'user.name=Doc', 'commit', '-q', '-m', 'init')
+    return root
+
+
+@pytest.fixture
+def runner_env(tmp_path, sample_project):
+    """Import Doc's test runner against an isolated database and project."""
+    modules_to_clear = [k for k in sys.modules.keys()
+                        if k.startswith(('config', 'database', 'services'))]
+    saved_modules = {k: sys.modules.pop(k) for k in modules_to_clear}
+
+    doc_path = str(project_root / 'doc')
+    if doc_path in sys.path:
+        sys.path.remove(doc_path)
+    sys.path.insert(0, doc_path)
+
+    try:
+        import database.db
+        import services.test_runner
+        runner_module = sys.modules['services.test_runner']
+        test_db = sys.modules['database.db'].DocDatabase(str(tmp_path / 'test_doc.db'))
+        original_db = runner_module.db
+        runner_module.db = test_db
+
+        runner = runner_module.TestRunner()
+        runner.project_root = sample_project
+        yield runner, test_db, runner_module
+
+        runner_module.db = original_db
+    finally:
+        modules_to_remove = [k for k in sys.modules.keys()
+                             if k.startswith(('config', 'database', 'services'))]
+        for k in modules_to_remove:
+            sys.modules.pop(k, None)
+        sys.modules.update(saved_modules)
+        if doc_path in sys.path:
+            sys.path.remove(doc_path)
+
+
+@pytest.mark.unit
+@pytest.mark.doc
+@pytest.mark.slow
+class TestShardedRuns:
+    """Test runs split across pytest processes."""
+
+    def test_sharded_run_records_results(self, runner_env):
+        """Test a file-sharded run merges JUnit results from every shard."""
+        runner, test_db, _ = runner_env
+
+        result = runner.run_tests(workers=2, shard_by='file')
+
+        assert result['status'] == 'passed'
+        assert result['workers'] == 2
+        assert result['stats'] == {'total': 5, 'passed': 4, 'failed': 0, 'errors': 0, 'skipped': 1}
+
+        results = test_db.get_test_results(result['run_id'])
+        nodeids = {r['nodeid'] for r in results}
+        assert 'tests/unit/test_alpha_core.py::TestAlpha::test_one' in nodeids
+        assert {r['bot'] for r in results} == {'alpha', 'beta', 'misc'}
+        assert all(r['duration_seconds'] is not None for r in results)
+        assert set(test_db.get_file_durations()) == {
+            'tests/unit/test_alpha_core.py',
+            'tests/unit/test_beta_core.py',
+            'tests/unit/test_misc.py',
+        }
+
+    def test_marker_shards_cover_everything_once(self, runner_env):
+        """Test marker shards include unmarked tests and don't double count."""
+        runner, _, _ = runner_env
+
+        result = runner.run_tests(workers=3, shard_by='marker')
+
+        assert result['status'] == 'passed'
+        assert result['stats']['total'] == 5
+
+    def test_failure_reported(self, runner_env, sample_project):
+        """Test a failing test marks the run failed with its message stored."""
+        runner, test_db, _ = runner_env
+        _write(sample_project / 'tests' / 'unit' / 'test_beta_core.py', """
+            def test_broken():
+                assert 1 == 2, 'beta is broken'
+        """)
+
+        result = runner.run_tests(workers=2)
+
+        assert result['status'] == 'failed'
+        failed = test_db.get_test_results(result['run_id'], outcome='failed')
+        assert [r['nodeid'] for r in failed] == ['tests/unit/test_beta_core.py::test_broken']
+        assert 'beta is broken' in failed[0]['message']
+
+
+@pytest.mark.unit
+@pytest.mark.doc
+class TestShardPlanning:
+    """Test how work is split."""
+
+    def test_files_balanced_by_duration(self, runner_env):
+        """Test the slowest file gets a shard to itself."""
+        runner, test_db, _ = runner_env
+        run_id = test_db.start_test_run()
+        test_db.record_test_results(run_id, [
+            {'nodeid': 'a', 'file': 'tests/unit/test_alpha_core.py', 'outcome': 'passed', 'duration_seconds': 10},
+            {'nodeid': 'b', 'file': 'tests/unit/test_beta_core.py', 'outcome': 'passed', 'duration_seconds': 1},
+            {'nodeid': 'c', 'file': 'tests/unit/test_misc.py', 'outcome': 'passed', 'duration_seconds': 1},
+        ])
+
+        shards = runner._plan_shards(None, 2, 'file', verbose=False)
+
+        assert shards == [
+            ['tests/unit/test_alpha_core.py'],
+            ['tests/unit/test_beta_core.py', 'tests/unit/test_misc.py'],
+        ]
+
+    def test_marker_combined_with_user_marker(self, runner_env):
+        """Test each shard is limited to the requested marker."""
+        runner, _, _ = runner_env
+        shards = runner._plan_shards(None, 2, 'marker', marker='unit', verbose=False)
+        assert all(args[0] == '-m' and args[1].startswith('(unit) and (') for args in shards)
+
+    def test_bad_shard_mode(self, runner_env):
+        """Test an unknown shard_by is refused."""
+        runner, _, _ = runner_env
+        assert runner.run_tests(shard_by='random')['success'] is False
+
+
+@pytest.mark.unit
+@pytest.mark.doc
+class TestChangedOnly:
+    """Test picking tests for bots changed since the last green run."""
+
+    def _green_run(self, runner, test_db):
+        run_id = test_db.start_test_run(git_commit=runner._git_head())
+        test_db.complete_test_run(run_id, 'passed')
+
+    def test_no_green_run_means_full(self, runner_env):
+        """Test the whole suite is selected without a baseline."""
+        runner, _, _ = runner_env
+        assert runner.select_changed_tests()['full'] is True
+
+    def test_bot_change_selects_its_tests(self, runner_env, sample_project):
+        """Test editing a bot selects only that bot's test files."""
+        runner, test_db, _ = runner_env
+        self._green_run(runner, test_db)
+        (sample_project / 'beta' / 'app.py').write_text("NAME = 'beta2'\n")
+
+        selection = runner.select_changed_tests()
+
+        assert selection['full'] is False
+        assert selection['bots'] == ['beta']
+        assert selection['files'] == ['tests/unit/test_beta_core.py']
+
+    def test_shared_change_selects_everything(self, runner_env, sample_project):
+        """Test changes outside bot directories fall back to a full run."""
+        runner, test_db, _ = runner_env
+        self._green_run(runner, test_db)
+        _write(sample_project / 'shared' / 'helpers.py', "X = 1\n")
+
+        selection = runner.select_changed_tests()
+
+        assert selection['full'] is True
+        assert 'shared/helpers.py' in selection['reason']
+
+    def test_nothing_changed_is_green_noop(self, runner_env):
+        """Test a changed-only run with no changes records a passing run."""
+        runner, test_db, _ = runner_env
+        self._green_run(runner, test_db)
+
+        result = runner.run_tests(changed_only=True)
+
+        assert result['status'] == 'passed'
+        assert result['stats']['total'] == 0
+        assert test_db.get_test_run(result['run_id'])['mode'] == 'changed'
@@ -0,0 +1,197 @@
+"""
+Unit tests for Doc's checkup rollups and latest-status table.
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+
+@pytest.fixture
+def doc_db(tmp_path):
+    """Import Doc's database module against an isolated database."""
+    modules_to_clear = [k for k in sys.modules.keys()
+                        if k.startswith(('config', 'database', 'services'))]
+    saved_modules = {k: sys.modules.pop(k) for k in modules_to_clear}
+
+    doc_path = str(project_root / 'doc')
+    if doc_path in sys.path:
+        sys.path.remove(doc_path)
+    sys.path.insert(0, doc_path)
+
+    try:
+        import database.db
+        db_module = sys.modules['database.db']
+        yield db_module.DocDatabase(str(tmp_path / 'test_doc.db')), db_module
+    finally:
+        modules_to_remove = [k for k in sys.modules.keys()
+                             if k.startswith(('config', 'database', 'services'))]
+        for k in modules_to_remove:
+            sys.modules.pop(k, None)
+        sys.modules.update(saved_modules)
+        if doc_path in sys.path:
+            sys.path.remove(doc_path)
+
+
+def _insert_raw_checkup(test_db, bot_name, checked_at, status, response_time_ms):
+    """Write a checkup row directly, bypassing the rollups."""
+    conn = test_db._get_connection()
+    try:
+        conn.execute(
+            """INSERT INTO checkups (bot_name, checked_at, status, response_time_ms)
+               VALUES (?, ?, ?, ?)""",
+            (bot_name, checked_at, status, response_time_ms)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+@pytest.mark.doc
+class TestRollups:
+    """Test vitals read from the rollup tables."""
+
+    def test_bot_vitals(self, doc_db):
+        """Test uptime, averages and percentiles for one bot."""
+        test_db, _ = doc_db
+        for ms in (20, 40, 60, 80):
+            test_db.record_checkup('fred', 'healthy', response_time_ms=ms)
+        test_db.record_checkup('fred', 'unreachable', error_message='refused')
+
+        vitals = test_db.get_bot_vitals('fred')
+
+        assert vitals['total_checks'] == 5
+        assert vitals['healthy_count'] == 4
+        assert vitals['uptime_percent'] == 80.0
+        assert vitals['avg_response_time_ms'] == 50.0
+        assert vitals['min_response_time_ms'] == 20
+        assert vitals['max_response_time_ms'] == 80
+        assert 20 <= vitals['p50_response_time_ms'] <= 80
+        assert vitals['p50_response_time_ms'] <= vitals['p95_response_time_ms'] <= 80
+
+    def test_percentiles_follow_distribution(self, doc_db):
+        """Test p95 lands in the slow tail and p50 in the fast bulk."""
+        test_db, _ = doc_db
+        for _ in range(90):
+            test_db.record_checkup('peter', 'healthy', response_time_ms=30)
+        for _ in range(10):
+            test_db.record_checkup('peter', 'healthy', response_time_ms=2500)
+
+        vitals = test_db.get_bot_vitals('peter')
+
+        assert vitals['p50_response_time_ms'] <= 50
+        assert vitals['p95_response_time_ms'] > 2000
+
+    def test_unknown_bot_has_empty_vitals(self, doc_db):
+        """Test a bot with no checkups returns the empty shape."""
+        test_db, _ = doc_db
+        vitals = test_db.get_bot_vitals('nobody')
+        assert vitals['total_checks'] == 0
+        assert vitals['p95_response_time_ms'] is None
+
+    def test_team_vitals_use_latest_status(self, doc_db):
+        """Test current status comes from each bot's latest checkup."""
+        test_db, _ = doc_db
+        test_db.record_checkup('fred', 'unhealthy', response_time_ms=100, status_code=500)
+        test_db.record_checkup('fred', 'healthy', response_time_ms=50, status_code=200)
+        test_db.record_checkup('iris', 'timeout')
+
+        vitals = test_db.get_team_vitals()
+
+        assert vitals['bots_checked'] == 2
+        assert vitals['total_checks'] == 3
+        assert vitals['current_status'] == {'healthy': 1, 'unhealthy': 1, 'total': 2}
+        assert [b['bot_name'] for b in vitals['bots']] == ['fred', 'iris']
+        assert vitals['bots'][0]['status_code'] == 200
+        assert test_db.get_latest_checkup('fred')['status'] == 'healthy'
+        assert set(test_db.get_latest_checkups()) == {'fred', 'iris'}
+
+    def test_vitals_do_not_read_checkups(self, doc_db):
+        """Test deleting raw checkups leaves the rollups intact."""
+        test_db, _ = doc_db
+        test_db.record_checkup('fred', 'healthy', response_time_ms=50)
+        conn = test_db._get_connection()
+        conn.execute('DELETE FROM checkups')
+        conn.commit()
+        conn.close()
+
+        assert test_db.get_bot_vitals('fred')['total_checks'] == 1
+        assert test_db.get_team_vitals()['current_status']['total'] == 1
+
+    def test_cleanup_drops_bots_no_longer_checked(self, doc_db):
+        """Test a removed bot's latest status is pruned with old checkups."""
+        test_db, _ = doc_db
+        test_db.record_checkup('fred', 'healthy', response_time_ms=50)
+        test_db.record_checkup('olaf', 'healthy', response_time_ms=50)
+        conn = test_db._get_connection()
+        conn.execute(
+            "UPDATE bot_status SET checked_at = '2020-01-01T00:00:00+00:00' WHERE bot_name = 'olaf'"
+        )
+        conn.commit()
+        conn.close()
+
+        test_db.cleanup_old_checkups(days=30)
+
+        vitals = test_db.get_team_vitals()
+        assert [b['bot_name'] for b in vitals['bots']] == ['fred']
+        assert vitals['current_status']['total'] == 1
+
+    def test_long_periods_use_daily_rollups(self, doc_db):
+        """Test windows beyond the hourly retention read daily rollups."""
+        test_db, db_module = doc_db
+        test_db.record_checkup('fred', 'healthy', response_time_ms=50)
+
+        period, _ = test_db._rollup_window(db_module.HOURLY_ROLLUP_DAYS * 24 + 1)
+        assert period == 'day'
+        assert test_db.get_bot_vitals('fred', hours=24 * 30)['total_checks'] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.doc
+class TestBackfill:
+    """Test existing checkups are folded into rollups on startup."""
+
+    def test_backfill_existing_checkups(self, doc_db):
+        """Test a database with raw checkups but no rollups is backfilled."""
+        test_db, db_module = doc_db
+        now = db_module.datetime.now(db_module.timezone.utc).isoformat()
+        _insert_raw_checkup(test_db, 'fred', now, 'healthy', 40)
+        _insert_raw_checkup(test_db, 'fred', now, 'unhealthy', 60)
+
+        reopened = db_module.DocDatabase(test_db.db_path)
+
+        vitals = reopened.get_bot_vitals('fred')
+        assert vitals['total_checks'] == 2
+        assert vitals['uptime_percent'] == 50.0
+        assert reopened.get_latest_checkup('fred')['status'] == 'unhealthy'
+
+        # Starting again doesn't count them twice
+        again = db_module.DocDatabase(test_db.db_path)
+        assert again.get_bot_vitals('fred')['total_checks'] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.doc
+class TestPercentile:
+    """Test histogram percentile estimation."""
+
+    def test_single_value(self, doc_db):
+        """Test a single observation is its own percentile."""
+        _, db_module = doc_db
+        bin_index = db_module.bisect_left(db_module.RESPONSE_TIME_BINS, 42)
+        assert db_module._percentile({bin_index: 1}, 50, 42, 42) == 42
+
+    def test_empty(self, doc_db):
+        """Test no observations gives no percentile."""
+        _, db_module = doc_db
+        assert db_module._percentile({}, 95, None, None) is None
@@ -0,0 +1,252 @@
+"""
+Unit tests for Evelyn's streaming formula-to-values conversion.
+"""
+
+import io
+import re
+import zipfile
+import pytest
+import importlib.util
+from pathlib import Path
+from xml.etree import ElementTree
+
+import openpyxl
+from openpyxl.comments import Comment
+from openpyxl.workbook.defined_name import DefinedName
+
+# Import the module directly using importlib to avoid sys.modules caching issues
+project_root = Path(__file__).parent.parent.parent
+module_path = project_root / 'evelyn' / 'services' / 'xlsx_stream.py'
+spec = importlib.util.spec_from_file_location('evelyn_xlsx_stream', module_path)
+xlsx_stream = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(xlsx_stream)
+
+CONTENT_TYPES_NS = '{http://schemas.openxmlformats.org/package/2006/content-types}'
+
+
+def _save(wb) -> bytes:
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _rewrite_parts(data: bytes, rewrites: dict, extra: dict = None) -> bytes:
+    """Copy a package, passing chosen parts' text through rewrite functions."""
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as source, zipfile.ZipFile(output, 'w') as target:
+        for info in source.infolist():
+            content = source.read(info.filename)
+            if info.filename in rewrites:
+                content = rewrites[info.filename](content.decode('utf-8')).encode('utf-8')
+            target.writestr(info.filename, content)
+        for name, content in (extra or {}).items():
+            target.writestr(name, content)
+    return output.getvalue()
+
+
+def _cache(values: dict):
+    """Rewrite function giving formula cells the values Excel would have cached."""
+    def rewrite(xml):
+        def cell(match):
+            ref, style, formula = match.group(1), match.group(2) or '', match.group(3)
+            if ref not in values:
+                return match.group(0)
+            cell_type, value = values[ref]
+            return f'<c r="{ref}"{style} t="{cell_type}"><f>{formula}</f><v>{value}</v></c>'
+        return re.sub(r'<c r="(\w+)"( s="\d+")?><f>(.*?)</f><v ?/></c>', cell, xml)
+    return rewrite
+
+
+def _convert(data: bytes, keep: list) -> bytes:
+    output = io.BytesIO()
+    xlsx_stream.convert_to_values(io.BytesIO(data), output, keep)
+    return output.getvalue()
+
+
+def _load(data: bytes):
+    return openpyxl.load_workbook(io.BytesIO(data))
+
+
+@pytest.fixture
+def workbook_bytes():
+    """Three sheets: formulas with cached values, a sheet with a comment, a hidden one."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'Pricing'
+    ws.append([10, 'Roller', '=A1*2', '=B1&" blind"', '=1/0', '=Z99'])
+    ws['C1'].font = openpyxl.styles.Font(bold=True)
+    ws.merge_cells('A3:B3')
+    ws.column_dimensions['A'].width = 30
+
+    notes = wb.create_sheet("Supplier's Notes")
+    notes['A1'] = '=Pricing!A1'
+    notes['A1'].comment = Comment('Check with supplier', 'Derek')
+
+    hidden = wb.create_sheet('Lookup')
+    hidden.sheet_state = 'hidden'
+    hidden['A1'] = 'lookup'
+
+    wb.defined_names['PricingCell'] = DefinedName('PricingCell', attr_text='Pricing!$A$1')
+    wb.defined_names['NotesCell'] = DefinedName('NotesCell', attr_text="'Supplier''s Notes'!$A$1")
+    hidden.defined_names['LocalLookup'] = DefinedName('LocalLookup', attr_text='Lookup!$A$1')
+    wb.active = 1
+
+    return _rewrite_parts(_save(wb), {
+        'xl/worksheets/sheet1.xml': _cache({
+            'C1': ('n', '20'),
+            'D1': ('str', ' Roller blind'),
+            'E1': ('e', '#DIV/0!'),
+        }),
+        'xl/worksheets/sheet2.xml': _cache({'A1': ('n', '10')}),
+    })
+
+
+@pytest.mark.unit
+@pytest.mark.evelyn
+class TestFormulaConversion:
+    """Test formulas are replaced with their cached values."""
+
+    def test_cached_values_replace_formulas(self, workbook_bytes):
+        """Numbers, strings and errors keep the values Excel calculated."""
+        ws = _load(_convert(workbook_bytes, ['Pricing']))['Pricing']
+
+        assert [c.value for c in ws[1]] == [10, 'Roller', 20, ' Roller blind', '#DIV/0!', None]
+
+    def test_no_formulas_left(self, workbook_bytes):
+        """The kept sheet's XML has no formula elements."""
+        with zipfile.ZipFile(io.BytesIO(_convert(workbook_bytes, ['Pricing']))) as archive:
+            sheet_xml = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        assert '<f>' not in sheet_xml and '<f ' not in sheet_xml
+
+    def test_formatting_kept(self, workbook_bytes):
+        """Styles, merged cells and column widths come through untouched."""
+        ws = _load(_convert(workbook_bytes, ['Pricing']))['Pricing']
+
+        assert ws['C1'].font.b is True
+        assert 'A3:B3' in {str(r) for r in ws.merged_cells.ranges}
+        assert ws.column_dimensions['A'].width == 30
+
+    def test_shared_and_array_formulas(self):
+        """Shared formula children and array formulas become values too."""
+        wb = openpyxl.Workbook()
+        wb.active.append([1, 2, 3])
+        sheet_xml = (
+            '<row r="2"><c r="A2"><f t="shared" ref="A2:C2" si="0">A1*2</f><v>2</v></c>'
+            '<c r="B2"><f t="shared" si="0"/><v>4</v></c>'
+            '<c r="C2"><f t="array" ref="C2">SUM(A1:C1)</f><v>6</v></c></row>'
+        )
+        data = _rewrite_parts(_save(wb), {
+            'xl/worksheets/sheet1.xml': lambda xml: xml.replace(
+                '</row></sheetData>', '</row>' + sheet_xml + '</sheetData>'
+            )
+        })
+
+        result = io.BytesIO()
+        stats = xlsx_stream.convert_to_values(io.BytesIO(data), result, ['Sheet'])
+
+        assert stats['formulas_replaced'] == 3
+        assert [c.value for c in _load(result.getvalue())['Sheet'][2]] == [2, 4, 6]
+
+    def test_prefixed_worksheet_xml(self):
+        """Worksheets written with a namespace prefix are handled."""
+        wb = openpyxl.Workbook()
+        wb.active['A1'] = '=1+1'
+        data = _rewrite_parts(_save(wb), {
+            'xl/worksheets/sheet1.xml': lambda xml: re.sub(
+                r'<(/?)(\w+)', r'<\1x:\2', _cache({'A1': ('str', 'two')})(xml)
+            ).replace('xmlns=', 'xmlns:x=')
+        })
+
+        with zipfile.ZipFile(io.BytesIO(_convert(data, ['Sheet']))) as archive:
+            sheet_xml = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        assert '<x:c r="A1" t="inlineStr"><x:is><x:t>two</x:t></x:is></x:c>' in sheet_xml
+
+
+@pytest.mark.unit
+@pytest.mark.evelyn
+class TestSheetRemoval:
+    """Test dropping sheets at the package level."""
+
+    def test_read_sheet_names(self, workbook_bytes):
+        """Sheet names come back in workbook order."""
+        assert xlsx_stream.read_sheet_names(io.BytesIO(workbook_bytes)) == [
+            'Pricing', "Supplier's Notes", 'Lookup'
+        ]
+
+    def test_missing_sheet_raises(self, workbook_bytes):
+        """Asking for a sheet that doesn't exist is a ValueError."""
+        with pytest.raises(ValueError, match="Sheet 'Nope' not found"):
+            _convert(workbook_bytes, ['Pricing', 'Nope'])
+
+    def test_dropped_sheet_parts_removed(self, workbook_bytes):
+        """Dropped sheets take their comments and drawings with them."""
+        data = _convert(workbook_bytes, ['Pricing'])
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            names = set(archive.namelist())
+            overrides = {
+                o.get('PartName').lstrip('/')
+                for o in ElementTree.fromstring(archive.read('[Content_Types].xml'))
+                if o.tag == f'{CONTENT_TYPES_NS}Override'
+            }
+
+        assert 'xl/worksheets/sheet2.xml' not in names
+        assert not any(n.startswith(('xl/comments/', 'xl/drawings/')) for n in names)
+        assert overrides <= names
+        assert _load(data).sheetnames == ['Pricing']
+
+    def test_defined_names_follow_sheets(self, workbook_bytes):
+        """Names on or pointing at dropped sheets go; the rest are renumbered."""
+        wb = _load(_convert(workbook_bytes, ['Pricing', 'Lookup']))
+
+        assert list(wb.defined_names) == ['PricingCell']
+        assert 'LocalLookup' in wb['Lookup'].defined_names
+
+    def test_active_tab_kept_in_range(self, workbook_bytes):
+        """The active sheet was dropped, so the first kept sheet is active."""
+        with zipfile.ZipFile(io.BytesIO(_convert(workbook_bytes, ['Pricing']))) as archive:
+            workbook_xml = archive.read('xl/workbook.xml').decode('utf-8')
+        assert 'activeTab="0"' in workbook_xml
+
+    def test_only_hidden_sheets_kept(self, workbook_bytes):
+        """A workbook needs a visible sheet, so the first kept one is unhidden."""
+        wb = _load(_convert(workbook_bytes, ['Lookup']))
+        assert wb['Lookup'].sheet_state == 'visible'
+
+    def test_calc_chain_and_macros_removed(self, workbook_bytes):
+        """The calculation chain and VBA project are dropped; output is a plain .xlsx."""
+        macro_type = 'application/vnd.ms-excel.sheet.macroEnabled.main+xml'
+        data = _rewrite_parts(workbook_bytes, {
+            '[Content_Types].xml': lambda xml: xml.replace(
+                xlsx_stream.XLSX_MAIN_CONTENT_TYPE, macro_type
+            ).replace(
+                '</Types>',
+                '<Default Extension="bin" ContentType="application/vnd.ms-office.vbaProject"/>'
+                '<Override PartName="/xl/calcChain.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.calcChain+xml"/>'
+                '</Types>'
+            ),
+            'xl/_rels/workbook.xml.rels': lambda xml: xml.replace(
+                '</Relationships>',
+                '<Relationship Id="rIdVba" Target="vbaProject.bin" '
+                'Type="http://schemas.microsoft.com/office/2006/relationships/vbaProject"/>'
+                '<Relationship Id="rIdCalc" Target="calcChain.xml" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/calcChain"/>'
+                '</Relationships>'
+            ),
+        }, extra={
+            'xl/vbaProject.bin': b'macros',
+            'xl/calcChain.xml': '<calcChain xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                                '<c r="C1" i="1"/></calcChain>',
+        })
+
+        with zipfile.ZipFile(io.BytesIO(_convert(data, ['Pricing']))) as archive:
+            names = set(archive.namelist())
+            content_types = archive.read('[Content_Types].xml').decode('utf-8')
+            rels = archive.read('xl/_rels/workbook.xml.rels').decode('utf-8')
+
+        assert 'xl/vbaProject.bin' not in names
+        assert 'xl/calcChain.xml' not in names
+        assert 'rIdVba' not in rels and 'rIdCalc' not in rels
+        assert macro_type not in content_types
+        assert xlsx_stream.XLSX_MAIN_CONTENT_TYPE in content_types
@@ -0,0 +1,232 @@
+"""
+Unit tests for Grant's permissions snapshot and GatewayAuth's Grant cache.
+"""
+
+import os
+import sys
+import pytest
+import importlib.util
+from pathlib import Path
+from unittest.mock import Mock, patch
+from flask import Flask
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['SKIP_ENV_VALIDATION'] = '1'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+from shared.auth.gateway_auth import GatewayAuth  # noqa: E402
+
+# Import Database directly using importlib to avoid sys.modules caching issues
+module_path = project_root / 'grant' / 'database' / 'db.py'
+spec = importlib.util.spec_from_file_location('grant_database_db_snapshot', module_path)
+grant_db_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(grant_db_module)
+Database = grant_db_module.Database
+
+
+@pytest.fixture
+def grant_db(tmp_path):
+    """Create an isolated Grant database for testing."""
+    return Database(str(tmp_path / "grant_test.db"))
+
+
+def _response(status_code=200, data=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = data or {}
+    return response
+
+
+class FakeGrant:
+    """Stands in for BotHttpClient, answering from a Grant database."""
+
+    def __init__(self, database):
+        self.db = database
+        self.calls = []
+
+    def __call__(self, base_url, timeout=None):
+        return self
+
+    def get(self, path, params=None):
+        self.calls.append(path)
+        if path == '/api/access/version':
+            return _response(data={'version': self.db.get_permissions_version()})
+        version = self.db.get_permissions_version()
+        result = self.db.check_access(params['email'], params['bot'])
+        return _response(data={**result, 'version': version})
+
+
+@pytest.fixture
+def gateway(grant_db):
+    """GatewayAuth in grant mode, talking to a FakeGrant."""
+    app = Flask(__name__)
+    app.secret_key = 'test-secret-key'
+
+    config = Mock()
+    config.name = 'fiona'
+    config.auth = {
+        'mode': 'grant',
+        'allowed_domains': ['example.com'],
+        'grant_url': 'http://grant',
+        'grant_cache_size': 3,
+        'grant_version_check_seconds': 5,
+    }
+    auth = GatewayAuth(app, config)
+
+    fake = FakeGrant(grant_db)
+    with patch('shared.http_client.BotHttpClient', fake):
+        yield auth, fake
+
+
+@pytest.mark.unit
+@pytest.mark.grant
+class TestPermissionsSnapshot:
+    """Test the versioned permissions snapshot."""
+
+    def test_version_bumped_by_changes(self, grant_db):
+        """Grants, revokes and policy changes move the version on."""
+        start = grant_db.get_permissions_version()
+
+        grant_db.grant_permission('user@example.com', 'fiona', 'user', 'admin@example.com')
+        assert grant_db.get_permissions_version() == start + 1
+
+        grant_db.revoke_permission('user@example.com', 'fiona', 'admin@example.com')
+        assert grant_db.get_permissions_version() == start + 2
+
+        grant_db.sync_bots([{'name': 'fiona'}])
+        grant_db.update_bot_access_policy('fiona', 'domain')
+        assert grant_db.get_permissions_version() == start + 4
+
+    def test_revoke_of_missing_permission_keeps_version(self, grant_db):
+        """Nothing changed, so cached answers stay valid."""
+        start = grant_db.get_permissions_version()
+        assert grant_db.revoke_permission('nobody@example.com', 'fiona', 'admin@example.com') is False
+        assert grant_db.get_permissions_version() == start
+
+    def test_snapshot_rebuilt_on_revoke(self, grant_db):
+        """Revocations are reflected immediately."""
+        grant_db.grant_permission('user@example.com', 'fiona', 'admin', 'admin@example.com')
+        assert grant_db.check_access('user@example.com', 'fiona')['is_admin'] is True
+
+        grant_db.revoke_permission('user@example.com', 'fiona', 'admin@example.com')
+        assert grant_db.check_access('user@example.com', 'fiona')['allowed'] is False
+
+    def test_snapshot_sees_other_process_changes(self, grant_db, tmp_path):
+        """A second Database on the same file (another worker) picks up changes."""
+        other = Database(str(tmp_path / "grant_test.db"))
+        assert other.check_access('user@example.com', 'fiona')['allowed'] is False
+
+        grant_db.grant_permission('user@example.com', 'fiona', 'user', 'admin@example.com')
+        assert other.check_access('user@example.com', 'fiona')['allowed'] is True
+
+    def test_explicit_permission_beats_wildcard(self, grant_db):
+        """A bot-specific role wins over the user's wildcard role."""
+        grant_db.grant_permission('user@example.com', '*', 'admin', 'admin@example.com')
+        grant_db.grant_permission('user@example.com', 'fiona', 'user', 'admin@example.com')
+
+        assert grant_db.check_access('user@example.com', 'fiona')['role'] == 'user'
+        assert grant_db.check_access('user@example.com', 'skye')['role'] == 'admin'
+
+    def test_domain_policy_from_snapshot(self, grant_db):
+        """Bots with domain access ask the caller to check the domain."""
+        grant_db.sync_bots([{'name': 'fiona'}])
+        grant_db.update_bot_access_policy('fiona', 'domain')
+
+        result = grant_db.check_access('USER@example.com ', 'Fiona')
+        assert result['allowed'] is None
+        assert result['default_access'] == 'domain'
+
+
+@pytest.mark.unit
+@pytest.mark.shared
+class TestGatewayGrantCache:
+    """Test GatewayAuth's LRU cache of Grant answers."""
+
+    def test_cached_answers_skip_grant(self, gateway, grant_db):
+        """Repeat checks within the version interval make no calls."""
+        auth, fake = gateway
+        grant_db.grant_permission('user@example.com', 'fiona', 'user', 'admin@example.com')
+
+        with patch('shared.auth.gateway_auth.time.time', return_value=1000.0):
+            for _ in range(5):
+                assert auth._query_grant('user@example.com') == {'allowed': True, 'is_admin': False}
+
+        assert fake.calls == ['/api/access']
+
+    def test_revocation_applies_after_version_check(self, gateway, grant_db):
+        """Once the version interval passes, a revoke drops the cached answer."""
+        auth, fake = gateway
+        grant_db.grant_permission('user@example.com', 'fiona', 'user', 'admin@example.com')
+
+        with patch('shared.auth.gateway_auth.time.time', return_value=1000.0):
+            assert auth._query_grant('user@example.com')['allowed'] is True
+
+        grant_db.revoke_permission('user@example.com', 'fiona', 'admin@example.com')
+
+        with patch('shared.auth.gateway_auth.time.time', return_value=1002.0):
+            # Still inside the interval - served from cache
+            assert auth._query_grant('user@example.com')['allowed'] is True
+        with patch('shared.auth.gateway_auth.time.time', return_value=1006.0):
+            assert auth._query_grant('user@example.com')['allowed'] is False
+
+        assert fake.calls == ['/api/access', '/api/access/version', '/api/access']
+
+    def test_unchanged_version_keeps_cache(self, gateway, grant_db):
+        """A version check that finds nothing new keeps serving from cache."""
+        auth, fake = gateway
+
+        with patch('shared.auth.gateway_auth.time.time', return_value=1000.0):
+            auth._query_grant('user@example.com')
+        with patch('shared.auth.gateway_auth.time.time', return_value=1010.0):
+            auth._query_grant('user@example.com')
+
+        assert fake.calls == ['/api/access', '/api/access/version']
+
+    def test_cache_is_bounded(self, gateway):
+        """The least recently used entries are evicted beyond grant_cache_size."""
+        auth, fake = gateway
+
+        with patch('shared.auth.gateway_auth.time.time', return_value=1000.0):
+            for name in ('a', 'b', 'c'):
+                auth._query_grant(f'{name}@example.com')
+            auth._query_grant('a@example.com')  # a is now most recent
+            auth._query_grant('d@example.com')
+
+        assert list(auth._grant_cache) == [
+            'c@example.com:fiona', 'a@example.com:fiona', 'd@example.com:fiona'
+        ]
+
+    def test_grant_unavailable_backs_off(self, gateway):
+        """A failing Grant isn't called again on every request."""
+        auth, fake = gateway
+        fake.get = Mock(side_effect=ConnectionError('down'))
+
+        with patch('shared.auth.gateway_auth.time.time', return_value=1000.0):
+            assert auth._query_grant('user@example.com') is None
+            assert auth._query_grant('user@example.com') is None
+
+        assert fake.get.call_count == 1
+
+    def test_revoked_session_is_logged_out(self, gateway, grant_db):
+        """Existing sessions are re-checked against Grant on each request."""
+        auth, fake = gateway
+        grant_db.grant_permission('user@example.com', 'fiona', 'admin', 'admin@example.com')
+        load_user = auth.login_manager._user_callback
+
+        with auth.app.test_request_context('/'):
+            from flask import session
+            session['user'] = {'email': 'user@example.com', 'is_admin': False}
+
+            with patch('shared.auth.gateway_auth.time.time', return_value=1000.0):
+                user = load_user('user@example.com')
+            assert user.is_admin is True
+
+            grant_db.revoke_permission('user@example.com', 'fiona', 'admin@example.com')
+            with patch('shared.auth.gateway_auth.time.time', return_value=1006.0):
+                assert load_user('user@example.com') is None
+            assert 'user' not in session
@@ -215,3 +215,68 @@ class TestAuditLog:
         assert audit[0]['action'] == 'revoke'
         assert audit[1]['action'] == 'modify'
         assert audit[2]['action'] == 'grant'
+
+
+@pytest.mark.unit
+@pytest.mark.grant
+class TestBatchAccess:
+    """Test batch access checks and per-bot user lists."""
+
+    @pytest.fixture
+    def populated(self, permission_service):
+        """Two bots, one open to the domain, plus explicit and wildcard grants."""
+        permission_service.allowed_domains = ['example.com']
+        db = permission_service._get_db()
+        db.sync_bots([{'name': 'fiona'}, {'name': 'skye'}])
+        db.update_bot_access_policy('fiona', 'domain')
+        permission_service.grant_permission('user@other.com', 'skye', 'user', 'superadmin@example.com')
+        permission_service.grant_permission('itadmin@other.com', '*', 'admin', 'superadmin@example.com')
+        return permission_service
+
+    def test_batch_matches_single_checks(self, populated):
+        """Every cell of the matrix agrees with check_access."""
+        emails = ['user@other.com', 'itadmin@other.com', 'staff@example.com',
+                  'nobody@other.com', 'superadmin@example.com']
+
+        results = populated.check_access_batch(emails)
+
+        assert set(results) == set(emails)
+        for email in emails:
+            assert set(results[email]) == {'fiona', 'skye'}
+            for bot in ('fiona', 'skye'):
+                assert results[email][bot] == populated.check_access(email, bot)
+
+    def test_batch_applies_policies(self, populated):
+        """Wildcard, domain and superadmin rules are applied in bulk."""
+        results = populated.check_access_batch(
+            ['Staff@Example.com', 'itadmin@other.com', 'superadmin@example.com'],
+            ['fiona', 'skye']
+        )
+
+        assert results['staff@example.com']['fiona']['source'] == 'domain'
+        assert results['staff@example.com']['skye']['allowed'] is False
+        assert results['itadmin@other.com']['skye']['is_admin'] is True
+        assert results['superadmin@example.com']['skye']['source'] == 'superadmin'
+
+    def test_get_bot_users(self, populated):
+        """Per-bot lists include explicit, wildcard and superadmin access."""
+        bots = populated.get_bot_users()
+
+        assert bots['fiona']['domain_access'] is True
+        assert bots['skye']['domain_access'] is False
+
+        skye = {u['email']: u['source'] for u in bots['skye']['users']}
+        assert skye == {
+            'user@other.com': 'permission',
+            'itadmin@other.com': 'wildcard',
+            **{email: 'superadmin' for email in populated.superadmins},
+        }
+        assert 'superadmin@example.com' in skye
+
+    def test_explicit_permission_listed_over_wildcard(self, populated):
+        """A user with both shows once, with their bot-specific role."""
+        populated.grant_permission('itadmin@other.com', 'skye', 'user', 'superadmin@example.com')
+
+        users = populated.get_bot_users(['skye'])['skye']['users']
+        itadmin = [u for u in users if u['email'] == 'itadmin@other.com']
+        assert itadmin == [{'email': 'itadmin@other.com', 'role': 'user', 'source': 'permission'}]
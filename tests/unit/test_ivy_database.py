@@ -366,3 +366,83 @@ class TestStatsOperations:
         assert 'canberra' in stats['inventory_by_org']
         assert stats['inventory_by_org']['canberra']['total'] == 2
         assert stats['inventory_by_org']['canberra']['active'] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.ivy
+class TestBulkMerge:
+    """Test set-based bulk upserts and unchanged-row skipping."""
+
+    @staticmethod
+    def make_items(count, price=10.0):
+        return [
+            {'group_code': 'ROLL', 'item_code': f'R{i:04d}', 'description': f'Item {i}', 'sell_price': price}
+            for i in range(count)
+        ]
+
+    def test_resync_unchanged_rows_are_skipped(self, ivy_db):
+        items = self.make_items(25)
+        first = ivy_db.bulk_upsert_inventory_items('canberra', items, chunk_size=10)
+        assert (first['created'], first['updated'], first['unchanged']) == (25, 0, 0)
+
+        second = ivy_db.bulk_upsert_inventory_items('canberra', items, chunk_size=10)
+        assert (second['created'], second['updated'], second['unchanged']) == (0, 0, 25)
+        assert second['total'] == 25
+
+    def test_only_changed_rows_are_written(self, ivy_db):
+        items = self.make_items(20)
+        ivy_db.bulk_upsert_inventory_items('canberra', items)
+
+        conn = ivy_db.get_connection()
+        conn.execute("UPDATE inventory_items SET updated_at = '2000-01-01 00:00:00'")
+        conn.commit()
+        conn.close()
+
+        items[3]['sell_price'] = 99.0
+        items.append({'group_code': 'ROLL', 'item_code': 'NEW1', 'description': 'New item'})
+        result = ivy_db.bulk_upsert_inventory_items('canberra', items, chunk_size=7)
+
+        assert (result['created'], result['updated'], result['unchanged']) == (1, 1, 19)
+
+        changed = ivy_db.get_inventory_items(org_key='canberra', search='Item 3')
+        assert changed[0]['sell_price'] == 99.0
+
+        conn = ivy_db.get_connection()
+        touched = conn.execute(
+            "SELECT COUNT(*) FROM inventory_items WHERE updated_at != '2000-01-01 00:00:00'"
+        ).fetchone()[0]
+        conn.close()
+        assert touched == 2
+
+    def test_duplicate_keys_last_wins(self, ivy_db):
+        items = [
+            {'group_code': 'ROLL', 'item_code': 'R1', 'description': 'First'},
+            {'group_code': 'ROLL', 'item_code': 'R1', 'description': 'Second'},
+        ]
+        result = ivy_db.bulk_upsert_inventory_items('canberra', items)
+
+        assert result['created'] == 1
+        assert ivy_db.get_inventory_items(org_key='canberra')[0]['item_name'] == 'Second'
+
+    def test_orgs_are_independent(self, ivy_db):
+        items = self.make_items(3)
+        ivy_db.bulk_upsert_inventory_items('canberra', items)
+        result = ivy_db.bulk_upsert_inventory_items('tweed', items)
+
+        assert result['created'] == 3
+
+    def test_pricing_resync(self, ivy_db):
+        coefficients = [
+            {'group_code': 'ROLL', 'item_code': f'R{i}', 'description': f'Rate {i}', 'sell_sqm': 50.0 + i}
+            for i in range(12)
+        ]
+        first = ivy_db.bulk_upsert_pricing_coefficients('canberra', coefficients, chunk_size=5)
+        assert first['created'] == 12
+
+        coefficients[0]['sell_sqm'] = 1.0
+        second = ivy_db.bulk_upsert_pricing_coefficients('canberra', coefficients, chunk_size=5)
+        assert (second['created'], second['updated'], second['unchanged']) == (0, 1, 11)
+
+    def test_empty_batch(self, ivy_db):
+        result = ivy_db.bulk_upsert_inventory_items('canberra', [])
+        assert result['total'] == 0
@@ -40,6 +40,8 @@ if HAS_OPENPYXL:
     module_path = project_root / 'ivy' / 'services' / 'parser_service.py'
     spec = importlib.util.spec_from_file_location('ivy_parser_service', module_path)
     parser_module = importlib.util.module_from_spec(spec)
+    # Registered so process-pool workers can unpickle its worker functions
+    sys.modules['ivy_parser_service'] = parser_module
     spec.loader.exec_module(parser_module)
     BuzExcelParser = parser_module.BuzExcelParser
 
@@ -307,3 +309,96 @@ class TestEmptyAndEdgeCases:
         # Invalid numeric values should default to 0
         assert items['TEST2']['cost_price'] == 0.0
         assert items['TEST2']['sell_price'] == 0.0
+
+
+@pytest.fixture
+def multi_sheet_inventory_excel(tmp_path):
+    """Inventory workbook with a Help sheet and two groups of 7 and 3 items."""
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    help_sheet = wb.active
+    help_sheet.title = "Help"
+    help_sheet.append(["Instructions go here"])
+
+    for group, count in (("ROLL", 7), ("VERT", 3)):
+        ws = wb.create_sheet(group)
+        ws.append([f"{group} Blinds - 28/11/2025"])
+        ws.append(["PkId", "Code*", "Description*", "Active"])
+        for i in range(count):
+            ws.append([i + 1, f"{group}{i:03d}", f"{group} item {i}", "Yes"])
+
+    file_path = tmp_path / "multi_inventory.xlsx"
+    wb.save(file_path)
+    return str(file_path)
+
+
+@pytest.mark.unit
+@pytest.mark.ivy
+class TestStreamingBatches:
+    """Test generator-based batch parsing."""
+
+    def test_batches_are_bounded_and_per_sheet(self, parser, multi_sheet_inventory_excel):
+        batches = list(parser.iter_inventory_batches(multi_sheet_inventory_excel, batch_size=3))
+
+        assert [(b['sheet'], len(b['rows'])) for b in batches] == [
+            ('ROLL', 3), ('ROLL', 3), ('ROLL', 1), ('VERT', 3)
+        ]
+        assert all(b['sheet_count'] == 2 for b in batches)
+        assert batches[-1]['sheet_index'] == 1
+        assert batches[0]['rows'][0]['item_code'] == 'ROLL000'
+
+    def test_is_lazy(self, parser, multi_sheet_inventory_excel):
+        batches = parser.iter_inventory_batches(multi_sheet_inventory_excel, batch_size=2)
+
+        first = next(batches)
+        assert len(first['rows']) == 2
+        batches.close()
+
+    def test_parse_file_matches_streamed_rows(self, parser, multi_sheet_inventory_excel):
+        result = parser.parse_inventory_file(multi_sheet_inventory_excel)
+        streamed = [
+            row
+            for batch in parser.iter_inventory_batches(multi_sheet_inventory_excel, batch_size=4)
+            for row in batch['rows']
+        ]
+
+        assert result['items'] == streamed
+        assert {g['group_code']: g['item_count'] for g in result['groups']} == {'ROLL': 7, 'VERT': 3}
+
+
+@pytest.mark.unit
+@pytest.mark.ivy
+class TestParallelSheetParsing:
+    """Test process-pool sheet parsing."""
+
+    def test_parallel_batches_match_sequential(self, parser, multi_sheet_inventory_excel):
+        sequential = list(parser.iter_inventory_batches(multi_sheet_inventory_excel, batch_size=3))
+        parallel = list(parser.iter_inventory_batches(
+            multi_sheet_inventory_excel, batch_size=3, max_workers=2
+        ))
+
+        assert parallel == sequential
+
+    def test_parallel_parse_file_matches_sequential(self, parser, multi_sheet_inventory_excel):
+        assert parser.parse_inventory_file(multi_sheet_inventory_excel, max_workers=2) == \
+            parser.parse_inventory_file(multi_sheet_inventory_excel)
+
+    def test_parallel_keeps_sheet_order(self, parser, tmp_path):
+        import openpyxl
+
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+        groups = [f"G{i:02d}" for i in range(9)]
+        for group in groups:
+            ws = wb.create_sheet(group)
+            ws.append([f"{group} - 28/11/2025"])
+            ws.append(["Code*", "Description*"])
+            ws.append([f"{group}-A", "Item"])
+        file_path = tmp_path / "many_sheets.xlsx"
+        wb.save(file_path)
+
+        batches = list(parser.iter_inventory_batches(str(file_path), max_workers=3))
+
+        assert [b['sheet'] for b in batches] == groups
+        assert [b['sheet_index'] for b in batches] == list(range(9))
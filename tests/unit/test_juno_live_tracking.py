@@ -0,0 +1,214 @@
+"""
+Unit tests for Juno's shared location cache, view counting and live stream.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import pytest
+from pathlib import Path
+from flask import Flask
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+from juno.database.db import Database  # noqa: E402
+from juno.services.location_cache import LocationCache  # noqa: E402
+from juno.services.view_counter import ViewCounter  # noqa: E402
+import juno.api.routes as juno_routes  # noqa: E402
+
+
+class CountingCache(LocationCache):
+    """LocationCache whose Travis call is slow and counted."""
+
+    def __init__(self, ttl_seconds=5, delay=0.0):
+        super().__init__('http://travis.test', ttl_seconds=ttl_seconds)
+        self.delay = delay
+        self.calls = 0
+        self.location = {'shareable': True, 'status': 'in_transit',
+                         'latitude': -35.28, 'longitude': 149.13}
+
+    def _fetch(self, staff_id):
+        self.calls += 1
+        time.sleep(self.delay)
+        return {'success': True, **self.location}
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Juno database in a temp directory."""
+    return Database(str(tmp_path / 'test_juno.db'))
+
+
+@pytest.fixture
+def link(test_db):
+    """An active tracking link."""
+    return test_db.create_tracking_link(journey_id=1, staff_id=7, customer_name='Mrs Jones')
+
+
+@pytest.fixture
+def client(test_db, monkeypatch):
+    """Flask client for Juno's API with a counting cache and stopped counter."""
+    cache = CountingCache()
+    monkeypatch.setattr(juno_routes, 'db', test_db)
+    monkeypatch.setattr(juno_routes, 'location_cache', cache)
+    monkeypatch.setattr(juno_routes, 'view_counter', ViewCounter(database=test_db))
+    app = Flask(__name__)
+    app.register_blueprint(juno_routes.api_bp, url_prefix='/api')
+    return app.test_client(), cache
+
+
+def _sse_events(body):
+    """Parse (event, data) pairs out of an SSE body."""
+    events = []
+    for block in body.split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines()
+                     if ': ' in line and not line.startswith(':'))
+        if 'event' in lines:
+            events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+@pytest.mark.unit
+@pytest.mark.juno
+class TestLocationCache:
+    """Test the per-staff cache."""
+
+    def test_concurrent_viewers_share_one_fetch(self):
+        """Test simultaneous requests for a staff member coalesce."""
+        cache = CountingCache(delay=0.2)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(cache.get(7)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.calls == 1
+        assert len(results) == 5
+        assert all(r['latitude'] == -35.28 for r in results)
+
+    def test_entries_expire(self):
+        """Test a stale entry is refetched."""
+        cache = CountingCache(ttl_seconds=0)
+        cache.get(7)
+        cache.get(7)
+        assert cache.calls == 2
+
+    def test_staff_cached_separately(self):
+        """Test different staff members don't share entries."""
+        cache = CountingCache()
+        cache.get(7)
+        cache.get(7)
+        cache.get(8)
+        assert cache.calls == 2
+        assert cache.get_stats()['hits'] == 1
+
+    def test_callers_get_copies(self):
+        """Test mutating a returned payload doesn't change the cache."""
+        cache = CountingCache()
+        cache.get(7)['latitude'] = 0
+        assert cache.get(7)['latitude'] == -35.28
+
+
+@pytest.mark.unit
+@pytest.mark.juno
+class TestViewCounter:
+    """Test aggregated view counting."""
+
+    def test_views_aggregated_then_flushed(self, test_db, link):
+        """Test views are held in memory and written together."""
+        counter = ViewCounter(database=test_db, flush_interval=3600)
+        counter.start()
+        try:
+            for _ in range(4):
+                counter.record(link['code'])
+            assert counter.pending() == {link['code']: 4}
+            assert test_db.get_tracking_link_by_code(link['code'])['view_count'] == 0
+        finally:
+            counter.stop()
+
+        stored = test_db.get_tracking_link_by_code(link['code'])
+        assert stored['view_count'] == 4
+        assert stored['first_viewed_at'] is not None
+        events = [e for e in test_db.get_link_events(link['id']) if e['event_type'] == 'viewed']
+        assert len(events) == 1
+        assert events[0]['event_data'] == {'first_view': True, 'views': 4}
+
+    def test_unknown_codes_ignored(self, test_db):
+        """Test counts for missing links are dropped."""
+        assert test_db.record_views({'nope': 3}) == 0
+
+    def test_record_view_still_works(self, test_db, link):
+        """Test the single-view helper goes through the batch path."""
+        assert test_db.record_view(link['code']) is True
+        assert test_db.get_tracking_link_by_code(link['code'])['view_count'] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.juno
+class TestTrackingEndpoints:
+    """Test the customer-facing location endpoints."""
+
+    def test_location_served_from_cache(self, client, test_db, link):
+        """Test repeated polls hit Travis once and still count views."""
+        http, cache = client
+        for _ in range(3):
+            data = http.get(f"/api/tracking-links/{link['code']}/location").get_json()
+            assert data['latitude'] == -35.28
+
+        assert cache.calls == 1
+        assert test_db.get_tracking_link_by_code(link['code'])['view_count'] == 3
+
+    def test_ended_link_not_fetched(self, client, test_db, link):
+        """Test cancelled links report their status without calling Travis."""
+        http, cache = client
+        test_db.mark_cancelled(link['code'])
+
+        data = http.get(f"/api/tracking-links/{link['code']}/location").get_json()
+        assert data['status'] == 'cancelled'
+        assert cache.calls == 0
+
+    def test_stream_disabled_by_default(self, client, link):
+        """Test streaming is off unless live_updates.enabled is set."""
+        http, _ = client
+        assert http.get(f"/api/tracking-links/{link['code']}/stream").status_code == 404
+
+    def test_stream_sends_location(self, client, link, monkeypatch):
+        """Test the stream sends the location as an SSE event."""
+        http, _ = client
+        monkeypatch.setattr(juno_routes.config, 'live_updates_enabled', True)
+        monkeypatch.setattr(juno_routes.config, 'live_stream_max_seconds', 0)
+
+        response = http.get(f"/api/tracking-links/{link['code']}/stream")
+        assert response.mimetype == 'text/event-stream'
+        events = _sse_events(response.get_data(as_text=True))
+        assert events == [('location', {'success': True, 'shareable': True,
+                                        'status': 'in_transit',
+                                        'latitude': -35.28, 'longitude': 149.13})]
+
+    def test_stream_ends_with_link(self, client, test_db, link, monkeypatch):
+        """Test the stream sends 'ended' and closes for a finished link."""
+        http, _ = client
+        monkeypatch.setattr(juno_routes.config, 'live_updates_enabled', True)
+        test_db.mark_arrived(link['code'])
+
+        body = http.get(f"/api/tracking-links/{link['code']}/stream").get_data(as_text=True)
+        events = _sse_events(body)
+        assert [name for name, _ in events] == ['ended']
+        assert events[0][1]['status'] == 'arrived'
+
+    def test_stream_404_for_unknown_code(self, client, monkeypatch):
+        """Test unknown codes are rejected before streaming."""
+        http, _ = client
+        monkeypatch.setattr(juno_routes.config, 'live_updates_enabled', True)
+        assert http.get('/api/tracking-links/missing/stream').status_code == 404
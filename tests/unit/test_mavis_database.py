@@ -216,3 +216,154 @@ class TestSyncMetadataOperations:
 
         mavis_db.update_sync_record(sync_id, status='success')
         assert mavis_db.is_sync_running('products') is False
+
+
+@pytest.mark.unit
+@pytest.mark.mavis
+class TestSyncCheckpoints:
+    """Test page checkpoints for resumable syncs."""
+
+    def test_save_and_read_checkpoint(self, mavis_db):
+        """Test recording completed pages on a sync."""
+        sync_id = mavis_db.create_sync_record('products')
+        mavis_db.save_sync_checkpoint(sync_id, 5, {3, 1, 2})
+
+        record = mavis_db.get_sync_history('products', limit=1)[0]
+        assert record['pages_total'] == 5
+        assert mavis_db.get_sync_checkpoint(record) == [1, 2, 3]
+
+    def test_failed_sync_is_resumable(self, mavis_db):
+        """Test a recent failed sync with checkpoints can be resumed."""
+        sync_id = mavis_db.create_sync_record('products')
+        mavis_db.save_sync_checkpoint(sync_id, 5, [1, 2])
+        mavis_db.update_sync_record(sync_id, status='failed', error_message='timeout')
+
+        resumable = mavis_db.get_resumable_sync('products')
+        assert resumable['id'] == sync_id
+
+        # The new sync carries the checkpoint forward
+        new_id = mavis_db.create_sync_record('products', resume_from=resumable)
+        record = mavis_db.get_sync_history('products', limit=1)[0]
+        assert record['id'] == new_id
+        assert record['resumed_from'] == sync_id
+        assert mavis_db.get_sync_checkpoint(record) == [1, 2]
+
+    def test_success_is_not_resumable(self, mavis_db):
+        """Test nothing resumes once the latest sync succeeded."""
+        failed_id = mavis_db.create_sync_record('products')
+        mavis_db.save_sync_checkpoint(failed_id, 5, [1, 2])
+        mavis_db.update_sync_record(failed_id, status='failed')
+
+        sync_id = mavis_db.create_sync_record('products')
+        mavis_db.update_sync_record(sync_id, status='success')
+
+        assert mavis_db.get_resumable_sync('products') is None
+
+    def test_failure_without_pages_is_not_resumable(self, mavis_db):
+        """Test a sync that failed before writing any page starts over."""
+        sync_id = mavis_db.create_sync_record('products')
+        mavis_db.update_sync_record(sync_id, status='failed')
+
+        assert mavis_db.get_resumable_sync('products') is None
+
+    def test_old_checkpoint_is_ignored(self, mavis_db):
+        """Test checkpoints older than the resume window are ignored."""
+        sync_id = mavis_db.create_sync_record('products')
+        mavis_db.save_sync_checkpoint(sync_id, 5, [1])
+        mavis_db.update_sync_record(sync_id, status='failed')
+        with mavis_db.connection() as conn:
+            conn.execute(
+                "UPDATE sync_metadata SET started_at = '2020-01-01T00:00:00Z' WHERE id = ?",
+                (sync_id,)
+            )
+
+        assert mavis_db.get_resumable_sync('products', max_age_minutes=60) is None
+
+
+def _product_data(code, description='Fabric'):
+    return {
+        'product_code': code,
+        'product_description': description,
+        'product_group': 'Fabric',
+        'raw_payload': f'{{"ProductCode": "{code}", "ProductDescription": "{description}"}}'
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.mavis
+class TestChunkedUpserts:
+    """Test transactional chunk upserts with fingerprint skipping."""
+
+    def test_chunk_creates_products(self, mavis_db):
+        """Test a chunk of new products is inserted."""
+        counts = mavis_db.upsert_products_chunk([_product_data('FAB001'), _product_data('fab002')])
+
+        assert counts == {'created': 2, 'updated': 0, 'unchanged': 0}
+        assert mavis_db.get_product_by_code('FAB002') is not None
+
+    def test_unchanged_products_are_skipped(self, mavis_db):
+        """Test products with the same fingerprint aren't rewritten."""
+        mavis_db.upsert_products_chunk([_product_data('FAB001'), _product_data('FAB002')])
+        with mavis_db.connection() as conn:
+            conn.execute("UPDATE unleashed_products SET updated_at = '2020-01-01T00:00:00Z', "
+                         "last_seen_at = '2020-01-01T00:00:00Z'")
+
+        counts = mavis_db.upsert_products_chunk([
+            _product_data('FAB001'),
+            _product_data('FAB002', description='Changed'),
+        ])
+
+        assert counts == {'created': 0, 'updated': 1, 'unchanged': 1}
+        unchanged = mavis_db.get_product_by_code('FAB001')
+        changed = mavis_db.get_product_by_code('FAB002')
+        assert unchanged['updated_at'] == '2020-01-01T00:00:00Z'
+        # Still marked as seen for full-sync reconciles
+        assert unchanged['last_seen_at'] != '2020-01-01T00:00:00Z'
+        assert changed['product_description'] == 'Changed'
+        assert changed['updated_at'] != '2020-01-01T00:00:00Z'
+
+    def test_update_keeps_id_and_created_at(self, mavis_db):
+        """Test changed products are updated in place."""
+        product_id, _ = mavis_db.upsert_product(_product_data('FAB001'))
+        before = mavis_db.get_product_by_code('FAB001')
+
+        mavis_db.upsert_products_chunk([_product_data('FAB001', description='Changed')])
+
+        after = mavis_db.get_product_by_code('FAB001')
+        assert after['id'] == product_id
+        assert after['created_at'] == before['created_at']
+
+    def test_single_upsert_fingerprint_matches_chunk(self, mavis_db):
+        """Test upsert_product stores a fingerprint the chunk path recognises."""
+        mavis_db.upsert_product(_product_data('FAB001'))
+
+        counts = mavis_db.upsert_products_chunk([_product_data('FAB001')])
+        assert counts['unchanged'] == 1
+
+    def test_batch_upsert_reports_progress(self, mavis_db):
+        """Test batch_upsert_products commits per batch and reports progress."""
+        progress = []
+        products = [_product_data(f'FAB{i:03d}') for i in range(5)]
+
+        result = mavis_db.batch_upsert_products(
+            products,
+            progress_callback=lambda *args: progress.append(args),
+            batch_size=2
+        )
+
+        assert result == {'created': 5, 'updated': 0, 'unchanged': 0}
+        assert progress == [(2, 2, 0), (4, 4, 0), (5, 5, 0)]
+
+    def test_checkpoint_records_throughput(self, mavis_db):
+        """Test progress and rows/s are written with the page checkpoint."""
+        sync_id = mavis_db.create_sync_record('products')
+        mavis_db.save_sync_checkpoint(sync_id, 3, [1], progress={
+            'records_processed': 200,
+            'records_unchanged': 150,
+            'rows_per_second': 812.5,
+        })
+
+        record = mavis_db.get_sync_record(sync_id)
+        assert record['records_processed'] == 200
+        assert record['records_unchanged'] == 150
+        assert record['rows_per_second'] == 812.5
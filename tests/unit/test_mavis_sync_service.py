@@ -0,0 +1,276 @@
+"""
+Unit tests for Mavis product sync.
+"""
+
+import os
+import sys
+import pytest
+import importlib.util
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['SKIP_ENV_VALIDATION'] = '1'
+os.environ['UNLEASHED_API_ID'] = 'test-api-id'
+os.environ['UNLEASHED_API_KEY'] = 'test-api-key'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+# Import Database directly using importlib to avoid sys.modules caching issues
+module_path = project_root / 'mavis' / 'database' / 'db.py'
+spec = importlib.util.spec_from_file_location('mavis_database_db', module_path)
+mavis_db_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mavis_db_module)
+MavisDatabase = mavis_db_module.Database
+
+
+class FakeUnleashedClient:
+    """Serves products in pages of 2 and records what was asked for."""
+
+    def __init__(self, products, fail_on_page=None):
+        self.products = products
+        self.fail_on_page = fail_on_page
+        self.calls = []
+
+    def iter_product_pages(self, skip_pages=(), total_pages=None, modified_since=None):
+        self.calls.append({'skip_pages': set(skip_pages), 'modified_since': modified_since})
+        pages = [self.products[i:i + 2] for i in range(0, len(self.products), 2)] or [[]]
+        for number, items in enumerate(pages, start=1):
+            if number in skip_pages:
+                continue
+            if number == self.fail_on_page:
+                raise RuntimeError(f'page {number} failed')
+            yield number, items, len(pages)
+
+
+def _product(code, description='Fabric'):
+    return {
+        'ProductCode': code,
+        'ProductDescription': description,
+        'ProductGroup': {'GroupName': 'Fabric'},
+        'IsSellable': True,
+        'IsObsolete': False,
+    }
+
+
+@pytest.fixture
+def sync_env(tmp_path):
+    """Import Mavis's sync service against an isolated database."""
+    modules_to_clear = [k for k in sys.modules.keys()
+                        if k.startswith(('config', 'database', 'services'))]
+    saved_modules = {k: sys.modules.pop(k) for k in modules_to_clear}
+
+    mavis_path = str(project_root / 'mavis')
+    if mavis_path in sys.path:
+        sys.path.remove(mavis_path)
+    sys.path.insert(0, mavis_path)
+
+    try:
+        test_db = MavisDatabase(str(tmp_path / 'test_mavis.db'))
+
+        import services.sync_service
+        sync_service_module = sys.modules['services.sync_service']
+        original_db = sync_service_module.db
+        sync_service_module.db = test_db
+
+        service = sync_service_module.SyncService()
+        yield service, test_db, sync_service_module
+
+        sync_service_module.db = original_db
+    finally:
+        modules_to_remove = [k for k in sys.modules.keys()
+                             if k.startswith(('config', 'database', 'services'))]
+        for k in modules_to_remove:
+            sys.modules.pop(k, None)
+        sys.modules.update(saved_modules)
+        if mavis_path in sys.path:
+            sys.path.remove(mavis_path)
+
+
+def _use_client(service, client):
+    service._create_unleashed_client = lambda: client
+    return client
+
+
+@pytest.mark.unit
+@pytest.mark.mavis
+class TestResumableSync:
+    """Test page checkpoints during a sync."""
+
+    def test_failed_sync_resumes_from_checkpoint(self, sync_env):
+        """Test a retry skips the pages the failed sync already wrote."""
+        service, test_db, _ = sync_env
+        products = [_product(f'FAB{i:03d}') for i in range(6)]
+
+        _use_client(service, FakeUnleashedClient(products, fail_on_page=3))
+        result = service.run_product_sync('full')
+        assert result['success'] is False
+        assert test_db.get_product_count() == 4
+
+        client = _use_client(service, FakeUnleashedClient(products))
+        result = service.run_product_sync()
+
+        assert result['success'] is True
+        assert result['resumed_from'] is not None
+        assert client.calls[0]['skip_pages'] == {1, 2}
+        assert test_db.get_product_count() == 6
+
+
+@pytest.mark.unit
+@pytest.mark.mavis
+class TestDeltaSync:
+    """Test incremental syncs and full reconciles."""
+
+    def test_first_sync_is_full(self, sync_env):
+        """Test auto mode does a full pull when nothing has synced yet."""
+        service, _, _ = sync_env
+        client = _use_client(service, FakeUnleashedClient([_product('FAB001')]))
+
+        result = service.run_product_sync()
+
+        assert result['sync_mode'] == 'full'
+        assert client.calls[0]['modified_since'] is None
+
+    def test_auto_uses_delta_after_full(self, sync_env):
+        """Test auto mode asks only for changes after a recent full sync."""
+        service, test_db, _ = sync_env
+        _use_client(service, FakeUnleashedClient([_product('FAB001')]))
+        service.run_product_sync('full')
+        full_sync = test_db.get_last_successful_sync('products')
+
+        client = _use_client(service, FakeUnleashedClient([_product('FAB002')]))
+        result = service.run_product_sync()
+
+        assert result['sync_mode'] == 'delta'
+        assert client.calls[0]['modified_since'] is not None
+        assert client.calls[0]['modified_since'] <= full_sync['started_at']
+        # Delta syncs never delete
+        assert test_db.get_product_count() == 2
+
+    def test_auto_reconciles_when_full_is_due(self, sync_env, monkeypatch):
+        """Test auto mode does a full pull once full_reconcile_hours has passed."""
+        service, _, module = sync_env
+        _use_client(service, FakeUnleashedClient([_product('FAB001')]))
+        service.run_product_sync('full')
+
+        monkeypatch.setattr(module.config, 'sync_full_reconcile_hours', 0)
+        result = service.run_product_sync()
+
+        assert result['sync_mode'] == 'full'
+
+    def test_full_sync_deletes_missing_products(self, sync_env, monkeypatch):
+        """Test a full sync removes products Unleashed no longer returns."""
+        service, test_db, module = sync_env
+        monkeypatch.setattr(module.config, 'sync_reconcile_max_delete_percent', 50)
+        products = [_product(f'FAB{i:03d}') for i in range(4)]
+        _use_client(service, FakeUnleashedClient(products))
+        service.run_product_sync('full')
+
+        # Make the first sync's writes clearly older than the next one
+        with test_db.connection() as conn:
+            conn.execute("UPDATE unleashed_products SET last_seen_at = '2020-01-01T00:00:00Z'")
+
+        _use_client(service, FakeUnleashedClient(products[:3]))
+        result = service.run_product_sync('full')
+
+        assert result['records_deleted'] == 1
+        assert test_db.get_product_by_code('FAB003') is None
+        assert test_db.get_product_count() == 3
+
+    def test_reconcile_skipped_when_too_many_missing(self, sync_env):
+        """Test the reconcile refuses to delete most of the catalogue."""
+        service, test_db, _ = sync_env
+        products = [_product(f'FAB{i:03d}') for i in range(4)]
+        _use_client(service, FakeUnleashedClient(products))
+        service.run_product_sync('full')
+        with test_db.connection() as conn:
+            conn.execute("UPDATE unleashed_products SET last_seen_at = '2020-01-01T00:00:00Z'")
+
+        _use_client(service, FakeUnleashedClient(products[:1]))
+        result = service.run_product_sync('full')
+
+        assert result['records_deleted'] == 0
+        assert test_db.get_product_count() == 4
+
+    def test_resumed_full_sync_skips_reconcile(self, sync_env, monkeypatch):
+        """Test a resumed full sync doesn't delete products a catalogue shift hid."""
+        service, test_db, module = sync_env
+        monkeypatch.setattr(module.config, 'sync_reconcile_max_delete_percent', 50)
+        products = [_product(f'FAB{i:03d}') for i in range(6)]
+        _use_client(service, FakeUnleashedClient(products))
+        service.run_product_sync('full')
+        with test_db.connection() as conn:
+            conn.execute("UPDATE unleashed_products SET last_seen_at = '2020-01-01T00:00:00Z'")
+
+        _use_client(service, FakeUnleashedClient(products, fail_on_page=3))
+        assert service.run_product_sync('full')['success'] is False
+
+        # FAB000 is removed, so FAB004 shifts into page 2, which is skipped
+        client = _use_client(service, FakeUnleashedClient(products[1:]))
+        result = service.run_product_sync()
+
+        assert result['resumed_from'] is not None
+        assert client.calls[0]['skip_pages'] == {1, 2}
+        assert result['records_deleted'] == 0
+        assert test_db.get_product_by_code('FAB004') is not None
+
+        # The next auto sync is an uninterrupted full one, which reconciles
+        with test_db.connection() as conn:
+            conn.execute("UPDATE unleashed_products SET last_seen_at = '2020-01-01T00:00:00Z'")
+        _use_client(service, FakeUnleashedClient(products[1:]))
+        result = service.run_product_sync()
+        assert result['sync_mode'] == 'full'
+        assert result['records_deleted'] == 1
+        assert test_db.get_product_by_code('FAB000') is None
+        assert test_db.get_product_by_code('FAB004') is not None
+
+    def test_unknown_mode_rejected(self, sync_env):
+        """Test an unknown mode raises before starting a sync."""
+        service, test_db, _ = sync_env
+        with pytest.raises(ValueError):
+            service.run_product_sync('partial')
+        assert test_db.get_sync_history('products') == []
+
+
+@pytest.mark.unit
+@pytest.mark.mavis
+class TestChunkedSync:
+    """Test the streaming, chunked write path."""
+
+    def test_resync_skips_unchanged_products(self, sync_env):
+        """Test a second full sync rewrites only products that changed."""
+        service, test_db, _ = sync_env
+        products = [_product(f'FAB{i:03d}') for i in range(5)]
+        _use_client(service, FakeUnleashedClient(products))
+        service.run_product_sync('full')
+
+        products[2] = _product('FAB002', description='New colour')
+        _use_client(service, FakeUnleashedClient(products))
+        result = service.run_product_sync('full')
+
+        assert result['records_processed'] == 5
+        assert result['records_updated'] == 1
+        assert result['records_unchanged'] == 4
+        record = test_db.get_last_successful_sync('products')
+        assert record['records_unchanged'] == 4
+        assert record['rows_per_second'] is not None
+
+    def test_writes_one_transaction_per_chunk(self, sync_env, monkeypatch):
+        """Test pages are written in chunks of sync.chunk_size."""
+        service, test_db, module = sync_env
+        monkeypatch.setattr(module.config, 'sync_chunk_size', 1)
+        chunks = []
+        original = test_db.upsert_products_chunk
+
+        def tracking(products):
+            chunks.append(len(products))
+            return original(products)
+
+        monkeypatch.setattr(test_db, 'upsert_products_chunk', tracking)
+        _use_client(service, FakeUnleashedClient([_product(f'FAB{i:03d}') for i in range(3)]))
+        service.run_product_sync('full')
+
+        assert chunks == [1, 1, 1]
@@ -38,7 +38,8 @@ def unleashed_client():
         base_url='https://api.unleashedsoftware.com',
         page_size=10,
         timeout=5,
-        max_retries=1
+        max_retries=1,
+        requests_per_second=0
     )
 
 
@@ -238,3 +239,101 @@ class TestUnleashedClientConnectionTest:
 
         assert result['success'] is False
         assert 'error' in result
+
+
+def _add_product_pages(total_pages):
+    """Register one product per page for /Products/1..total_pages."""
+    for page in range(1, total_pages + 1):
+        responses.add(
+            responses.GET,
+            f'https://api.unleashedsoftware.com/Products/{page}',
+            json={
+                'Items': [{'ProductCode': f'PROD{page:03d}'}],
+                'Pagination': {'NumberOfPages': total_pages, 'PageNumber': page, 'PageSize': 10}
+            },
+            status=200
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.mavis
+class TestUnleashedClientConcurrentPages:
+    """Test concurrent, resumable page fetching."""
+
+    @responses.activate
+    def test_paginate_keeps_page_order(self, unleashed_client):
+        """Test pages fetched concurrently are combined in page order."""
+        _add_product_pages(6)
+        unleashed_client.max_concurrency = 3
+
+        products = unleashed_client.fetch_all_products()
+
+        assert [p['ProductCode'] for p in products] == [f'PROD{i:03d}' for i in range(1, 7)]
+
+    @responses.activate
+    def test_iter_pages_skips_completed_pages(self, unleashed_client):
+        """Test resuming fetches only pages not already done."""
+        _add_product_pages(5)
+
+        pages = list(unleashed_client.iter_product_pages(skip_pages={1, 2, 4}, total_pages=5))
+
+        assert sorted(page for page, _, _ in pages) == [3, 5]
+        fetched = sorted(call.request.url.split('?')[0] for call in responses.calls)
+        assert fetched == [
+            'https://api.unleashedsoftware.com/Products/3',
+            'https://api.unleashedsoftware.com/Products/5',
+        ]
+
+    @responses.activate
+    def test_iter_pages_discovers_page_count(self, unleashed_client):
+        """Test page 1 is fetched to count pages when the count is unknown."""
+        _add_product_pages(3)
+
+        pages = list(unleashed_client.iter_product_pages(skip_pages={1}))
+
+        assert sorted(page for page, _, _ in pages) == [2, 3]
+        assert all(total == 3 for _, _, total in pages)
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_page_failure_propagates(self, unleashed_client):
+        """Test a page that fails after retries stops the iteration."""
+        _add_product_pages(1)
+        responses.replace(
+            responses.GET,
+            'https://api.unleashedsoftware.com/Products/1',
+            json={'Items': [{'ProductCode': 'PROD001'}], 'Pagination': {'NumberOfPages': 2}},
+            status=200
+        )
+        responses.add(
+            responses.GET,
+            'https://api.unleashedsoftware.com/Products/2',
+            json={'error': 'Server error'},
+            status=500
+        )
+
+        with pytest.raises(Exception):
+            list(unleashed_client.iter_product_pages())
+
+    def test_rate_limiter_spaces_requests(self):
+        """Test the rate limiter holds calls to the configured rate."""
+        limiter = unleashed_module.RateLimiter(20)
+
+        import time
+        started = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        elapsed = time.monotonic() - started
+
+        # 5 calls at 20/s: the first is immediate, the rest 50ms apart
+        assert elapsed >= 0.19
+
+    def test_rate_limiter_disabled(self):
+        """Test a rate of 0 means no limit."""
+        limiter = unleashed_module.RateLimiter(0)
+
+        import time
+        started = time.monotonic()
+        for _ in range(100):
+            limiter.acquire()
+        assert time.monotonic() - started < 0.1
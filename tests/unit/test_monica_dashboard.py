@@ -0,0 +1,144 @@
+"""
+Unit tests for Monica's cached dashboard model and change feed.
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+from flask import Flask
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+from monica.database.db import Database  # noqa: E402
+from monica.services.dashboard_service import DashboardService  # noqa: E402
+import monica.services.auth as monica_auth  # noqa: E402
+
+# GatewayAuth normally injects the decorator in app.py
+if monica_auth.login_required is None:
+    monica_auth.login_required = lambda view: view
+
+import monica.web.routes as monica_web  # noqa: E402
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Monica database in a temp directory."""
+    return Database(str(tmp_path / 'test_monica.db'))
+
+
+@pytest.fixture
+def devices(test_db):
+    """Two registered devices at one store."""
+    store_id = test_db.get_or_create_store('FYSHWICK')
+    return [
+        test_db.get_or_create_device(store_id, 'Front Counter', 'token-a'),
+        test_db.get_or_create_device(store_id, 'Back Office', 'token-b'),
+    ]
+
+
+@pytest.fixture
+def service(test_db):
+    """Dashboard service that never expires on its own."""
+    return DashboardService(database=test_db, max_age_seconds=3600)
+
+
+def _counter(version):
+    return int(version.split('.')[1])
+
+
+@pytest.mark.unit
+@pytest.mark.monica
+class TestDashboardModel:
+    """Test the cached model and its versions."""
+
+    def test_model_cached_until_devices_change(self, service, test_db, devices):
+        """Test repeat loads reuse the model and heartbeats invalidate it."""
+        first = service.get_model()
+        assert [d['device_label'] for d in first['devices']] == ['Back Office', 'Front Counter']
+
+        service.get_model()
+        assert service.rebuilds == 1
+
+        test_db.record_heartbeats([{'device_id': devices[0]['id'], 'status': 'online',
+                                    'received_at': '2025-01-01 10:00:00'}])
+        service.get_model()
+        assert service.rebuilds == 2
+
+    def test_changes_only_include_changed_devices(self, service, test_db, devices):
+        """Test a heartbeat only reports its own device as changed."""
+        version = service.get_model()['version']
+
+        test_db.update_device_heartbeat(devices[0]['id'], 'online', '1.2.3.4')
+        changes = service.get_changes(version)
+
+        assert changes['full'] is False
+        assert [d['id'] for d in changes['devices']] == [devices[0]['id']]
+        assert _counter(changes['version']) == _counter(version) + 1
+
+    def test_unchanged_rebuild_keeps_version(self, service, devices):
+        """Test a rebuild that changes no card doesn't bump the version."""
+        version = service.get_model()['version']
+        service.invalidate()
+
+        changes = service.get_changes(version)
+
+        assert changes['version'] == version
+        assert changes['devices'] == []
+
+    def test_removed_devices_reported(self, service, test_db, devices):
+        """Test deleted devices are listed as removed."""
+        version = service.get_model()['version']
+        test_db.delete_device(devices[1]['id'])
+
+        changes = service.get_changes(version)
+
+        assert changes['removed'] == [devices[1]['id']]
+
+    def test_foreign_version_gets_everything(self, service, devices):
+        """Test versions from another process fall back to a full list."""
+        service.get_model()
+        changes = service.get_changes('deadbeef.3')
+        assert changes['full'] is True
+        assert len(changes['devices']) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.monica
+class TestDashboardRoutes:
+    """Test the precompiled pages and the change feed endpoint."""
+
+    @pytest.fixture
+    def app(self, service, monkeypatch):
+        monkeypatch.setattr(monica_web, 'dashboard_service', service)
+        app = Flask(__name__)
+        app.register_blueprint(monica_web.web_bp, url_prefix='/')
+        return app
+
+    def test_templates_compiled_at_registration(self, app):
+        """Test page templates are in the Jinja cache before any request."""
+        cached = {key[1] for key in app.jinja_env.cache.keys()}
+        assert set(monica_web.PAGE_TEMPLATES) <= cached
+
+    def test_changes_endpoint_renders_cards(self, app, test_db, devices):
+        """Test changed devices come back with their card HTML."""
+        client = app.test_client()
+        page = client.get('/dashboard')
+        assert page.status_code == 200
+        assert b'Front Counter' in page.data
+
+        version = client.get('/dashboard/changes').get_json()['version']
+        test_db.update_device_heartbeat(devices[0]['id'], 'online', '9.9.9.9')
+
+        result = client.get(f'/dashboard/changes?since={version}').get_json()
+
+        assert result['success'] is True
+        assert [d['id'] for d in result['devices']] == [devices[0]['id']]
+        assert '9.9.9.9' in result['devices'][0]['html']
+        assert f'data-id="{devices[0]["id"]}"' in result['devices'][0]['html']
@@ -0,0 +1,187 @@
+"""
+Unit tests for Monica's write-behind heartbeat ingest.
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+from flask import Flask
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+from monica.database.db import Database  # noqa: E402
+from monica.services.heartbeat_writer import HeartbeatWriter  # noqa: E402
+import monica.api.routes as monica_routes  # noqa: E402
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Monica database in a temp directory."""
+    return Database(str(tmp_path / 'test_monica.db'))
+
+
+@pytest.fixture
+def device(test_db):
+    """A registered store device."""
+    store_id = test_db.get_or_create_store('FYSHWICK')
+    return test_db.get_or_create_device(store_id, 'Front Counter', 'token-abc')
+
+
+@pytest.fixture
+def writer(test_db):
+    """A running writer that only flushes when asked."""
+    writer = HeartbeatWriter(database=test_db, flush_interval_seconds=60)
+    writer.start()
+    yield writer
+    writer.stop()
+
+
+@pytest.fixture
+def client(test_db, writer, monkeypatch):
+    """Flask client for Monica's API against the test database."""
+    monkeypatch.setattr(monica_routes, 'db', test_db)
+    monkeypatch.setattr(monica_routes, 'heartbeat_writer', writer)
+    app = Flask(__name__)
+    app.register_blueprint(monica_routes.api_bp, url_prefix='/api')
+    return app.test_client()
+
+
+def _heartbeat_count(test_db):
+    conn = test_db.get_connection()
+    try:
+        return conn.execute('SELECT COUNT(*) FROM heartbeats').fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+@pytest.mark.monica
+class TestDeviceTokenCache:
+    """Test the agent token lookup cache."""
+
+    def test_repeat_lookups_skip_database(self, test_db, device, monkeypatch):
+        """Test a cached token is served without opening a connection."""
+        assert test_db.get_device_by_token('token-abc')['id'] == device['id']
+
+        def no_connection():
+            raise AssertionError('database should not be touched')
+
+        monkeypatch.setattr(test_db, 'get_connection', no_connection)
+        cached = test_db.get_device_by_token('token-abc')
+        assert cached['store_code'] == 'FYSHWICK'
+
+    def test_reregistration_invalidates(self, test_db, device):
+        """Test an old token stops working once the device re-registers."""
+        test_db.get_device_by_token('token-abc')
+        test_db.get_or_create_device(device['store_id'], 'Front Counter', 'token-new')
+
+        assert test_db.get_device_by_token('token-abc') is None
+        assert test_db.get_device_by_token('token-new')['id'] == device['id']
+
+    def test_delete_invalidates(self, test_db, device):
+        """Test a deleted device's token is refused."""
+        test_db.get_device_by_token('token-abc')
+        test_db.delete_device(device['id'])
+        assert test_db.get_device_by_token('token-abc') is None
+
+
+@pytest.mark.unit
+@pytest.mark.monica
+class TestRecordHeartbeats:
+    """Test batched heartbeat writes."""
+
+    def test_batch_updates_device_once(self, test_db, device):
+        """Test the latest heartbeat in a batch sets the device status."""
+        written = test_db.record_heartbeats([
+            {'device_id': device['id'], 'public_ip': '1.1.1.1', 'status': 'degraded',
+             'latency_ms': 900.0, 'received_at': '2025-01-01 10:00:00'},
+            {'device_id': device['id'], 'public_ip': '2.2.2.2', 'status': 'online',
+             'latency_ms': 40.0, 'received_at': '2025-01-01 10:01:00'},
+        ])
+
+        assert written == 2
+        stored = test_db.get_device_by_id(device['id'])
+        assert stored['last_status'] == 'online'
+        assert stored['last_public_ip'] == '2.2.2.2'
+        assert stored['last_heartbeat_at'] == '2025-01-01 10:01:00'
+
+    def test_wake_event_tracked(self, test_db, device):
+        """Test a wake heartbeat updates the device's wake details."""
+        test_db.record_heartbeats([
+            {'device_id': device['id'], 'status': 'online', 'is_wake_event': True,
+             'sleep_duration_seconds': 3600, 'network_ok_on_wake': True,
+             'received_at': '2025-01-01 07:00:00'},
+        ])
+
+        stored = test_db.get_device_by_id(device['id'])
+        assert stored['last_wake_at'] == '2025-01-01 07:00:00'
+        assert stored['last_sleep_duration_seconds'] == 3600
+        heartbeat = test_db.get_device_heartbeats(device['id'])[0]
+        assert heartbeat['is_wake_event'] == 1
+        assert heartbeat['network_ok_on_wake'] == 1
+
+    def test_deleted_device_dropped(self, test_db, device):
+        """Test heartbeats queued for a since-deleted device aren't written."""
+        test_db.delete_device(device['id'])
+        written = test_db.record_heartbeats([
+            {'device_id': device['id'], 'status': 'online', 'received_at': '2025-01-01 10:00:00'},
+        ])
+        assert written == 0
+        assert _heartbeat_count(test_db) == 0
+
+
+@pytest.mark.unit
+@pytest.mark.monica
+class TestHeartbeatEndpoint:
+    """Test the heartbeat endpoint only validates and queues."""
+
+    def test_heartbeat_queued_then_flushed(self, client, test_db, writer, device):
+        """Test heartbeats wait in the queue until the writer flushes."""
+        response = client.post('/api/heartbeat', json={'latency_ms': 45.2},
+                               headers={'X-Agent-Token': 'token-abc'})
+
+        assert response.status_code == 200
+        assert response.get_json()['success'] is True
+        assert writer.pending_count() == 1
+        assert _heartbeat_count(test_db) == 0
+
+        assert writer.flush() == 1
+        assert _heartbeat_count(test_db) == 1
+        stored = test_db.get_device_by_id(device['id'])
+        assert stored['last_status'] == 'online'
+        assert stored['last_heartbeat_at'] is not None
+
+    def test_invalid_token_rejected(self, client, writer, device):
+        """Test unknown tokens are refused without queueing anything."""
+        response = client.post('/api/heartbeat', json={},
+                               headers={'X-Agent-Token': 'nope'})
+        assert response.status_code == 401
+        assert writer.pending_count() == 0
+
+    def test_failed_flush_requeues(self, test_db, writer, device, monkeypatch):
+        """Test a failed write keeps heartbeats queued for the next flush."""
+        writer.submit({'device_id': device['id'], 'status': 'online'})
+
+        def broken(heartbeats):
+            raise RuntimeError('database is locked')
+
+        monkeypatch.setattr(test_db, 'record_heartbeats', broken)
+        with pytest.raises(RuntimeError):
+            writer.flush()
+        assert writer.pending_count() == 1
+
+        monkeypatch.undo()
+        assert writer.flush() == 1
+        assert _heartbeat_count(test_db) == 1
+
+    def test_stopped_writer_writes_through(self, test_db, device):
+        """Test heartbeats are written immediately when the writer isn't running."""
+        HeartbeatWriter(database=test_db).submit({'device_id': device['id'], 'status': 'online'})
+        assert _heartbeat_count(test_db) == 1
@@ -0,0 +1,177 @@
+"""
+Unit tests for Monica's heartbeat rollup tiers and retention.
+"""
+
+import os
+import sys
+import importlib.util
+import pytest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from flask import Flask
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+from monica.database.db import (  # noqa: E402
+    Database, format_heartbeat_timestamp, history_resolution
+)
+import monica.api.routes as monica_routes  # noqa: E402
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Monica database in a temp directory."""
+    return Database(str(tmp_path / 'test_monica.db'))
+
+
+@pytest.fixture
+def device(test_db):
+    """A registered store device."""
+    store_id = test_db.get_or_create_store('FYSHWICK')
+    return test_db.get_or_create_device(store_id, 'Front Counter', 'token-abc')
+
+
+def _ago(**kwargs):
+    return format_heartbeat_timestamp(datetime.now(timezone.utc) - timedelta(**kwargs))
+
+
+def _heartbeat(device, timestamp, latency_ms=None, download_mbps=None, status='online'):
+    return {
+        'device_id': device['id'], 'timestamp': timestamp, 'received_at': timestamp,
+        'latency_ms': latency_ms, 'download_mbps': download_mbps, 'status': status,
+    }
+
+
+def _rollups(test_db, bucket_seconds):
+    conn = test_db.get_connection()
+    try:
+        rows = conn.execute(
+            'SELECT * FROM heartbeat_rollups WHERE bucket_seconds = ? ORDER BY bucket_start',
+            (bucket_seconds,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+@pytest.mark.monica
+class TestRollupOnIngest:
+    """Test heartbeats are folded into both rollup tiers as they're written."""
+
+    def test_five_minute_and_hourly_buckets(self, test_db, device):
+        """Test min/avg/max and online counts per bucket."""
+        test_db.record_heartbeats([
+            _heartbeat(device, '2025-01-01 10:01:00', latency_ms=40.0, download_mbps=50.0),
+            _heartbeat(device, '2025-01-01 10:02:00', latency_ms=80.0, status='degraded'),
+            _heartbeat(device, '2025-01-01 10:07:00', latency_ms=60.0),
+        ])
+
+        five = _rollups(test_db, 300)
+        assert [r['bucket_start'] for r in five] == ['2025-01-01 10:00:00', '2025-01-01 10:05:00']
+        first = five[0]
+        assert first['heartbeat_count'] == 2
+        assert first['online_count'] == 1
+        assert first['latency_sum'] / first['latency_count'] == 60.0
+        assert (first['latency_min'], first['latency_max']) == (40.0, 80.0)
+        assert (first['download_count'], first['download_min']) == (1, 50.0)
+
+        hourly = _rollups(test_db, 3600)
+        assert len(hourly) == 1
+        assert hourly[0]['heartbeat_count'] == 3
+        assert hourly[0]['latency_max'] == 80.0
+
+    def test_single_record_rolls_up(self, test_db, device):
+        """Test record_heartbeat also feeds the rollups."""
+        test_db.record_heartbeat(device['id'], '1.1.1.1', latency_ms=900.0)
+
+        rollup = _rollups(test_db, 300)[0]
+        assert rollup['heartbeat_count'] == 1
+        assert rollup['online_count'] == 0  # degraded by latency
+
+    def test_backfill_from_raw(self, test_db, device):
+        """Test the migration folds existing heartbeats into the rollups."""
+        test_db.record_heartbeats([
+            _heartbeat(device, '2025-01-01 10:01:00', latency_ms=40.0),
+            _heartbeat(device, '2025-01-01 11:01:00', latency_ms=60.0),
+        ])
+        conn = test_db.get_connection()
+        try:
+            conn.execute('DELETE FROM heartbeat_rollups')
+            path = project_root / 'monica' / 'migrations' / '003_add_heartbeat_rollups.py'
+            spec = importlib.util.spec_from_file_location('monica_rollup_migration', path)
+            migration = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(migration)
+            migration.up(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+        assert len(_rollups(test_db, 300)) == 2
+        assert [r['latency_min'] for r in _rollups(test_db, 3600)] == [40.0, 60.0]
+
+
+@pytest.mark.unit
+@pytest.mark.monica
+class TestHistoryTiers:
+    """Test chart windows read the right tier."""
+
+    def test_resolution_by_window(self):
+        """Test short windows use raw rows and longer ones use rollups."""
+        assert history_resolution(6) == 0
+        assert history_resolution(24) == 300
+        assert history_resolution(168) == 3600
+        assert history_resolution(2160) == 3600
+        assert history_resolution(6, raw_retention_hours=2) == 300
+
+    def test_rollup_history(self, test_db, device):
+        """Test rollup rows are shaped like raw heartbeats."""
+        test_db.record_heartbeats([
+            _heartbeat(device, _ago(hours=3), latency_ms=40.0),
+            _heartbeat(device, _ago(hours=3), latency_ms=60.0),
+            _heartbeat(device, _ago(hours=1)),
+        ])
+
+        raw = test_db.get_device_latency_history(device['id'], hours=6, resolution=0)
+        assert len(raw) == 2
+
+        rolled = test_db.get_device_latency_history(device['id'], hours=24)
+        assert len(rolled) == 1  # buckets without latency are skipped
+        assert rolled[0]['latency_ms'] == 50.0
+        assert rolled[0]['heartbeat_count'] == 2
+
+    def test_cleanup_keeps_rollups(self, test_db, device):
+        """Test trimming raw heartbeats leaves the chart history intact."""
+        test_db.record_heartbeats([
+            _heartbeat(device, _ago(days=5), latency_ms=40.0),
+            _heartbeat(device, _ago(days=100), latency_ms=40.0),
+            _heartbeat(device, _ago(hours=1), latency_ms=40.0),
+        ])
+
+        deleted = test_db.cleanup_old_heartbeats()
+
+        assert deleted == {'raw': 2, 'five_minute': 1, 'hourly': 0}
+        assert len(test_db.get_device_heartbeats(device['id'])) == 1
+        week = test_db.get_device_latency_history(device['id'], hours=168)
+        assert len(week) == 2
+        assert len(_rollups(test_db, 3600)) == 3
+
+    def test_api_reports_resolution(self, test_db, device, monkeypatch):
+        """Test the latency endpoint returns the tier and online fraction."""
+        test_db.record_heartbeats([
+            _heartbeat(device, _ago(hours=3), latency_ms=40.0),
+        ])
+        monkeypatch.setattr(monica_routes, 'db', test_db)
+        app = Flask(__name__)
+        app.register_blueprint(monica_routes.api_bp, url_prefix='/api')
+
+        result = app.test_client().get(f"/api/devices/{device['id']}/latency?hours=72").get_json()
+
+        assert result['resolution_seconds'] == 3600
+        assert result['data'][0]['online_fraction'] == round(1 / 60, 3)
@@ -0,0 +1,108 @@
+"""
+Unit tests for Peter's staff search indexes.
+"""
+import os
+import sys
+import pytest
+import importlib.util
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+peter_path = project_root / 'peter'
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['SKIP_ENV_VALIDATION'] = '1'
+
+# Load the database module directly (Peter imports it as database.db)
+spec = importlib.util.spec_from_file_location('peter_database_db', peter_path / 'database' / 'db.py')
+peter_db = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(peter_db)
+StaffDatabase = peter_db.StaffDatabase
+
+
+@pytest.fixture
+def staff_db(tmp_path):
+    """Staff database with a few people in it."""
+    db = StaffDatabase(str(tmp_path / 'staff.db'))
+    db.add_staff('Sarah Jones', position='Sales Manager', section='Sales', extension='1234',
+                 phone_fixed='02 6280 1234', phone_mobile='0412 345 678',
+                 work_email='sarah.jones@example.com')
+    db.add_staff('Tom Salisbury', position='Installer', section='Installations', extension='5678',
+                 phone_fixed='(02) 6280 5678', phone_mobile='+61 423 111 222',
+                 work_email='tom@example.com')
+    db.add_staff('Amelia Chen', position='Accounts', section='Finance', extension='1299',
+                 work_email='amelia@example.com')
+    return db
+
+
+def _names(results):
+    return [staff['name'] for staff in results]
+
+
+@pytest.mark.unit
+@pytest.mark.peter
+class TestTextSearch:
+    """Test FTS-backed search by name, position, section and email."""
+
+    def test_prefix_matches_for_type_ahead(self, staff_db):
+        """Test partial words find people."""
+        assert _names(staff_db.search_staff('sar')) == ['Sarah Jones']
+        assert _names(staff_db.search_staff('sarah jo')) == ['Sarah Jones']
+
+    def test_name_ranked_above_other_columns(self, staff_db):
+        """Test a name match outranks a section or position match."""
+        # "sal" is Tom's surname prefix, and Sarah's section and position
+        assert _names(staff_db.search_staff('sal')) == ['Tom Salisbury', 'Sarah Jones']
+
+    def test_email_search(self, staff_db):
+        """Test email addresses are searchable by their parts."""
+        assert _names(staff_db.search_staff('amelia@example')) == ['Amelia Chen']
+
+    def test_inactive_staff_excluded(self, staff_db):
+        """Test staff marked inactive don't appear."""
+        staff = staff_db.search_staff('sarah')[0]
+        staff_db.delete_staff(staff['id'])
+        assert staff_db.search_staff('sarah') == []
+
+    def test_updates_reindexed(self, staff_db):
+        """Test triggers keep the index in step with edits."""
+        staff = staff_db.search_staff('amelia')[0]
+        staff_db.update_staff(staff['id'], name='Amelia Wong', phone_mobile='0499 000 111')
+
+        assert staff_db.search_staff('chen') == []
+        assert _names(staff_db.search_staff('wong')) == ['Amelia Wong']
+        assert _names(staff_db.search_staff('0499')) == ['Amelia Wong']
+
+    def test_limit_and_punctuation(self, staff_db):
+        """Test limit is applied and query syntax can't break the search."""
+        assert len(staff_db.search_staff('example', limit=2)) == 2
+        assert staff_db.search_staff('"*') == []
+        assert _names(staff_db.search_staff('sarah" OR tom')) == []
+
+
+@pytest.mark.unit
+@pytest.mark.peter
+class TestDigitSearch:
+    """Test the normalised phone digits index."""
+
+    def test_extension_prefix(self, staff_db):
+        """Test extensions match by prefix, exact match first."""
+        assert _names(staff_db.search_staff('12')) == ['Amelia Chen', 'Sarah Jones']
+        assert _names(staff_db.search_staff('1234')) == ['Sarah Jones']
+
+    def test_number_formats(self, staff_db):
+        """Test a number is found however it's written."""
+        for query in ('02 6280 5678', '0262805678', '6280 5678', '2 6280 5678', '+61 2 6280 5678'):
+            assert _names(staff_db.search_staff(query)) == ['Tom Salisbury'], query
+
+    def test_international_mobile(self, staff_db):
+        """Test +61 mobiles are indexed in their local form."""
+        assert _names(staff_db.search_staff('0423 111')) == ['Tom Salisbury']
+
+    def test_normalise_digits(self):
+        """Test the query side matches the index's normalisation."""
+        assert peter_db.normalise_digits('+61 (2) 6280-1234') == '0262801234'
+        assert peter_db.normalise_digits('ext. 1234') == '1234'
@@ -0,0 +1,144 @@
+"""
+Unit tests for shared concurrent bot-to-bot calls.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.async_http_client import AsyncBotHttpClient, BotRequest, gather_requests, fan_out
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """Responds after sleeping for the number of ms given in the path, e.g. /sleep/200."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.startswith('/sleep/'):
+            time.sleep(int(self.path.rsplit('/', 1)[1]) / 1000)
+        status = 404 if self.path == '/missing' else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_bot():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _SlowHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unit
+@pytest.mark.shared
+class TestGatherRequests:
+    """Test the asyncio batch helper."""
+
+    def test_requests_run_concurrently(self, local_bot):
+        batch = [BotRequest(f'bot{i}', local_bot, 'GET', '/sleep/300') for i in range(5)]
+
+        started = time.monotonic()
+        results = asyncio.run(gather_requests(batch))
+        elapsed = time.monotonic() - started
+
+        assert list(results.keys()) == ['bot0', 'bot1', 'bot2', 'bot3', 'bot4']
+        assert all(r.ok for r in results.values())
+        assert results['bot0'].response.json() == {'ok': True}
+        # Five 300ms calls in series would take 1.5s
+        assert elapsed < 1.0
+
+    def test_http_error_marked_not_ok(self, local_bot):
+        results = asyncio.run(gather_requests([BotRequest('x', local_bot, 'GET', '/missing')]))
+
+        assert results['x'].ok is False
+        assert results['x'].error == 'HTTP 404'
+
+    def test_per_call_timeout(self, local_bot):
+        results = asyncio.run(gather_requests([
+            BotRequest('slow', local_bot, 'GET', '/sleep/1000', timeout=0.1),
+            BotRequest('fast', local_bot, 'GET', '/health'),
+        ]))
+
+        assert results['slow'].ok is False
+        assert results['slow'].timed_out is False
+        assert results['fast'].ok is True
+
+    def test_global_deadline(self, local_bot):
+        started = time.monotonic()
+        results = asyncio.run(gather_requests([
+            BotRequest('slow', local_bot, 'GET', '/sleep/1500'),
+            BotRequest('fast', local_bot, 'GET', '/health'),
+        ], deadline=0.3))
+        elapsed = time.monotonic() - started
+
+        assert results['slow'].timed_out is True
+        assert results['fast'].ok is True
+        assert elapsed < 1.0
+
+    def test_unreachable_bot(self):
+        results = asyncio.run(gather_requests([BotRequest('down', 'http://127.0.0.1:1', timeout=1)]))
+
+        assert results['down'].ok is False
+        assert results['down'].error
+
+    def test_async_client_get(self, local_bot):
+        async def call():
+            client = AsyncBotHttpClient(local_bot, timeout=5)
+            return await client.get('/health')
+
+        response = asyncio.run(call())
+        assert response.status_code == 200
+
+
+@pytest.mark.unit
+@pytest.mark.shared
+class TestFanOut:
+    """Test the sync fan-out helper."""
+
+    def test_collects_values_and_errors(self):
+        def boom():
+            raise RuntimeError('bot is down')
+
+        results = fan_out({'a': lambda: {'connected': True}, 'b': boom})
+
+        assert results['a'].ok is True
+        assert results['a'].value == {'connected': True}
+        assert results['b'].ok is False
+        assert results['b'].error == 'bot is down'
+
+    def test_runs_concurrently(self):
+        started = time.monotonic()
+        results = fan_out({str(i): (lambda i=i: time.sleep(0.2) or i) for i in range(6)})
+        elapsed = time.monotonic() - started
+
+        assert len(results) == 6
+        assert elapsed < 0.6
+
+    def test_deadline(self):
+        results = fan_out({
+            'slow': lambda: time.sleep(1),
+            'fast': lambda: 'done',
+        }, deadline=0.2)
+
+        assert results['slow'].timed_out is True
+        assert results['fast'].value == 'done'
+
+    def test_empty(self):
+        assert fan_out({}) == {}
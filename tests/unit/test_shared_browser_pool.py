@@ -0,0 +1,270 @@
+"""
+Unit tests for the shared Playwright browser pool.
+
+Uses a fake launcher so no real browser is started.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.playwright.browser_pool import BrowserPool, runs_on_pool
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self, browser, storage_state=None):
+        self.browser = browser
+        self.storage_state = storage_state
+        self.pages = []
+        self.closed = False
+        self.timeout = None
+        self.broken = False
+
+    def set_default_timeout(self, timeout):
+        self.timeout = timeout
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def cookies(self):
+        if self.broken or self.closed:
+            raise RuntimeError('Target closed')
+        return []
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = FakeContext(self, kwargs.get('storage_state'))
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def launches():
+    return []
+
+
+@pytest.fixture
+def pool(launches):
+    async def launcher(headless):
+        browser = FakeBrowser()
+        launches.append(browser)
+        return FakePlaywright(), browser
+
+    pool = BrowserPool(launcher=launcher, max_contexts_per_org=2, lease_timeout=1)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def storage_state(tmp_path):
+    path = tmp_path / 'canberra.json'
+    path.write_text(json.dumps({'cookies': [], 'origins': []}))
+    return str(path)
+
+
+@pytest.mark.unit
+@pytest.mark.shared
+class TestBrowserPool:
+    """Test lease/return, reuse and recycling."""
+
+    def test_context_is_reused_between_leases(self, pool, launches, storage_state):
+        async def use():
+            async with pool.lease('canberra', storage_state) as lease:
+                return lease.context, lease.page
+
+        context1, page1 = pool.run_coroutine(use())
+        context2, page2 = pool.run_coroutine(use())
+
+        assert context1 is context2
+        assert page1 is not page2
+        assert page1.closed is True
+        assert len(launches) == 1
+        status = pool.get_status()
+        assert status['leases'] == 2
+        assert status['warm_leases'] == 1
+        assert status['orgs']['canberra'] == {'idle': 1, 'in_use': 0}
+
+    def test_orgs_get_separate_contexts(self, pool, storage_state):
+        async def use(org_key):
+            async with pool.lease(org_key, storage_state) as lease:
+                return lease.context
+
+        assert pool.run_coroutine(use('canberra')) is not pool.run_coroutine(use('tweed'))
+
+    def test_failed_operation_discards_context(self, pool, storage_state):
+        async def fail():
+            async with pool.lease('canberra', storage_state) as lease:
+                raise ValueError(lease)
+
+        with pytest.raises(ValueError) as exc_info:
+            pool.run_coroutine(fail())
+
+        lease = exc_info.value.args[0]
+        assert lease.context.closed is True
+        assert pool.get_status()['orgs']['canberra']['idle'] == 0
+
+    def test_unhealthy_context_is_recycled(self, pool, storage_state):
+        async def use():
+            async with pool.lease('canberra', storage_state) as lease:
+                return lease.context
+
+        first = pool.run_coroutine(use())
+        first.broken = True
+        second = pool.run_coroutine(use())
+
+        assert second is not first
+        assert first.closed is True
+
+    def test_max_uses_recycles_context(self, pool, storage_state):
+        pool.max_context_uses = 2
+
+        async def use():
+            async with pool.lease('canberra', storage_state) as lease:
+                return lease.context
+
+        contexts = [pool.run_coroutine(use()) for _ in range(3)]
+
+        assert contexts[0] is contexts[1]
+        assert contexts[2] is not contexts[0]
+
+    def test_storage_state_change_recycles_context(self, pool, storage_state):
+        async def use():
+            async with pool.lease('canberra', storage_state) as lease:
+                return lease.context
+
+        first = pool.run_coroutine(use())
+        # Re-authenticating rewrites the storage state file
+        later = time.time() + 10
+        os.utime(storage_state, (later, later))
+        second = pool.run_coroutine(use())
+
+        assert second is not first
+
+    def test_disconnected_browser_is_relaunched(self, pool, launches, storage_state):
+        async def use():
+            async with pool.lease('canberra', storage_state) as lease:
+                return lease.context
+
+        pool.run_coroutine(use())
+        launches[0].connected = False
+        pool.run_coroutine(use())
+
+        assert len(launches) == 2
+
+    def test_leases_per_org_are_bounded(self, pool, storage_state):
+        async def hold_all():
+            first = await pool.acquire('canberra', storage_state)
+            second = await pool.acquire('canberra', storage_state)
+            try:
+                with pytest.raises(TimeoutError):
+                    await pool.acquire('canberra', storage_state, timeout=0.1)
+            finally:
+                await pool.release(first)
+                await pool.release(second)
+            third = await pool.acquire('canberra', storage_state, timeout=0.1)
+            await pool.release(third)
+
+        pool.run_coroutine(hold_all())
+
+    def test_missing_storage_state(self, pool, tmp_path):
+        async def use():
+            async with pool.lease('canberra', str(tmp_path / 'missing.json')):
+                pass
+
+        with pytest.raises(FileNotFoundError):
+            pool.run_coroutine(use())
+        assert pool.get_status()['orgs']['canberra']['in_use'] == 0
+
+    def test_lease_requires_pool_loop(self, pool, storage_state):
+        async def use():
+            async with pool.lease('canberra', storage_state):
+                pass
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(use())
+
+    def test_idle_sweep_closes_browser(self, pool, launches, storage_state):
+        async def use():
+            async with pool.lease('canberra', storage_state) as lease:
+                return lease.context
+
+        context = pool.run_coroutine(use())
+        pool.idle_timeout = 0
+        time.sleep(0.01)
+        pool.run_coroutine(pool.sweep())
+
+        assert context.closed is True
+        assert launches[0].connected is False
+        assert pool.get_status()['browser_open'] is False
+
+
+@pytest.mark.unit
+@pytest.mark.shared
+class TestPooledBrowser:
+    """Test the AsyncBrowserManager-compatible wrapper."""
+
+    def test_new_page_for_org_reuses_context(self, pool, storage_state):
+        class Service:
+            browser_pool = pool
+
+            @runs_on_pool
+            async def work(self):
+                async with self.browser_pool.browser(default_timeout=1234) as browser:
+                    page = await browser.new_page_for_org('canberra', storage_state)
+                    return page.context
+
+        first = asyncio.run(Service().work())
+        second = asyncio.run(Service().work())
+
+        assert first is second
+        assert first.timeout == 1234
+        assert first.pages == []
+
+    def test_runs_inline_without_pool(self):
+        class Service:
+            browser_pool = None
+
+            @runs_on_pool
+            async def work(self):
+                return 'done'
+
+        assert asyncio.run(Service().work()) == 'done'
@@ -0,0 +1,172 @@
+"""
+Unit tests for the Buz Playwright lease scheduler.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from filelock import Timeout
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.playwright.buz import lock as lock_module
+from shared.playwright.buz.lock import BuzPlaywrightLock, BuzLockTimeout
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    return tmp_path / 'buz_playwright.db'
+
+
+@pytest.fixture
+def buz_lock(lock_path):
+    return BuzPlaywrightLock(lock_path=lock_path, timeout=2)
+
+
+def _hold(lock, bot, org_key, priority, started, released, order):
+    """Thread target: wait for a lease, record the order, hold until released."""
+    with lock.acquire(bot, org_key=org_key, priority=priority):
+        order.append(bot)
+        started.set()
+        released.wait(5)
+
+
+@pytest.mark.unit
+@pytest.mark.shared
+class TestBuzLeaseScheduler:
+    """Test per-org leases, priorities and metrics."""
+
+    def test_different_orgs_run_concurrently(self, buz_lock):
+        with buz_lock.acquire('ivy', org_key='canberra'):
+            started = time.monotonic()
+            with buz_lock.acquire('hugo', org_key='tweed'):
+                assert time.monotonic() - started < 1
+                status = buz_lock.get_lock_status()
+                assert status['active_leases'] == 2
+
+    def test_same_org_is_serialised(self, lock_path):
+        lock = BuzPlaywrightLock(lock_path=lock_path, timeout=0.5)
+        with lock.acquire('ivy', org_key='canberra'):
+            with pytest.raises(Timeout):
+                with lock.acquire('hugo', org_key='canberra'):
+                    pass
+
+        status = lock.get_lock_status()
+        assert status['timeouts'] == 1
+        assert status['queue_depth'] == 0
+
+    def test_timeout_is_filelock_compatible(self, lock_path):
+        lock = BuzPlaywrightLock(lock_path=lock_path, timeout=0.3)
+        with lock.acquire('ivy', org_key='canberra'):
+            with pytest.raises(BuzLockTimeout) as exc_info:
+                lock.lock('hugo', org_key='canberra')
+        assert isinstance(exc_info.value, Timeout)
+        assert exc_info.value.org_key == 'canberra'
+
+    def test_per_org_concurrency_limit(self, lock_path):
+        lock = BuzPlaywrightLock(lock_path=lock_path, timeout=0.5, org_limits={'canberra': 2})
+        with lock.acquire('ivy', org_key='canberra'):
+            with lock.acquire('hugo', org_key='canberra'):
+                with pytest.raises(Timeout):
+                    with lock.acquire('banji', org_key='canberra'):
+                        pass
+
+    def test_global_lease_blocks_every_org(self, lock_path):
+        lock = BuzPlaywrightLock(lock_path=lock_path, timeout=0.5)
+        with lock.acquire('ivy'):
+            with pytest.raises(Timeout):
+                with lock.acquire('hugo', org_key='tweed'):
+                    pass
+
+    def test_interactive_jumps_ahead_of_batch(self, buz_lock):
+        order = []
+        release_holder = threading.Event()
+        holder_started = threading.Event()
+        holder = threading.Thread(
+            target=_hold,
+            args=(buz_lock, 'holder', 'canberra', 'batch', holder_started, release_holder, order)
+        )
+        holder.start()
+        assert holder_started.wait(5)
+
+        release_waiters = threading.Event()
+        release_waiters.set()
+        batch = threading.Thread(
+            target=_hold,
+            args=(buz_lock, 'batch', 'canberra', 'batch', threading.Event(), release_waiters, order)
+        )
+        batch.start()
+        time.sleep(0.3)
+        interactive = threading.Thread(
+            target=_hold,
+            args=(buz_lock, 'interactive', 'canberra', 'interactive', threading.Event(), release_waiters, order)
+        )
+        interactive.start()
+        time.sleep(0.3)
+
+        status = buz_lock.get_lock_status()
+        assert status['orgs']['canberra']['queued'] == 2
+        assert status['orgs']['canberra']['holders'][0]['bot'] == 'holder'
+
+        release_holder.set()
+        for thread in (holder, batch, interactive):
+            thread.join(5)
+
+        assert order == ['holder', 'interactive', 'batch']
+
+    def test_wait_metrics(self, buz_lock):
+        with buz_lock.acquire('ivy', org_key='canberra'):
+            pass
+
+        status = buz_lock.get_lock_status()
+        assert status['wait_seconds']['samples'] == 1
+        assert status['wait_seconds']['avg'] is not None
+        assert status['active_leases'] == 0
+
+    def test_dead_holder_is_reclaimed(self, buz_lock, lock_path):
+        import sqlite3
+
+        buz_lock.lock('ivy', org_key='canberra')
+        # Pretend the holder was another process that has since died
+        # (above the kernel's maximum PID, so it can't be running)
+        conn = sqlite3.connect(str(lock_path))
+        conn.execute('UPDATE leases SET pid = ?', (4194305,))
+        conn.commit()
+        conn.close()
+
+        with buz_lock.acquire('hugo', org_key='canberra'):
+            pass
+
+        assert buz_lock.get_lock_status()['stale_reclaimed'] == 1
+
+    def test_manual_lock_unlock(self, buz_lock):
+        buz_lock.lock('hugo', org_key='canberra')
+        assert buz_lock.is_locked
+        assert buz_lock.holder == 'hugo'
+        buz_lock.unlock()
+        assert not buz_lock.is_locked
+        assert buz_lock.get_lock_status()['active_leases'] == 0
+
+    def test_async_acquire(self, buz_lock):
+        async def work():
+            async with buz_lock.acquire_async('ivy', org_key='canberra', priority='batch'):
+                return buz_lock.get_lock_status()['orgs']['canberra']['active']
+
+        assert asyncio.run(work()) == 1
+        assert buz_lock.get_lock_status()['active_leases'] == 0
+
+    def test_holder_info_by_org(self, buz_lock, lock_path):
+        with buz_lock.acquire('ivy', org_key='canberra'):
+            info = lock_module.get_lock_holder_info('canberra', lock_path)
+            assert info['bot'] == 'ivy'
+            assert lock_module.get_lock_holder_info('tweed', lock_path) is None
+
+    def test_unknown_priority(self, buz_lock):
+        with pytest.raises(ValueError):
+            with buz_lock.acquire('ivy', org_key='canberra', priority='urgent'):
+                pass
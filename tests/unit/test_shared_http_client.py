@@ -0,0 +1,146 @@
+"""
+Unit tests for the shared BotHttpClient connection pooling.
+"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared import http_client
+from shared.http_client import BotHttpClient, get_pool_stats, close_all_pools
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Cookie header of each request received
+    cookies_received = []
+
+    def do_GET(self):
+        self.cookies_received.append(self.headers.get('Cookie'))
+        body = b'{"status": "healthy"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Set-Cookie', 'session=abc123; Path=/')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_bot():
+    """A tiny keep-alive HTTP server standing in for another bot."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _KeepAliveHandler.cookies_received = []
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    close_all_pools()
+    yield
+    close_all_pools()
+
+
+@pytest.mark.unit
+@pytest.mark.shared
+class TestConnectionPooling:
+    """Test that BotHttpClient reuses connections per host."""
+
+    def test_clients_for_same_host_share_pool(self):
+        a = BotHttpClient('http://localhost:8001')
+        b = BotHttpClient('http://localhost:8001/api/')
+        c = BotHttpClient('http://localhost:8002')
+
+        assert a.session is b.session
+        assert a.session is not c.session
+
+    def test_different_pool_settings_get_separate_pools(self):
+        a = BotHttpClient('http://localhost:8001')
+        b = BotHttpClient('http://localhost:8001', keep_alive=False)
+        c = BotHttpClient('http://localhost:8001', pool_maxsize=2)
+
+        assert a.session is not b.session
+        assert a.session is not c.session
+        assert b.pool_stats()['keep_alive'] is False
+        assert c.pool_stats()['pool_maxsize'] == 2
+
+    def test_cookies_not_shared_between_calls(self, local_bot):
+        BotHttpClient(local_bot).get('/login')
+        BotHttpClient(local_bot).get('/health')
+
+        assert len(BotHttpClient(local_bot).session.cookies) == 0
+        assert _KeepAliveHandler.cookies_received == [None, None]
+
+    def test_sequential_calls_reuse_connection(self, local_bot):
+        for _ in range(5):
+            # New client per call, as most bot services do
+            response = BotHttpClient(local_bot).get('/health')
+            assert response.status_code == 200
+
+        stats = BotHttpClient(local_bot).pool_stats()
+        assert stats['requests'] == 5
+        assert stats['new_connections'] == 1
+        assert stats['reused_connections'] == 4
+
+    def test_keep_alive_disabled_opens_new_connections(self, local_bot):
+        client = BotHttpClient(local_bot, keep_alive=False)
+        for _ in range(3):
+            client.get('/health')
+
+        stats = client.pool_stats()
+        assert stats['keep_alive'] is False
+        assert stats['new_connections'] == 3
+
+    def test_get_pool_stats_totals(self, local_bot):
+        client = BotHttpClient(local_bot)
+        client.get('/health')
+        client.get('/health')
+
+        stats = get_pool_stats()
+        assert len(stats['hosts']) == 1
+        assert stats['totals']['requests'] == 2
+        assert stats['totals']['reused_connections'] == 1
+
+    def test_threads_share_pool(self, local_bot):
+        client = BotHttpClient(local_bot, pool_maxsize=2, pool_block=True)
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(5):
+                    client.get('/health')
+            except Exception as e:  # pragma: no cover - surfaced via assert
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = client.pool_stats()
+        assert not errors
+        assert stats['requests'] == 20
+        # pool_block caps the number of sockets at pool_maxsize
+        assert stats['new_connections'] <= 2
+
+    def test_sends_api_key(self, monkeypatch, mock_responses):
+        monkeypatch.setenv('BOT_API_KEY', 'secret-key')
+        mock_responses.add(mock_responses.GET, 'http://localhost:8123/health', json={})
+
+        BotHttpClient('http://localhost:8123').get('/health')
+
+        assert mock_responses.calls[0].request.headers['X-API-Key'] == 'secret-key'
@@ -0,0 +1,293 @@
+"""
+Unit tests for Travis's buffered location ping ingest.
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+from flask import Flask
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+import travis.database.db as travis_db_module  # noqa: E402
+from travis.database.db import Database  # noqa: E402
+from travis.services.ping_writer import PingWriter  # noqa: E402
+import travis.api.routes as travis_routes  # noqa: E402
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Travis database in a temp directory."""
+    return Database(str(tmp_path / 'test_travis.db'))
+
+
+@pytest.fixture
+def staff(test_db):
+    """A staff member who is on the road."""
+    member = test_db.create_staff('Sarah Jones', 'sarah@example.com')
+    test_db.update_staff_status(member['id'], 'in_transit')
+    return member
+
+
+@pytest.fixture
+def client(test_db, monkeypatch):
+    """Flask client for Travis's API against the test database."""
+    writer = PingWriter(database=test_db)
+    monkeypatch.setattr(travis_routes, 'db', test_db)
+    monkeypatch.setattr(travis_routes, 'ping_writer', writer)
+    app = Flask(__name__)
+    app.register_blueprint(travis_routes.api_bp, url_prefix='/api')
+    return app.test_client()
+
+
+def _ping_count(test_db):
+    conn = test_db.get_connection()
+    try:
+        return conn.execute('SELECT COUNT(*) FROM location_pings').fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+@pytest.mark.travis
+class TestRecordPings:
+    """Test batch writes and the latest-position cache."""
+
+    def test_batch_written_in_one_call(self, test_db, staff):
+        """Test record_pings writes every ping and bumps last_ping_at."""
+        ids = test_db.record_pings([
+            {'staff_id': staff['id'], 'latitude': -35.0, 'longitude': 149.0,
+             'timestamp': '2025-01-01 10:00:00'},
+            {'staff_id': staff['id'], 'latitude': -35.1, 'longitude': 149.1,
+             'timestamp': '2025-01-01 10:00:30'},
+        ])
+
+        assert len(ids) == 2
+        assert _ping_count(test_db) == 2
+        assert test_db.get_staff_by_id(staff['id'])['last_ping_at'] is not None
+
+    def test_latest_ping_served_from_memory(self, test_db, staff, monkeypatch):
+        """Test get_latest_ping doesn't query once the staff member has pinged."""
+        test_db.record_ping(staff['id'], -35.2, 149.2)
+
+        def no_connection():
+            raise AssertionError('database should not be touched')
+
+        monkeypatch.setattr(test_db, 'get_connection', no_connection)
+        assert test_db.get_latest_ping(staff['id'])['latitude'] == -35.2
+
+    def test_late_upload_does_not_replace_newer_position(self, test_db, staff):
+        """Test an older queued ping doesn't move the cached position back."""
+        test_db.record_pings([{'staff_id': staff['id'], 'latitude': -35.5, 'longitude': 149.5,
+                               'timestamp': '2025-01-01 10:05:00'}])
+        test_db.record_pings([{'staff_id': staff['id'], 'latitude': -35.0, 'longitude': 149.0,
+                               'timestamp': '2025-01-01 10:00:00'}])
+
+        assert test_db.get_latest_ping(staff['id'])['latitude'] == -35.5
+
+    def test_cache_loaded_from_database(self, test_db, staff):
+        """Test a fresh instance falls back to the database and agrees."""
+        test_db.record_ping(staff['id'], -35.3, 149.3)
+        fresh = Database(test_db.db_path)
+
+        assert fresh.get_latest_ping(staff['id'])['latitude'] == -35.3
+
+    def test_latest_ping_cache_expires(self, test_db, staff, monkeypatch):
+        """Test another worker's pings show up once the cached one expires."""
+        test_db.record_ping(staff['id'], -35.2, 149.2, timestamp='2025-01-01 10:00:00')
+        Database(test_db.db_path).record_ping(
+            staff['id'], -35.7, 149.7, timestamp='2025-01-01 10:01:00'
+        )
+        assert test_db.get_latest_ping(staff['id'])['latitude'] == -35.2
+
+        now = travis_db_module.time.monotonic()
+        monkeypatch.setattr(travis_db_module.time, 'monotonic',
+                            lambda: now + travis_db_module.LATEST_PING_CACHE_SECONDS + 1)
+        assert test_db.get_latest_ping(staff['id'])['latitude'] == -35.7
+
+    def test_unflushed_ping_beats_database(self, test_db, staff, monkeypatch):
+        """Test an expired cached ping newer than the database is still used."""
+        test_db.record_ping(staff['id'], -35.2, 149.2, timestamp='2025-01-01 10:00:00')
+        test_db.cache_latest_ping({'id': None, 'staff_id': staff['id'], 'latitude': -35.9,
+                                   'longitude': 149.9, 'timestamp': '2025-01-01 10:02:00'})
+
+        now = travis_db_module.time.monotonic()
+        monkeypatch.setattr(travis_db_module.time, 'monotonic',
+                            lambda: now + travis_db_module.LATEST_PING_CACHE_SECONDS + 1)
+        assert test_db.get_latest_ping(staff['id'])['latitude'] == -35.9
+
+    def test_status_change_hides_location(self, test_db, staff):
+        """Test a status change made by another worker hides the location at once."""
+        test_db.record_ping(staff['id'], -35.2, 149.2)
+        assert test_db.get_shareable_location(staff['id'])['shareable'] is True
+
+        Database(test_db.db_path).update_staff_status(staff['id'], 'at_customer')
+
+        location = test_db.get_shareable_location(staff['id'])
+        assert location['shareable'] is False
+        assert location['status'] == 'at_customer'
+
+
+@pytest.mark.unit
+@pytest.mark.travis
+class TestPingWriter:
+    """Test the group-committing writer."""
+
+    def test_queued_pings_visible_before_flush(self, test_db, staff):
+        """Test queued pings are cached immediately and written on flush."""
+        writer = PingWriter(database=test_db, flush_interval_ms=60000)
+        writer.start()
+        try:
+            writer.submit({'staff_id': staff['id'], 'latitude': -35.4, 'longitude': 149.4})
+            writer.submit({'staff_id': staff['id'], 'latitude': -35.6, 'longitude': 149.6})
+
+            assert writer.pending_count() == 2
+            assert _ping_count(test_db) == 0
+            assert test_db.get_latest_ping(staff['id'])['latitude'] == -35.6
+        finally:
+            writer.stop()
+
+        assert writer.pending_count() == 0
+        assert writer.batches_written == 1
+        assert _ping_count(test_db) == 2
+
+    def test_full_batch_flushes_early(self, test_db, staff):
+        """Test reaching flush_batch_size wakes the writer before the interval."""
+        writer = PingWriter(database=test_db, flush_interval_ms=60000, flush_batch_size=3)
+        writer.start()
+        try:
+            for i in range(3):
+                writer.submit({'staff_id': staff['id'], 'latitude': -35.0 - i, 'longitude': 149.0})
+            for _ in range(50):
+                if _ping_count(test_db) == 3:
+                    break
+                writer._stop_event.wait(0.05)
+            assert _ping_count(test_db) == 3
+        finally:
+            writer.stop()
+
+    def test_failed_flush_keeps_pings(self, test_db, staff, monkeypatch):
+        """Test pings are requeued when the write fails."""
+        writer = PingWriter(database=test_db, flush_interval_ms=60000)
+        writer.start()
+        try:
+            writer.submit({'staff_id': staff['id'], 'latitude': -35.0, 'longitude': 149.0})
+
+            def fail(pings):
+                raise RuntimeError('database is locked')
+
+            monkeypatch.setattr(test_db, 'record_pings', fail)
+            with pytest.raises(RuntimeError):
+                writer.flush()
+            assert writer.pending_count() == 1
+        finally:
+            monkeypatch.undo()
+            writer.stop()
+        assert _ping_count(test_db) == 1
+
+    def test_submit_writes_through_when_stopped(self, test_db, staff):
+        """Test submit writes immediately if the writer isn't running."""
+        PingWriter(database=test_db).submit(
+            {'staff_id': staff['id'], 'latitude': -35.0, 'longitude': 149.0}
+        )
+        assert _ping_count(test_db) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.travis
+class TestLocationEndpoints:
+    """Test the ingest API."""
+
+    def test_batch_endpoint(self, client, test_db, staff):
+        """Test a device can upload queued pings in one request."""
+        response = client.post(
+            '/api/location/batch',
+            headers={'X-Device-Token': staff['device_token']},
+            json={'pings': [
+                {'latitude': -35.0, 'longitude': 149.0, 'timestamp': '2025-01-01T10:00:00Z'},
+                {'longitude': 149.1},
+                {'latitude': -35.2, 'longitude': 149.2, 'timestamp': '2025-01-01T10:01:00Z'},
+            ]}
+        )
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['recorded'] == 2
+        assert [r['index'] for r in data['rejected']] == [1]
+        assert _ping_count(test_db) == 2
+        assert test_db.get_latest_ping(staff['id'])['timestamp'] == '2025-01-01 10:01:00'
+
+    def test_batch_pings_filed_by_timestamp(self, client, test_db, staff):
+        """Test queued pings go to the journey running when they were taken."""
+        earlier = test_db.create_journey(staff['id'])
+        current = test_db.create_journey(staff['id'])
+        conn = test_db.get_connection()
+        with conn:
+            conn.execute(
+                """UPDATE journeys SET status = 'completed', started_at = '2025-01-01 09:00:00',
+                   completed_at = '2025-01-01 09:30:00' WHERE id = ?""", (earlier['id'],)
+            )
+            conn.execute(
+                """UPDATE journeys SET status = 'in_progress', started_at = '2025-01-01 10:00:00'
+                   WHERE id = ?""", (current['id'],)
+            )
+        conn.close()
+
+        client.post(
+            '/api/location/batch',
+            headers={'X-Device-Token': staff['device_token']},
+            json={'pings': [
+                {'latitude': -35.0, 'longitude': 149.0, 'timestamp': '2025-01-01T09:10:00Z'},
+                {'latitude': -35.1, 'longitude': 149.1, 'timestamp': '2025-01-01T09:45:00Z'},
+                {'latitude': -35.2, 'longitude': 149.2, 'timestamp': '2025-01-01T10:05:00Z'},
+            ]}
+        )
+
+        conn = test_db.get_connection()
+        try:
+            rows = conn.execute(
+                'SELECT journey_id FROM location_pings ORDER BY timestamp'
+            ).fetchall()
+        finally:
+            conn.close()
+        assert [row[0] for row in rows] == [earlier['id'], None, current['id']]
+
+    def test_batch_requires_token(self, client):
+        """Test the batch endpoint rejects unknown devices."""
+        response = client.post(
+            '/api/location/batch',
+            headers={'X-Device-Token': 'nope'},
+            json={'pings': [{'latitude': -35.0, 'longitude': 149.0}]}
+        )
+        assert response.status_code == 401
+
+    def test_batch_size_limited(self, client, staff, monkeypatch):
+        """Test oversized batches are refused."""
+        monkeypatch.setattr(travis_routes.config, 'ingest_max_batch_pings', 1)
+        response = client.post(
+            '/api/location/batch',
+            headers={'X-Device-Token': staff['device_token']},
+            json={'pings': [{'latitude': -35.0, 'longitude': 149.0}] * 2}
+        )
+        assert response.status_code == 413
+
+    def test_single_ping_then_location(self, client, staff):
+        """Test a single ping is immediately shareable."""
+        response = client.post(
+            '/api/location',
+            headers={'X-Device-Token': staff['device_token']},
+            json={'latitude': -35.28, 'longitude': 149.13}
+        )
+        assert response.status_code == 200
+        assert response.get_json()['queued'] is True
+
+        location = client.get(f"/api/location/{staff['id']}").get_json()
+        assert location['shareable'] is True
+        assert location['latitude'] == -35.28
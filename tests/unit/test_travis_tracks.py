@@ -0,0 +1,177 @@
+"""
+Unit tests for Travis's journey track simplification and storage.
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+from flask import Flask
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Set test environment
+os.environ['TESTING'] = '1'
+os.environ['FLASK_SECRET_KEY'] = 'test-secret-key'
+
+from travis.database.db import Database  # noqa: E402
+from travis.services.ping_writer import PingWriter  # noqa: E402
+from travis.services.tracks import (  # noqa: E402
+    simplify, encode_deltas, decode_deltas, encode_track, decode_track
+)
+import travis.api.routes as travis_routes  # noqa: E402
+
+
+def _straight_route(count, wobble=0.0):
+    """Points heading north, 10 s and roughly 11 m apart."""
+    return [
+        {
+            'latitude': -35.0 + i * 0.0001,
+            'longitude': 149.0 + (wobble if i % 2 else 0.0),
+            'timestamp': f'2025-01-01 10:{(i * 10) // 60:02d}:{(i * 10) % 60:02d}',
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Travis database in a temp directory."""
+    return Database(str(tmp_path / 'test_travis.db'))
+
+
+@pytest.fixture
+def journey(test_db):
+    """An in-progress journey with a straight route plus one corner."""
+    staff = test_db.create_staff('Sarah Jones', 'sarah@example.com')
+    journey = test_db.create_journey(staff['id'], job_reference='JOB-1')
+    test_db.start_journey(journey['id'])
+    points = _straight_route(20)
+    # Turn east at the end
+    points.append({'latitude': points[-1]['latitude'], 'longitude': 149.01,
+                   'timestamp': '2025-01-01 10:04:00'})
+    test_db.record_pings([{'staff_id': staff['id'], 'journey_id': journey['id'], **p}
+                          for p in points])
+    return journey
+
+
+@pytest.fixture
+def client(test_db, monkeypatch):
+    """Flask client for Travis's API against the test database."""
+    monkeypatch.setattr(travis_routes, 'db', test_db)
+    monkeypatch.setattr(travis_routes, 'ping_writer', PingWriter(database=test_db))
+    app = Flask(__name__)
+    app.register_blueprint(travis_routes.api_bp, url_prefix='/api')
+    return app.test_client()
+
+
+@pytest.mark.unit
+@pytest.mark.travis
+class TestSimplify:
+    """Test Douglas-Peucker simplification."""
+
+    def test_straight_line_reduced_to_ends(self):
+        """Test collinear points are dropped."""
+        points = _straight_route(50)
+        assert simplify(points, 1.0) == [points[0], points[-1]]
+
+    def test_corner_kept(self):
+        """Test a point far off the line survives."""
+        points = _straight_route(10) + [{'latitude': -35.0, 'longitude': 149.01,
+                                          'timestamp': '2025-01-01 10:02:00'}]
+        simplified = simplify(points, 5.0)
+        assert points[9] in simplified
+        assert len(simplified) == 3
+
+    def test_jitter_below_tolerance_dropped(self):
+        """Test sub-metre sideways GPS noise is removed, but kept at tolerance 0."""
+        # 0.00001 degrees of longitude is under a metre
+        points = _straight_route(30, wobble=0.00001)
+        assert len(simplify(points, 2.0)) == 2
+        assert len(simplify(points, 0)) == 30
+
+
+@pytest.mark.unit
+@pytest.mark.travis
+class TestEncoding:
+    """Test the delta encoding round trip."""
+
+    def test_deltas_round_trip(self):
+        """Test negative, zero and large values survive encoding."""
+        rows = [(-3500000, 14900000, 0), (-3499990, 14900005, 10), (-3499990, 14899000, 20)]
+        assert decode_deltas(encode_deltas(rows), 3) == rows
+
+    def test_track_round_trip(self):
+        """Test decoded track points match the originals to 1e-5 degrees."""
+        points = _straight_route(5)
+        track = encode_track(points)
+        decoded = decode_track(track['started_at'], track['encoded_points'])
+
+        assert track['point_count'] == 5
+        assert [p['timestamp'] for p in decoded] == [p['timestamp'] for p in points]
+        for original, restored in zip(points, decoded):
+            assert restored['latitude'] == pytest.approx(original['latitude'], abs=1e-5)
+            assert restored['longitude'] == pytest.approx(original['longitude'], abs=1e-5)
+
+    def test_track_is_compact(self):
+        """Test the encoded form is far smaller than the raw numbers."""
+        track = encode_track(_straight_route(200))
+        assert len(track['encoded_points']) < 200 * 8
+
+
+@pytest.mark.unit
+@pytest.mark.travis
+class TestJourneyTracks:
+    """Test archiving tracks and serving them."""
+
+    def test_complete_archives_track(self, client, test_db, journey):
+        """Test completing a journey stores its simplified track."""
+        response = client.put(f"/api/journeys/{journey['id']}/complete")
+        assert response.status_code == 200
+
+        track = test_db.get_journey_track(journey['id'])
+        assert track['raw_point_count'] == 21
+        assert track['point_count'] == 3
+        assert track['points'][0]['timestamp'] == '2025-01-01 10:00:00'
+
+    def test_tolerance_parameter(self, client, journey):
+        """Test ?tolerance= returns a simplified route from the raw pings."""
+        raw = client.get(f"/api/journeys/{journey['id']}/pings").get_json()
+        simplified = client.get(f"/api/journeys/{journey['id']}/pings?tolerance=5").get_json()
+
+        assert raw['source'] == 'pings'
+        assert len(raw['pings']) == 21
+        assert simplified['tolerance'] == 5.0
+        assert len(simplified['pings']) == 3
+
+    def test_tolerance_simplifies_whole_route(self, client, test_db, journey):
+        """Test a route with more pings than limit still ends at the latest ping."""
+        staff_id = test_db.get_journey_by_id(journey['id'])['staff_id']
+        test_db.record_pings([{'staff_id': staff_id, 'journey_id': journey['id'],
+                               'latitude': -34.99, 'longitude': 149.02,
+                               'timestamp': '2025-01-01 10:05:00'}])
+
+        data = client.get(f"/api/journeys/{journey['id']}/pings?tolerance=5&limit=10").get_json()
+
+        assert data['source'] == 'pings'
+        assert data['pings'][-1]['timestamp'] == '2025-01-01 10:05:00'
+        assert data['pings'][-1]['latitude'] == -34.99
+
+    def test_negative_tolerance_rejected(self, client, journey):
+        """Test a negative tolerance is a bad request."""
+        response = client.get(f"/api/journeys/{journey['id']}/pings?tolerance=-1")
+        assert response.status_code == 400
+
+    def test_track_served_after_cleanup(self, client, test_db, journey):
+        """Test the route is still available once old pings are deleted."""
+        test_db.complete_journey(journey['id'])
+
+        # Pings are from 2025, well outside the retention window
+        deleted = test_db.cleanup_old_pings(hours=1)
+        assert deleted == 21
+
+        data = client.get(f"/api/journeys/{journey['id']}/pings").get_json()
+        assert data['source'] == 'track'
+        assert len(data['pings']) == 3
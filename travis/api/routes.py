@@ -16,7 +16,9 @@ from datetime import datetime
 import logging
 
 from travis.config import config
-from travis.database.db import db
+from travis.database.db import db, format_ping_timestamp
+from travis.services.ping_writer import ping_writer
+from travis.services.tracks import simplify
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +29,103 @@ api_bp = Blueprint('api', __name__)
 # Location endpoints (called by mobile app)
 # ══════════════════════════════════════════════════════════════════════════════
 
+def _authenticate_device(data: dict):
+    """
+    Look up the staff member for the request's device token.
+
+    Returns:
+        (staff, None) on success, or (None, error response tuple)
+    """
+    device_token = request.headers.get('X-Device-Token') or data.get('device_token')
+
+    if not device_token:
+        return None, (jsonify({
+            'success': False,
+            'error': 'device_token is required (X-Device-Token header or JSON body)'
+        }), 401)
+
+    staff = db.get_staff_by_token(device_token)
+    if not staff:
+        return None, (jsonify({
+            'success': False,
+            'error': 'Invalid device_token'
+        }), 401)
+
+    return staff, None
+
+
+def _parse_ping(data: dict, staff_id: int, journey_id):
+    """
+    Build a ping dictionary from a device's JSON.
+
+    Returns:
+        (ping, None) on success, or (None, error message)
+    """
+    latitude = data.get('latitude')
+    longitude = data.get('longitude')
+
+    if latitude is None or longitude is None:
+        return None, 'latitude and longitude are required'
+
+    try:
+        latitude = float(latitude)
+        longitude = float(longitude)
+    except (TypeError, ValueError):
+        return None, 'latitude and longitude must be numbers'
+
+    # Parse optional timestamp
+    timestamp = None
+    if data.get('timestamp'):
+        try:
+            timestamp = datetime.fromisoformat(
+                data['timestamp'].replace('Z', '+00:00')
+            )
+        except (ValueError, AttributeError):
+            pass
+
+    return {
+        'staff_id': staff_id,
+        'journey_id': journey_id,
+        'latitude': latitude,
+        'longitude': longitude,
+        'accuracy': data.get('accuracy'),
+        'heading': data.get('heading'),
+        'speed': data.get('speed'),
+        'altitude': data.get('altitude'),
+        'battery_level': data.get('battery_level'),
+        'timestamp': timestamp,
+    }, None
+
+
+def _journey_at(journeys: list, timestamp: str):
+    """
+    ID of the journey that was running at a timestamp, or None.
+
+    journeys come from db.get_journeys_since (oldest first); if windows
+    overlap, the most recently started journey wins.
+    """
+    journey_id = None
+    for journey in journeys:
+        if journey['started_at'] > timestamp:
+            break
+        if journey['completed_at'] is None or timestamp <= journey['completed_at']:
+            journey_id = journey['id']
+    return journey_id
+
+
 @api_bp.route('/location', methods=['POST'])
 def record_location():
     """
     Record a location ping from a device.
     This is the main endpoint called by the iOS app.
 
+    The ping is queued and group-committed with other devices' pings by the
+    ping writer (within ingest.flush_interval_ms). It's visible to
+    GET /api/location/<staff_id> immediately, but isn't on disk yet when
+    this responds, hence "queued": true. Pings the app can't afford to
+    lose should go through /api/location/batch, which writes before
+    responding.
+
     Request headers:
         X-Device-Token: <device_token>
 
@@ -51,86 +144,50 @@ def record_location():
     Response JSON:
         {
             "success": true,
-            "ping_id": 123,
-            "message": "Location recorded"
+            "queued": true,
+            "message": "Location queued"
         }
     """
     try:
-        # Authenticate via device token
-        device_token = request.headers.get('X-Device-Token')
-        if not device_token:
-            data = request.get_json() or {}
-            device_token = data.get('device_token')
-
-        if not device_token:
-            return jsonify({
-                'success': False,
-                'error': 'device_token is required (X-Device-Token header or JSON body)'
-            }), 401
+        data = request.get_json(silent=True) or {}
 
-        staff = db.get_staff_by_token(device_token)
-        if not staff:
-            return jsonify({
-                'success': False,
-                'error': 'Invalid device_token'
-            }), 401
+        # Authenticate via device token
+        staff, error = _authenticate_device(data)
+        if error:
+            return error
 
         # Get location data
-        data = request.get_json()
         if not data:
             return jsonify({
                 'success': False,
                 'error': 'No JSON data provided'
             }), 400
 
-        latitude = data.get('latitude')
-        longitude = data.get('longitude')
+        # Get active journey if any
+        active_journey = db.get_active_journey(staff['id'])
+        journey_id = active_journey['id'] if active_journey else None
 
-        if latitude is None or longitude is None:
+        ping, message = _parse_ping(data, staff['id'], journey_id)
+        if message:
             return jsonify({
                 'success': False,
-                'error': 'latitude and longitude are required'
+                'error': message
             }), 400
 
-        # Parse optional timestamp
-        timestamp = None
-        if data.get('timestamp'):
-            try:
-                timestamp = datetime.fromisoformat(
-                    data['timestamp'].replace('Z', '+00:00')
-                )
-            except (ValueError, AttributeError):
-                pass
-
-        # Get active journey if any
-        active_journey = db.get_active_journey(staff['id'])
-        journey_id = active_journey['id'] if active_journey else None
-
-        # Record the ping
-        ping_id = db.record_ping(
-            staff_id=staff['id'],
-            latitude=float(latitude),
-            longitude=float(longitude),
-            journey_id=journey_id,
-            accuracy=data.get('accuracy'),
-            heading=data.get('heading'),
-            speed=data.get('speed'),
-            altitude=data.get('altitude'),
-            battery_level=data.get('battery_level'),
-            timestamp=timestamp
-        )
+        # Queue the ping for the next group commit
+        ping_writer.submit(ping)
 
         # Log if configured
         if config.log_pings or logger.isEnabledFor(logging.DEBUG):
             logger.info(
                 f"Location ping: staff={staff['name']} ({staff['id']}), "
-                f"lat={latitude}, lng={longitude}, journey={journey_id}, ping_id={ping_id}"
+                f"lat={ping['latitude']}, lng={ping['longitude']}, journey={journey_id}"
             )
 
         return jsonify({
             'success': True,
-            'ping_id': ping_id,
-            'message': 'Location recorded'
+            'queued': True,
+            'message': 'Location queued'
         }), 200
 
     except Exception as e:
@@ -141,6 +198,100 @@ def record_location():
         }), 500
 
 
+@api_bp.route('/location/batch', methods=['POST'])
+def record_location_batch():
+    """
+    Record a batch of queued location pings from a device.
+    The iOS app uses this to upload pings it couldn't send while offline.
+
+    The batch is written in one transaction before responding, so the app
+    can drop its queue once it gets a success response. Invalid pings are
+    skipped and reported by index. Each ping is filed under the journey that
+    was running at its timestamp (none if it was taken between journeys).
+
+    Request headers:
+        X-Device-Token: <device_token>
+
+    Request JSON:
+        {
+            "pings": [
+                {"latitude": -35.2809, "longitude": 149.1300, "timestamp": "2025-..."},
+                ...
+            ]
+        }
+
+    Response JSON:
+        {
+            "success": true,
+            "recorded": 42,
+            "rejected": [{"index": 3, "error": "latitude and longitude are required"}]
+        }
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+
+        staff, error = _authenticate_device(data)
+        if error:
+            return error
+
+        pings = data.get('pings')
+        if not isinstance(pings, list) or not pings:
+            return jsonify({
+                'success': False,
+                'error': 'pings must be a non-empty list'
+            }), 400
+
+        if len(pings) > config.ingest_max_batch_pings:
+            return jsonify({
+                'success': False,
+                'error': f'Too many pings (max {config.ingest_max_batch_pings} per batch)'
+            }), 413
+
+        accepted = []
+        rejected = []
+        for index, item in enumerate(pings):
+            if not isinstance(item, dict):
+                rejected.append({'index': index, 'error': 'ping must be an object'})
+                continue
+            ping, message = _parse_ping(item, staff['id'], None)
+            if message:
+                rejected.append({'index': index, 'error': message})
+            else:
+                ping['timestamp'] = format_ping_timestamp(ping['timestamp'])
+                accepted.append(ping)
+
+        # Queued pings may predate the current journey or belong to an
+        # earlier one, so match each to a journey by its own timestamp
+        if accepted:
+            journeys = db.get_journeys_since(
+                staff['id'], min(ping['timestamp'] for ping in accepted)
+            )
+            for ping in accepted:
+                ping['journey_id'] = _journey_at(journeys, ping['timestamp'])
+
+        db.record_pings(accepted)
+
+        if config.log_pings or logger.isEnabledFor(logging.DEBUG):
+            journey_ids = sorted({p['journey_id'] for p in accepted if p['journey_id']})
+            logger.info(
+                f"Location batch: staff={staff['name']} ({staff['id']}), "
+                f"recorded={len(accepted)}, rejected={len(rejected)}, journeys={journey_ids}"
+            )
+
+        return jsonify({
+            'success': True,
+            'recorded': len(accepted),
+            'rejected': rejected
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Location batch error: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+
 @api_bp.route('/location/<int:staff_id>', methods=['GET'])
 def get_location(staff_id: int):
     """
@@ -638,6 +789,7 @@ def complete_journey(journey_id: int):
     """
     Mark journey as completed.
     Sets staff status to 'off_duty' (or they can start another journey).
+    The journey's pings are simplified and archived as its track.
 
     Response JSON:
         {
@@ -656,6 +808,13 @@ def complete_journey(journey_id: int):
         db.complete_journey(journey_id)
         # Don't automatically set off_duty - they might have another appointment
 
+        # Archive the route; queued pings are written first so it's complete
+        try:
+            ping_writer.flush()
+            db.archive_journey_track(journey_id, config.track_tolerance_meters)
+        except Exception as e:
+            logger.warning(f"Could not archive track for journey {journey_id}: {e}")
+
         logger.info(f"Journey {journey_id} completed for staff {journey['staff_id']}")
 
         return jsonify({
@@ -676,12 +835,21 @@ def get_journey_pings(journey_id: int):
     """
     Get all location pings for a journey (for drawing the route).
 
+    Without tolerance, returns the raw pings, or the archived track once
+    the raw pings have been cleaned up. With tolerance, returns the route
+    simplified so no dropped point is further than that many metres from
+    the line (larger = fewer points, for zoomed-out maps). Track points
+    only carry latitude, longitude and timestamp.
+
     Query params:
         limit: Maximum pings to return (default 1000)
+        tolerance: Simplification tolerance in metres (optional)
 
     Response JSON:
         {
             "success": true,
+            "source": "pings",      // or "track"
+            "tolerance": 25.0,      // null for raw pings
             "pings": [...]
         }
     """
@@ -694,11 +862,36 @@ def get_journey_pings(journey_id: int):
             }), 404
 
         limit = request.args.get('limit', 1000, type=int)
-        pings = db.get_journey_pings(journey_id, limit)
+        tolerance = request.args.get('tolerance', type=float)
+        if tolerance is not None and tolerance < 0:
+            return jsonify({
+                'success': False,
+                'error': 'tolerance must be zero or more metres'
+            }), 400
+
+        source = 'pings'
+        pings = []
+        if tolerance is None:
+            pings = db.get_journey_pings(journey_id, limit)
+
+        if not pings:
+            track = db.get_journey_track(journey_id)
+            if track:
+                source = 'track'
+                pings = track['points']
+            elif tolerance is not None:
+                # Simplify the whole route so it ends at the latest fix;
+                # limit applies to the simplified points
+                pings = db.get_journey_pings(journey_id, None)
+
+        if tolerance is not None:
+            pings = simplify(pings, tolerance)
 
         return jsonify({
             'success': True,
-            'pings': pings
+            'source': source,
+            'tolerance': tolerance,
+            'pings': pings[:limit]
         }), 200
 
     except Exception as e:
@@ -756,9 +949,11 @@ def intro():
         'personality': 'Watchful and discreet, tracks locations while respecting privacy',
         'capabilities': [
             'Receive GPS location pings from field staff devices',
+            'Accept batched uploads of pings queued while offline',
             'Track staff status (at_customer, in_transit, off_duty)',
             'Privacy-aware location sharing (only share when in transit)',
             'Store location history for active journeys',
+            'Keep simplified routes of completed journeys',
             'Provide location API for Journey bot'
         ],
         'privacy_note': 'Tracker only shares exact coordinates when staff is in_transit. '
@@ -12,6 +12,7 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 import os
+import atexit
 import logging
 from flask import Flask, jsonify
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -20,6 +21,7 @@ from travis.config import config
 from travis.api.routes import api_bp
 from travis.web.routes import web_bp
 from travis.web.auth_routes import auth_bp
+from travis.services.ping_writer import ping_writer
 from shared.auth import GatewayAuth
 from shared.error_handlers import register_error_handlers
 
@@ -63,6 +65,15 @@ app.register_blueprint(api_bp, url_prefix='/api')
 # Register error handlers
 register_error_handlers(app, logger)
 
+# Start the ping writer (group-commits queued location pings)
+ping_writer.start()
+
+
+@atexit.register
+def shutdown_ping_writer():
+    """Write any queued pings on shutdown"""
+    ping_writer.stop()
+
 
 @app.route('/health')
 def health():
@@ -70,7 +81,8 @@ def health():
     return jsonify({
         'status': 'healthy',
         'bot': config.name,
-        'version': config.version
+        'version': config.version,
+        'ping_writer': ping_writer.get_status()
     })
 
 
@@ -85,6 +97,7 @@ def info():
         'endpoints': {
             'api': {
                 'POST /api/location': 'Record GPS location ping from device',
+                'POST /api/location/batch': 'Record a batch of queued pings from device',
                 'GET /api/location/<staff_id>': 'Get shareable location (privacy-aware)',
                 'GET /api/staff': 'List all staff',
                 'POST /api/staff': 'Create new staff member',
@@ -96,7 +109,7 @@ def info():
                 'PUT /api/journeys/<id>/start': 'Start a journey',
                 'PUT /api/journeys/<id>/arrive': 'Mark journey arrived',
                 'PUT /api/journeys/<id>/complete': 'Complete journey',
-                'GET /api/journeys/<id>/pings': 'Get journey location history',
+                'GET /api/journeys/<id>/pings': 'Get journey location history (?tolerance= metres to simplify)',
                 'GET /api/journeys/by-reference/<ref>': 'Get journey by job reference'
             },
             'system': {
@@ -55,6 +55,13 @@ class Config:
         self.stale_threshold = location.get("stale_threshold", 120)
         self.history_retention_hours = location.get("history_retention_hours", 24)
 
+        # ── Ping ingest settings ───────────────────────────────
+        ingest = data.get("ingest", {}) or {}
+        self.ingest_flush_interval_ms = ingest.get("flush_interval_ms", 500)
+        self.ingest_flush_batch_size = ingest.get("flush_batch_size", 200)
+        self.ingest_max_pending = ingest.get("max_pending", 10000)
+        self.ingest_max_batch_pings = ingest.get("max_batch_pings", 500)
+
         # ── Privacy settings ───────────────────────────────────
         privacy = data.get("privacy", {}) or {}
         self.share_only_in_transit = privacy.get("share_only_in_transit", True)
@@ -68,6 +75,10 @@ class Config:
         database = data.get("database", {}) or {}
         self.cleanup_hours = database.get("cleanup_hours", 48)
 
+        # ── Journey track settings ─────────────────────────────
+        tracks = data.get("tracks", {}) or {}
+        self.track_tolerance_meters = tracks.get("tolerance_meters", 2.0)
+
         # ── Logging settings ──────────────────────────────────
         logging_config = data.get("logging", {}) or {}
         self.log_level = logging_config.get("level", "INFO")
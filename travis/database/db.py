@@ -5,14 +5,48 @@ Handles SQLite database connections and operations for location tracking
 
 import sqlite3
 import secrets
+import threading
+import time
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Union
+from datetime import datetime, timezone
 import logging
 from shared.migrations import MigrationRunner
+from travis.services.tracks import simplify, encode_track, decode_track
 
 logger = logging.getLogger(__name__)
 
+# How long a cached latest ping is trusted before re-reading SQLite, so a
+# worker that stops receiving a staff member's pings picks up other workers'
+LATEST_PING_CACHE_SECONDS = 30
+
+# Columns a ping can carry, in INSERT order
+PING_FIELDS = (
+    'staff_id', 'journey_id', 'latitude', 'longitude', 'accuracy',
+    'heading', 'speed', 'altitude', 'battery_level', 'timestamp'
+)
+
+
+def format_ping_timestamp(timestamp: Optional[Union[datetime, str]] = None) -> str:
+    """
+    Format a ping timestamp the way SQLite's CURRENT_TIMESTAMP does
+    (UTC, 'YYYY-MM-DD HH:MM:SS') so pings sort correctly by timestamp.
+
+    Args:
+        timestamp: Device timestamp (aware datetimes are converted to UTC),
+            an already formatted string, or None for now
+
+    Returns:
+        Timestamp string
+    """
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc)
+    if isinstance(timestamp, str):
+        return timestamp
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.strftime('%Y-%m-%d %H:%M:%S')
+
 
 class Database:
     """
@@ -34,6 +68,11 @@ class Database:
         logger.info(f"Database path: {self.db_path}")
         self._run_migrations()
 
+        # Latest position per staff member, so customer-facing polls rarely
+        # read location_pings: staff_id -> (expires_at, ping)
+        self._latest_pings: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self._cache_lock = threading.Lock()
+
     def _run_migrations(self):
         """Run database migrations"""
         migrations_dir = Path(__file__).parent.parent / 'migrations'
@@ -263,6 +302,35 @@ class Database:
         finally:
             conn.close()
 
+    def get_journeys_since(self, staff_id: int, since: str) -> List[Dict[str, Any]]:
+        """
+        Get a staff member's started journeys that were still running at or
+        after a time, oldest first
+
+        Used to file queued pings under the journey they were taken on.
+        Cancelled journeys are left out since they have no end time.
+
+        Args:
+            staff_id: Staff member ID
+            since: Timestamp ('YYYY-MM-DD HH:MM:SS', UTC)
+
+        Returns:
+            List of journey dictionaries
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute(
+                """SELECT * FROM journeys
+                   WHERE staff_id = ? AND started_at IS NOT NULL
+                     AND status != 'cancelled'
+                     AND (completed_at IS NULL OR completed_at >= ?)
+                   ORDER BY started_at""",
+                (staff_id, since)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
     def get_journey_by_job_reference(self, job_reference: str) -> Optional[Dict[str, Any]]:
         """Get journey by external job reference"""
         conn = self.get_connection()
@@ -438,45 +506,103 @@ class Database:
         Returns:
             Ping ID
         """
+        return self.record_pings([{
+            'staff_id': staff_id,
+            'journey_id': journey_id,
+            'latitude': latitude,
+            'longitude': longitude,
+            'accuracy': accuracy,
+            'heading': heading,
+            'speed': speed,
+            'altitude': altitude,
+            'battery_level': battery_level,
+            'timestamp': timestamp,
+        }])[0]
+
+    def record_pings(self, pings: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Record a batch of location pings in one transaction
+
+        Writes every ping and bumps each staff member's last_ping_at with a
+        single commit, so a batch costs one fsync however many rows it has.
+
+        Args:
+            pings: Ping dictionaries keyed by PING_FIELDS (staff_id, latitude
+                and longitude required; a missing timestamp means now)
+
+        Returns:
+            Ping IDs, in the order given
+        """
+        rows = []
+        for ping in pings:
+            row = {field: ping.get(field) for field in PING_FIELDS}
+            row['timestamp'] = format_ping_timestamp(row['timestamp'])
+            rows.append(row)
+        if not rows:
+            return []
+
         conn = self.get_connection()
         try:
-            if timestamp:
-                cursor = conn.execute(
-                    """INSERT INTO location_pings
-                       (staff_id, journey_id, latitude, longitude, accuracy, heading, speed, altitude, battery_level, timestamp)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (staff_id, journey_id, latitude, longitude, accuracy, heading, speed, altitude, battery_level, timestamp)
-                )
-            else:
-                cursor = conn.execute(
-                    """INSERT INTO location_pings
-                       (staff_id, journey_id, latitude, longitude, accuracy, heading, speed, altitude, battery_level)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (staff_id, journey_id, latitude, longitude, accuracy, heading, speed, altitude, battery_level)
+            ping_ids = []
+            with conn:
+                for row in rows:
+                    cursor = conn.execute(
+                        f"""INSERT INTO location_pings ({', '.join(PING_FIELDS)})
+                           VALUES ({', '.join('?' * len(PING_FIELDS))})""",
+                        tuple(row[field] for field in PING_FIELDS)
+                    )
+                    ping_ids.append(cursor.lastrowid)
+
+                # Update each staff member's last ping timestamp
+                staff_ids = sorted({row['staff_id'] for row in rows})
+                conn.execute(
+                    f"""UPDATE staff SET last_ping_at = CURRENT_TIMESTAMP
+                       WHERE id IN ({', '.join('?' * len(staff_ids))})""",
+                    staff_ids
                 )
-            conn.commit()
-
-            # Update staff's last ping timestamp
-            conn.execute(
-                "UPDATE staff SET last_ping_at = CURRENT_TIMESTAMP WHERE id = ?",
-                (staff_id,)
-            )
-            conn.commit()
-
-            return cursor.lastrowid
         finally:
             conn.close()
 
+        for ping_id, row in zip(ping_ids, rows):
+            self.cache_latest_ping({'id': ping_id, **row})
+        return ping_ids
+
+    def cache_latest_ping(self, ping: Dict[str, Any]):
+        """
+        Remember a ping as its staff member's latest position, unless a newer
+        one is already cached (queued uploads can arrive out of order)
+
+        Args:
+            ping: Ping dictionary with staff_id and a formatted timestamp
+        """
+        staff_id = ping['staff_id']
+        with self._cache_lock:
+            current = self._latest_pings.get(staff_id)
+            if current is None or ping['timestamp'] >= current[1]['timestamp']:
+                self._latest_pings[staff_id] = (
+                    time.monotonic() + LATEST_PING_CACHE_SECONDS, dict(ping)
+                )
+
     def get_latest_ping(self, staff_id: int) -> Optional[Dict[str, Any]]:
         """
         Get the most recent location ping for a staff member
 
+        Served from memory for LATEST_PING_CACHE_SECONDS after the staff
+        member pings (or is looked up). After that SQLite is read again, so
+        pings taken by other workers show up; a newer cached ping that the
+        ping writer hasn't flushed yet still wins.
+
         Args:
             staff_id: Staff member ID
 
         Returns:
             Latest ping dictionary or None
         """
+        with self._cache_lock:
+            entry = self._latest_pings.get(staff_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return dict(entry[1])
+
         conn = self.get_connection()
         try:
             cursor = conn.execute(
@@ -486,21 +612,29 @@ class Database:
                 (staff_id,)
             )
             row = cursor.fetchone()
-            return dict(row) if row else None
         finally:
             conn.close()
 
+        ping = dict(row) if row else None
+        if entry is not None and (ping is None or entry[1]['timestamp'] > ping['timestamp']):
+            ping = entry[1]
+        if ping is None:
+            return None
+        with self._cache_lock:
+            self._latest_pings[staff_id] = (time.monotonic() + LATEST_PING_CACHE_SECONDS, ping)
+        return dict(ping)
+
     def get_journey_pings(
         self,
         journey_id: int,
-        limit: int = 1000
+        limit: Optional[int] = 1000
     ) -> List[Dict[str, Any]]:
         """
         Get location pings for a specific journey
 
         Args:
             journey_id: Journey ID
-            limit: Maximum number of pings to return
+            limit: Maximum number of pings to return (None for all of them)
 
         Returns:
             List of ping dictionaries (oldest first for path drawing)
@@ -511,7 +645,7 @@ class Database:
                 """SELECT * FROM location_pings
                    WHERE journey_id = ?
                    ORDER BY timestamp ASC LIMIT ?""",
-                (journey_id, limit)
+                (journey_id, -1 if limit is None else limit)
             )
             return [dict(row) for row in cursor.fetchall()]
         finally:
@@ -547,16 +681,38 @@ class Database:
         finally:
             conn.close()
 
-    def cleanup_old_pings(self, hours: int = 48) -> int:
+    def cleanup_old_pings(self, hours: int = 48, tolerance_meters: float = 2.0) -> int:
         """
         Delete pings older than specified hours for completed/cancelled journeys
 
+        Journeys that don't have a track yet are archived to journey_tracks
+        first, so their route outlives the raw pings.
+
         Args:
             hours: Hours to keep pings
+            tolerance_meters: Simplification tolerance for tracks archived here
 
         Returns:
             Number of pings deleted
         """
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute(
+                """SELECT DISTINCT p.journey_id FROM location_pings p
+                   JOIN journeys j ON j.id = p.journey_id
+                   LEFT JOIN journey_tracks t ON t.journey_id = p.journey_id
+                   WHERE j.status IN ('completed', 'cancelled')
+                   AND t.journey_id IS NULL
+                   AND p.timestamp < datetime('now', '-' || ? || ' hours')""",
+                (hours,)
+            )
+            untracked = [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+        for journey_id in untracked:
+            self.archive_journey_track(journey_id, tolerance_meters)
+
         conn = self.get_connection()
         try:
             # Delete old pings for completed/cancelled journeys
@@ -577,10 +733,117 @@ class Database:
         finally:
             conn.close()
 
+    # ══════════════════════════════════════════════════════════════
+    # Journey track operations
+    # ══════════════════════════════════════════════════════════════
+
+    def archive_journey_track(
+        self,
+        journey_id: int,
+        tolerance_meters: float = 2.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Simplify a journey's pings and store them as its track
+
+        Replaces any existing track, so it's safe to call again if late
+        pings arrive after completion.
+
+        Args:
+            journey_id: Journey ID
+            tolerance_meters: Douglas-Peucker tolerance (drops GPS jitter
+                and points on straight stretches)
+
+        Returns:
+            Track summary (without points), or None if the journey has no pings
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute(
+                """SELECT latitude, longitude, timestamp FROM location_pings
+                   WHERE journey_id = ?
+                   ORDER BY timestamp ASC, id ASC""",
+                (journey_id,)
+            )
+            pings = [dict(row) for row in cursor.fetchall()]
+            if not pings:
+                return None
+
+            track = encode_track(simplify(pings, tolerance_meters))
+            conn.execute(
+                """INSERT OR REPLACE INTO journey_tracks
+                   (journey_id, started_at, encoded_points, point_count, raw_point_count, tolerance_meters)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (journey_id, track['started_at'], track['encoded_points'],
+                 track['point_count'], len(pings), tolerance_meters)
+            )
+            conn.commit()
+            logger.info(
+                f"Archived track for journey {journey_id}: "
+                f"{len(pings)} pings -> {track['point_count']} points"
+            )
+        finally:
+            conn.close()
+
+        return {
+            'journey_id': journey_id,
+            'started_at': track['started_at'],
+            'point_count': track['point_count'],
+            'raw_point_count': len(pings),
+            'tolerance_meters': tolerance_meters,
+        }
+
+    def get_journey_track(self, journey_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a journey's stored track with its points decoded
+
+        Args:
+            journey_id: Journey ID
+
+        Returns:
+            Track dictionary with a points list (latitude, longitude,
+            timestamp; oldest first), or None if not archived
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute(
+                "SELECT * FROM journey_tracks WHERE journey_id = ?",
+                (journey_id,)
+            )
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+        track = dict(row)
+        track['points'] = decode_track(track['started_at'], track.pop('encoded_points'))
+        return track
+
     # ══════════════════════════════════════════════════════════════
     # Privacy-aware location retrieval
     # ══════════════════════════════════════════════════════════════
 
+    def _get_staff_status(self, staff_id: int) -> Optional[str]:
+        """
+        Current status for a staff member, or None if not found
+
+        Always read from SQLite (a primary key lookup): status decides
+        whether coordinates are shared, so it mustn't lag behind a change
+        made through another worker.
+        """
+        conn = self.get_connection()
+        try:
+            row = conn.execute(
+                "SELECT current_status FROM staff WHERE id = ?",
+                (staff_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+        return row[0] or "off_duty"
+
     def get_shareable_location(self, staff_id: int) -> Dict[str, Any]:
         """
         Get location data that's safe to share with customers.
@@ -592,12 +855,10 @@ class Database:
         Returns:
             Dict with shareable location info or status message
         """
-        staff = self.get_staff_by_id(staff_id)
-        if not staff:
+        status = self._get_staff_status(staff_id)
+        if status is None:
             return {"shareable": False, "error": "Staff not found"}
 
-        status = staff.get("current_status", "off_duty")
-
         if status == "in_transit":
             # Safe to share location
             ping = self.get_latest_ping(staff_id)
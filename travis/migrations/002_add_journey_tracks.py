@@ -0,0 +1,30 @@
+"""Add journey_tracks for simplified, compact journey routes.
+
+When a journey completes its pings are simplified and stored here as one
+delta-encoded row, so the route survives cleanup_old_pings deleting the
+raw location_pings.
+"""
+
+
+def up(conn):
+    """Create the journey_tracks table."""
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS journey_tracks (
+            journey_id INTEGER PRIMARY KEY,
+            started_at DATETIME,
+            encoded_points TEXT NOT NULL DEFAULT '',
+            point_count INTEGER NOT NULL DEFAULT 0,
+            raw_point_count INTEGER NOT NULL DEFAULT 0,
+            tolerance_meters REAL NOT NULL DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (journey_id) REFERENCES journeys(id) ON DELETE CASCADE
+        )
+    ''')
+
+
+def down(conn):
+    """Drop the journey_tracks table."""
+    cursor = conn.cursor()
+    cursor.execute('DROP TABLE IF EXISTS journey_tracks')
@@ -0,0 +1,188 @@
+"""Buffered location ping writer for Travis.
+
+Devices ping every few seconds, and writing each ping on its own costs a
+connection and a commit per request. The writer queues pings in memory and
+a background thread group-commits them with Database.record_pings, either
+every flush_interval_ms or as soon as flush_batch_size pings are waiting.
+
+Queued pings are cached as their staff member's latest position straight
+away, so location lookups see them before they reach SQLite.
+"""
+import threading
+import logging
+from typing import Optional, Dict, Any, List
+
+from travis.config import config
+from travis.database.db import db, format_ping_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class PingWriter:
+    """Queues location pings and writes them in batches."""
+
+    def __init__(
+        self,
+        database=None,
+        flush_interval_ms: int = 500,
+        flush_batch_size: int = 200,
+        max_pending: int = 10000
+    ):
+        """
+        Initialize the ping writer.
+
+        Args:
+            database: Database to write to (defaults to the global db)
+            flush_interval_ms: Longest a queued ping waits before being written
+            flush_batch_size: Write as soon as this many pings are queued
+            max_pending: Pings kept queued while writes are failing; the
+                oldest are dropped beyond this
+        """
+        self.db = database or db
+        self.flush_interval_ms = flush_interval_ms
+        self.flush_batch_size = flush_batch_size
+        self.max_pending = max_pending
+
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        # Serialises flushes so batches are committed in the order queued
+        self._flush_lock = threading.Lock()
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._running = False
+
+        self.pings_written = 0
+        self.batches_written = 0
+
+    def start(self):
+        """Start the background flush thread."""
+        if self._running:
+            logger.warning("Ping writer already running")
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._running = True
+        logger.info(
+            f"Ping writer started (every {self.flush_interval_ms}ms "
+            f"or {self.flush_batch_size} pings)"
+        )
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flush thread and write anything still queued."""
+        if not self._running:
+            return
+
+        logger.info("Stopping ping writer...")
+        self._stop_event.set()
+        self._wake_event.set()
+
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning("Ping writer thread did not stop cleanly")
+
+        self._running = False
+        self.flush()
+        logger.info("Ping writer stopped")
+
+    def is_running(self) -> bool:
+        """Check if the writer is running."""
+        return self._running and self._thread and self._thread.is_alive()
+
+    def submit(self, ping: Dict[str, Any]):
+        """
+        Queue a ping for the next batch write.
+
+        The ping is stamped with the time it was received (if the device
+        didn't send one) so buffering doesn't shift it. When the writer isn't
+        running (scripts, tests) the ping is written immediately.
+
+        Args:
+            ping: Ping dictionary keyed by travis.database.db.PING_FIELDS
+        """
+        ping = dict(ping)
+        ping['timestamp'] = format_ping_timestamp(ping.get('timestamp'))
+
+        if not self.is_running():
+            self.db.record_pings([ping])
+            return
+
+        self.db.cache_latest_ping({'id': None, **ping})
+        with self._lock:
+            self._pending.append(ping)
+            full = len(self._pending) >= self.flush_batch_size
+        if full:
+            self._wake_event.set()
+
+    def pending_count(self) -> int:
+        """Number of pings waiting to be written."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write every queued ping in one transaction.
+
+        Returns:
+            Number of pings written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            try:
+                self.db.record_pings(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} pings: {e}")
+                with self._lock:
+                    self._pending = batch + self._pending
+                    overflow = len(self._pending) - self.max_pending
+                    if overflow > 0:
+                        del self._pending[:overflow]
+                        logger.warning(f"Ping queue full, dropped {overflow} oldest pings")
+                raise
+
+            self.pings_written += len(batch)
+            self.batches_written += 1
+            return len(batch)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth and write counters, for health endpoints."""
+        return {
+            'running': bool(self.is_running()),
+            'pending': self.pending_count(),
+            'pings_written': self.pings_written,
+            'batches_written': self.batches_written,
+            'flush_interval_ms': self.flush_interval_ms,
+            'flush_batch_size': self.flush_batch_size,
+        }
+
+    def _run(self):
+        """Flush loop: write on the interval, or early when a batch fills."""
+        logger.info("Ping writer thread started")
+
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.flush_interval_ms / 1000)
+            self._wake_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception(f"Error in ping writer loop: {e}")
+                # Back off so a locked or full database isn't hammered
+                self._stop_event.wait(self.flush_interval_ms / 1000)
+
+        logger.info("Ping writer thread exiting")
+
+
+# Global writer instance
+ping_writer = PingWriter(
+    flush_interval_ms=config.ingest_flush_interval_ms,
+    flush_batch_size=config.ingest_flush_batch_size,
+    max_pending=config.ingest_max_pending
+)
@@ -0,0 +1,199 @@
+"""Journey track simplification and compact encoding.
+
+A completed journey's pings are reduced to a track: Douglas-Peucker drops
+points that sit within a tolerance (in metres) of the line through their
+neighbours, and what's left is stored delta-encoded with the encoded
+polyline algorithm (lat/lng to 1e-5 degrees, about 1 m, plus time offsets
+in seconds). Maps ask for coarser levels of detail by passing a larger
+tolerance, which simplifies the stored track further on the fly.
+"""
+import math
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Sequence, Tuple
+
+# Metres per degree of latitude (close enough everywhere for simplification)
+METRES_PER_DEGREE = 111_320.0
+
+# Encoded polyline precision (1e-5 degrees)
+COORDINATE_SCALE = 100_000
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _offset_metres(origin: Tuple[float, float], point: Tuple[float, float]) -> Tuple[float, float]:
+    """Local x/y offset in metres of point from origin (equirectangular)."""
+    x = (point[1] - origin[1]) * METRES_PER_DEGREE * math.cos(math.radians(origin[0]))
+    y = (point[0] - origin[0]) * METRES_PER_DEGREE
+    return x, y
+
+
+def _distance_to_segment(point, start, end) -> float:
+    """Distance in metres from point to the segment start-end."""
+    px, py = _offset_metres(start, point)
+    ex, ey = _offset_metres(start, end)
+    length_sq = ex * ex + ey * ey
+    if length_sq == 0:
+        return math.hypot(px, py)
+    t = max(0.0, min(1.0, (px * ex + py * ey) / length_sq))
+    return math.hypot(px - t * ex, py - t * ey)
+
+
+def simplify(points: Sequence[Dict[str, Any]], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Simplify a route with Douglas-Peucker.
+
+    Args:
+        points: Point dictionaries with latitude and longitude, in order
+        tolerance: Largest distance in metres a dropped point may be from
+            the simplified line (0 keeps every point)
+
+    Returns:
+        The kept points (first and last are always kept)
+    """
+    if tolerance <= 0 or len(points) < 3:
+        return list(points)
+
+    coords = [(p['latitude'], p['longitude']) for p in points]
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+
+    # Iterative so long journeys can't hit the recursion limit
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        furthest, furthest_distance = None, tolerance
+        for i in range(first + 1, last):
+            distance = _distance_to_segment(coords[i], coords[first], coords[last])
+            if distance > furthest_distance:
+                furthest, furthest_distance = i, distance
+        if furthest is not None:
+            keep[furthest] = True
+            stack.append((first, furthest))
+            stack.append((furthest, last))
+
+    return [p for p, kept in zip(points, keep) if kept]
+
+
+def _encode_value(value: int) -> str:
+    """Encode one signed integer in the encoded polyline format."""
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return ''.join(chunks)
+
+
+def encode_deltas(rows: Sequence[Sequence[int]]) -> str:
+    """
+    Delta-encode rows of integers (each column against the previous row).
+
+    Args:
+        rows: Equal-length integer rows, e.g. [(lat_e5, lng_e5), ...]
+
+    Returns:
+        Encoded polyline-style string
+    """
+    encoded = []
+    previous = None
+    for row in rows:
+        if previous is None:
+            previous = [0] * len(row)
+        for column, value in enumerate(row):
+            encoded.append(_encode_value(value - previous[column]))
+        previous = list(row)
+    return ''.join(encoded)
+
+
+def decode_deltas(encoded: str, columns: int) -> List[Tuple[int, ...]]:
+    """
+    Decode a string from encode_deltas.
+
+    Args:
+        encoded: Encoded string
+        columns: Number of integers per row
+
+    Returns:
+        List of integer tuples
+    """
+    values = []
+    value = shift = 0
+    for char in encoded:
+        byte = ord(char) - 63
+        value |= (byte & 0x1f) << shift
+        shift += 5
+        if byte < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+
+    rows = []
+    current = [0] * columns
+    for start in range(0, len(values) - columns + 1, columns):
+        current = [total + delta for total, delta in zip(current, values[start:start + columns])]
+        rows.append(tuple(current))
+    return rows
+
+
+def _parse_timestamp(value) -> datetime:
+    """Parse a stored ping timestamp (naive UTC)."""
+    parsed = value if isinstance(value, datetime) else \
+        datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def encode_track(points: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Encode track points for storage.
+
+    Args:
+        points: Point dictionaries with latitude, longitude and timestamp
+
+    Returns:
+        Dict with started_at, encoded_points (lat/lng/seconds-since-start)
+        and point_count
+    """
+    if not points:
+        return {'started_at': None, 'encoded_points': '', 'point_count': 0}
+
+    started = _parse_timestamp(points[0]['timestamp'])
+    rows = [
+        (
+            round(p['latitude'] * COORDINATE_SCALE),
+            round(p['longitude'] * COORDINATE_SCALE),
+            int((_parse_timestamp(p['timestamp']) - started).total_seconds()),
+        )
+        for p in points
+    ]
+    return {
+        'started_at': started.strftime(TIMESTAMP_FORMAT),
+        'encoded_points': encode_deltas(rows),
+        'point_count': len(rows),
+    }
+
+
+def decode_track(started_at: str, encoded_points: str) -> List[Dict[str, Any]]:
+    """
+    Decode stored track points.
+
+    Args:
+        started_at: Timestamp of the first point
+        encoded_points: String from encode_track
+
+    Returns:
+        Point dictionaries with latitude, longitude and timestamp
+    """
+    if not encoded_points:
+        return []
+
+    started = _parse_timestamp(started_at)
+    return [
+        {
+            'latitude': lat / COORDINATE_SCALE,
+            'longitude': lng / COORDINATE_SCALE,
+            'timestamp': (started + timedelta(seconds=seconds)).strftime(TIMESTAMP_FORMAT),
+        }
+        for lat, lng, seconds in decode_deltas(encoded_points, 3)
+    ]